@@ -0,0 +1,149 @@
+"""
+Synthetic datasets for the hot-path microbenchmarks: compliance reports for 10 to
+10,000 coins, Orbital pools with 10 to 10,000 ticks and pool snapshots with 10 to
+10,000 tokens. Everything is generated from fixed seeds, so every run (and the
+baseline) measures the same data.
+"""
+
+import copy
+import math
+import os
+import random
+import tempfile
+
+import orjson
+import pytest
+
+# Checkout state goes to a throwaway SQLite file; set before src.configs is imported.
+os.environ.setdefault("STORE_PATH", os.path.join(tempfile.mkdtemp(), "shared_state.sqlite3"))
+
+from src.configs import BACKEND_DIR, genius_configs, orbital_configs  # noqa: E402
+from src.services import compliance_index, pool, pricing  # noqa: E402
+
+SIZES = (10, 100, 1_000, 10_000)
+
+POOL_SYMBOLS = ("USDC", "USDT", "PYUSD", "USDe")
+TICK_CAPITAL = 1_000_000.0
+
+
+def synthetic_compliance_data(count: int):
+    """`count` reports cloned from genius_compliance_data.json, renamed and perturbed."""
+    with open(os.path.join(BACKEND_DIR, "genius_compliance_data.json"), "rb") as file:
+        templates = orjson.loads(file.read())["stablecoins"]
+
+    rng = random.Random(count)
+    coins = []
+    for i in range(count):
+        coin = copy.deepcopy(templates[i % len(templates)])
+        coin["name"] = f"{coin['name']}-{i}"
+        coin["reserves"]["reserve_percent_of_total"] = rng.randint(85, 110)
+        coin["reserves"]["reserve_distribution"]["cash"] = rng.randint(30, 90)
+        coin["risk_liquidity"]["daily_liquidity_ratio_percent"] = rng.randint(10, 90)
+        coin["risk_liquidity"]["redemption_speed_days"] = rng.randint(1, 10)
+        coin["issuance"]["volatility"]["30d_rolling_stddev_vs_peg"] = rng.uniform(0, 0.02)
+        coins.append(coin)
+    return {"stablecoins": coins}
+
+
+@pytest.fixture(scope="session")
+def compliance_snapshot(request):
+    """size -> ComplianceIndex over a synthetic dataset of that many coins."""
+    # Snapshots are kept in pytest's cache dir; compiling 10,000 coins takes a while.
+    directory = request.config.cache.mkdir("compliance-snapshots")
+    indexes = {}
+
+    def load(size: int) -> compliance_index.ComplianceIndex:
+        if size not in indexes:
+            source = directory / f"coins-{size}.json"
+            if not source.exists():
+                source.write_bytes(orjson.dumps(synthetic_compliance_data(size)))
+            with pytest.MonkeyPatch.context() as patch:
+                patch.setattr(genius_configs, "SOURCE", str(source))
+                patch.setattr(genius_configs, "SNAPSHOT", str(directory / f"coins-{size}.snapshot"))
+                indexes[size] = compliance_index.load()
+        return indexes[size]
+
+    return load
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}-coins")
+def compliance(request, compliance_snapshot, monkeypatch):
+    """The worker's compliance index, swapped for a synthetic one of each size."""
+    index = compliance_snapshot(request.param)
+    monkeypatch.setattr(compliance_index, "_index", index)
+    return index
+
+
+@pytest.fixture
+def coins(compliance):
+    """First, middle and last coin of the synthetic dataset."""
+    names = compliance.names()
+    return names[0], names[len(names) // 2], names[-1]
+
+
+def synthetic_pool(ticks: int) -> pool.OrbitalPool:
+    """Four-token pool with `ticks` equal deposits, each with its own depeg tolerance."""
+    rng = random.Random(ticks)
+    orbital_pool = pool.OrbitalPool(len(POOL_SYMBOLS), symbols=POOL_SYMBOLS)
+    for _ in range(ticks):
+        radius, k = pool.tick_from_capital(
+            TICK_CAPITAL, rng.uniform(0.9, 0.999), len(POOL_SYMBOLS)
+        )
+        orbital_pool.add_liquidity(radius, k)
+    return orbital_pool
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}-ticks")
+def orbital_pool(request):
+    return synthetic_pool(request.param)
+
+
+def synthetic_pool_state(tokens: int) -> pricing.PoolState:
+    """pricing.PoolState of `tokens` tokens, the first four named like the pool's."""
+    rng = random.Random(tokens)
+    symbols = tuple(
+        POOL_SYMBOLS[i] if i < len(POOL_SYMBOLS) else f"TOKEN{i}" for i in range(tokens)
+    )
+    addresses = tuple(f"0x{i + 1:040x}" for i in range(tokens))
+    scale = 10**orbital_configs.INTERNAL_DECIMALS
+    # A sphere through n reserves needs their spread to shrink like 1/√n.
+    spread = 100_000 // math.isqrt(tokens)
+    reserves = tuple(
+        rng.randint(1_000_000 - spread, 1_000_000 + spread) * scale for _ in range(tokens)
+    )
+    return addresses, symbols, reserves
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}-tokens")
+def pool_state(request, monkeypatch):
+    """The worker's pool snapshot, swapped for a synthetic one of each size."""
+    state = synthetic_pool_state(request.param)
+    monkeypatch.setattr(pricing, "_state", state)
+    monkeypatch.setattr(pricing, "_conversions", {})
+    return state
+
+
+@pytest.fixture
+def live_pool(monkeypatch):
+    """A four-token pool snapshot and its ticks, as pricing.refresh reads them from the deployed pool."""
+    state = synthetic_pool_state(len(POOL_SYMBOLS))
+    scale = 10**orbital_configs.INTERNAL_DECIMALS
+    # Equal deposits across a spread of depeg tolerances.
+    capital = sum(state[2]) / scale / 4
+    ticks = tuple(
+        (int(radius * scale), int(k * scale))
+        for radius, k in (
+            pool.tick_from_capital(capital, depeg_price, len(POOL_SYMBOLS))
+            for depeg_price in (0.99, 0.95, 0.9, 0.8)
+        )
+    )
+    monkeypatch.setattr(pricing, "_state", state)
+    monkeypatch.setattr(pricing, "_ticks", ticks)
+    monkeypatch.setattr(pricing, "_conversions", {})
+    return state
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    # Keep the committed baseline to summary statistics, without every round's timing.
+    for bench in output_json["benchmarks"]:
+        bench["stats"].pop("data", None)
@@ -0,0 +1,132 @@
+"""
+Start-up time of the backend: how long a fresh worker takes to import src.main.
+
+Usage (from backend/):
+    python benchmarks/importtime.py                 Report and check against the budget
+    python benchmarks/importtime.py --json out.json Also write the results as JSON
+
+Each run is a fresh interpreter importing src.main, then one importing only fastapi,
+the floor every worker pays. Wall time is measured without -X importtime (which adds
+its own overhead); a separate `python -X importtime` run attributes the time to the
+packages imported directly by src modules.
+
+The budget is on what src adds over that floor, as a share of it (--budget-percent or
+IMPORT_BUDGET_PERCENT, default 100), so it holds on machines of any speed. Exits
+non-zero when the median over the floor's median is above it, so CI fails when
+something heavy is imported at start-up again. Measured on a 1-vCPU Linux VM with
+Python 3.11.7 (--runs 7): fastapi 305 ms, src.main 488 ms, so src adds 60%; it added
+120% while numpy, x402.facilitator and eth_utils were imported at start-up.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = "src.main"
+
+FLOOR_MODULE = "fastapi"
+
+_TIMED_IMPORT = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def wall_time_ms(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", _TIMED_IMPORT.format(module=module)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip()) * 1000
+
+
+def import_breakdown(module: str):
+    """(module, cumulative ms) for each import made directly by a src module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # importtime prints children before their parent, indented one level deeper.
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((len(match.group(3)), match.group(4), int(match.group(2)) / 1000))
+
+    breakdown = []
+    for i, (depth, name, cumulative) in enumerate(entries):
+        parent = next((e for e in entries[i + 1 :] if e[0] < depth), None)
+        if parent is not None and parent[1].startswith("src") and not name.startswith("src"):
+            breakdown.append((name, cumulative))
+    return sorted(breakdown, key=lambda item: -item[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-percent",
+        type=float,
+        default=float(os.getenv("IMPORT_BUDGET_PERCENT", "100")),
+    )
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    # Interleaved, so both medians see the same machine load.
+    times, floor_times = [], []
+    for _ in range(args.runs):
+        times.append(wall_time_ms(MODULE))
+        floor_times.append(wall_time_ms(FLOOR_MODULE))
+    median = statistics.median(times)
+    floor = statistics.median(floor_times)
+    added_percent = (median - floor) / floor * 100
+    breakdown = import_breakdown(MODULE)
+
+    print(f"import {MODULE}: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(times):.0f}, max {max(times):.0f})")
+    print(f"import {FLOOR_MODULE}: median {floor:.0f} ms; src adds {added_percent:.0f}% "
+          f"(budget {args.budget_percent:.0f}%)")
+    print("Slowest imports made by src modules (cumulative, with -X importtime):")
+    for name, cumulative in breakdown[: args.top]:
+        print(f"  {cumulative:8.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(
+                {
+                    "module": MODULE,
+                    "python": sys.version.split()[0],
+                    "runs_ms": times,
+                    "median_ms": median,
+                    "floor_module": FLOOR_MODULE,
+                    "floor_runs_ms": floor_times,
+                    "floor_median_ms": floor,
+                    "added_percent": added_percent,
+                    "budget_percent": args.budget_percent,
+                    "imports_ms": dict(breakdown),
+                },
+                file,
+                indent=2,
+            )
+
+    if added_percent > args.budget_percent:
+        print(f"Start-up regression: src adds {added_percent:.0f}% over {FLOOR_MODULE}, "
+              f"> {args.budget_percent:.0f}% budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Load test of the backend's pricing and swap endpoints: throughput and latency
+percentiles at increasing concurrency.
+
+Usage (from backend/, against a running backend; onchain/load-test.sh sets it up on a
+local anvil chain and runs this):
+    python benchmarks/load.py --tokens 0xUSDC,0xUSDT --symbols USDC,USDT --wallet 0x...
+    python benchmarks/load.py ... --concurrency 1,8,64 --duration 5 --json load.json
+
+Each endpoint is driven on its own at each concurrency level: that many clients send
+requests back to back for --duration seconds. A request counts as an error when the
+status is not 200. Needs httpx (installed with x402).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+# /swap takes token units; /route and /impact take the pool's 18-decimal units
+SWAP_AMOUNT = 1_000_000  # 1 token with 6 decimals
+QUOTE_AMOUNT = 10**18
+
+
+def endpoints(args) -> Dict[str, Callable[[httpx.AsyncClient, int], Any]]:
+    """Name -> coroutine function sending the i-th request of a client."""
+    tokens, symbols = args.tokens.split(","), args.symbols.split(",")
+    pairs = [(i, j) for i in range(len(tokens)) for j in range(len(tokens)) if i != j]
+
+    def swap(client, i):
+        token_in, token_out = pairs[i % len(pairs)]
+        return client.post(
+            "/swap",
+            json={
+                "chain": args.chain,
+                "tokenIn": tokens[token_in],
+                "tokenOut": tokens[token_out],
+                "amountIn": str(SWAP_AMOUNT),
+                "minAmountOut": "0",
+                "deadline": int(time.time()) + 600,
+                "walletAddress": args.wallet,
+            },
+        )
+
+    def pair_params(i):
+        token_in, token_out = pairs[i % len(pairs)]
+        return {
+            "tokenIn": symbols[token_in],
+            "tokenOut": symbols[token_out],
+            "amountIn": str(QUOTE_AMOUNT),
+        }
+
+    return {
+        "price": lambda client, i: client.get(f"/price/{args.feed}"),
+        "swap": swap,
+        "route": lambda client, i: client.get("/route", params=pair_params(i)),
+        "impact": lambda client, i: client.get("/impact", params=pair_params(i)),
+    }
+
+
+async def run_level(
+    url: str, send: Callable, concurrency: int, duration: float
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            i = 0
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await send(client, i)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += not ok
+                i += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    percentiles = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else latencies * 99
+    )
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentiles[49],
+        "p90_ms": percentiles[89],
+        "p99_ms": percentiles[98],
+        "max_ms": max(latencies),
+    }
+
+
+async def run(args) -> Dict[str, List[Dict[str, Any]]]:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    selected = args.endpoints.split(",")
+    senders = endpoints(args)
+    unknown = set(selected) - set(senders)
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+    print(
+        f"{'endpoint':<8} {'conc':>5} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for name in selected:
+        for level in levels:
+            result = await run_level(args.url, senders[name], level, args.duration)
+            results.setdefault(name, []).append(result)
+            print(
+                f"{name:<8} {level:>5} {result['requests']:>9} {result['errors']:>7} "
+                f"{result['throughput_rps']:>9.1f} {result['p50_ms']:>8.1f} "
+                f"{result['p90_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['max_ms']:>8.1f}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--tokens", required=True, help="pool token addresses, in order")
+    parser.add_argument("--symbols", required=True, help="pool token symbols, in order")
+    parser.add_argument("--wallet", required=True, help="wallet /swap estimates gas for")
+    parser.add_argument("--chain", default="flow-testnet")
+    parser.add_argument("--feed", default="FLR", help="symbol /price is asked for")
+    parser.add_argument("--endpoints", default="price,swap,route,impact")
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per level")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(
+                {
+                    "url": args.url,
+                    "duration_s": args.duration,
+                    "python": sys.version.split()[0],
+                    "endpoints": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if any(level["errors"] for levels in results.values() for level in levels):
+        print("Some requests failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""The x402 checkout's hot paths: building the 402 and decoding X-PAYMENT."""
+
+import asyncio
+
+import pytest
+from src import router
+from src.configs import merchant_configs
+from src.services import catalog, pricing, registry
+from starlette.requests import Request
+from x402.encoding import safe_base64_encode
+from x402.types import EIP3009Authorization, ExactPaymentPayload, PaymentPayload
+
+pytestmark = pytest.mark.benchmark(group="checkout")
+
+RESOURCE_ID = 1000
+
+
+def _request(path: str, headers=()) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        }
+    )
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    # Timeline spans are written to the store in the background
+    loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(loop)))
+    loop.close()
+
+
+def test_compile_payment_required_body(benchmark, live_pool):
+    # After a pool change: every accepted token is re-priced through the pool
+    entry = registry._config_resource(RESOURCE_ID)
+    currencies = merchant_configs.MERCHANT_TO_CURRENCY_MAP[entry["merchant"]]
+
+    def compile_body():
+        pricing._conversions.clear()
+        return catalog.compile_payment_required_body(entry, currencies)
+
+    assert benchmark(compile_body).startswith(b"{")
+
+
+def test_get_resource_payment_required(benchmark, live_pool, loop):
+    # A new checkout: span and its timeline write, compiled 402 body, correlation headers
+    request = _request(f"/get-resource/{RESOURCE_ID}")
+
+    def get_resource():
+        return loop.run_until_complete(router.get_resource(RESOURCE_ID, request))
+
+    assert benchmark(get_resource).status_code == 402
+
+
+def test_decode_payment(benchmark):
+    payment = PaymentPayload(
+        x402_version=1,
+        scheme="exact",
+        network=merchant_configs.NETWORK,
+        payload=ExactPaymentPayload(
+            signature="0x" + "ab" * 65,
+            authorization=EIP3009Authorization(
+                from_="0x" + "11" * 20,
+                to=merchant_configs.WALLET_ADDRESS,
+                value="1000",
+                valid_after="0",
+                valid_before="1999999999",
+                nonce="0x" + "22" * 32,
+            ),
+        ),
+    )
+    header = safe_base64_encode(payment.model_dump_json(by_alias=True))
+    assert benchmark(router.decode_payment, header) == payment
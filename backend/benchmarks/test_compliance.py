@@ -0,0 +1,37 @@
+"""Risk scores and compliance report lookups over 10 to 10,000 coins."""
+
+import pytest
+from src.services import merchant
+
+pytestmark = pytest.mark.benchmark(group="compliance")
+
+
+def test_compute_risk_score(benchmark, coins):
+    def score():
+        return [merchant.compute_risk_score(coin) for coin in coins]
+
+    assert all(benchmark(score))
+
+
+def test_score_report(benchmark, compliance, coins):
+    coin = coins[1]
+    data = compliance.get_data(coin)
+    assert benchmark(merchant.score_report, coin, data) is not None
+
+
+def test_get_all_stablecoin_risk_scores(benchmark, compliance):
+    scores = benchmark(merchant.get_all_stablecoin_risk_scores)
+    assert len(scores) == len(compliance.names())
+
+
+def test_get_stablecoin_data(benchmark, coins):
+    def lookup():
+        return [merchant.get_stablecoin_data(coin) for coin in (*coins, "NONE")]
+
+    assert benchmark(lookup)[-1] is None
+
+
+def test_get_encoded_coin_data(benchmark, compliance, coins):
+    # The /coin-data body as served: digest and encoded variants straight from the map
+    digest, variants = benchmark(compliance.get_encoded, coins[1], "data")
+    assert digest and "identity" in variants
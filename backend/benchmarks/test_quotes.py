@@ -0,0 +1,58 @@
+"""Off-chain quote math: pool snapshots of 10 to 10,000 tokens, pools of 10 to 10,000 ticks."""
+
+import pytest
+from src.services import impact, orbital_math, pricing, routing
+
+pytestmark = pytest.mark.benchmark(group="quotes")
+
+SMALL_TRADE = 10_000.0  # Whole tokens; crosses no tick
+CROSSING_SHARE = 0.01  # Of the reserves; crosses every tick of the synthetic pools
+
+
+def test_amount_out_and_in(benchmark):
+    reserves = (1_000_000 * 10**18, 1_100_000 * 10**18, 1_050_000 * 10**18)
+
+    def quote():
+        # A fresh state per round, so the sphere is fitted every time
+        state = orbital_math.PoolState(reserves, 30)
+        amount_out = state.amount_out(0, 1, 10**21)
+        return state.amount_in(0, 1, amount_out)
+
+    assert benchmark(quote) <= 10**21
+
+
+def test_convert(benchmark, pool_state):
+    # First conversion after a pool change; the last token is found by a full scan
+    _, symbols, _ = pool_state
+
+    def convert():
+        pricing._conversions.clear()
+        return pricing.convert(1_000_000, symbols[0], 6, symbols[-1], 6)
+
+    assert benchmark(convert)
+
+
+def test_torus_quote(benchmark, orbital_pool):
+    state = orbital_pool.state()
+    assert benchmark(state.quote, 0, 1, SMALL_TRADE) > 0
+
+
+def test_trace(benchmark, orbital_pool):
+    assert len(benchmark(orbital_pool.trace, 0, 1, SMALL_TRADE)) == 1
+
+
+def test_trace_crossing_every_tick(benchmark, orbital_pool):
+    amount = sum(orbital_pool.reserves) * CROSSING_SHARE
+    segments = benchmark(orbital_pool.trace, 0, 1, amount)
+    assert len(segments) >= len(orbital_pool.ticks)
+
+
+def test_plan_split(benchmark, live_pool):
+    markets = routing.get_live_markets()
+    plan = benchmark(routing.plan_split, markets, "USDC", "USDT", SMALL_TRADE)
+    assert plan.amount_out > 0
+
+
+def test_build_curves(benchmark, live_pool):
+    ((symbols, pool),) = routing.get_live_markets().values()
+    assert benchmark(impact.build_curves, pool, symbols)
@@ -0,0 +1,35 @@
+"""
+Mock of Circle's CCTP attestation service (v1 API) for local testing of the payment
+tracker (src/services/payments.py) against anvil chains.
+
+A message hash is "pending_confirmations" for ATTESTATION_DELAY_SECONDS after it is
+first requested, then "complete" with a dummy attestation; MockMessageTransmitter
+(onchain/src/MockCCTP.sol) accepts any attestation.
+
+Run with: uvicorn mock_attestation:app --port 8547
+"""
+
+import os
+import time
+
+import fastapi
+from eth_utils import keccak
+from fastapi.responses import JSONResponse
+
+ATTESTATION_DELAY_SECONDS = float(os.getenv("ATTESTATION_DELAY_SECONDS", "5"))
+
+app = fastapi.FastAPI()
+_first_seen = {}
+
+
+@app.get("/v1/attestations/{message_hash}")
+async def attestation(message_hash: str):
+    if not message_hash.startswith("0x") or len(message_hash) != 66:
+        return JSONResponse(status_code=400, content={"error": "Invalid message hash"})
+    first_seen = _first_seen.setdefault(message_hash.lower(), time.monotonic())
+    if time.monotonic() - first_seen < ATTESTATION_DELAY_SECONDS:
+        return {"attestation": "PENDING", "status": "pending_confirmations"}
+    return {
+        "attestation": "0x" + keccak(hexstr=message_hash).hex(),
+        "status": "complete",
+    }
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from src import metrics
+
+# Returned by LRUCache.get on a miss, so None can be cached as a value.
+MISSING = object()
+
+
+class LRUCache:
+    """
+    In-process least-recently-used cache with an optional time-to-live.
+
+    Values can be None (e.g. "no such merchant"), so misses return MISSING. Named
+    caches export their hit rate (metrics.CACHE_LOOKUPS).
+    """
+
+    def __init__(
+        self, max_size: int, ttl_seconds: Optional[float] = None, name: Optional[str] = None
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._counters = metrics.cache_counters(name) if name else None
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or (
+            self.ttl_seconds is not None and time.monotonic() > entry[0]
+        ):
+            self.misses += 1
+            if self._counters:
+                self._counters[1].inc()
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if self._counters:
+            self._counters[0].inc()
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else 0
+        )
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,10 +1,6 @@
-from x402.chains import (
-    get_chain_id,
-    get_token_decimals,
-    get_token_name,
-    get_token_version,
-    get_default_token_address,
-)
+import functools
+import json
+import os
 from x402.types import (
     PaymentPayload,
     PaymentRequirements,
@@ -17,6 +13,45 @@ from x402.types import (
     SettleResponse,
 )
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _lazy:
+    """
+    Config value computed from its class on first access, then stored on the class.
+
+    Keeps importing this module cheap for worker start-up: ABIs and data files are
+    read, and SDK lookups made, only once something uses them.
+    """
+
+    def __init__(self, load):
+        self.load = load
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = self.load(owner)
+        setattr(owner, self.name, value)
+        return value
+
+
+def _load_json(filename: str):
+    with open(os.path.join(BACKEND_DIR, filename), "rb") as file:
+        return json.load(file)
+
+
+@functools.lru_cache(maxsize=None)
+def load_abi(name: str) -> list:
+    """Contract ABI from abi/<name>.json (Foundry artifact layout: {"abi": [...]})."""
+    return _load_json(os.path.join("abi", f"{name}.json"))["abi"]
+
+
+def _x402_chains():
+    import x402.chains
+
+    return x402.chains
+
 
 class flare_configs:
     """
@@ -32,9 +67,9 @@ class flare_configs:
 
     """
 
-    FTSOV2_ADDRESS = "0x3d893C53D9e8056135C26C8c638B76C8b60Df726"
+    FTSOV2_ADDRESS = os.getenv("FTSOV2_ADDRESS", "0x3d893C53D9e8056135C26C8c638B76C8b60Df726")
     # FtsoV2 address (Flare Testnet Coston2), check https://dev.flare.network/ftso/solidity-reference for prod?
-    RPC_URL = "https://coston2-api.flare.network/ext/C/rpc"
+    RPC_URL = os.getenv("FLARE_RPC_URL", "https://coston2-api.flare.network/ext/C/rpc")
 
     # Feed IDs for stablecoins pegged to USD
     STABLECOIN_FEED_IDS = {
@@ -42,949 +77,39 @@ class flare_configs:
         "BTC": "0x014254432f55534400000000000000000000000000",  # BTC/USD
         "ETH": "0x014554482f55534400000000000000000000000000",  # ETH/USD
     }
-    # ABI for FtsoV2
-    ABI = [
-        {
-            "inputs": [
-                {
-                    "internalType": "address",
-                    "name": "_addressUpdater",
-                    "type": "address",
-                }
-            ],
-            "stateMutability": "nonpayable",
-            "type": "constructor",
-        },
-        {
-            "inputs": [],
-            "name": "FTSO_PROTOCOL_ID",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "fastUpdater",
-            "outputs": [
-                {"internalType": "contract IFastUpdater", "name": "", "type": "address"}
-            ],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "fastUpdatesConfiguration",
-            "outputs": [
-                {
-                    "internalType": "contract IFastUpdatesConfiguration",
-                    "name": "",
-                    "type": "address",
-                }
-            ],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "getAddressUpdater",
-            "outputs": [
-                {
-                    "internalType": "address",
-                    "name": "_addressUpdater",
-                    "type": "address",
-                }
-            ],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "bytes21", "name": "_feedId", "type": "bytes21"}
-            ],
-            "name": "getFeedById",
-            "outputs": [
-                {"internalType": "uint256", "name": "", "type": "uint256"},
-                {"internalType": "int8", "name": "", "type": "int8"},
-                {"internalType": "uint64", "name": "", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "bytes21", "name": "_feedId", "type": "bytes21"}
-            ],
-            "name": "getFeedByIdInWei",
-            "outputs": [
-                {"internalType": "uint256", "name": "_value", "type": "uint256"},
-                {"internalType": "uint64", "name": "_timestamp", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256", "name": "_index", "type": "uint256"}
-            ],
-            "name": "getFeedByIndex",
-            "outputs": [
-                {"internalType": "uint256", "name": "", "type": "uint256"},
-                {"internalType": "int8", "name": "", "type": "int8"},
-                {"internalType": "uint64", "name": "", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256", "name": "_index", "type": "uint256"}
-            ],
-            "name": "getFeedByIndexInWei",
-            "outputs": [
-                {"internalType": "uint256", "name": "_value", "type": "uint256"},
-                {"internalType": "uint64", "name": "_timestamp", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256", "name": "_index", "type": "uint256"}
-            ],
-            "name": "getFeedId",
-            "outputs": [{"internalType": "bytes21", "name": "", "type": "bytes21"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "bytes21", "name": "_feedId", "type": "bytes21"}
-            ],
-            "name": "getFeedIndex",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "bytes21[]", "name": "_feedIds", "type": "bytes21[]"}
-            ],
-            "name": "getFeedsById",
-            "outputs": [
-                {"internalType": "uint256[]", "name": "", "type": "uint256[]"},
-                {"internalType": "int8[]", "name": "", "type": "int8[]"},
-                {"internalType": "uint64", "name": "", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "bytes21[]", "name": "_feedIds", "type": "bytes21[]"}
-            ],
-            "name": "getFeedsByIdInWei",
-            "outputs": [
-                {"internalType": "uint256[]", "name": "_values", "type": "uint256[]"},
-                {"internalType": "uint64", "name": "_timestamp", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256[]", "name": "_indices", "type": "uint256[]"}
-            ],
-            "name": "getFeedsByIndex",
-            "outputs": [
-                {"internalType": "uint256[]", "name": "", "type": "uint256[]"},
-                {"internalType": "int8[]", "name": "", "type": "int8[]"},
-                {"internalType": "uint64", "name": "", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256[]", "name": "_indices", "type": "uint256[]"}
-            ],
-            "name": "getFeedsByIndexInWei",
-            "outputs": [
-                {"internalType": "uint256[]", "name": "_values", "type": "uint256[]"},
-                {"internalType": "uint64", "name": "_timestamp", "type": "uint64"},
-            ],
-            "stateMutability": "payable",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "relay",
-            "outputs": [
-                {"internalType": "contract IRelay", "name": "", "type": "address"}
-            ],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {
-                    "internalType": "bytes32[]",
-                    "name": "_contractNameHashes",
-                    "type": "bytes32[]",
-                },
-                {
-                    "internalType": "address[]",
-                    "name": "_contractAddresses",
-                    "type": "address[]",
-                },
-            ],
-            "name": "updateContractAddresses",
-            "outputs": [],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {
-                    "components": [
-                        {
-                            "internalType": "bytes32[]",
-                            "name": "proof",
-                            "type": "bytes32[]",
-                        },
-                        {
-                            "components": [
-                                {
-                                    "internalType": "uint32",
-                                    "name": "votingRoundId",
-                                    "type": "uint32",
-                                },
-                                {
-                                    "internalType": "bytes21",
-                                    "name": "id",
-                                    "type": "bytes21",
-                                },
-                                {
-                                    "internalType": "int32",
-                                    "name": "value",
-                                    "type": "int32",
-                                },
-                                {
-                                    "internalType": "uint16",
-                                    "name": "turnoutBIPS",
-                                    "type": "uint16",
-                                },
-                                {
-                                    "internalType": "int8",
-                                    "name": "decimals",
-                                    "type": "int8",
-                                },
-                            ],
-                            "internalType": "struct FtsoV2Interface.FeedData",
-                            "name": "body",
-                            "type": "tuple",
-                        },
-                    ],
-                    "internalType": "struct FtsoV2Interface.FeedDataWithProof",
-                    "name": "_feedData",
-                    "type": "tuple",
-                }
-            ],
-            "name": "verifyFeedData",
-            "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-    ]
+    # ABI for FtsoV2 (abi/FtsoV2.json)
+    ABI = _lazy(lambda cls: load_abi("FtsoV2"))
 
 
 class orbital_configs:
-    PROVIDER_URL = "https://testnet.evm.nodes.onflow.org"
-    CONTRACT_ADDRESS = "0x274725cdEEC749D4E97DC990de45a5Bba76F80C3"
-    ABI = [
-        {
-            "inputs": [
-                {"internalType": "address[]", "name": "_tokens", "type": "address[]"},
-                {"internalType": "string[]", "name": "_symbols", "type": "string[]"},
-                {"internalType": "address", "name": "_owner", "type": "address"},
-            ],
-            "stateMutability": "nonpayable",
-            "type": "constructor",
-        },
-        {
-            "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
-            "name": "OwnableInvalidOwner",
-            "type": "error",
-        },
-        {
-            "inputs": [
-                {"internalType": "address", "name": "account", "type": "address"}
-            ],
-            "name": "OwnableUnauthorizedAccount",
-            "type": "error",
-        },
-        {"inputs": [], "name": "ReentrancyGuardReentrantCall", "type": "error"},
-        {
-            "inputs": [{"internalType": "address", "name": "token", "type": "address"}],
-            "name": "SafeERC20FailedOperation",
-            "type": "error",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "uint256",
-                    "name": "tickId",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "enum OrbitalTypes.TickState",
-                    "name": "fromState",
-                    "type": "uint8",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "enum OrbitalTypes.TickState",
-                    "name": "toState",
-                    "type": "uint8",
-                },
-            ],
-            "name": "BoundaryCrossed",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "uint256",
-                    "name": "tickId",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "owner",
-                    "type": "address",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "amounts",
-                    "type": "uint256[]",
-                },
-            ],
-            "name": "FeesCollected",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "recipient",
-                    "type": "address",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "amounts",
-                    "type": "uint256[]",
-                },
-            ],
-            "name": "FeesCollected",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "provider",
-                    "type": "address",
-                },
-                {
-                    "indexed": True,
-                    "internalType": "uint256",
-                    "name": "tickId",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "radius",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "k",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "amounts",
-                    "type": "uint256[]",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "feeBps",
-                    "type": "uint256",
-                },
-            ],
-            "name": "LiquidityAdded",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "provider",
-                    "type": "address",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "amounts",
-                    "type": "uint256[]",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "lpTokensMinted",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "newReserves",
-                    "type": "uint256[]",
-                },
-            ],
-            "name": "LiquidityAdded",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "provider",
-                    "type": "address",
-                },
-                {
-                    "indexed": True,
-                    "internalType": "uint256",
-                    "name": "tickId",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "amounts",
-                    "type": "uint256[]",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "fees",
-                    "type": "uint256[]",
-                },
-            ],
-            "name": "LiquidityRemoved",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "provider",
-                    "type": "address",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "amounts",
-                    "type": "uint256[]",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "lpTokensBurned",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "newReserves",
-                    "type": "uint256[]",
-                },
-            ],
-            "name": "LiquidityRemoved",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "previousOwner",
-                    "type": "address",
-                },
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "newOwner",
-                    "type": "address",
-                },
-            ],
-            "name": "OwnershipTransferred",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "trader",
-                    "type": "address",
-                },
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "tokenIn",
-                    "type": "address",
-                },
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "tokenOut",
-                    "type": "address",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "amountIn",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "amountOut",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "segments",
-                    "type": "uint256",
-                },
-            ],
-            "name": "Swap",
-            "type": "event",
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {
-                    "indexed": True,
-                    "internalType": "address",
-                    "name": "trader",
-                    "type": "address",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "tokenInIndex",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "tokenOutIndex",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "amountIn",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256",
-                    "name": "amountOut",
-                    "type": "uint256",
-                },
-                {
-                    "indexed": False,
-                    "internalType": "uint256[]",
-                    "name": "newReserves",
-                    "type": "uint256[]",
-                },
-            ],
-            "name": "Swap",
-            "type": "event",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "activeTickIds",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"},
-                {"internalType": "uint256", "name": "capital", "type": "uint256"},
-                {
-                    "internalType": "uint256",
-                    "name": "depegTolerance",
-                    "type": "uint256",
-                },
-                {"internalType": "uint256", "name": "feeBps", "type": "uint256"},
-            ],
-            "name": "addLiquidity",
-            "outputs": [
-                {
-                    "components": [
-                        {
-                            "internalType": "uint256",
-                            "name": "tickId",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "kValue",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "radius",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "depegProtection",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "capitalEfficiency",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "virtualReserves",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256[]",
-                            "name": "initialReserves",
-                            "type": "uint256[]",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "effectiveDeposit",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256[]",
-                            "name": "leftoverAmounts",
-                            "type": "uint256[]",
-                        },
-                        {"internalType": "bool", "name": "success", "type": "bool"},
-                        {"internalType": "string", "name": "message", "type": "string"},
-                    ],
-                    "internalType": "struct OrbitalTypes.LiquidityResult",
-                    "name": "result",
-                    "type": "tuple",
-                }
-            ],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "boundaryTickIds",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256", "name": "tickId", "type": "uint256"}
-            ],
-            "name": "collectFees",
-            "outputs": [],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "getPoolStats",
-            "outputs": [
-                {
-                    "components": [
-                        {
-                            "internalType": "string[]",
-                            "name": "tokenSymbols",
-                            "type": "string[]",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "totalTicks",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "interiorTicks",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "boundaryTicks",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256[]",
-                            "name": "totalReserves",
-                            "type": "uint256[]",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "totalLiquidity",
-                            "type": "uint256",
-                        },
-                    ],
-                    "internalType": "struct OrbitalTypes.PoolStats",
-                    "name": "",
-                    "type": "tuple",
-                }
-            ],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint8", "name": "tokenInIndex", "type": "uint8"},
-                {"internalType": "uint8", "name": "tokenOutIndex", "type": "uint8"},
-                {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-            ],
-            "name": "getQuote",
-            "outputs": [
-                {"internalType": "uint256", "name": "amountOut", "type": "uint256"}
-            ],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "interiorTickIds",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "isBoundaryTick",
-            "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "isInteriorTick",
-            "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "nextTickId",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "owner",
-            "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256", "name": "tickId", "type": "uint256"}
-            ],
-            "name": "removeLiquidity",
-            "outputs": [
-                {"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"},
-                {"internalType": "uint256[]", "name": "fees", "type": "uint256[]"},
-            ],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "renounceOwnership",
-            "outputs": [],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "address", "name": "tokenIn", "type": "address"},
-                {"internalType": "address", "name": "tokenOut", "type": "address"},
-                {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-                {"internalType": "uint256", "name": "minAmountOut", "type": "uint256"},
-                {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-            ],
-            "name": "swap",
-            "outputs": [
-                {
-                    "components": [
-                        {
-                            "internalType": "uint256",
-                            "name": "inputAmountGross",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "inputAmountNet",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "outputAmount",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "effectivePrice",
-                            "type": "uint256",
-                        },
-                        {
-                            "internalType": "uint256",
-                            "name": "segments",
-                            "type": "uint256",
-                        },
-                        {"internalType": "bool", "name": "success", "type": "bool"},
-                        {"internalType": "string", "name": "message", "type": "string"},
-                    ],
-                    "internalType": "struct OrbitalTypes.TradeResult",
-                    "name": "result",
-                    "type": "tuple",
-                }
-            ],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "uint8", "name": "tokenInIndex", "type": "uint8"},
-                {"internalType": "uint8", "name": "tokenOutIndex", "type": "uint8"},
-                {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-                {"internalType": "uint256", "name": "minAmountOut", "type": "uint256"},
-                {"internalType": "address", "name": "recipient", "type": "address"},
-            ],
-            "name": "swapExactIn",
-            "outputs": [
-                {"internalType": "uint256", "name": "amountOut", "type": "uint256"}
-            ],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "tickIdToIndex",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "ticks",
-            "outputs": [
-                {"internalType": "uint256", "name": "tickId", "type": "uint256"},
-                {"internalType": "address", "name": "owner", "type": "address"},
-                {"internalType": "uint256", "name": "k", "type": "uint256"},
-                {"internalType": "uint256", "name": "radius", "type": "uint256"},
-                {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-                {
-                    "internalType": "enum OrbitalTypes.TickState",
-                    "name": "state",
-                    "type": "uint8",
-                },
-                {"internalType": "uint256", "name": "feeBps", "type": "uint256"},
-            ],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "tokenCount",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "address", "name": "", "type": "address"}],
-            "name": "tokenIndex",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "tokenSymbols",
-            "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "tokens",
-            "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "totalLiquidity",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [],
-            "name": "totalReserves",
-            "outputs": [{"internalType": "uint256[]", "name": "", "type": "uint256[]"}],
-            "stateMutability": "view",
-            "type": "function",
-        },
-        {
-            "inputs": [
-                {"internalType": "address", "name": "newOwner", "type": "address"}
-            ],
-            "name": "transferOwnership",
-            "outputs": [],
-            "stateMutability": "nonpayable",
-            "type": "function",
-        },
-    ]
+    # The ORBITAL_* variables point the backend at another deployment, e.g. the local
+    # pool onchain/load-test.sh deploys.
+    PROVIDER_URL = os.getenv("ORBITAL_RPC_URL", "https://testnet.evm.nodes.onflow.org")
+    CONTRACT_ADDRESS = os.getenv(
+        "ORBITAL_POOL_ADDRESS", "0x274725cdEEC749D4E97DC990de45a5Bba76F80C3"
+    )
+    # The pool stores reserves normalized to 18 decimals and getQuote charges a flat fee.
+    INTERNAL_DECIMALS = 18
+    SWAP_FEE_BPS = 30
+    # How often the pool state is re-read for pricing (roughly one block).
+    REFRESH_SECONDS = 12
+
+    # /swap builds unsigned transactions for this chain only.
+    CHAIN = os.getenv("ORBITAL_CHAIN", "flow-testnet")
+    CHAIN_ID = int(os.getenv("ORBITAL_CHAIN_ID", "545"))
+    # Gas estimates requested within this window go out as one JSON-RPC batch, and
+    # an estimate is reused for the same token pair and amount bucket for about one
+    # block. Buckets keep this many leading bits of amountIn (within 1/8 of each other
+    # at 4), so a reused estimate is for a swap crossing about as many ticks.
+    GAS_BATCH_WINDOW_SECONDS = 0.01
+    GAS_CACHE_SECONDS = 12
+    GAS_CACHE_SIZE = 1024
+    GAS_AMOUNT_BUCKET_BITS = 4
+    # Estimates are for whichever swap in the bucket hit the RPC first, and for its
+    # wallet's balances; leave room for the rest of the bucket and first-time holders.
+    GAS_HEADROOM_PERCENT = 120
+    # abi/OrbitalPool.json, exported from the Foundry build
+    ABI = _lazy(lambda cls: load_abi("OrbitalPool"))
 
 
 class merchant_configs:
@@ -993,9 +118,13 @@ class merchant_configs:
     """
 
     MERCHANT_ID_TO_MERCHANT_MAP = {
+        123: "NYTIMES",  # The article frontend/orbital-fe sells
         1000: "NYTIMES",
     }
 
+    # Resource /verify settles for when the request does not name one
+    DEFAULT_RESOURCE_ID = 123
+
     MERCHANT_TO_CURRENCY_MAP = {
         "NYTIMES": ["USDC", "USDT", "DAI", "PYUSD", "USDe", "FRAX"],
     }
@@ -1014,146 +143,236 @@ class merchant_configs:
     RESOURCE = "url"  # url
     DESCRIPTION = "Access to weather data (Custom Token)"
     # Get USDC address for the network
-    CHAIN_ID = get_chain_id(NETWORK)
+    CHAIN_ID = _lazy(lambda cls: _x402_chains().get_chain_id(cls.NETWORK))
     ASSET_ADDRESS = PRICE.asset.address
     WALLET_ADDRESS = "0x0"
 
     # Get EIP-712 domain info
-    EIP712_DOMAIN = {
-        "name": get_token_name(CHAIN_ID, ASSET_ADDRESS),
-        "version": get_token_version(CHAIN_ID, ASSET_ADDRESS),
+    EIP712_DOMAIN = _lazy(
+        lambda cls: {
+            "name": _x402_chains().get_token_name(cls.CHAIN_ID, cls.ASSET_ADDRESS),
+            "version": _x402_chains().get_token_version(cls.CHAIN_ID, cls.ASSET_ADDRESS),
+        }
+    )
+
+    PAYMENT_REQUIREMENT = _lazy(
+        lambda cls: PaymentRequirements(
+            scheme="exact",
+            network=cls.NETWORK,
+            max_amount_required=cls.PRICE.amount,
+            resource=cls.RESOURCE,
+            description=cls.DESCRIPTION,
+            mime_type="application/json",
+            pay_to=cls.WALLET_ADDRESS,
+            max_timeout_seconds=60,
+            asset=cls.ASSET_ADDRESS,
+            output_schema=None,
+            extra=cls.EIP712_DOMAIN,
+        )
+    )
+
+    # Tokens a payer can settle in on NETWORK, keyed by pool symbol. Prices in other
+    # tokens are converted from the resource's own token through the Orbital pool.
+    PAYMENT_TOKENS = _lazy(
+        lambda cls: {
+            "USDC": {"asset": cls.ASSET_ADDRESS, "decimals": 6, "extra": cls.EIP712_DOMAIN},
+            "USDT": {
+                "asset": "0x3b7e3a661cec642fa7bCE0130e327b11FF0af43e",
+                "decimals": 6,
+                "extra": {"name": "USDT", "version": "1"},
+            },
+            "PYUSD": {
+                "asset": "0x20180e82dB7Ac476A9F3b0aF245338288c88D0Ef",
+                "decimals": 6,
+                "extra": {"name": "PYUSD", "version": "1"},
+            },
+            # 18-decimal tokens from onchain/script/DeployStablecoinsBaseSepolia.s.sol;
+            # left out of 402s until their deployed addresses are set.
+            "USDe": {
+                "asset": os.getenv("USDE_ADDRESS", ""),
+                "decimals": 18,
+                "extra": {"name": "USDe", "version": "1"},
+            },
+            "DAI": {
+                "asset": os.getenv("DAI_ADDRESS", ""),
+                "decimals": 18,
+                "extra": {"name": "DAI", "version": "1"},
+            },
+            "FRAX": {
+                "asset": os.getenv("FRAX_ADDRESS", ""),
+                "decimals": 18,
+                "extra": {"name": "FRAX", "version": "1"},
+            },
+        }
+    )
+
+    # Priced resources keyed by (merchant, resource id), seeded with every resource in
+    # MERCHANT_ID_TO_MERCHANT_MAP at PRICE. Edit through services.catalog so the
+    # compiled 402 bodies are rebuilt.
+    RESOURCE_CATALOG = _lazy(
+        lambda cls: {
+            (merchant, resource_id): {
+                "symbol": "USDC",
+                "price": cls.PRICE.amount,
+                "asset": cls.ASSET_ADDRESS,
+                "network": cls.NETWORK,
+                "description": cls.DESCRIPTION,
+                "extra": cls.EIP712_DOMAIN,
+            }
+            for resource_id, merchant in cls.MERCHANT_ID_TO_MERCHANT_MAP.items()
+        }
+    )
+
+
+class mongo_configs:
+    """
+    Storage for the merchant/resource registry.
+
+    Leave MONGO_URI unset to keep the registry in memory, served from merchant_configs.
+    """
+
+    URI = os.getenv("MONGO_URI", "")
+    DATABASE = os.getenv("MONGO_DATABASE", "rip_stripe")
+    MERCHANTS_COLLECTION = "merchants"
+    RESOURCES_COLLECTION = "resources"
+
+    # Connection pool per worker. Lookups are served from the registry cache, so the
+    # pool only has to absorb cache misses and onboarding writes.
+    MAX_POOL_SIZE = 50
+    MIN_POOL_SIZE = 5
+    MAX_IDLE_TIME_MS = 60_000
+    WAIT_QUEUE_TIMEOUT_MS = 2_000
+    SERVER_SELECTION_TIMEOUT_MS = 2_000
+
+    # Registry read-through cache (entries per worker). The TTL bounds staleness when
+    # change streams are unavailable (standalone mongod).
+    CACHE_SIZE = 10_000
+    CACHE_TTL_SECONDS = 300
+
+
+class store_configs:
+    """
+    State shared by every worker (services.store): checkout entitlements, x402
+    idempotency keys, cross-chain payments and checkout timelines. Kept in Mongo when
+    MONGO_URI is set, otherwise in a SQLite file that every worker on the host opens.
+    """
+
+    SQLITE_PATH = os.getenv("STORE_PATH", os.path.join(BACKEND_DIR, "shared_state.sqlite3"))
+    # How long a worker waits for another worker's write lock.
+    SQLITE_TIMEOUT_SECONDS = 5
+    COLLECTION = "shared_state"
+
+    # A settled payment unlocks its resource, for its payer, for this long.
+    ENTITLEMENT_TTL_SECONDS = 86_400
+    # Settled payment nonces are remembered this long, well past the payment's
+    # max_timeout_seconds, so a replayed X-PAYMENT is never settled twice.
+    IDEMPOTENCY_TTL_SECONDS = 86_400
+
+
+class bridge_configs:
+    """
+    Chains followed by the cross-chain payment tracker (services.payments).
+
+    CCTP legs use Circle's v1 contracts (depositForBurn returns the burn nonce), which
+    share addresses across testnets; LayerZero legs use each chain's OFT. Set
+    BRIDGE_CHAINS to a JSON object of the same shape, and CCTP_ATTESTATION_URL, to
+    track payments on local anvil chains against a mock attestation service.
+    """
+
+    CHAINS = {
+        "ethereum-sepolia": {
+            "rpc": os.getenv(
+                "ETHEREUM_SEPOLIA_RPC_URL", "https://ethereum-sepolia-rpc.publicnode.com"
+            ),
+            "cctp_domain": 0,
+            "lz_eid": 40161,
+            "token_messenger": "0x9f3B8679c73C2Fef8b59B4f3444d4e156fb70AA5",
+            "message_transmitter": "0x7865fAfC2db2093669d92c0F33AeEF291086BEFD",
+            "oft": os.getenv("ETHEREUM_SEPOLIA_OFT", ""),
+        },
+        "base-sepolia": {
+            "rpc": os.getenv("BASE_SEPOLIA_RPC_URL", "https://sepolia.base.org"),
+            "cctp_domain": 6,
+            "lz_eid": 40245,
+            "token_messenger": "0x9f3B8679c73C2Fef8b59B4f3444d4e156fb70AA5",
+            "message_transmitter": "0x7865fAfC2db2093669d92c0F33AeEF291086BEFD",
+            "oft": os.getenv("BASE_SEPOLIA_OFT", ""),
+        },
+        "arbitrum-sepolia": {
+            "rpc": os.getenv(
+                "ARBITRUM_SEPOLIA_RPC_URL", "https://sepolia-rollup.arbitrum.io/rpc"
+            ),
+            "cctp_domain": 3,
+            "lz_eid": 40231,
+            "token_messenger": "0x9f3B8679c73C2Fef8b59B4f3444d4e156fb70AA5",
+            "message_transmitter": "0x7865fAfC2db2093669d92c0F33AeEF291086BEFD",
+            "oft": os.getenv("ARBITRUM_SEPOLIA_OFT", ""),
+        },
     }
+    if os.getenv("BRIDGE_CHAINS"):
+        CHAINS = json.loads(os.environ["BRIDGE_CHAINS"])
+
+    ATTESTATION_URL = os.getenv("CCTP_ATTESTATION_URL", "https://iris-api-sandbox.circle.com")
+    ATTESTATION_CONCURRENCY = 16
+
+    # Every leg is polled once per interval: one receipt batch per source chain, one log
+    # query per destination chain and concurrent attestation lookups.
+    POLL_SECONDS = 4
+    # Destination logs are searched from this many blocks before the head when a leg
+    # starts waiting, in case the mint lands before the tracker sees the burn.
+    LOG_LOOKBACK_BLOCKS = 100
+    # A source transaction that is still unknown after this long is marked failed.
+    SOURCE_TIMEOUT_SECONDS = 900
+    # Payments stay queryable for this long after their last change.
+    RETENTION_SECONDS = 86_400
+    # Status streams re-read their payment from the shared store this often; the
+    # worker polling the chains may be another one.
+    STREAM_POLL_SECONDS = 1
+    # Idle status streams send a comment this often so proxies keep them open.
+    STREAM_KEEPALIVE_SECONDS = 15
+
 
-    PAYMENT_REQUIREMENT = PaymentRequirements(
-        scheme="exact",
-        network=NETWORK,
-        max_amount_required=PRICE.amount,
-        resource=RESOURCE,
-        description=DESCRIPTION,
-        mime_type="application/json",
-        pay_to=WALLET_ADDRESS,
-        max_timeout_seconds=60,
-        asset=ASSET_ADDRESS,
-        output_schema=None,
-        extra=EIP712_DOMAIN,
+class tracing_configs:
+    """
+    Checkout tracing (src/tracing.py). Spans always feed the per-checkout timelines,
+    kept in the shared store (services.store); set TRACE_FILE to also append them as
+    JSON lines, and the standard OTEL_EXPORTER_OTLP_(TRACES_)ENDPOINT variables to
+    export them to a collector.
+    """
+
+    SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "rip-stripe-backend")
+    TRACE_FILE = os.getenv("TRACE_FILE", "")
+    OTLP_ENABLED = bool(
+        os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+        or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
     )
+    # Spans stay available to /checkout/{correlation_id}/timeline for this long.
+    TIMELINE_TTL_SECONDS = 3600
+    # Spans shown per checkout; settlement retries are the only unbounded stage.
+    TIMELINE_MAX_SPANS = 200
+
+
+def _genius_dataset_version(cls) -> str:
+    from src.services import compliance_index
+
+    return compliance_index.get().version
 
 
 class genius_configs:
-    DATA: dict
+    SOURCE = os.path.join(BACKEND_DIR, "genius_compliance_data.json")
+    # Compiled from SOURCE and memory-mapped by every worker (services.compliance_index).
+    SNAPSHOT = os.getenv(
+        "COMPLIANCE_SNAPSHOT", os.path.join(BACKEND_DIR, "genius_compliance.snapshot")
+    )
+    # The parsed dataset, for analyses over every report (per worker; request paths
+    # read the snapshot instead).
+    DATA = _lazy(lambda cls: _load_json("genius_compliance_data.json"))
+    # Dataset version (latest report submission date).
+    VERSION = _lazy(_genius_dataset_version)
 
 
 class premium_data:
-    DATA = {
-        "page": {
-            "id": "premium-landing",
-            "title": "Premium Membership",
-            "description": "Unlock exclusive features, advanced analytics, and priority support with our premium plan.",
-            "layout": "two-column",
-            "theme": {
-                "primaryColor": "#1E40AF",
-                "secondaryColor": "#FACC15",
-                "background": "#F9FAFB",
-                "font": "Inter",
-            },
-            "sections": [
-                {
-                    "type": "hero",
-                    "headline": "Upgrade to Premium",
-                    "subheadline": "Experience the best we have to offer.",
-                    "cta": {"text": "Get Premium", "link": "/subscribe"},
-                    "image": "/assets/premium-hero.png",
-                },
-                {
-                    "type": "features",
-                    "headline": "Premium Benefits",
-                    "items": [
-                        {
-                            "icon": "chart-bar",
-                            "title": "Advanced Analytics",
-                            "description": "Gain deeper insights into your activity with premium analytics.",
-                        },
-                        {
-                            "icon": "lock",
-                            "title": "Exclusive Content",
-                            "description": "Access premium-only articles, guides, and resources.",
-                        },
-                        {
-                            "icon": "support",
-                            "title": "Priority Support",
-                            "description": "Skip the line with 24/7 priority customer support.",
-                        },
-                    ],
-                },
-                {
-                    "type": "pricing",
-                    "headline": "Choose Your Plan",
-                    "plans": [
-                        {
-                            "id": "monthly",
-                            "title": "Monthly",
-                            "price": "$12",
-                            "billingCycle": "per month",
-                            "features": ["All premium features", "Cancel anytime"],
-                            "cta": {
-                                "text": "Subscribe Monthly",
-                                "link": "/subscribe?plan=monthly",
-                            },
-                        },
-                        {
-                            "id": "yearly",
-                            "title": "Yearly",
-                            "price": "$99",
-                            "billingCycle": "per year",
-                            "features": ["All premium features", "2 months free"],
-                            "cta": {
-                                "text": "Subscribe Yearly",
-                                "link": "/subscribe?plan=yearly",
-                            },
-                        },
-                    ],
-                },
-                {
-                    "type": "testimonials",
-                    "headline": "What Our Members Say",
-                    "items": [
-                        {
-                            "name": "Jane Doe",
-                            "quote": "Premium has completely transformed how I use this platform.",
-                            "avatar": "/avatars/jane.png",
-                        },
-                        {
-                            "name": "John Smith",
-                            "quote": "The advanced analytics are worth every penny.",
-                            "avatar": "/avatars/john.png",
-                        },
-                    ],
-                },
-                {
-                    "type": "faq",
-                    "headline": "Frequently Asked Questions",
-                    "items": [
-                        {
-                            "question": "Can I cancel anytime?",
-                            "answer": "Yes, you can cancel your premium plan at any time.",
-                        },
-                        {
-                            "question": "Do you offer student discounts?",
-                            "answer": "Yes, we provide a 20% discount for students. Contact support for details.",
-                        },
-                    ],
-                },
-            ],
-            "footer": {
-                "links": [
-                    {"text": "Privacy Policy", "url": "/privacy"},
-                    {"text": "Terms of Service", "url": "/terms"},
-                    {"text": "Support", "url": "/support"},
-                ],
-                "copyright": "© 2025 YourCompany. All rights reserved.",
-            },
-        }
-    }
+    DATA = _lazy(lambda cls: _load_json("premium_data.json"))
 
 
 class secret_data:
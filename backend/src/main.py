@@ -1,12 +1,10 @@
 import fastapi
-from src.router import router
-from src.configs import genius_configs
-import json
+from src.router import router, warm_up
+from src.metrics import RequestMetricsMiddleware
+from src.services import payments, pricing, registry, store
+import asyncio
 from fastapi.middleware.cors import CORSMiddleware
 
-with open("genius_compliance_data.json", "r") as file:
-    genius_configs.DATA = json.load(file)
-
 server = fastapi.FastAPI()
 
 server.add_middleware(
@@ -15,6 +13,24 @@ server.add_middleware(
     allow_credentials=True,       # Allow cookies/auth headers
     allow_methods=["*"],          # Allow all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],          # Allow all headers
+    expose_headers=["X-Correlation-ID", "traceparent"],  # Checkout tracing (src/tracing.py)
 )
 
+server.add_middleware(RequestMetricsMiddleware)
+
 server.include_router(router)
+
+
+@server.on_event("startup")
+async def startup_event():
+    await registry.connect()
+    await store.connect()
+    asyncio.create_task(registry.watch_changes())
+    asyncio.create_task(pricing.watch_pool())
+    asyncio.create_task(payments.watch_payments())
+    asyncio.create_task(asyncio.to_thread(warm_up))
+
+
+@server.on_event("shutdown")
+async def shutdown_event():
+    await registry.close()
@@ -0,0 +1,154 @@
+"""
+Prometheus metrics, served at /metrics.
+
+- http_request_duration_seconds: per method, route template and status
+- rpc_request_duration_seconds / rpc_errors_total: per chain and JSON-RPC method, with
+  eth_call labelled by contract function (e.g. 'eth_call:getPoolStats'). web3 clients
+  record through rpc_middleware; hand-rolled JSON-RPC batches through observe_rpc.
+- facilitator_request_duration_seconds / facilitator_retries_total /
+  facilitator_results_total: x402 verify and settle
+- cache_lookups_total: hits and misses per cache
+
+Metrics are per process; with several uvicorn workers each one is scraped separately.
+"""
+
+import functools
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from src.configs import flare_configs, orbital_configs
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response completes",
+    ["method", "route", "status"],
+)
+RPC_LATENCY = Histogram(
+    "rpc_request_duration_seconds",
+    "JSON-RPC request latency (batches are one request)",
+    ["chain", "method"],
+)
+RPC_ERRORS = Counter(
+    "rpc_errors_total",
+    "JSON-RPC requests that raised or returned an error",
+    ["chain", "method"],
+)
+FACILITATOR_LATENCY = Histogram(
+    "facilitator_request_duration_seconds",
+    "x402 facilitator call latency, per attempt",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+FACILITATOR_RETRIES = Counter(
+    "facilitator_retries_total", "x402 facilitator retries", ["operation"]
+)
+FACILITATOR_RESULTS = Counter(
+    "facilitator_results_total", "x402 facilitator outcomes", ["operation", "outcome"]
+)
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups", ["cache", "result"])
+
+
+def render() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with their content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def cache_counters(name: str):
+    """(hit, miss) counters for one cache, bound once so lookups skip the label lookup."""
+    return CACHE_LOOKUPS.labels(name, "hit"), CACHE_LOOKUPS.labels(name, "miss")
+
+
+@functools.lru_cache(maxsize=None)
+def _selectors() -> Dict[str, str]:
+    # 4-byte selector -> contract function name, for labelling eth_call. Built on the
+    # first eth_call, so importing this module does not load the ABIs.
+    from eth_utils import function_abi_to_4byte_selector
+
+    selectors = {}
+    for abi in (orbital_configs.ABI, flare_configs.ABI):
+        for item in abi:
+            if item.get("type") == "function":
+                # Some ABIs leave out empty inputs
+                selector = function_abi_to_4byte_selector({"inputs": [], **item})
+                selectors["0x" + selector.hex()] = item["name"]
+    return selectors
+
+
+def _rpc_label(method: str, params: Any) -> str:
+    if method == "eth_call" and params and isinstance(params[0], dict):
+        data = params[0].get("data") or params[0].get("input") or ""
+        if isinstance(data, bytes):
+            data = "0x" + data.hex()
+        selector = data[:10].lower()
+        return f"eth_call:{_selectors().get(selector, selector)}"
+    return method
+
+
+def observe_rpc(chain: str, method: str, seconds: float, failed: bool = False):
+    RPC_LATENCY.labels(chain, method).observe(seconds)
+    if failed:
+        RPC_ERRORS.labels(chain, method).inc()
+
+
+def batch_label(methods) -> str:
+    """Method label for a JSON-RPC batch: 'batch:<method>' when every call is the same."""
+    unique = set(methods)
+    return f"batch:{unique.pop()}" if len(unique) == 1 else "batch"
+
+
+def _wrap_make_request(self, make_request: Callable) -> Callable:
+    def middleware(method, params):
+        label = _rpc_label(method, params)
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = make_request(method, params)
+            failed = "error" in response
+            return response
+        finally:
+            observe_rpc(self.chain, label, time.perf_counter() - start, failed)
+
+    return middleware
+
+
+def rpc_middleware(chain: str):
+    """web3 middleware recording every request to `chain`."""
+    # web3 is only imported by the code that builds a client.
+    from web3.middleware import Web3Middleware
+
+    return type(
+        "RPCMetricsMiddleware",
+        (Web3Middleware,),
+        {"chain": chain, "wrap_make_request": _wrap_make_request},
+    )
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording request latency by route template (e.g. /price/{stablecoin})."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route in the shared scope.
+            route: Optional[Any] = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], route.path if route is not None else "unmatched", str(status)
+            ).observe(time.perf_counter() - start)
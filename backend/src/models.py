@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
 
 
 class BasicModel(BaseModel):
@@ -7,6 +10,8 @@ class BasicModel(BaseModel):
 
 
 class SwapRequest(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
     chain: str
     token_in: str
     token_out: str
@@ -25,14 +30,35 @@ class SwapRequest(BaseModel):
     # }
 
 
+class SwapTransaction(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    to: str
+    data: str
+    value: str
+    chain_id: int
+    gas: Optional[str] = None
+    # Unsigned; the wallet signs and sends it.
+    # {
+    #     "to": "0xOrbitalPool",
+    #     "data": "0x7a950f99...",
+    #     "value": "0",
+    #     "chainId": 545,
+    #     "gas": "180000",
+    # }
+
+
 class SwapResponse(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
     input_amount_gross: str
     input_amount_net: str
     output_amount: str
     effective_price: str
-    sgements: int
+    segments: int
     success: bool
     message: str
+    transaction: Optional[SwapTransaction] = None
     # {
     #   "inputAmountGross": "1000000000000000000",
     #   "inputAmountNet": "999000000000000000",
@@ -42,3 +68,16 @@ class SwapResponse(BaseModel):
     #   "success": true,
     #   "message": "Swap successful"
     # }
+
+
+class PaymentRequest(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    source_chain: str
+    tx_hash: str
+    kind: str = "cctp"
+    # {
+    #     "sourceChain": "ethereum-sepolia",
+    #     "txHash": "0x5c50...",  # swapAndBridge or OFT send transaction
+    #     "kind": "cctp",  # or "layerzero"
+    # }
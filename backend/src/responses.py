@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import brotli
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from src import metrics
+
+# Bodies smaller than this are not worth compressing.
+MIN_COMPRESS_SIZE = 1024
+
+# key -> (version, body digest, {content-encoding: body})
+_encoded: Dict[Hashable, Tuple[Hashable, str, Dict[str, bytes]]] = {}
+_hit, _miss = metrics.cache_counters("responses")
+
+
+def encode_payload(data: Any) -> Dict[str, bytes]:
+    """Encode a payload with orjson and precompress the gzip and brotli variants."""
+    body = orjson.dumps(data)
+    variants = {"identity": body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        variants["br"] = brotli.compress(body, quality=11)
+        variants["gzip"] = gzip.compress(body, compresslevel=9)
+    return variants
+
+
+def body_digest(body: bytes) -> str:
+    """Digest of an encoded body, used for its ETags."""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def make_etag(digest: str, coding: str) -> str:
+    """Strong ETag for one content-coding of a body; each encoding gets its own tag."""
+    if coding == "identity":
+        return f'"{digest}"'
+    return f'"{digest}-{coding}"'
+
+
+def etag_matches(if_none_match: str, digest: str) -> bool:
+    """
+    Check an If-None-Match header against a body (weak comparison, RFC 9110).
+
+    Any encoding of the same body matches, so a client holding the gzip
+    representation still gets a 304.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        opaque = tag.strip().removeprefix("W/").strip('"')
+        if opaque.split("-", 1)[0] == digest:
+            return True
+    return False
+
+
+def get_encoded(key: Hashable, version: Hashable, build: Callable[[], Any]):
+    """
+    Get the encoded variants of a payload, re-encoding only when its version changes.
+
+    Args:
+        key: Cache key for the payload (e.g., ('coin-data', 'USDC'))
+        version: Anything that changes when the underlying data changes
+        build: Called on a cache miss to produce the payload
+
+    Returns:
+        Tuple of the body digest and a dict mapping content-encoding
+        ('identity', 'gzip', 'br') to body bytes
+    """
+    cached = _encoded.get(key)
+    if cached is not None and cached[0] == version:
+        _hit.inc()
+        return cached[1], cached[2]
+
+    _miss.inc()
+    variants = encode_payload(build())
+    digest = body_digest(variants["identity"])
+    _encoded[key] = (version, digest, variants)
+    return digest, variants
+
+
+def choose_encoding(accept_encoding: str, variants: Dict[str, bytes]) -> str:
+    """Pick the best precompressed variant the client accepts (br > gzip > identity)."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+
+    for coding in ("br", "gzip"):
+        if coding in variants and (coding in accepted or "*" in accepted):
+            return coding
+    return "identity"
+
+
+def cached_json_response(
+    request: Request,
+    key: Hashable,
+    version: Hashable,
+    build: Callable[[], Any],
+    status_code: int = 200,
+) -> Response:
+    """Serve a JSON payload from its pre-encoded bytes, or 304 if the client has it."""
+    digest, variants = get_encoded(key, version, build)
+    return encoded_response(request, digest, variants, status_code)
+
+
+def encoded_response(
+    request: Request, digest: str, variants: Dict[str, bytes], status_code: int = 200
+) -> Response:
+    """Serve already encoded JSON variants (see get_encoded), or 304 if the client has them."""
+    coding = choose_encoding(request.headers.get("accept-encoding", ""), variants)
+    headers = {"ETag": make_etag(digest, coding), "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match", ""), digest):
+        return Response(status_code=304, headers=headers)
+
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(
+        content=variants[coding],
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -1,19 +1,18 @@
 import fastapi
 from fastapi import Request
-from fastapi.responses import JSONResponse
-from src.configs import merchant_configs, premium_data, secret_data
-from src.services import oracle, merchant
-from src import models
-from x402.types import x402PaymentRequiredResponse, PaymentPayload
-from x402.facilitator import FacilitatorClient, FacilitatorConfig
-from cdp.auth.utils.jwt import generate_jwt, JwtOptions
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from src.configs import merchant_configs, premium_data, secret_data, genius_configs, orbital_configs, store_configs
+from src.services import oracle, merchant, catalog, compliance, compliance_index, payments, routing, store, swap as swap_builder
+from src import metrics, models, responses, tracing
+from x402.types import PaymentPayload
 import requests
 from x402.types import PaymentRequirements
 from x402.encoding import safe_base64_decode
+import functools
 import json
+from typing import Optional
 
 router = fastapi.APIRouter()
-has_been_verified = False
 
 
 @router.get("/")
@@ -23,29 +22,156 @@ async def root():
 
 @router.get("/get-resource/{resource_id}")
 async def get_resource(resource_id: int, request: Request):
-    # Get the PaymentRequirement for a requested merchant resource.
-    payment_requirements = merchant.resolve_merchant_payment_reqs(resource_id)
-    error_data = x402PaymentRequiredResponse(
-        x402_version=1,
-        error=str("Payment required"),
-        accepts=[payment_requirements],
-    ).model_dump(by_alias=True)
-
-    if not has_been_verified:
-        # Return the merchant PaymentRequirement.
+    with tracing.checkout_span(
+        "checkout.get_resource", request, **{"resource.id": resource_id}
+    ) as span:
+        # Payments settled by any worker unlock the resource for their payer
+        # (services.store); the payer proves it by sending the settled X-PAYMENT again.
+        payment_header = request.headers.get("X-PAYMENT")
+        entitled = payment_header is not None and await _is_entitled(
+            payment_header, resource_id
+        )
+        if not entitled:
+            # Return the merchant PaymentRequirement, compiled once per catalog version.
+            with tracing.span("catalog.payment_required"):
+                body = await catalog.get_payment_required_body(resource_id)
+            if body is None:
+                tracing.fail(span, "unknown resource")
+                return JSONResponse(status_code=404, content={"error": "Unknown resource"})
+            # The correlation id rides in headers: the body is shared by every checkout.
+            return Response(
+                content=body,
+                status_code=402,
+                media_type="application/json",
+                headers=tracing.correlation_headers(span),
+            )
+        return responses.cached_json_response(
+            request, "premium-data", id(premium_data.DATA), lambda: premium_data.DATA
+        )
+
+
+def entitlement_key(payer: str, resource_id: int) -> str:
+    return f"{payer.lower()}:{resource_id}"
+
+
+async def _is_entitled(payment_header: str, resource_id: int) -> bool:
+    # The entitlement records the settled payment's nonce, which only its payer knows.
+    try:
+        authorization = decode_payment(payment_header).payload.authorization
+    except (ValueError, TypeError):
+        return False
+    entitlement = await store.get(
+        store.ENTITLEMENT, entitlement_key(authorization.from_, resource_id)
+    )
+    return entitlement is not None and entitlement["nonce"] == authorization.nonce
+
+
+@router.get("/verify")
+async def verify(
+    request: Request,
+    resourceId: int = merchant_configs.DEFAULT_RESOURCE_ID,
+    asset: Optional[str] = None,
+):
+    # X-PAYMENT for one of the resource's 402 'accepts' entries, chosen by token
+    # address (asset); the resource's own token when asset is omitted. Without
+    # resourceId, the article the frontend sells.
+    with tracing.checkout_span(
+        "checkout.verify", request, **{"resource.id": resourceId}
+    ) as span:
+        return await _verify(request, resourceId, asset, span)
+
+
+async def _verify(request: Request, resource_id: int, asset: Optional[str], span):
+    with tracing.span("x402.decode_payment"):
+        decoded_payment = decode_payment(request.headers.get("X-PAYMENT", ""))
+    authorization = decoded_payment.payload.authorization
+    span.set_attributes(
+        {
+            "x402.network": decoded_payment.network,
+            "x402.authorization.nonce": authorization.nonce,
+        }
+    )
+
+    accepts = await catalog.get_accepts(resource_id)
+    if accepts is None:
+        tracing.fail(span, "unknown resource")
+        return JSONResponse(status_code=404, content={"error": "Unknown resource"})
+    payment_requirements = catalog.find_payment_requirements(
+        accepts, decoded_payment, asset
+    )
+    if payment_requirements is None:
+        tracing.fail(span, "no matching payment requirements")
         return JSONResponse(
             status_code=402,
-            content=error_data,
-            headers={"Content-Type": "application/json"},
+            content={
+                "x402Version": 1,
+                "error": "X-PAYMENT matches none of the advertised payment requirements",
+                "accepts": [
+                    requirements.model_dump(by_alias=True) for requirements in accepts
+                ],
+            },
+            headers=tracing.correlation_headers(span),
         )
-    return premium_data.DATA
+    span.set_attribute("x402.asset", payment_requirements.asset)
 
+    # The authorization nonce identifies the payment, so it is settled once however
+    # many workers or retries it reaches.
+    checkout = tracing.correlation_id(span)
+    claimed = await store.add(
+        store.IDEMPOTENCY,
+        authorization.nonce,
+        {"status": "pending", "checkout": checkout},
+        store_configs.IDEMPOTENCY_TTL_SECONDS,
+    )
+    if not claimed:
+        previous = await store.get(store.IDEMPOTENCY, authorization.nonce) or {}
+        tracing.fail(span, "payment already submitted")
+        return JSONResponse(
+            status_code=409,
+            content={
+                "error": "Payment already submitted",
+                "status": previous.get("status", "pending"),
+            },
+            headers=tracing.correlation_headers(span),
+        )
 
-@router.get("/verify")
-async def verify(request: Request):
-    payment_header = request.headers.get("X-PAYMENT", "")
+    settled = False
+    try:
+        response, settled = await _verify_and_settle(
+            decoded_payment, payment_requirements, span
+        )
+    finally:
+        if not settled:
+            # Nothing was settled: the same signed payment may be retried.
+            await store.delete(store.IDEMPOTENCY, authorization.nonce)
+
+    if settled:
+        await store.put(
+            store.IDEMPOTENCY,
+            authorization.nonce,
+            {"status": "settled", "checkout": checkout},
+            store_configs.IDEMPOTENCY_TTL_SECONDS,
+        )
+        # get_resource with this X-PAYMENT now serves the resource to its payer.
+        await store.put(
+            store.ENTITLEMENT,
+            entitlement_key(authorization.from_, resource_id),
+            {"nonce": authorization.nonce, "checkout": checkout},
+            store_configs.ENTITLEMENT_TTL_SECONDS,
+        )
+    return response
+
+
+def decode_payment(payment_header: str) -> PaymentPayload:
+    """Decode an X-PAYMENT header (base64 JSON) into the x402 PaymentPayload."""
     payment_obj = safe_base64_decode(payment_header)
-    decoded_payment = PaymentPayload(**json.loads(payment_obj))
+    return PaymentPayload(**json.loads(payment_obj))
+
+
+async def _verify_and_settle(
+    decoded_payment: PaymentPayload, payment_requirements: PaymentRequirements, span
+):
+    """Verify and settle with the facilitator; (error response or None, settled)."""
     access_token = make_access_token("GET")
     jwt_token = access_token
     headers = {
@@ -53,33 +179,26 @@ async def verify(request: Request):
         "Content-Type": "application/json",
     }
 
-    # Facilitator to check payment confirmation
-    payment_requirements = PaymentRequirements(
-        scheme="exact",
-        network="base-sepolia",
-        max_amount_required="1000",
-        resource="https://api.cdp.coinbase.com/platform/v2/x402/settle",
-        description="Premium API access for data analysis",
-        mime_type="application/json",
-        output_schema={"data": "string"},
-        pay_to="0x74051bf72a90014a515c511fECFe9811dE138235",
-        max_timeout_seconds=300,
-        asset="0x50766571B3769d9CfC170f3b17668F3673F80EbA",
-        extra={
-            "name": "USDC",
-            "version": "1",
-            "gasLimit": "1000000",
-        },
-    )
-    facilitator_config: FacilitatorConfig = {"url": merchant_configs.FACILITATOR_URL}
-    facilitator = FacilitatorClient(facilitator_config)
-    verify_response = await facilitator.verify(decoded_payment, payment_requirements)
+    # Facilitator to check payment confirmation, against the 'accepts' entry it pays
+    facilitator = _facilitator_client()
+    with tracing.span("facilitator.verify") as verify_span, metrics.FACILITATOR_LATENCY.labels(
+        "verify"
+    ).time():
+        verify_response = await facilitator.verify(decoded_payment, payment_requirements)
+        verify_span.set_attribute("x402.valid", verify_response.is_valid)
+    metrics.FACILITATOR_RESULTS.labels(
+        "verify", "valid" if verify_response.is_valid else "invalid"
+    ).inc()
     print("Result of verification:", verify_response)
     if not verify_response.is_valid:
-        return JSONResponse(
-            status_code=402,
-            content=verify_response.model_dump(by_alias=True),
-            headers=headers,
+        tracing.fail(span, "payment invalid")
+        return (
+            JSONResponse(
+                status_code=402,
+                content=verify_response.model_dump(by_alias=True),
+                headers={**headers, **tracing.correlation_headers(span)},
+            ),
+            False,
         )
 
     # Settle the payment with retry logic
@@ -100,53 +219,90 @@ async def verify(request: Request):
     max_retries = 5
     retry_count = 0
     response = None
+    settled = False
 
-    while retry_count < max_retries:
-        try:
-            response = requests.post(
-                url=settle_url,
-                json=payload,
-                headers=headers,
-            )
-            response_data = response.json()
-            print(f"Attempt {retry_count + 1}: {response_data}")
-
-            # Check if settlement was successful
-            if response_data.get("success", False):
-                print("Settlement successful!")
-                break
-            else:
-                print(
-                    f"Settlement failed: {response_data.get('message', 'Unknown error')}"
-                )
-                retry_count += 1
-
-                if retry_count < max_retries:
-                    print(
-                        f"Retrying in 2 seconds... (Attempt {retry_count + 1}/{max_retries})"
-                    )
-                    import time
-
-                    time.sleep(2)
-                else:
-                    print("Max retries reached. Settlement failed.")
-
-        except Exception as e:
-            print(f"Error during settlement attempt {retry_count + 1}: {e}")
-            retry_count += 1
-
-            if retry_count < max_retries:
-                print(
-                    f"Retrying in 2 seconds... (Attempt {retry_count + 1}/{max_retries})"
-                )
-                import time
-
-                time.sleep(2)
-            else:
-                print("Max retries reached due to errors.")
+    with tracing.span("facilitator.settle") as settle_span:
+        while retry_count < max_retries:
+            with tracing.span(
+                "facilitator.settle.attempt", attempt=retry_count + 1
+            ) as attempt_span:
+                try:
+                    with metrics.FACILITATOR_LATENCY.labels("settle").time():
+                        response = requests.post(
+                            url=settle_url,
+                            json=payload,
+                            headers=headers,
+                        )
+                    response_data = response.json()
+                    print(f"Attempt {retry_count + 1}: {response_data}")
+
+                    # Check if settlement was successful
+                    if response_data.get("success", False):
+                        print("Settlement successful!")
+                        attempt_span.set_attribute("x402.settled", True)
+                        settled = True
+                        break
+                    else:
+                        print(
+                            f"Settlement failed: {response_data.get('message', 'Unknown error')}"
+                        )
+                        tracing.fail(
+                            attempt_span, str(response_data.get("message", "Unknown error"))
+                        )
+                        retry_count += 1
+
+                        if retry_count < max_retries:
+                            print(
+                                f"Retrying in 2 seconds... (Attempt {retry_count + 1}/{max_retries})"
+                            )
+                            metrics.FACILITATOR_RETRIES.labels("settle").inc()
+                            import time
+
+                            time.sleep(2)
+                        else:
+                            print("Max retries reached. Settlement failed.")
 
+                except Exception as e:
+                    print(f"Error during settlement attempt {retry_count + 1}: {e}")
+                    attempt_span.record_exception(e)
+                    tracing.fail(attempt_span, str(e))
+                    retry_count += 1
+
+                    if retry_count < max_retries:
+                        print(
+                            f"Retrying in 2 seconds... (Attempt {retry_count + 1}/{max_retries})"
+                        )
+                        metrics.FACILITATOR_RETRIES.labels("settle").inc()
+                        import time
+
+                        time.sleep(2)
+                    else:
+                        print("Max retries reached due to errors.")
+
+        settle_span.set_attributes({"x402.settled": settled, "x402.attempts": retry_count + settled})
+        if not settled:
+            tracing.fail(settle_span, "settlement failed")
+            tracing.fail(span, "settlement failed")
+
+    metrics.FACILITATOR_RESULTS.labels("settle", "success" if settled else "failure").inc()
     print("Final settle result:", response.json() if response else "No response")
-    has_been_verified = True
+    return None, settled
+
+
+@router.get("/checkout/{correlation_id}/timeline")
+async def checkout_timeline(correlation_id: str):
+    # Where one checkout's latency went, from the 402 to settlement.
+    spans = await tracing.get_timeline(correlation_id)
+    if not spans:
+        return JSONResponse(status_code=404, content={"error": "Unknown checkout"})
+    return tracing.timeline_to_dict(correlation_id, spans)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    # Prometheus scrape endpoint
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
 
 
 @router.get("/price/{stablecoin}")
@@ -156,37 +312,198 @@ async def get_price(stablecoin: str):
     return {"Stablecoin": stablecoin, "Price": f"${price}", "fetched at": date}
 
 
+@router.get("/coin-data/changes")
+async def genius_compliance_changes(request: Request, since: str = ""):
+    # Delta feed: reports changed after the dataset version the client last saw.
+    try:
+        coins = tuple(compliance.get_changed_coins(since))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return responses.cached_json_response(
+        request,
+        ("coin-data-changes", coins),
+        compliance_index.get().version,
+        lambda: compliance.get_changes(coins),
+    )
+
+
 @router.get("/coin-data/{stablecoin}")
-async def genius_compliance(stablecoin: str):
-    return merchant.get_stablecoin_data(stablecoin.upper())
+async def genius_compliance(stablecoin: str, request: Request):
+    stablecoin = stablecoin.upper()
+    # Bodies are pre-encoded in the shared compliance snapshot.
+    encoded = compliance_index.get().get_encoded(stablecoin, "data")
+    if encoded is not None:
+        return responses.encoded_response(request, *encoded)
+    return responses.cached_json_response(
+        request,
+        ("coin-data", stablecoin),
+        compliance.get_coin_version(stablecoin) or genius_configs.VERSION,
+        lambda: merchant.get_stablecoin_data(stablecoin),
+    )
 
 
 @router.get("/risk-score/{stablecoin}")
-async def risk_score(stablecoin: str):
-    return merchant.compute_risk_score(stablecoin.upper())
+async def risk_score(stablecoin: str, request: Request):
+    stablecoin = stablecoin.upper()
+    encoded = compliance_index.get().get_encoded(stablecoin, "score")
+    if encoded is not None:
+        return responses.encoded_response(request, *encoded)
+    return responses.cached_json_response(
+        request,
+        ("risk-score", stablecoin),
+        compliance.get_coin_version(stablecoin) or genius_configs.VERSION,
+        lambda: merchant.compute_risk_score(stablecoin),
+    )
+
+
+@router.post("/swap", response_model=models.SwapResponse)
+async def swap(data: models.SwapRequest):
+    # Unsigned OrbitalPool.swap calldata; the wallet signs and sends it.
+    try:
+        return await swap_builder.build_swap(data)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except LookupError as e:
+        return JSONResponse(status_code=503, content={"error": str(e)})
+
+
+@router.get("/route")
+async def route(tokenIn: str, tokenOut: str, amountIn: str):
+    # Split plan for a large swap; amounts in the pool's 18-decimal units.
+    markets = routing.get_live_markets()
+    if not markets:
+        return JSONResponse(status_code=503, content={"error": "Pool state unavailable"})
+    try:
+        amount_in = int(amountIn) / 10**orbital_configs.INTERNAL_DECIMALS
+        plan = routing.plan_split(markets, tokenIn, tokenOut, amount_in)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return routing.plan_to_dict(plan)
+
+
+@router.get("/impact")
+async def price_impact(tokenIn: str, tokenOut: str, amountIn: Optional[str] = None):
+    # Amount out / slippage curve for a pair, plus an interpolated quote for amountIn
+    # (18-decimal units) with its error bound.
+    impact = _impact()
+    curve = impact.get_curve(tokenIn, tokenOut)
+    if curve is None:
+        return JSONResponse(status_code=404, content={"error": "No curve for this pair"})
+    try:
+        amount_in = (
+            int(amountIn) / 10**orbital_configs.INTERNAL_DECIMALS
+            if amountIn is not None
+            else None
+        )
+        return impact.curve_to_dict(curve, amount_in)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@router.get("/lp/optimize")
+async def optimize_lp(
+    capital: str, tokens: str, depegPrice: float, maxLoss: Optional[float] = None
+):
+    # depegTolerance and k for addLiquidity; capital in the pool's 18-decimal units,
+    # tokens comma-separated.
+    symbols = [symbol for symbol in tokens.split(",") if symbol]
+    optimizer = _optimizer()
+    try:
+        recommendation = optimizer.optimize(
+            int(capital) / 10**orbital_configs.INTERNAL_DECIMALS,
+            len(symbols),
+            depegPrice,
+            maxLoss,
+        )
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return {"tokens": symbols, **optimizer.recommendation_to_dict(recommendation)}
 
 
-@router.post("/swap")
-async def swap(data: models.BasicModel):
-    # Return SwapResponse
-    returned_data = merchant.swap_currencies()
+@router.post("/payments")
+async def track_payment(data: models.PaymentRequest):
+    # Start following a cross-chain payment from its source-chain transaction.
+    try:
+        payment = await payments.register(data.kind, data.source_chain, data.tx_hash)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return payments.payment_to_dict(payment)
+
+
+@router.get("/payments/{payment_id}/status")
+async def payment_status(payment_id: str, request: Request):
+    # Current stage, or a server-sent event stream of every change for clients that
+    # accept text/event-stream (EventSource).
+    payment = await payments.get(payment_id)
+    if payment is None:
+        return JSONResponse(status_code=404, content={"error": "Unknown payment"})
+    if "text/event-stream" not in request.headers.get("accept", ""):
+        return payments.payment_to_dict(payment)
+    return StreamingResponse(
+        payments.event_stream(payment),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _cdp_jwt():
+    # The CDP SDK takes seconds to import, so it is loaded after start-up (warm_up).
+    from cdp.auth.utils import jwt
+
+    return jwt
+
+
+@functools.lru_cache(maxsize=None)
+def _facilitator_client():
+    from x402.facilitator import FacilitatorClient, FacilitatorConfig
+
+    facilitator_config: FacilitatorConfig = {"url": merchant_configs.FACILITATOR_URL}
+    return FacilitatorClient(facilitator_config)
+
+
+@functools.lru_cache(maxsize=None)
+def _impact():
+    # impact and optimizer need numpy, which is loaded after start-up too.
+    from src.services import impact
+
+    return impact
+
+
+@functools.lru_cache(maxsize=None)
+def _optimizer():
+    from src.services import optimizer
+
+    return optimizer
+
+
+def warm_up():
+    """Import the SDKs deferred at start-up, so the first request does not wait for them."""
+    _cdp_jwt()
+    _facilitator_client()
+    _impact()
+    _optimizer()
+    swap_builder.pool_address()
 
 
 def make_access_token(request):
     # Generate the JWT using the CDP SDK
-    jwt_token = generate_jwt(
-        JwtOptions(
-            api_key_id=secret_data.KEYID,
-            api_key_secret=secret_data.SECRET,
-            request_method=request,
-            request_host="api.cdp.coinbase.com",
-            request_path="/platform/v2/x402/settle",
-            expires_in=900,  # optional (defaults to 120 seconds)
+    jwt = _cdp_jwt()
+    with tracing.span("jwt.mint", **{"http.method": request}):
+        jwt_token = jwt.generate_jwt(
+            jwt.JwtOptions(
+                api_key_id=secret_data.KEYID,
+                api_key_secret=secret_data.SECRET,
+                request_method=request,
+                request_host="api.cdp.coinbase.com",
+                request_path="/platform/v2/x402/settle",
+                expires_in=900,  # optional (defaults to 120 seconds)
+            )
         )
-    )
     return jwt_token
 
 
 @router.get("/access-token")
-def get_access_token():
-    return make_access_token("POST")
+def get_access_token(request: Request):
+    with tracing.checkout_span("checkout.access_token", request):
+        return make_access_token("POST")
@@ -0,0 +1,430 @@
+"""
+Monte Carlo backtests of LP positions on the off-chain pool model.
+
+A backtest replays swap flows (synthetic or recorded) against a pool of LP ticks that
+starts at the equal price point, and reports each LP's fee income, capital efficiency
+and loss against simply holding the deposit. Scenarios are split into chunks that run
+in a process pool; within a chunk every scenario advances at once with NumPy, one
+array row per scenario, with the pool in consolidated form (total reserves plus how
+many ticks, in k/r order, are on their boundary).
+
+Each trade is priced in one segment and tick crossings are resolved after it, so a
+trade that crosses a tick is priced on the pre-crossing invariant. With trades small
+relative to the pool the difference is negligible; pool.OrbitalPool gives the exact,
+segmented result for a single path.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from src.services.pool import (
+    FEE_DENOMINATOR,
+    boundary_radius,
+    capital_efficiency,
+    equal_price_reserve,
+    k_bounds,
+    tick_from_capital,
+)
+
+# Bisection steps per trade; 64 halvings take the bracket below float resolution.
+BISECTION_STEPS = 64
+DEFAULT_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Position:
+    """An LP deposit as passed to OrbitalPool.addLiquidity."""
+
+    owner: str
+    capital: float
+    depeg_price: float  # depegTolerance: the price at which the tick reaches its boundary
+
+
+@dataclass
+class Flows:
+    """
+    Trades to replay, one row per scenario.
+
+    token_in, token_out and amount_in have shape (scenarios, steps); an amount of 0
+    skips the step. prices (scenarios, tokens) are the external prices positions and
+    fees are valued at, and depeg_token (scenarios,) is the token that depegs in each
+    scenario, or -1.
+    """
+
+    token_in: np.ndarray
+    token_out: np.ndarray
+    amount_in: np.ndarray
+    prices: np.ndarray
+    depeg_token: np.ndarray
+
+    @property
+    def scenarios(self) -> int:
+        return self.amount_in.shape[0]
+
+    @property
+    def steps(self) -> int:
+        return self.amount_in.shape[1]
+
+    def chunk(self, start: int, stop: int) -> "Flows":
+        return Flows(
+            self.token_in[start:stop],
+            self.token_out[start:stop],
+            self.amount_in[start:stop],
+            self.prices[start:stop],
+            self.depeg_token[start:stop],
+        )
+
+
+@dataclass
+class LPOutcome:
+    """One LP's results, one entry per scenario; values are in units of the external prices."""
+
+    owner: str
+    capital: float
+    capital_efficiency: float
+    fee_income: np.ndarray
+    final_value: np.ndarray  # Reserves at the end of the flow
+    hodl_value: np.ndarray  # The deposit, had it stayed out of the pool
+    crossed_at: np.ndarray  # First step the tick was on its boundary, or -1
+
+    @property
+    def depeg_loss(self) -> np.ndarray:
+        return self.hodl_value - self.final_value
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return self.final_value + self.fee_income - self.hodl_value
+
+    def summary(self, depegged: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """Means and 5th/95th percentiles; loss figures over the depeg scenarios only."""
+        loss = self.depeg_loss if depegged is None else self.depeg_loss[depegged]
+        if loss.size == 0:
+            loss = np.zeros(1)
+        return {
+            "capital": self.capital,
+            "capitalEfficiency": self.capital_efficiency,
+            "feeIncomeMean": float(self.fee_income.mean()),
+            "feeIncomeP5": float(np.percentile(self.fee_income, 5)),
+            "feeIncomeP95": float(np.percentile(self.fee_income, 95)),
+            "depegLossMean": float(loss.mean()),
+            "depegLossP95": float(np.percentile(loss, 95)),
+            "pnlMean": float(self.pnl.mean()),
+            "pnlP5": float(np.percentile(self.pnl, 5)),
+            "boundaryRate": float((self.crossed_at >= 0).mean()),
+        }
+
+
+def initial_reserve(positions: Sequence[Position], token_count: int) -> float:
+    """Per-token reserve of the pool the positions form at the equal price point."""
+    return sum(position.capital for position in positions) / token_count
+
+
+def synthetic_flows(
+    token_count: int,
+    scenarios: int,
+    steps: int,
+    reserve: float,
+    trade_fraction: float = 0.002,
+    depeg_probability: float = 0.1,
+    depeg_prices: Tuple[float, float] = (0.85, 0.99),
+    depeg_share: float = 0.5,
+    seed: Optional[int] = None,
+) -> Flows:
+    """
+    Random two-way flow, with a one-way depeg in some scenarios.
+
+    Args:
+        token_count (int): Tokens in the pool
+        scenarios (int): Number of independent paths
+        steps (int): Trades per path
+        reserve (float): Per-token pool reserve the trade sizes are relative to
+        trade_fraction (float): Median trade size as a fraction of reserve (lognormal)
+        depeg_probability (float): Share of scenarios in which one token depegs
+        depeg_prices (tuple): Range the depegged token's price is drawn from
+        depeg_share (float): Share of a depeg scenario's trades that sell the depegged
+            token, scaled by the depth of the depeg
+        seed (int): Random seed
+
+    Returns:
+        Flows
+    """
+    rng = np.random.default_rng(seed)
+    shape = (scenarios, steps)
+    token_in = rng.integers(0, token_count, shape)
+    token_out = (token_in + rng.integers(1, token_count, shape)) % token_count
+    amount_in = reserve * trade_fraction * rng.lognormal(0.0, 1.0, shape)
+
+    prices = np.ones((scenarios, token_count))
+    depeg_token = np.where(
+        rng.random(scenarios) < depeg_probability,
+        rng.integers(0, token_count, scenarios),
+        -1,
+    )
+    depegged = depeg_token >= 0
+    low, high = depeg_prices
+    depeg_price = rng.uniform(low, high, scenarios)
+    prices[depegged, depeg_token[depegged]] = depeg_price[depegged]
+
+    # Deeper depegs push more one-way flow into the pool.
+    one_way_share = depeg_share * (1 - depeg_price) / (1 - low)
+    one_way = depegged[:, None] & (rng.random(shape) < one_way_share[:, None])
+    sold = np.broadcast_to(depeg_token[:, None], shape)
+    token_in = np.where(one_way, sold, token_in)
+    token_out = np.where(
+        one_way, (sold + rng.integers(1, token_count, shape)) % token_count, token_out
+    )
+    return Flows(token_in, token_out, amount_in, prices, depeg_token)
+
+
+def recorded_flows(
+    trades: Sequence[Tuple[int, int, float]],
+    token_count: int,
+    prices: Optional[Sequence[float]] = None,
+) -> Flows:
+    """A single scenario replaying (token_in, token_out, amount_in) trades in order."""
+    token_in, token_out, amount_in = (np.array([column]) for column in zip(*trades))
+    return Flows(
+        token_in.astype(int),
+        token_out.astype(int),
+        amount_in.astype(float),
+        np.array([prices if prices is not None else [1.0] * token_count], dtype=float),
+        np.array([-1]),
+    )
+
+
+def _residual(total, sum_squares, interior_radius, boundary_constant, boundary_radius_, n):
+    """TorusState._residual over arrays."""
+    sqrt_n = math.sqrt(n)
+    orthogonal = np.sqrt(np.maximum(sum_squares - total * total / n, 0.0))
+    a = total / sqrt_n - boundary_constant - interior_radius * sqrt_n
+    b = orthogonal - boundary_radius_
+    return a * a + b * b - interior_radius * interior_radius
+
+
+def _simulate(
+    radii: np.ndarray, constants: np.ndarray, token_count: int, fee_bps: int, flows: Flows
+) -> Dict[str, np.ndarray]:
+    """
+    Run one chunk of scenarios.
+
+    Returns:
+        dict: 'fees', 'final', 'crossed_at' and 'boundary' (whether the tick ends on its
+        boundary), each (scenarios, ticks) in position order, and the final
+        'reserves' (scenarios, tokens)
+    """
+    n = token_count
+    sqrt_n = math.sqrt(n)
+    scenarios, ticks = flows.scenarios, len(radii)
+
+    # Ticks in k/r order: the first `split` of them are on their boundary, and the
+    # consolidated interior radius, boundary constant and boundary radius for any split
+    # are prefix sums.
+    order = np.argsort(constants / radii, kind="stable")
+    thresholds = (constants / radii)[order]
+    r = radii[order]
+    k = constants[order]
+    s = np.array([boundary_radius(a, b, n) for a, b in zip(r, k)])
+    cum_r = np.concatenate(([0.0], np.cumsum(r)))
+    cum_k = np.concatenate(([0.0], np.cumsum(k)))
+    cum_s = np.concatenate(([0.0], np.cumsum(s)))
+    total_radius = cum_r[-1]
+
+    x = np.full((scenarios, n), equal_price_reserve(total_radius, n))
+    split = np.zeros(scenarios, dtype=int)
+    positions = np.arange(ticks)
+    rows = np.arange(scenarios)
+    fees = np.zeros((scenarios, ticks))
+    crossed_at = np.full((scenarios, ticks), -1)
+    fee_factor = (FEE_DENOMINATOR - fee_bps) / FEE_DENOMINATOR
+
+    def settle(split):
+        # Move the split until the interior projection sits between its neighbours.
+        for _ in range(ticks + 1):
+            interior_radius = total_radius - cum_r[split]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                projection = np.where(
+                    interior_radius > 0,
+                    (x.sum(axis=1) / sqrt_n - cum_k[split]) / interior_radius,
+                    np.inf,
+                )
+            up = (split < ticks) & (projection >= thresholds[np.minimum(split, ticks - 1)])
+            down = (split > 0) & (projection < thresholds[np.maximum(split - 1, 0)])
+            if not (up | down).any():
+                return split
+            split = split + up - down
+        return split
+
+    split = settle(split)
+    crossed_at[positions[None, :] < split[:, None]] = 0
+
+    for step in range(flows.steps):
+        token_in = flows.token_in[:, step]
+        token_out = flows.token_out[:, step]
+        amount_in = flows.amount_in[:, step]
+        net_in = amount_in * fee_factor
+
+        interior_radius = total_radius - cum_r[split]
+        boundary_constant = cum_k[split]
+        boundary_radius_ = cum_s[split]
+
+        def residual(total, sum_squares):
+            return _residual(
+                total, sum_squares, interior_radius, boundary_constant, boundary_radius_, n
+            )
+
+        total = x.sum(axis=1)
+        sum_squares = (x * x).sum(axis=1)
+        x_in = x[rows, token_in]
+        x_out = x[rows, token_out]
+        # Keep the state on its own level set, so rounding never turns into a transfer.
+        level = residual(total, sum_squares)
+        total = total + net_in
+        base_squares = sum_squares - x_in * x_in + (x_in + net_in) ** 2 - x_out * x_out
+
+        lo = np.zeros(scenarios)
+        hi = x_out.copy()
+        fillable = residual(total - hi, base_squares) >= level
+        for _ in range(BISECTION_STEPS):
+            mid = (lo + hi) / 2
+            below = residual(total - mid, base_squares + (x_out - mid) ** 2) < level
+            lo = np.where(below, mid, lo)
+            hi = np.where(below, hi, mid)
+
+        filled = fillable & (amount_in > 0) & (interior_radius > 0)
+        x[rows[filled], token_in[filled]] += net_in[filled]
+        x[rows[filled], token_out[filled]] -= lo[filled]
+
+        # Fees go to the ticks providing liquidity: the interior ones, pro rata to radius.
+        fee = np.where(filled, (amount_in - net_in) * flows.prices[rows, token_in], 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(interior_radius > 0, fee / interior_radius, 0.0)
+        fees += (positions[None, :] >= split[:, None]) * r[None, :] * share[:, None]
+
+        split = settle(split)
+        newly = (positions[None, :] < split[:, None]) & (crossed_at < 0)
+        crossed_at[newly] = step
+
+    # Expand the consolidated state into each tick's reserves, valued at the prices.
+    prices = flows.prices
+    mean = x.mean(axis=1, keepdims=True)
+    w = x - mean
+    norm = np.linalg.norm(w, axis=1, keepdims=True)
+    direction = np.divide(w, norm, out=np.zeros_like(w), where=norm > 0)
+    price_sum = prices.sum(axis=1)
+    direction_value = (direction * prices).sum(axis=1)
+
+    boundary_value = (
+        k[None, :] / sqrt_n * price_sum[:, None] + s[None, :] * direction_value[:, None]
+    )
+    interior_radius = total_radius - cum_r[split]
+    interior = x - cum_k[split][:, None] / sqrt_n - cum_s[split][:, None] * direction
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_radius = np.where(
+            interior_radius > 0, (interior * prices).sum(axis=1) / interior_radius, 0.0
+        )
+    interior_value = r[None, :] * per_radius[:, None]
+    final = np.where(positions[None, :] < split[:, None], boundary_value, interior_value)
+
+    unsort = np.argsort(order)
+    return {
+        "fees": fees[:, unsort],
+        "final": final[:, unsort],
+        "crossed_at": crossed_at[:, unsort],
+        "boundary": (positions[None, :] < split[:, None])[:, unsort],
+        "reserves": x,
+    }
+
+
+def _ticks(
+    positions: Sequence[Position], token_count: int
+) -> List[Tuple[float, float]]:
+    ticks = [tick_from_capital(p.capital, p.depeg_price, token_count) for p in positions]
+    for position, (radius, k) in zip(positions, ticks):
+        k_min, k_max = k_bounds(radius, token_count)
+        if not k_min <= k <= k_max:
+            raise ValueError(f"Invalid depeg price for {position.owner}")
+    return ticks
+
+
+def simulate(
+    positions: Sequence[Position], token_count: int, flows: Flows, fee_bps: int = 30
+) -> Dict[str, np.ndarray]:
+    """
+    Run every scenario of flows as one in-process batch.
+
+    Returns:
+        dict: Per-scenario arrays; see run_backtest for the aggregated form
+    """
+    ticks = _ticks(positions, token_count)
+    radii = np.array([radius for radius, _ in ticks])
+    constants = np.array([k for _, k in ticks])
+    return _simulate(radii, constants, token_count, fee_bps, flows)
+
+
+def run_backtest(
+    positions: Sequence[Position],
+    token_count: int,
+    flows: Flows,
+    fee_bps: int = 30,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[LPOutcome]:
+    """
+    Replay flows against a pool made of the given positions.
+
+    Args:
+        positions (list): LP deposits, all made at the equal price point
+        token_count (int): Tokens in the pool
+        flows (Flows): Trades per scenario
+        fee_bps (int): Swap fee in basis points
+        workers (int): Worker processes (default: CPU count); 1 runs in-process
+        chunk_size (int): Scenarios per vectorized chunk
+
+    Returns:
+        list: LPOutcome per position, in order
+
+    Raises:
+        ValueError: If a position's depeg price gives a plane constant out of bounds
+    """
+    ticks = _ticks(positions, token_count)
+    radii = np.array([radius for radius, _ in ticks])
+    constants = np.array([k for _, k in ticks])
+
+    bounds = [
+        (start, min(start + chunk_size, flows.scenarios))
+        for start in range(0, flows.scenarios, chunk_size)
+    ]
+    args = [
+        (radii, constants, token_count, fee_bps, flows.chunk(start, stop))
+        for start, stop in bounds
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(args) == 1:
+        results = [_simulate(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as executor:
+            results = list(executor.map(_simulate, *zip(*args)))
+
+    fees = np.concatenate([result["fees"] for result in results])
+    final = np.concatenate([result["final"] for result in results])
+    crossed_at = np.concatenate([result["crossed_at"] for result in results])
+    price_sum = flows.prices.sum(axis=1)
+
+    outcomes = []
+    for i, (position, (radius, k)) in enumerate(zip(positions, ticks)):
+        outcomes.append(
+            LPOutcome(
+                owner=position.owner,
+                capital=position.capital,
+                capital_efficiency=capital_efficiency(radius, k, token_count),
+                fee_income=fees[:, i],
+                final_value=final[:, i],
+                hodl_value=equal_price_reserve(radius, token_count) * price_sum,
+                crossed_at=crossed_at[:, i],
+            )
+        )
+    return outcomes
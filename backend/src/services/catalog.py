@@ -0,0 +1,208 @@
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import orjson
+from src import metrics
+from src.configs import merchant_configs
+from src.services import pricing, registry
+from x402.types import PaymentPayload, PaymentRequirements, x402PaymentRequiredResponse
+
+# Bumped on every registry or pool state change; compiled 402 bodies are only valid for one version.
+CATALOG_VERSION = 0
+
+_compiled_version = -1
+_compiled_bodies: Dict[int, bytes] = {}
+_hit, _miss = metrics.cache_counters("payment-required")
+
+# Accepted currencies already reported as not payable; bodies are recompiled on every
+# pool refresh, so each is reported once per process.
+_unpayable: Set[str] = set()
+
+
+def invalidate(kind: str, key: Any):
+    """Drop compiled 402 bodies after a registry or pool state change."""
+    global CATALOG_VERSION
+    CATALOG_VERSION += 1
+    if kind == "resource" and _compiled_version == CATALOG_VERSION - 1:
+        # Only one body is stale; keep the others compiled.
+        _compiled_bodies.pop(key, None)
+        _sync_version()
+
+
+def _sync_version():
+    global _compiled_version
+    _compiled_version = CATALOG_VERSION
+
+
+registry.subscribe(invalidate)
+pricing.subscribe(invalidate)
+
+
+def build_payment_requirements(entry: Dict[str, Any]) -> PaymentRequirements:
+    """Build the x402 PaymentRequirements for a registry resource entry."""
+    return PaymentRequirements(
+        scheme="exact",
+        network=entry["network"],
+        max_amount_required=entry["price"],
+        resource=merchant_configs.RESOURCE,
+        description=entry["description"],
+        mime_type="application/json",
+        pay_to=merchant_configs.WALLET_ADDRESS,
+        max_timeout_seconds=60,
+        asset=entry["asset"],
+        output_schema=None,
+        extra=entry["extra"],
+    )
+
+
+def build_accepts(
+    entry: Dict[str, Any], currencies: Sequence[str]
+) -> List[PaymentRequirements]:
+    """
+    Build one PaymentRequirements per token the merchant accepts.
+
+    The resource's own price comes first; other tokens are priced through the Orbital
+    pool and skipped when the pool cannot quote them. Currencies missing from
+    PAYMENT_TOKENS, or without a deployed address there, are skipped with a warning.
+
+    Args:
+        entry (dict): Registry resource entry
+        currencies (list): Symbols the merchant accepts (e.g., ['USDC', 'USDT'])
+
+    Returns:
+        list: PaymentRequirements for the 402 'accepts' field
+    """
+    accepts = [build_payment_requirements(entry)]
+    symbol = entry.get("symbol")
+    base_token = merchant_configs.PAYMENT_TOKENS.get(symbol)
+    if base_token is None:
+        return accepts
+
+    for currency in currencies:
+        if currency == symbol:
+            continue
+        token = merchant_configs.PAYMENT_TOKENS.get(currency)
+        if token is None or not token["asset"]:
+            _warn_unpayable(currency, entry["merchant"])
+            continue
+        amount = pricing.convert(
+            int(entry["price"]),
+            symbol,
+            base_token["decimals"],
+            currency,
+            token["decimals"],
+        )
+        if amount is None:
+            continue
+        accepts.append(
+            build_payment_requirements(
+                {
+                    **entry,
+                    "price": str(amount),
+                    "asset": token["asset"],
+                    "extra": token["extra"],
+                }
+            )
+        )
+    return accepts
+
+
+def _warn_unpayable(currency: str, merchant: str):
+    if currency in _unpayable:
+        return
+    _unpayable.add(currency)
+    print(
+        f"Warning: {merchant} accepts {currency}, which has no asset address in "
+        "PAYMENT_TOKENS; it is left out of 402 responses"
+    )
+
+
+def find_payment_requirements(
+    accepts: Sequence[PaymentRequirements], payment: PaymentPayload, asset: Optional[str]
+) -> Optional[PaymentRequirements]:
+    """
+    Pick the advertised PaymentRequirements an X-PAYMENT was signed for.
+
+    The exact scheme's payload does not name its token, so the payer says which
+    'accepts' entry it chose by asset address; without one, the resource's own token.
+
+    Args:
+        accepts (list): The resource's 402 'accepts' entries (build_accepts)
+        payment (PaymentPayload): Decoded X-PAYMENT
+        asset (str): Token address the payment is in, or None
+
+    Returns:
+        PaymentRequirements with the payment's scheme, network and asset, or None
+    """
+    if asset is None:
+        accepts = accepts[:1]
+    for requirements in accepts:
+        if asset is not None and requirements.asset.lower() != asset.lower():
+            continue
+        if requirements.scheme == payment.scheme and requirements.network == payment.network:
+            return requirements
+    return None
+
+
+def compile_payment_required_body(
+    entry: Dict[str, Any], currencies: Sequence[str] = ()
+) -> bytes:
+    """Render the full 402 JSON body for a registry resource entry."""
+    error_data = x402PaymentRequiredResponse(
+        x402_version=1,
+        error="Payment required",
+        accepts=build_accepts(entry, currencies),
+    ).model_dump(by_alias=True)
+    return orjson.dumps(error_data)
+
+
+async def get_payment_requirements(resource_id: int) -> Optional[PaymentRequirements]:
+    """Get the PaymentRequirements a merchant set for one of its resources."""
+    entry = await registry.get_resource(resource_id)
+    if not entry:
+        return None
+    return build_payment_requirements(entry)
+
+
+async def get_accepts(resource_id: int) -> Optional[List[PaymentRequirements]]:
+    """Get the 'accepts' entries a resource's 402 advertises, or None if it is not priced."""
+    entry = await registry.get_resource(resource_id)
+    if not entry:
+        return None
+    merchant = await registry.get_merchant(entry["merchant"])
+    return build_accepts(entry, merchant["currencies"] if merchant else [])
+
+
+async def get_payment_required_body(resource_id: int) -> Optional[bytes]:
+    """
+    Get the 402 JSON body for a resource, compiling it at most once per catalog version.
+
+    Pool conversions are part of the body, so offering several tokens costs the same
+    per request as offering one.
+
+    Args:
+        resource_id (int): Resource identifier served under /get-resource
+
+    Returns:
+        bytes: Serialized x402PaymentRequiredResponse, or None if the resource is not priced
+    """
+    if _compiled_version != CATALOG_VERSION:
+        _compiled_bodies.clear()
+        _sync_version()
+
+    body = _compiled_bodies.get(resource_id)
+    if body is not None:
+        _hit.inc()
+        return body
+    _miss.inc()
+
+    version = CATALOG_VERSION
+    entry = await registry.get_resource(resource_id)
+    if not entry:
+        return None
+    merchant = await registry.get_merchant(entry["merchant"])
+    currencies = merchant["currencies"] if merchant else []
+    body = compile_payment_required_body(entry, currencies)
+    # Do not keep a body built from an entry that changed while we were reading it.
+    if version == CATALOG_VERSION:
+        _compiled_bodies[resource_id] = body
+    return body
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from src.services import compliance_index
+
+
+def get_report_version(item: Dict[str, Any], updated: str) -> str:
+    """Version of a single stablecoin report: '<report_id>@<dataset version it changed in>'."""
+    report_id = item.get("report_metadata", {}).get("report_id", "unknown")
+    return f"{report_id}@{updated}"
+
+
+def format_version(moment: datetime) -> str:
+    """
+    Dataset version for a moment: an ISO 8601 UTC timestamp to the microsecond.
+
+    Reports can be edited more than once a day, so versions are full timestamps (when
+    the source changed, see compliance_index.build) rather than submission dates.
+    """
+    return moment.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def parse_version(version: str) -> datetime:
+    """
+    Parse a dataset version; a bare date (YYYY-MM-DD) is midnight UTC.
+
+    Raises:
+        ValueError: If it is not an ISO 8601 date or timestamp
+    """
+    try:
+        moment = datetime.fromisoformat(version)
+    except ValueError:
+        raise ValueError(f"Invalid dataset version: {version!r}") from None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def get_coin_version(coin: str) -> Optional[str]:
+    """Get the report version for a stablecoin, or None if coin not found."""
+    return compliance_index.get().get_report_version(coin)
+
+
+def get_changed_coins(since: str = "") -> List[str]:
+    """
+    Names of the stablecoins whose report changed after a dataset version.
+
+    Args:
+        since (str): Dataset version the client last saw; every coin when empty
+
+    Raises:
+        ValueError: If since is not a dataset version
+    """
+    index = compliance_index.get()
+    if not since:
+        return index.names()
+    after = parse_version(since)
+    return [name for name in index.names() if parse_version(index.get_updated(name)) > after]
+
+
+def get_changes(coins: List[str]) -> Dict[str, Any]:
+    """
+    Build the delta feed for a set of changed stablecoins.
+
+    Args:
+        coins (list): Names returned by get_changed_coins
+
+    Returns:
+        Dict with the current dataset version and the changed reports and risk scores
+    """
+    index = compliance_index.get()
+    changes = []
+    for coin in coins:
+        changes.append(
+            {
+                "name": coin,
+                "version": index.get_report_version(coin),
+                "data": index.get_data(coin),
+                "risk_score": index.get_risk_score(coin),
+            }
+        )
+
+    return {"version": index.version, "changes": changes}
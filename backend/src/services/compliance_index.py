@@ -0,0 +1,256 @@
+"""
+Compiled, memory-mapped snapshot of the GENIUS compliance dataset.
+
+Every uvicorn worker maps the same read-only file, so the reports, their risk scores
+and the encoded /coin-data and /risk-score bodies live once in the page cache rather
+than once per worker. The snapshot is compiled from genius_configs.SOURCE by the first
+worker that finds it missing or stale (or ahead of time with
+`python -m src.services.compliance_index`) and replaced atomically.
+
+Layout (little-endian):
+    header   magic, format, coin count, sha256 of the source, dataset version slice
+    entries  one per coin: an (offset, length) slice per field in FIELDS
+    blob     the bytes the slices point at
+
+Report data and risk scores are stored as JSON bodies with their gzip and brotli
+variants and digests, as responses.encode_payload would produce them.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from src import responses
+from src.configs import genius_configs
+
+MAGIC = b"GCIX"
+FORMAT = 2
+
+# Per-coin fields; "data" is the report, "score" its risk score (merchant.score_report).
+FIELDS = (
+    "name",
+    "version",
+    "updated",
+    "data.digest",
+    "data.identity",
+    "data.gzip",
+    "data.br",
+    "score.digest",
+    "score.identity",
+    "score.gzip",
+    "score.br",
+)
+_CODINGS = ("identity", "gzip", "br")
+
+_HEADER = struct.Struct("<4sHHI32sII")
+_ENTRY = struct.Struct("<" + "II" * len(FIELDS))
+
+_index: Optional["ComplianceIndex"] = None
+_lock = threading.Lock()
+
+
+def compile_snapshot(
+    data: Dict[str, Any],
+    source_digest: bytes,
+    previous: Optional["ComplianceIndex"] = None,
+    changed_at: Optional[datetime] = None,
+) -> bytes:
+    """
+    Compile a compliance dataset into the snapshot layout.
+
+    A report whose body is unchanged since `previous` keeps the version it changed in;
+    new and edited reports are stamped `changed_at` (now by default), moved past
+    `previous`'s version so that versions only increase.
+    """
+    # Imported here: merchant reads the dataset through this module.
+    from src.services import compliance, merchant
+
+    stamp = changed_at or datetime.now(timezone.utc)
+    if previous is not None and previous.version:
+        earliest = compliance.parse_version(previous.version) + timedelta(microseconds=1)
+        stamp = max(stamp, earliest)
+    stamp = compliance.format_version(stamp)
+
+    blob = bytearray()
+
+    def add(value: bytes) -> Tuple[int, int]:
+        offset = len(blob)
+        blob.extend(value)
+        return offset, len(value)
+
+    def add_payload(payload: Any) -> Tuple[str, List[Tuple[int, int]]]:
+        variants = responses.encode_payload(payload)
+        digest = responses.body_digest(variants["identity"])
+        return digest, [add(digest.encode())] + [add(variants.get(c, b"")) for c in _CODINGS]
+
+    entries = []
+    names = set()
+    changed = False
+    for item in data.get("stablecoins", []):
+        name = item["name"]
+        names.add(name)
+        digest, data_slices = add_payload(item)
+        updated = previous.get_updated(name) if previous is not None else None
+        if updated is None or previous.get_encoded(name, "data")[0] != digest:
+            updated = stamp
+            changed = True
+        fields = [
+            add(name.encode()),
+            add(compliance.get_report_version(item, updated).encode()),
+            add(updated.encode()),
+        ]
+        fields += data_slices
+        fields += add_payload(merchant.score_report(name, item))[1]
+        entries.append(_ENTRY.pack(*(n for field in fields for n in field)))
+
+    # Removed reports change the dataset too.
+    if previous is not None and set(previous.names()) - names:
+        changed = True
+    dataset_version = stamp if changed or previous is None else previous.version
+    version = add(dataset_version.encode())
+
+    # Slices are relative to the blob, which follows the header and entries.
+    header = _HEADER.pack(MAGIC, FORMAT, 0, len(entries), source_digest, *version)
+    return header + b"".join(entries) + bytes(blob)
+
+
+class ComplianceIndex:
+    """Read-only view of a snapshot file; lookups slice the shared mapping."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count, self.source_digest, *dataset = _HEADER.unpack_from(
+            self._map
+        )
+        if magic != MAGIC or version != FORMAT:
+            raise ValueError(f"{path} is not a compliance snapshot (format {FORMAT})")
+        self._blob = _HEADER.size + count * _ENTRY.size
+        self.version = self._read(*dataset).decode()
+
+        # Only the name -> slices table is per worker.
+        self._entries: Dict[str, Tuple[int, ...]] = {}
+        for i in range(count):
+            slices = _ENTRY.unpack_from(self._map, _HEADER.size + i * _ENTRY.size)
+            self._entries[self._read(*slices[:2]).decode()] = slices
+
+    def _read(self, offset: int, length: int) -> bytes:
+        start = self._blob + offset
+        return self._map[start : start + length]
+
+    def _field(self, name: str, field: str) -> Optional[bytes]:
+        slices = self._entries.get(name)
+        if slices is None:
+            return None
+        i = FIELDS.index(field) * 2
+        return self._read(slices[i], slices[i + 1])
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def get_report_version(self, name: str) -> Optional[str]:
+        value = self._field(name, "version")
+        return value.decode() if value is not None else None
+
+    def get_updated(self, name: str) -> Optional[str]:
+        """Dataset version the coin's report last changed in."""
+        value = self._field(name, "updated")
+        return value.decode() if value is not None else None
+
+    def get_data(self, name: str) -> Optional[Dict[str, Any]]:
+        body = self._field(name, "data.identity")
+        return orjson.loads(body) if body is not None else None
+
+    def get_risk_score(self, name: str) -> Optional[Dict[str, Any]]:
+        body = self._field(name, "score.identity")
+        return orjson.loads(body) if body is not None else None
+
+    def get_encoded(self, name: str, kind: str) -> Optional[Tuple[str, Dict[str, bytes]]]:
+        """Digest and encoded variants of a coin's "data" or "score" body, or None."""
+        digest = self._field(name, f"{kind}.digest")
+        if digest is None:
+            return None
+        variants = {}
+        for coding in _CODINGS:
+            body = self._field(name, f"{kind}.{coding}")
+            if body or coding == "identity":
+                variants[coding] = body
+        return digest.decode(), variants
+
+
+def _source_digest(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def _modified_at(path: str) -> datetime:
+    microseconds = os.stat(path).st_mtime_ns // 1000
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=microseconds)
+
+
+def build(source: str, snapshot: str) -> bytes:
+    """
+    Compile `source` into `snapshot`, replacing any existing file atomically.
+
+    Reports changed since the existing snapshot are versioned by the source's
+    modification time.
+    """
+    try:
+        previous: Optional[ComplianceIndex] = ComplianceIndex(snapshot)
+    except (OSError, ValueError, struct.error):
+        previous = None
+    changed_at = _modified_at(source)
+    with open(source, "rb") as file:
+        raw = file.read()
+    digest = hashlib.sha256(raw).digest()
+    compiled = compile_snapshot(orjson.loads(raw), digest, previous, changed_at)
+
+    # Workers racing to build write identical files: the versions come from the source
+    # and the snapshot being replaced, not the clock. The last rename wins.
+    tmp = f"{snapshot}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as file:
+        file.write(compiled)
+    os.replace(tmp, snapshot)
+    return digest
+
+
+def load() -> ComplianceIndex:
+    """Map the snapshot, compiling it first if it is missing or older than the source."""
+    source, snapshot = genius_configs.SOURCE, genius_configs.SNAPSHOT
+    digest = _source_digest(source)
+    try:
+        index = ComplianceIndex(snapshot)
+        if index.source_digest == digest:
+            return index
+    except (OSError, ValueError, struct.error):
+        pass
+    build(source, snapshot)
+    return ComplianceIndex(snapshot)
+
+
+def get() -> ComplianceIndex:
+    """The worker's compliance index, mapped on first use."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = load()
+    return _index
+
+
+if __name__ == "__main__":
+    # Compile ahead of time (e.g. at deploy), so no worker builds it on start-up.
+    build(genius_configs.SOURCE, genius_configs.SNAPSHOT)
+    index = ComplianceIndex(genius_configs.SNAPSHOT)
+    print(
+        f"{genius_configs.SNAPSHOT}: {len(index.names())} coins, dataset {index.version}, "
+        f"{os.path.getsize(genius_configs.SNAPSHOT)} bytes",
+        file=sys.stderr,
+    )
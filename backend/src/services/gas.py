@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import requests
+from src import metrics
+from src.cache import MISSING, LRUCache
+from src.configs import orbital_configs
+
+# key -> gas units, reused for about one block
+_estimates = LRUCache(
+    orbital_configs.GAS_CACHE_SIZE, orbital_configs.GAS_CACHE_SECONDS, name="gas-estimates"
+)
+
+# key -> (transaction, future) waiting for the next batch
+_pending: Dict[Hashable, Tuple[Dict[str, Any], asyncio.Future]] = {}
+_flush_task: Optional[asyncio.Task] = None
+
+
+async def estimate_gas(key: Hashable, transaction: Dict[str, Any]) -> Optional[int]:
+    """
+    Estimate gas for a transaction, sharing RPC round-trips between concurrent callers.
+
+    Callers asking for the same key while an estimate is cached or in flight get that
+    estimate; everything requested within GAS_BATCH_WINDOW_SECONDS goes out as one
+    JSON-RPC batch.
+
+    Args:
+        key: Transactions with the same key are assumed to cost the same
+            (e.g., ('swap', token_in, token_out, amount_bucket(amount_in)))
+        transaction (dict): eth_estimateGas call object ({'from', 'to', 'data'})
+
+    Returns:
+        int: Estimated gas units, or None if the node could not estimate (e.g., revert)
+    """
+    gas = _estimates.get(key)
+    if gas is not MISSING:
+        return gas
+
+    pending = _pending.get(key)
+    if pending is None:
+        future = asyncio.get_running_loop().create_future()
+        _pending[key] = (transaction, future)
+        _schedule_flush()
+    else:
+        future = pending[1]
+    return await asyncio.shield(future)
+
+
+def amount_bucket(amount: int) -> Tuple[int, int]:
+    """
+    Group amounts that cost about the same gas to swap: amounts with the same bit
+    length and the same GAS_AMOUNT_BUCKET_BITS leading bits.
+
+    Example:
+        amount_bucket(1000) == amount_bucket(1023) != amount_bucket(1100)
+    """
+    shift = max(amount.bit_length() - orbital_configs.GAS_AMOUNT_BUCKET_BITS, 0)
+    return amount.bit_length(), amount >> shift
+
+
+def _schedule_flush():
+    global _flush_task
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_flush())
+
+
+async def _flush():
+    # Keys requested while a batch is in flight go out in the next one; this task is
+    # still running then, so _schedule_flush does not start another.
+    while _pending:
+        await asyncio.sleep(orbital_configs.GAS_BATCH_WINDOW_SECONDS)
+        batch = list(_pending.items())
+        _pending.clear()
+
+        try:
+            results = await asyncio.to_thread(
+                _send_batch, [transaction for _, (transaction, _) in batch]
+            )
+        except Exception as e:
+            print(f"Gas estimation batch failed: {e}")
+            results = [None] * len(batch)
+
+        for (key, (_, future)), gas in zip(batch, results):
+            # Reverts depend on the sender (balance, allowance), so only successes are shared.
+            if gas is not None:
+                _estimates.put(key, gas)
+            if not future.done():
+                future.set_result(gas)
+
+
+def _send_batch(transactions: List[Dict[str, Any]]) -> List[Optional[int]]:
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": "eth_estimateGas", "params": [tx]}
+        for i, tx in enumerate(transactions)
+    ]
+    start = time.perf_counter()
+    failed = True
+    try:
+        response = requests.post(orbital_configs.PROVIDER_URL, json=payload, timeout=10)
+        response.raise_for_status()
+        by_id = {item.get("id"): item for item in response.json()}
+        failed = False
+    finally:
+        metrics.observe_rpc(
+            orbital_configs.CHAIN,
+            "batch:eth_estimateGas",
+            time.perf_counter() - start,
+            failed,
+        )
+
+    results = []
+    for i in range(len(transactions)):
+        result = by_id.get(i, {}).get("result")
+        results.append(int(result, 16) if result is not None else None)
+    return results
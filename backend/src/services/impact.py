@@ -0,0 +1,258 @@
+"""
+Precomputed price-impact curves: amount out and slippage against trade size, per token pair.
+
+A curve is sampled at log-spaced input sizes plus, exactly, every size at which the
+trade crosses a tick (pool.OrbitalPool.trace). Output is increasing and concave in
+the input within each segment, so linear interpolation between samples never
+overstates it. The gap to the true output is bounded on each interval by the
+tangents at its ends, and every interpolated quote carries that bound.
+
+The live pool's curves are rebuilt lazily, all pairs at once, after each pool state
+change.
+"""
+
+import bisect
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from src import metrics
+from src.configs import orbital_configs
+from src.services import pricing, routing
+from src.services.pool import FEE_DENOMINATOR, OrbitalPool, Segment, TorusState
+
+DEFAULT_POINTS = 64
+# Smallest sampled size, relative to the input token's reserve.
+MIN_SIZE = 1e-6
+# Largest sampled size: the input that takes this share of the output token's reserve,
+# halved until the pool can fill it.
+MAX_DRAIN = 0.5
+
+_version = 0
+_built_version = -1
+_curves: Dict[Tuple[str, str], "Curve"] = {}
+_hit, _miss = metrics.cache_counters("impact-curves")
+
+
+def invalidate(kind: str, key: None):
+    """Drop the live pool's curves after a pool state change."""
+    global _version
+    _version += 1
+
+
+pricing.subscribe(invalidate)
+
+
+@dataclass
+class Curve:
+    """
+    Output against input (fees included) for one pair, in whole tokens.
+
+    amount_in starts at 0 and is strictly increasing; error[i] bounds how far the
+    interpolated output on (amount_in[i], amount_in[i + 1]) can fall short of the
+    true output.
+    """
+
+    token_in: str
+    token_out: str
+    spot_rate: float  # Marginal rate after fees before any trade
+    amount_in: np.ndarray
+    amount_out: np.ndarray
+    error: np.ndarray
+    breakpoints: Tuple[float, ...]  # Inputs at which the trade crosses a tick
+
+    @property
+    def capacity(self) -> float:
+        return float(self.amount_in[-1])
+
+    @property
+    def slippage(self) -> np.ndarray:
+        """Shortfall of the average rate against spot_rate at each sample."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(self.amount_in > 0, self.amount_out / self.amount_in, self.spot_rate)
+        return 1 - rate / self.spot_rate
+
+    def quote(self, amount_in: float) -> Tuple[float, float]:
+        """
+        Interpolated output for any size up to the largest sample.
+
+        Returns:
+            Tuple (amount out, bound on how much the true output can exceed it)
+
+        Raises:
+            ValueError: If amount_in is negative or beyond the curve
+        """
+        if not 0 <= amount_in <= self.capacity:
+            raise ValueError("Amount outside the curve")
+        i = int(np.searchsorted(self.amount_in, amount_in))
+        amount_out = float(np.interp(amount_in, self.amount_in, self.amount_out))
+        if self.amount_in[i] == amount_in:
+            return amount_out, 0.0
+        return amount_out, float(self.error[i - 1])
+
+
+def _trace(
+    market: Union[OrbitalPool, TorusState], token_in: int, token_out: int, amount_in: float
+) -> List[Segment]:
+    if isinstance(market, OrbitalPool):
+        return market.trace(token_in, token_out, amount_in)
+    # A bare consolidated state has no ticks to cross.
+    fee_factor = (FEE_DENOMINATOR - market.fee_bps) / FEE_DENOMINATOR
+    return [Segment(0.0, 0.0, market, amount_in * fee_factor, 0)]
+
+
+def _gap_bound(x: np.ndarray, y: np.ndarray, slope: np.ndarray) -> np.ndarray:
+    """
+    Largest gap between a concave function and its chord on each interval.
+
+    The function lies under both end tangents, whose excess over the chord is largest
+    where they meet: (m_a - m)(m - m_b)(b - a) / (m_a - m_b) for chord slope m.
+    """
+    width = np.diff(x)
+    chord = np.diff(y) / width
+    left = np.maximum(slope[:-1] - chord, 0.0)
+    right = np.maximum(chord - slope[1:], 0.0)
+    spread = left + right
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(spread > 0, left * right * width / spread, 0.0)
+
+
+def build_curve(
+    market: Union[OrbitalPool, TorusState],
+    symbols: Sequence[str],
+    token_in: str,
+    token_out: str,
+    points: int = DEFAULT_POINTS,
+) -> Optional[Curve]:
+    """
+    Sample one pair's curve.
+
+    Args:
+        market: Off-chain pool (exact tick crossings) or a consolidated state
+        symbols (list): Token symbols in pool order
+        token_in (str): Symbol paid in
+        token_out (str): Symbol received
+        points (int): Log-spaced samples, in addition to 0 and the crossings
+
+    Returns:
+        Curve, or None if the pool cannot quote the pair
+    """
+    i, j = symbols.index(token_in), symbols.index(token_out)
+    state = market.state() if isinstance(market, OrbitalPool) else market
+    fee_factor = (FEE_DENOMINATOR - state.fee_bps) / FEE_DENOMINATOR
+    try:
+        spot_rate = state.marginal_rate(i, j)
+    except ZeroDivisionError:
+        return None
+    if not spot_rate > 0 or state.reserves[i] <= 0:
+        return None
+    drain, largest = MAX_DRAIN, None
+    while largest is None and drain > MIN_SIZE:
+        largest = state.quote_in(i, j, state.reserves[j] * drain)
+        drain /= 2
+    if not largest:
+        return None
+
+    segments = _trace(market, i, j, largest)
+    if not segments:
+        return None
+    reach = (segments[-1].net_in + segments[-1].length) / fee_factor
+    sizes = np.geomspace(state.reserves[i] * MIN_SIZE, largest, points)
+    breakpoints = tuple(
+        segment.net_in / fee_factor for segment in segments[1:] if segment.net_in > 0
+    )
+    nodes = np.unique(np.concatenate([[0.0], sizes[sizes < reach], breakpoints, [reach]]))
+
+    starts = [segment.net_in for segment in segments]
+    amount_out = np.empty(len(nodes))
+    slope = np.empty(len(nodes))
+    for n, size in enumerate(nodes):
+        net = size * fee_factor
+        segment = segments[max(bisect.bisect_right(starts, net) - 1, 0)]
+        out, after = segment.state.apply_net(i, j, net - segment.net_in)
+        amount_out[n] = segment.amount_out + out
+        slope[n] = after.marginal_rate(i, j)
+
+    return Curve(
+        token_in,
+        token_out,
+        spot_rate,
+        nodes,
+        np.maximum.accumulate(amount_out),
+        _gap_bound(nodes, amount_out, slope),
+        breakpoints,
+    )
+
+
+def build_curves(
+    market: Union[OrbitalPool, TorusState],
+    symbols: Sequence[str],
+    points: int = DEFAULT_POINTS,
+) -> Dict[Tuple[str, str], Curve]:
+    """Curves for every ordered pair the pool can quote."""
+    curves = {}
+    for token_in in symbols:
+        for token_out in symbols:
+            if token_in == token_out:
+                continue
+            curve = build_curve(market, symbols, token_in, token_out, points)
+            if curve is not None:
+                curves[(token_in, token_out)] = curve
+    return curves
+
+
+def get_curve(token_in: str, token_out: str) -> Optional[Curve]:
+    """The live pool's curve for a pair, rebuilding all pairs if the pool has changed."""
+    global _built_version
+    if _built_version == _version:
+        _hit.inc()
+    else:
+        _miss.inc()
+        _curves.clear()
+        for symbols, pool in routing.get_live_markets().values():
+            _curves.update(build_curves(pool, symbols))
+        _built_version = _version
+    return _curves.get((token_in, token_out))
+
+
+def curve_to_dict(curve: Curve, amount_in: Optional[float] = None) -> Dict[str, object]:
+    """
+    Serialize a curve, and optionally one interpolated quote, in 18-decimal units.
+
+    Each point's errorBound covers the interval up to the next point.
+    """
+    scale = 10**orbital_configs.INTERNAL_DECIMALS
+
+    def units(amount: float) -> str:
+        return str(int(amount * scale))
+
+    body: Dict[str, object] = {
+        "tokenIn": curve.token_in,
+        "tokenOut": curve.token_out,
+        "spotRate": curve.spot_rate,
+        "capacity": units(curve.capacity),
+        "breakpoints": [units(amount) for amount in curve.breakpoints],
+        "points": [
+            {
+                "amountIn": units(amount_in_),
+                "amountOut": units(amount_out),
+                "slippage": float(slippage),
+                "errorBound": units(error),
+            }
+            for amount_in_, amount_out, slippage, error in zip(
+                curve.amount_in,
+                curve.amount_out,
+                curve.slippage,
+                np.append(curve.error, 0.0),
+            )
+        ],
+    }
+    if amount_in is not None:
+        amount_out, error = curve.quote(amount_in)
+        body["quote"] = {
+            "amountIn": units(amount_in),
+            "amountOut": units(amount_out),
+            "slippage": 1 - amount_out / (amount_in * curve.spot_rate) if amount_in else 0.0,
+            "errorBound": units(error),
+        }
+    return body
@@ -1,34 +1,21 @@
-from src.configs import merchant_configs, orbital_configs, genius_configs
-from web3 import HTTPProvider, Web3
+from src.services import catalog, compliance_index, registry
 
 from typing import Dict, Any, Optional
 
 
-def get_valid_payment_currencies(resource_id: int):
+async def get_valid_payment_currencies(resource_id: int):
     """Get valid payment methods for a merchant."""
-    merchant_name = merchant_configs.MERCHANT_ID_TO_MERCHANT_MAP.get(resource_id)
-    merchant_currencies = merchant_configs.MERCHANT_TO_CURRENCY_MAP.get(merchant_name)
-    return merchant_currencies
-
-
-def swap_currencies():
-    web3 = Web3(HTTPProvider(orbital_configs.PROVIDER_URL))
-
-    orbital_contract = web3.eth.contract(
-        address=web3.to_checksum_address(orbital_configs.CONTRACT_ADDRESS),
-        abi=orbital_configs.ABI,
-    )
-    total_reserves = orbital_contract.functions.totalReserves()
-    return total_reserves
+    resource = await registry.get_resource(resource_id)
+    if not resource:
+        return None
+    merchant = await registry.get_merchant(resource["merchant"])
+    if not merchant:
+        return None
+    return merchant["currencies"]
 
 
 def get_stablecoin_data(coin: str):
-    found_data = None
-    for item in genius_configs.DATA["stablecoins"]:
-        if item["name"] == coin:
-            found_data = item
-            break
-    return found_data
+    return compliance_index.get().get_data(coin)
 
 
 def calculate_reserve_risk(reserves: Dict[str, Any]) -> float:
@@ -287,7 +274,11 @@ def compute_risk_score(coin: str) -> Optional[Dict[str, Any]]:
     data = get_stablecoin_data(coin)
     if not data:
         return None
+    return score_report(coin, data)
+
 
+def score_report(coin: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Risk score of one compliance report (see compute_risk_score)."""
     try:
         risk_scores = {}
 
@@ -346,13 +337,10 @@ def compute_risk_score(coin: str) -> Optional[Dict[str, Any]]:
 
 def get_all_stablecoin_risk_scores() -> Dict[str, Any]:
     """Get risk scores for all available stablecoins."""
-    if not hasattr(genius_configs, "DATA") or not genius_configs.DATA:
-        return {}
-
+    index = compliance_index.get()
     all_scores = {}
-    for stablecoin in genius_configs.DATA["stablecoins"]:
-        coin_name = stablecoin["name"]
-        risk_data = compute_risk_score(coin_name)
+    for coin_name in index.names():
+        risk_data = index.get_risk_score(coin_name)
         if risk_data:
             all_scores[coin_name] = risk_data
 
@@ -444,5 +432,6 @@ def check_genius_compliance(coin: str) -> bool:
 #     return comparison
 
 
-def resolve_merchant_payment_reqs(resource_id: int):
-    return merchant_configs.PAYMENT_REQUIREMENT
+async def resolve_merchant_payment_reqs(resource_id: int):
+    """Get the PaymentRequirements a merchant set for one of its resources."""
+    return await catalog.get_payment_requirements(resource_id)
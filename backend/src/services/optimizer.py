@@ -0,0 +1,225 @@
+"""
+LP parameter selection: which plane constant k (and so which depegTolerance) to deposit with.
+
+For a given capital the tick radius is fixed (pool.tick_from_capital); only k varies,
+between k_min (boundary at the equal price point) and the k whose boundary is reached
+when one token falls to the lowest depegTolerance OrbitalPool.addLiquidity accepts.
+A tighter tick is more capital efficient: it provides the depth of a full sphere
+holding `efficiency` times the capital. It loses the same multiple when a token
+depegs, and stops earning once it is pinned to its boundary. The whole range is
+evaluated on a dense grid of k values with NumPy.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from src.configs import orbital_configs
+from src.services.pool import (
+    capital_efficiency,
+    depeg_price_to_k,
+    equal_price_reserve,
+    k_bounds,
+    tick_from_capital,
+)
+
+# OrbitalPool.addLiquidity rejects depegTolerance outside [0.8, 1].
+MIN_DEPEG_TOLERANCE = 0.8
+DEFAULT_GRID_POINTS = 4096
+# Grid points in a serialized frontier.
+FRONTIER_SAMPLES = 64
+# Offset of the tightest grid point from k_min, relative to the radius. k_min itself
+# has no capital at risk (infinite efficiency).
+MIN_K_OFFSET = 1e-12
+
+
+@dataclass
+class Frontier:
+    """Grid of candidate ticks for one deposit, ordered from tightest to widest."""
+
+    radius: float
+    token_count: int
+    target_price: float
+    k: np.ndarray
+    depeg_price: np.ndarray  # Price of a depegged token at which the tick is pinned
+    efficiency: np.ndarray
+    loss: np.ndarray  # Loss against holding at target_price, as a share of capital
+
+
+@dataclass
+class Recommendation:
+    capital: float
+    token_count: int
+    target_price: float
+    radius: float
+    k: float
+    depeg_tolerance: float
+    efficiency: float
+    loss: float
+    frontier: Frontier
+
+
+def boundary_price(k: np.ndarray, radius: float, token_count: int) -> np.ndarray:
+    """
+    Inverse of pool.depeg_price_to_k: the price at which a tick with plane constant k is pinned.
+
+    With a = (n r - k√n)/r, the price p solves a²(p² + n - 1) = (n - 1 + p)², the root
+    in [0, 1] for k in [k_min, k_max].
+    """
+    n = token_count
+    a2 = ((n * radius - k * math.sqrt(n)) / radius) ** 2
+    curvature = a2 - 1
+    discriminant = (n - 1) ** 2 - curvature * (a2 * (n - 1) - (n - 1) ** 2)
+    return ((n - 1) - np.sqrt(np.maximum(discriminant, 0.0))) / curvature
+
+
+def sphere_reserves(price: np.ndarray, radius: float, token_count: int):
+    """
+    Reserves (depegged token, each other token) of a full sphere where one token trades at price.
+
+    r - x = u(p, 1, ..., 1) with u = r/√(p² + n - 1), as in pool.depeg_price_to_k.
+    """
+    u = radius / np.sqrt(price * price + token_count - 1)
+    return radius - u * price, radius - u
+
+
+def efficiency(k: np.ndarray, radius: float, token_count: int) -> np.ndarray:
+    """pool.capital_efficiency over an array of plane constants."""
+    n = token_count
+    base = equal_price_reserve(radius, n)
+    offset = k - radius * math.sqrt(n)
+    s = np.sqrt(np.maximum(radius * radius - offset * offset, 0.0))
+    x_min = k / math.sqrt(n) - s * math.sqrt((n - 1) / n)
+    at_risk = base - np.maximum(x_min, 0.0)
+    with np.errstate(divide="ignore"):
+        return np.where(at_risk > 0, base / at_risk, np.inf)
+
+
+def build_frontier(
+    capital: float,
+    token_count: int,
+    target_price: float,
+    points: int = DEFAULT_GRID_POINTS,
+) -> Frontier:
+    """
+    Evaluate every candidate k for a balanced deposit.
+
+    Args:
+        capital (float): Total deposit across all tokens, in whole tokens
+        token_count (int): Tokens in the pool
+        target_price (float): Depeg price the LP wants to be covered down to
+        points (int): Grid size
+
+    Returns:
+        Frontier: Efficiency and loss at target_price for each k
+
+    Raises:
+        ValueError: If the inputs are outside what addLiquidity accepts
+    """
+    if token_count < 2:
+        raise ValueError("A pool needs at least two tokens")
+    if capital <= 0:
+        raise ValueError("Capital must be positive")
+    if not MIN_DEPEG_TOLERANCE <= target_price < 1:
+        raise ValueError(f"Target price must be in [{MIN_DEPEG_TOLERANCE}, 1)")
+
+    n = token_count
+    radius, _ = tick_from_capital(capital, target_price, n)
+    k_min, _ = k_bounds(radius, n)
+    widest = depeg_price_to_k(MIN_DEPEG_TOLERANCE, radius, n)
+    # The boundary price moves with √(k - k_min), so space the grid geometrically
+    # to keep it dense near the equal price point.
+    k = k_min + np.geomspace(radius * MIN_K_OFFSET, widest - k_min, points)
+    depeg = np.clip(boundary_price(k, radius, n), 0.0, 1.0)
+    scale = efficiency(k, radius, n)
+
+    # A tick pinned above the target price stops at its boundary reserves.
+    at = np.maximum(depeg, target_price)
+    x_depeg, x_other = sphere_reserves(at, radius, n)
+    base = equal_price_reserve(radius, n)
+    held = base * (target_price + n - 1)
+    loss = scale * (held - (target_price * x_depeg + (n - 1) * x_other)) / (n * base)
+
+    return Frontier(radius, n, target_price, k, depeg, scale, loss)
+
+
+def optimize(
+    capital: float,
+    token_count: int,
+    target_price: float,
+    max_loss: Optional[float] = None,
+    points: int = DEFAULT_GRID_POINTS,
+) -> Recommendation:
+    """
+    Most capital-efficient tick that stays active down to target_price.
+
+    Args:
+        capital (float): Total deposit across all tokens, in whole tokens
+        token_count (int): Tokens in the pool
+        target_price (float): Depeg price the LP wants to be covered down to
+        max_loss (float): Optional cap on the loss against holding at target_price,
+            as a share of capital
+        points (int): Grid size
+
+    Returns:
+        Recommendation: The chosen tick, with the frontier it was picked from
+
+    Raises:
+        ValueError: If the inputs are invalid or no tick meets max_loss
+    """
+    frontier = build_frontier(capital, token_count, target_price, points)
+    eligible = frontier.depeg_price <= target_price
+    if max_loss is not None:
+        eligible &= frontier.loss <= max_loss
+    if not eligible.any():
+        raise ValueError("No tick meets the loss limit")
+
+    # The grid runs from tightest to widest, so the first eligible point is the most
+    # efficient one.
+    best = int(np.argmax(eligible))
+    k = float(frontier.k[best])
+    depeg_tolerance = float(frontier.depeg_price[best])
+    return Recommendation(
+        capital=capital,
+        token_count=token_count,
+        target_price=target_price,
+        radius=frontier.radius,
+        k=k,
+        depeg_tolerance=depeg_tolerance,
+        efficiency=capital_efficiency(frontier.radius, k, token_count),
+        loss=float(frontier.loss[best]),
+        frontier=frontier,
+    )
+
+
+def recommendation_to_dict(
+    recommendation: Recommendation, samples: int = FRONTIER_SAMPLES
+) -> Dict[str, object]:
+    """Serialize a recommendation with amounts in the pool's 18-decimal units."""
+    scale = 10**orbital_configs.INTERNAL_DECIMALS
+
+    def units(amount: float) -> str:
+        return str(int(amount * scale))
+
+    frontier = recommendation.frontier
+    indices = np.unique(np.linspace(0, len(frontier.k) - 1, samples).astype(int))
+    return {
+        "capital": units(recommendation.capital),
+        "tokenCount": recommendation.token_count,
+        "targetPrice": recommendation.target_price,
+        "radius": units(recommendation.radius),
+        "k": units(recommendation.k),
+        "depegTolerance": units(recommendation.depeg_tolerance),
+        "efficiency": recommendation.efficiency,
+        "loss": recommendation.loss,
+        "frontier": [
+            {
+                "k": units(frontier.k[i]),
+                "depegTolerance": units(frontier.depeg_price[i]),
+                "efficiency": float(frontier.efficiency[i]),
+                "loss": float(frontier.loss[i]),
+            }
+            for i in indices
+        ],
+    }
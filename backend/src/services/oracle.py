@@ -1,8 +1,22 @@
+import functools
 from datetime import datetime
-from web3 import HTTPProvider, Web3
+from src import metrics
 from src.configs import flare_configs
 
 
+@functools.lru_cache(maxsize=None)
+def _ftsov2():
+    # Built on the first price request and reused; web3 is not loaded at import.
+    from web3 import HTTPProvider, Web3
+
+    web3 = Web3(HTTPProvider(flare_configs.RPC_URL))
+    web3.middleware_onion.add(metrics.rpc_middleware("flare-coston2"))
+    return web3.eth.contract(
+        address=web3.to_checksum_address(flare_configs.FTSOV2_ADDRESS),
+        abi=flare_configs.ABI,
+    )
+
+
 def get_stablecoin_price(stablecoin: str) -> float:
     """
     Fetch the price of a stablecoin from a blockchain or API.
@@ -13,12 +27,7 @@ def get_stablecoin_price(stablecoin: str) -> float:
     Returns:
         float: The price of the stablecoin.
     """
-    web3 = Web3(HTTPProvider(flare_configs.RPC_URL))
-
-    ftsov2 = web3.eth.contract(
-        address=web3.to_checksum_address(flare_configs.FTSOV2_ADDRESS),
-        abi=flare_configs.ABI,
-    )
+    ftsov2 = _ftsov2()
     feed_id = flare_configs.STABLECOIN_FEED_IDS.get(stablecoin)
     if not feed_id:
         raise ValueError(f"Stablecoin {stablecoin} not supported.")
@@ -0,0 +1,502 @@
+"""
+Bit-exact port of onchain/src/libraries/OrbitalMath.sol and OrbitalPool.getAmountOut.
+
+Everything is uint256 arithmetic on Python ints: products and quotients truncate the
+way the EVM does, and any operation Solidity 0.8 would revert on (overflow,
+underflow, division by zero) raises Panic instead. The library's custom errors and
+the pool's require() failures raise the matching OrbitalMathError subclass, so a
+call either returns exactly what the contract returns or fails where it fails.
+
+OrbitalMath.sqrt runs Newton's method downward from a power of two above √x, which
+always lands on ⌊√x⌋, so it is math.isqrt. nthRoot is iterated step for step.
+
+The differential corpus written by onchain/test/OrbitalMathCorpus.t.sol is replayed
+with `python -m src.services.orbital_math <corpus.jsonl>`.
+"""
+
+import json
+import math
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PRECISION = 10**18
+MAX_TOKENS = 10
+FEE_DENOMINATOR = 10000
+UINT256_MAX = 2**256 - 1
+
+# Solidity panic codes
+PANIC_OVERFLOW = 0x11
+PANIC_DIVISION_BY_ZERO = 0x12
+PANIC_ARRAY_INDEX = 0x32
+
+
+class OrbitalMathError(ValueError):
+    """A call the contract would revert."""
+
+
+class InvalidTokenCount(OrbitalMathError):
+    pass
+
+
+class InvalidReserves(OrbitalMathError):
+    pass
+
+
+class InvariantViolation(OrbitalMathError):
+    pass
+
+
+class Panic(OrbitalMathError):
+    def __init__(self, code: int):
+        super().__init__(f"Panic({code})")
+        self.code = code
+
+
+class Revert(OrbitalMathError):
+    """A require() failure, with its reason string."""
+
+
+def _add(a: int, b: int) -> int:
+    c = a + b
+    if c > UINT256_MAX:
+        raise Panic(PANIC_OVERFLOW)
+    return c
+
+
+def _sub(a: int, b: int) -> int:
+    if b > a:
+        raise Panic(PANIC_OVERFLOW)
+    return a - b
+
+
+def _mul(a: int, b: int) -> int:
+    c = a * b
+    if c > UINT256_MAX:
+        raise Panic(PANIC_OVERFLOW)
+    return c
+
+
+def _div(a: int, b: int) -> int:
+    if b == 0:
+        raise Panic(PANIC_DIVISION_BY_ZERO)
+    return a // b
+
+
+# ============ OrbitalMath ============
+
+
+def sqrt(x: int) -> int:
+    return math.isqrt(x)
+
+
+def log2(x: int) -> int:
+    return x.bit_length() - 1 if x else 0
+
+
+def nth_root(x: int, n: int) -> int:
+    if x == 0:
+        return 0
+    if n == 0:
+        raise InvalidTokenCount()
+    if n == 1:
+        return x
+    if n == 2:
+        return sqrt(x)
+
+    y = x >> (256 // n)
+    if y == 0:
+        y = 1
+    for _ in range(8):
+        # y^n despite the contract's name for it: the inner loop multiplies n - 1 times
+        power = y
+        for _ in range(1, n):
+            power = _mul(power, y)
+        if power == 0:
+            break
+        new_y = _add(_mul(n - 1, y), x // power) // n
+        if new_y >= y:
+            break
+        y = new_y
+    return y
+
+
+def sum_squared_differences(reserves: Sequence[int], radius: int) -> int:
+    n = len(reserves)
+    if n == 0 or n > MAX_TOKENS:
+        raise InvalidTokenCount()
+    total = 0
+    for reserve in reserves:
+        if reserve >= radius:
+            raise InvalidReserves()
+        diff = radius - reserve
+        total = _add(total, _mul(diff, diff))
+    return total
+
+
+def check_invariant(reserves: Sequence[int], radius: int) -> bool:
+    # sumSquaredDifferencesHighPrecision computes the same sum
+    total = sum_squared_differences(reserves, radius)
+    radius_squared = _mul(radius, radius)
+    tolerance = _mul(radius_squared // 1000, len(reserves)) // 2
+    return total >= _sub(radius_squared, tolerance) and total <= _add(
+        radius_squared, tolerance
+    )
+
+
+def calculate_swap_output(
+    reserve_in: int, reserve_out: int, amount_in: int, radius: int, fee_rate: int
+) -> int:
+    amount_in_after_fee = _mul(amount_in, _sub(10000, fee_rate)) // 10000
+    new_reserve_in = _add(reserve_in, amount_in_after_fee)
+    if new_reserve_in >= radius:
+        raise InvariantViolation()
+
+    new_diff_in = radius - new_reserve_in
+    radius_squared = _mul(radius, radius)
+    new_diff_in_squared = _mul(new_diff_in, new_diff_in)
+    tolerance = radius_squared // 200
+    if new_diff_in_squared > _add(radius_squared, tolerance):
+        raise InvariantViolation()
+
+    if new_diff_in_squared > radius_squared:
+        target_diff_out_squared = 1
+    else:
+        target_diff_out_squared = radius_squared - new_diff_in_squared
+
+    new_reserve_out = _sub(radius, sqrt(target_diff_out_squared))
+    if new_reserve_out >= reserve_out:
+        raise InvariantViolation()
+    return reserve_out - new_reserve_out
+
+
+def calculate_swap_output_multi(
+    all_reserves: Sequence[int],
+    token_in_index: int,
+    token_out_index: int,
+    amount_in: int,
+    radius: int,
+    fee_rate: int,
+) -> int:
+    n = len(all_reserves)
+    if token_in_index >= n or token_out_index >= n:
+        raise InvalidTokenCount()
+    if token_in_index == token_out_index:
+        raise InvalidReserves()
+
+    amount_in_after_fee = _mul(amount_in, _sub(10000, fee_rate)) // 10000
+    new_reserve_in = _add(all_reserves[token_in_index], amount_in_after_fee)
+    if new_reserve_in >= radius:
+        raise InvariantViolation()
+
+    radius_squared = _mul(radius, radius)
+    other_tokens_sum = 0
+    for i, reserve in enumerate(all_reserves):
+        if i == token_out_index:
+            continue
+        diff = radius - new_reserve_in if i == token_in_index else _sub(radius, reserve)
+        other_tokens_sum = _add(other_tokens_sum, _mul(diff, diff))
+
+    if other_tokens_sum >= radius_squared:
+        raise InvariantViolation()
+
+    new_reserve_out = _sub(radius, sqrt(radius_squared - other_tokens_sum))
+    reserve_out = all_reserves[token_out_index]
+    if new_reserve_out >= reserve_out:
+        raise InvariantViolation()
+    return reserve_out - new_reserve_out
+
+
+def calculate_price(reserve_a: int, reserve_b: int, radius: int) -> int:
+    diff_a = _sub(radius, reserve_a)
+    diff_b = _sub(radius, reserve_b)
+    if diff_a == 0:
+        raise InvalidReserves()
+    return _mul(diff_b, PRECISION) // diff_a
+
+
+def calculate_equal_price_point(n: int, radius: int) -> Tuple[int, int]:
+    if n == 0 or n > MAX_TOKENS:
+        raise InvalidTokenCount()
+    sqrt_inv_n = sqrt(PRECISION * PRECISION // n)
+    equal_reserve = _mul(radius, PRECISION - sqrt_inv_n) // PRECISION
+    return equal_reserve, sqrt_inv_n
+
+
+def calculate_lp_tokens_to_mint(
+    amounts: Sequence[int], reserves: Sequence[int], total_supply: int
+) -> int:
+    n = len(amounts)
+    if n != len(reserves):
+        raise InvalidTokenCount()
+
+    if total_supply == 0:
+        product = PRECISION
+        for amount in amounts:
+            product = _mul(product, amount) // PRECISION
+        return nth_root(product, n)
+
+    min_ratio = UINT256_MAX
+    for amount, reserve in zip(amounts, reserves):
+        if reserve == 0:
+            raise InvalidReserves()
+        min_ratio = min(min_ratio, _mul(amount, total_supply) // reserve)
+    return min_ratio
+
+
+def calculate_liquidity_removal(
+    lp_tokens: int, total_supply: int, reserves: Sequence[int]
+) -> List[int]:
+    if total_supply == 0:
+        raise InvalidReserves()
+    return [_mul(lp_tokens, reserve) // total_supply for reserve in reserves]
+
+
+def swap_outputs_multi(
+    all_reserves: Sequence[int],
+    trades: Sequence[Tuple[int, int, int]],
+    radius: int,
+    fee_rate: int,
+) -> List[Optional[int]]:
+    """
+    calculate_swap_output_multi for many (token_in, token_out, amount_in) on one state.
+
+    The squared distances of the untouched tokens are summed once. Sums of
+    non-negative terms overflow in some order exactly when the total does, so the
+    precomputed sum reverts for the same trades the loop does.
+
+    Returns:
+        list: Output per trade, or None where the contract would revert
+    """
+    n = len(all_reserves)
+    try:
+        radius_squared = _mul(radius, radius)
+        fee_factor = _sub(10000, fee_rate)
+    except OrbitalMathError:
+        return [None] * len(trades)
+
+    # (radius - x)² per token, None where the loop would revert on it
+    squares: List[Optional[int]] = []
+    for reserve in all_reserves:
+        diff = radius - reserve
+        squares.append(diff * diff if 0 <= diff and diff * diff <= UINT256_MAX else None)
+    valid = [square for square in squares if square is not None]
+    total = sum(valid)
+
+    outputs: List[Optional[int]] = []
+    for token_in, token_out, amount_in in trades:
+        if token_in >= n or token_out >= n or token_in == token_out:
+            outputs.append(None)
+            continue
+        new_reserve_in = all_reserves[token_in] + amount_in * fee_factor // 10000
+        if amount_in * fee_factor > UINT256_MAX or new_reserve_in >= radius:
+            outputs.append(None)
+            continue
+        if any(
+            square is None for i, square in enumerate(squares) if i not in (token_in, token_out)
+        ):
+            outputs.append(None)
+            continue
+        new_diff_in = radius - new_reserve_in
+        other = (
+            total
+            - (squares[token_in] or 0)
+            - (squares[token_out] or 0)
+            + new_diff_in * new_diff_in
+        )
+        if other > UINT256_MAX or other >= radius_squared:
+            outputs.append(None)
+            continue
+        new_reserve_out = radius - sqrt(radius_squared - other)
+        reserve_out = all_reserves[token_out]
+        outputs.append(
+            reserve_out - new_reserve_out
+            if 0 <= new_reserve_out < reserve_out
+            else None
+        )
+    return outputs
+
+
+# ============ OrbitalPool.getAmountOut ============
+
+
+def fit_radius(reserves: Sequence[int]) -> int:
+    """OrbitalPool._fitRadius: the larger root of (n - 1)r² - 2Σx·r + Σx² = 0."""
+    total = 0
+    sum_squares = 0
+    for reserve in reserves:
+        total = _add(total, reserve)
+        sum_squares = _add(sum_squares, _mul(reserve, reserve))
+    spread = _mul(len(reserves) - 1, sum_squares)
+    square = _mul(total, total)
+    if square < spread:
+        raise Revert("Insufficient liquidity")
+    return _add(total, sqrt(square - spread)) // (len(reserves) - 1)
+
+
+class PoolState:
+    """What OrbitalPool.getAmountOut reads: getInteriorReserves() and swapFee."""
+
+    def __init__(self, reserves: Sequence[int], swap_fee: int):
+        self.reserves = tuple(reserves)
+        self.swap_fee = swap_fee
+        self._radius: Optional[int] = None
+
+    @property
+    def radius(self) -> int:
+        """The sphere through the interior reserves; the same for every trade."""
+        if self._radius is None:
+            self._radius = fit_radius(self.reserves)
+        return self._radius
+
+    def amount_out(self, token_in: int, token_out: int, amount_in: int) -> int:
+        """OrbitalPool.getAmountOut."""
+        count = len(self.reserves)
+        if token_in >= count or token_out >= count:
+            raise Revert("Invalid token index")
+        if token_in == token_out:
+            raise Revert("Same token")
+        amount_in = (
+            _mul(amount_in, _sub(FEE_DENOMINATOR, self.swap_fee)) // FEE_DENOMINATOR
+        )
+        return self._swap_output(token_in, token_out, amount_in)
+
+    def amounts_out(self, trades: Sequence[Tuple[int, int, int]]) -> List[Optional[int]]:
+        """
+        amount_out for many (token_in, token_out, amount_in) on this state.
+
+        Returns:
+            list: Output per trade, or None where getAmountOut would revert
+        """
+        outputs: List[Optional[int]] = []
+        for token_in, token_out, amount_in in trades:
+            try:
+                outputs.append(self.amount_out(token_in, token_out, amount_in))
+            except OrbitalMathError:
+                outputs.append(None)
+        return outputs
+
+    def amount_in(self, token_in: int, token_out: int, amount_out: int) -> Optional[int]:
+        """
+        Smallest amountIn for which getAmountOut returns at least amount_out.
+
+        Solved in closed form on the same sphere, rounding the way getAmountOut does:
+        its floored square root reaches diffOut + amount_out exactly when the radicand
+        does, so the new input distance is the floored square root of what is left.
+
+        Returns:
+            int: Required input, fee included, or None if the pool cannot pay amount_out
+        """
+        count = len(self.reserves)
+        if token_in >= count or token_out >= count:
+            raise Revert("Invalid token index")
+        if token_in == token_out:
+            raise Revert("Same token")
+
+        radius = self.radius
+        reserve_in = self.reserves[token_in]
+        reserve_out = self.reserves[token_out]
+        if reserve_in >= radius or reserve_out > radius:
+            return None
+        diff_in = radius - reserve_in
+        diff_out = radius - reserve_out
+        target = diff_out + amount_out
+        left = diff_in * diff_in + diff_out * diff_out - target * target
+        new_diff_in = sqrt(left) if left > 0 else 0
+        if new_diff_in == 0 or self.swap_fee >= FEE_DENOMINATOR:
+            return None
+        net_in = max(diff_in - new_diff_in, 0)
+        fee_factor = FEE_DENOMINATOR - self.swap_fee
+        return -(-net_in * FEE_DENOMINATOR // fee_factor)
+
+    def _swap_output(self, token_in: int, token_out: int, amount_in: int) -> int:
+        """OrbitalPool._calculateSwapOutput."""
+        radius = self.radius
+        reserve_in = self.reserves[token_in]
+        reserve_out = self.reserves[token_out]
+        new_reserve_in = _add(reserve_in, amount_in)
+        if new_reserve_in >= radius or reserve_out > radius:
+            raise Revert("Insufficient liquidity")
+
+        diff_in = radius - reserve_in
+        new_diff_in = radius - new_reserve_in
+        diff_out = radius - reserve_out
+        new_diff_out = sqrt(
+            _sub(
+                _add(_mul(diff_out, diff_out), _mul(diff_in, diff_in)),
+                _mul(new_diff_in, new_diff_in),
+            )
+        )
+        return _sub(new_diff_out, diff_out)
+
+
+# ============ Differential corpus ============
+
+
+def _call(fn: str, args: List[Any]) -> Any:
+    if fn == "sqrt":
+        return sqrt(args[0])
+    if fn == "nthRoot":
+        return nth_root(*args)
+    if fn == "sumSquaredDifferences":
+        return sum_squared_differences(*args)
+    if fn == "calculateSwapOutputMulti":
+        return calculate_swap_output_multi(*args)
+    if fn == "calculatePrice":
+        return calculate_price(*args)
+    if fn == "calculateLPTokensToMint":
+        return calculate_lp_tokens_to_mint(*args)
+    if fn == "getAmountOut":
+        reserves, token_in, token_out, amount_in, swap_fee = args
+        return PoolState(reserves, swap_fee).amount_out(token_in, token_out, amount_in)
+    raise KeyError(fn)
+
+
+def _parse(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_parse(item) for item in value]
+    return int(value)
+
+
+def _outcome(fn: str, args: List[Any]) -> str:
+    """Result as the corpus records it: the decimal value or the revert name."""
+    try:
+        return str(_call(fn, args))
+    except Panic as e:
+        return f"Panic({e.code})"
+    except Revert:
+        return "Error"
+    except OrbitalMathError as e:
+        return type(e).__name__
+
+
+def replay(path: str) -> List[Dict[str, Any]]:
+    """
+    Check every corpus case against the port, and the batched calls against the scalar ones.
+
+    Returns:
+        list: The mismatching cases, each with the port's outcome under 'got'
+    """
+    mismatches = []
+    with open(path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            args = _parse(case["args"])
+            got = _outcome(case["fn"], args)
+            if case["fn"] == "calculateSwapOutputMulti":
+                [batched] = swap_outputs_multi(args[0], [tuple(args[1:4])], *args[4:])
+                expected = int(case["out"]) if case["out"].isdigit() else None
+                if batched != expected:
+                    got = f"batched {batched}"
+            if got != case["out"]:
+                mismatches.append({**case, "got": got})
+    return mismatches
+
+
+if __name__ == "__main__":
+    failures = replay(sys.argv[1])
+    for failure in failures[:20]:
+        print(json.dumps(failure))
+    print(f"{len(failures)} mismatches")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,512 @@
+"""
+Cross-chain payment tracker: where a payment is between the source-chain swap and the
+destination mint.
+
+A CCTP payment (SourceChainSwapAndBridge.swapAndBridge) goes submitted -> burned (the
+source receipt carries DepositForBurn and MessageSent) -> attested (Circle's
+attestation service has signed the message) -> minted (MessageReceived on the
+destination MessageTransmitter). A LayerZero OFT payment goes submitted -> sent
+(OFTSent) -> minted (OFTReceived with the same guid on the destination chain).
+
+One polling loop advances every payment at once: a JSON-RPC batch of receipts per
+source chain, one eth_getLogs per destination chain covering every payment waiting
+there, and concurrent attestation lookups. Payments live in the shared store
+(services.store), so any worker can register one or stream its status; each round is
+run by whichever worker takes the round's lease.
+"""
+
+import asyncio
+import dataclasses
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
+import requests
+from src import metrics
+from src.configs import bridge_configs
+from src.services import store
+
+CCTP = "cctp"
+LAYERZERO = "layerzero"
+
+# Stages in order for each kind of payment; FAILED can end a payment at any stage.
+STAGES = {
+    CCTP: ("submitted", "burned", "attested", "minted"),
+    LAYERZERO: ("submitted", "sent", "minted"),
+}
+MINTED = "minted"
+FAILED = "failed"
+
+# JSON-RPC calls per batch request; public endpoints reject larger batches.
+RPC_BATCH_SIZE = 100
+
+TX_HASH = re.compile(r"^0x[0-9a-fA-F]{64}$")
+
+
+def _decode(types: List[str], data: bytes) -> Tuple:
+    # eth_abi is imported with the first log decoded rather than at start-up.
+    from eth_abi import decode
+
+    return decode(types, data)
+
+
+def _keccak(data: bytes) -> bytes:
+    from eth_utils import keccak
+
+    return keccak(data)
+
+
+# Event topics (keccak of the signature), written out so start-up needs no keccak.
+# CCTP v1 TokenMessenger / MessageTransmitter
+# DepositForBurn(uint64,address,uint256,address,bytes32,uint32,bytes32,bytes32)
+DEPOSIT_FOR_BURN = "0x2fa9ca894982930190727e75500a97d8dc500233a5065e0f3126c48fbe0343c0"
+# MessageSent(bytes)
+MESSAGE_SENT = "0x8c5261668696ce22758910d05bab8f186d6eb247ceac2af2e82c7dc17669b036"
+# MessageReceived(address,uint32,uint64,bytes32,bytes)
+MESSAGE_RECEIVED = "0x58200b4c34ae05ee816d710053fff3fb75af4395915d3d2a771b24aa10e3cc5d"
+# LayerZero OFT / OFTAdapter
+# OFTSent(bytes32,uint32,address,uint256,uint256)
+OFT_SENT = "0x85496b760a4b7f8d66384b9df21b381f5d1b1e79f229a47aaf4c232edc2fe59a"
+# OFTReceived(bytes32,uint32,address,uint256)
+OFT_RECEIVED = "0xefed6d3500546b29533b128a29e3a94d70788727f0507505ac12eaf2e578fd9c"
+
+
+@dataclass
+class Payment:
+    id: str
+    kind: str
+    source_chain: str
+    tx_hash: str
+    created: float
+    updated: float
+    stage: str = "submitted"
+    destination_chain: Optional[str] = None
+    amount: Optional[int] = None
+    recipient: Optional[str] = None
+    nonce: Optional[int] = None  # CCTP burn nonce, unique per source domain
+    message: Optional[bytes] = None  # CCTP message, relayed with the attestation
+    message_hash: Optional[str] = None
+    attestation: Optional[str] = None
+    guid: Optional[str] = None  # LayerZero message guid
+    destination_tx: Optional[str] = None
+    scanned_to: Optional[int] = None  # Last destination block searched for the mint
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.stage in (MINTED, FAILED)
+
+
+# Identifies this worker's hold on a polling round's lease.
+_WORKER = f"{os.getpid()}:{uuid.uuid4().hex}"
+
+
+def _to_state(payment: Payment) -> Dict[str, Any]:
+    state = dataclasses.asdict(payment)
+    state["message"] = payment.message.hex() if payment.message is not None else None
+    return state
+
+
+def _from_state(state: Dict[str, Any]) -> Payment:
+    payment = Payment(**state)
+    if payment.message is not None:
+        payment.message = bytes.fromhex(state["message"])
+    return payment
+
+
+async def _save(payment: Payment):
+    # The transaction index is refreshed with the payment, so both expire together.
+    ttl = bridge_configs.RETENTION_SECONDS
+    await store.put(store.PAYMENT, payment.id, _to_state(payment), ttl)
+    await store.put(
+        store.PAYMENT_TX, f"{payment.source_chain}:{payment.tx_hash}", payment.id, ttl
+    )
+
+
+async def register(kind: str, source_chain: str, tx_hash: str) -> Payment:
+    """
+    Start following a payment from its source-chain transaction.
+
+    Registering the same transaction again, on any worker, returns the payment
+    already tracked.
+
+    Raises:
+        ValueError: If the kind or chain is unknown or the hash is malformed
+    """
+    if kind not in STAGES:
+        raise ValueError(f"Unknown payment kind {kind!r}")
+    if source_chain not in bridge_configs.CHAINS:
+        raise ValueError(f"Unknown chain {source_chain!r}")
+    if not TX_HASH.match(tx_hash):
+        raise ValueError("Malformed transaction hash")
+
+    now = time.time()
+    payment = Payment(uuid.uuid4().hex, kind, source_chain, tx_hash.lower(), now, now)
+    key = f"{source_chain}:{payment.tx_hash}"
+    ttl = bridge_configs.RETENTION_SECONDS
+    # The payment is stored before its index entry, so an indexed payment can be read.
+    await store.put(store.PAYMENT, payment.id, _to_state(payment), ttl)
+    if await store.add(store.PAYMENT_TX, key, payment.id, ttl):
+        return payment
+
+    await store.delete(store.PAYMENT, payment.id)
+    existing = await get(await store.get(store.PAYMENT_TX, key) or "")
+    if existing is not None:
+        return existing
+    # The indexed payment has just expired
+    await _save(payment)
+    return payment
+
+
+async def get(payment_id: str) -> Optional[Payment]:
+    state = await store.get(store.PAYMENT, payment_id)
+    return _from_state(state) if state is not None else None
+
+
+def payment_to_dict(payment: Payment) -> Dict[str, Any]:
+    """Serialize a payment's status; amounts in the token's smallest unit."""
+    return {
+        "id": payment.id,
+        "kind": payment.kind,
+        "stage": payment.stage,
+        "stages": list(STAGES[payment.kind]),
+        "sourceChain": payment.source_chain,
+        "txHash": payment.tx_hash,
+        "destinationChain": payment.destination_chain,
+        "amount": str(payment.amount) if payment.amount is not None else None,
+        "recipient": payment.recipient,
+        "nonce": payment.nonce,
+        "message": "0x" + payment.message.hex() if payment.message is not None else None,
+        "messageHash": payment.message_hash,
+        "attestation": payment.attestation,
+        "guid": payment.guid,
+        "destinationTx": payment.destination_tx,
+        "error": payment.error,
+        "updatedAt": int(payment.updated),
+    }
+
+
+async def event_stream(payment: Payment) -> AsyncIterator[bytes]:
+    """
+    Server-sent events: the payment's status now and after every change, until it is
+    minted or has failed (or has expired from the store).
+
+    Changes are read back from the shared store every STREAM_POLL_SECONDS, since the
+    worker advancing the payment need not be the one serving the stream.
+    """
+    body = payment_to_dict(payment)
+    yield b"data: " + orjson.dumps(body) + b"\n\n"
+    idle = 0.0
+    while body["stage"] not in (MINTED, FAILED):
+        await asyncio.sleep(bridge_configs.STREAM_POLL_SECONDS)
+        current = await get(payment.id)
+        if current is None:
+            return
+        latest = payment_to_dict(current)
+        if latest != body:
+            body = latest
+            idle = 0.0
+            yield b"data: " + orjson.dumps(body) + b"\n\n"
+            continue
+        idle += bridge_configs.STREAM_POLL_SECONDS
+        if idle >= bridge_configs.STREAM_KEEPALIVE_SECONDS:
+            idle = 0.0
+            yield b": keepalive\n\n"
+
+
+def _advance(payment: Payment, stage: str):
+    payment.stage = stage
+    payment.updated = time.time()
+
+
+def _fail(payment: Payment, error: str):
+    payment.error = error
+    _advance(payment, FAILED)
+
+
+# ============ Polling ============
+
+
+async def watch_payments():
+    """
+    Advance every pending payment once per bridge_configs.POLL_SECONDS. Every worker
+    runs this loop; the one that takes a round's lease polls the chains for it.
+    """
+    while True:
+        try:
+            if await store.add(store.LEASE, "payments", _WORKER, bridge_configs.POLL_SECONDS):
+                await poll()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Payment tracking failed: {e}")
+        await asyncio.sleep(bridge_configs.POLL_SECONDS)
+
+
+async def poll():
+    """One round of receipt, attestation and destination log checks for every payment."""
+    pending = [
+        payment
+        for payment in (_from_state(state) for _, state in await store.scan(store.PAYMENT))
+        if not payment.done
+    ]
+    before = {payment.id: _to_state(payment) for payment in pending}
+
+    sources: Dict[str, List[Payment]] = {}
+    destinations: Dict[str, List[Payment]] = {}
+    attesting = []
+    for payment in pending:
+        if payment.stage == "submitted":
+            sources.setdefault(payment.source_chain, []).append(payment)
+            continue
+        # The mint can land before the tracker sees the attestation (another relayer),
+        # so destinations are searched from the burn onwards.
+        destinations.setdefault(payment.destination_chain, []).append(payment)
+        if payment.stage == "burned":
+            attesting.append(payment)
+
+    results = await asyncio.gather(
+        *(_check_sources(chain, group) for chain, group in sources.items()),
+        *(_check_destinations(chain, group) for chain, group in destinations.items()),
+        _check_attestations(attesting),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Payment tracking failed: {result}")
+
+    # Stage changes and destination search progress
+    for payment in pending:
+        if _to_state(payment) != before[payment.id]:
+            await _save(payment)
+
+
+async def _check_sources(chain: str, group: List[Payment]):
+    receipts = await asyncio.to_thread(
+        _rpc_batch,
+        chain,
+        [("eth_getTransactionReceipt", [payment.tx_hash]) for payment in group],
+    )
+    now = time.time()
+    for payment, receipt in zip(group, receipts):
+        if receipt is None:
+            if now - payment.created > bridge_configs.SOURCE_TIMEOUT_SECONDS:
+                _fail(payment, "Source transaction not found")
+        elif int(receipt["status"], 16) != 1:
+            _fail(payment, "Source transaction reverted")
+        elif payment.kind == CCTP:
+            _read_burn(payment, receipt["logs"])
+        else:
+            _read_oft_send(payment, receipt["logs"])
+
+
+def _read_burn(payment: Payment, logs: List[Dict[str, Any]]):
+    chain = bridge_configs.CHAINS[payment.source_chain]
+    burn = _find_log(logs, DEPOSIT_FOR_BURN, chain.get("token_messenger"))
+    sent = _find_log(logs, MESSAGE_SENT, chain.get("message_transmitter"))
+    if burn is None or sent is None:
+        _fail(payment, "No CCTP burn in the source transaction")
+        return
+
+    amount, mint_recipient, domain, _, _ = _decode(
+        ["uint256", "bytes32", "uint32", "bytes32", "bytes32"], _data(burn)
+    )
+    destination = _chain_with("cctp_domain", domain)
+    if destination is None:
+        _fail(payment, f"Unknown CCTP destination domain {domain}")
+        return
+
+    (message,) = _decode(["bytes"], _data(sent))
+    payment.nonce = int(burn["topics"][1], 16)
+    payment.amount = amount
+    payment.recipient = "0x" + mint_recipient[-20:].hex()
+    payment.message = message
+    payment.message_hash = "0x" + _keccak(message).hex()
+    payment.destination_chain = destination
+    _advance(payment, "burned")
+
+
+def _read_oft_send(payment: Payment, logs: List[Dict[str, Any]]):
+    sent = _find_log(logs, OFT_SENT, bridge_configs.CHAINS[payment.source_chain].get("oft"))
+    if sent is None:
+        _fail(payment, "No OFT send in the source transaction")
+        return
+
+    eid, _, amount_received = _decode(["uint32", "uint256", "uint256"], _data(sent))
+    destination = _chain_with("lz_eid", eid)
+    if destination is None:
+        _fail(payment, f"Unknown LayerZero endpoint {eid}")
+        return
+
+    payment.guid = sent["topics"][1]
+    payment.amount = amount_received
+    payment.destination_chain = destination
+    _advance(payment, "sent")
+
+
+async def _check_attestations(group: List[Payment]):
+    semaphore = asyncio.Semaphore(bridge_configs.ATTESTATION_CONCURRENCY)
+
+    async def check(payment: Payment):
+        async with semaphore:
+            try:
+                body = await asyncio.to_thread(_fetch_attestation, payment.message_hash)
+            except requests.RequestException as e:
+                print(f"Attestation lookup failed for {payment.message_hash}: {e}")
+                return
+        # The destination search may have seen the mint in the meantime.
+        if body is not None and body.get("status") == "complete" and payment.stage == "burned":
+            payment.attestation = body["attestation"]
+            _advance(payment, "attested")
+
+    await asyncio.gather(*(check(payment) for payment in group))
+
+
+def _fetch_attestation(message_hash: str) -> Optional[Dict[str, Any]]:
+    response = requests.get(
+        f"{bridge_configs.ATTESTATION_URL}/v1/attestations/{message_hash}", timeout=10
+    )
+    # Not seen yet: the burn is still waiting for block confirmations
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+async def _check_destinations(chain: str, group: List[Payment]):
+    """
+    Look for the mints of every payment bound for one chain, with one log query per
+    kind over the blocks not searched yet.
+    """
+    config = bridge_configs.CHAINS[chain]
+    cctp = [p for p in group if p.kind == CCTP and p.scanned_to is not None]
+    oft = [p for p in group if p.kind == LAYERZERO and p.scanned_to is not None]
+
+    calls = [("eth_blockNumber", [])]
+    queries = []
+    if cctp:
+        nonces = sorted({"0x" + p.nonce.to_bytes(32, "big").hex() for p in cctp})
+        calls.append(
+            _get_logs(
+                config.get("message_transmitter"),
+                min(p.scanned_to for p in cctp) + 1,
+                [MESSAGE_RECEIVED, None, nonces],
+            )
+        )
+        queries.append((cctp, _match_cctp_mint))
+    if oft:
+        guids = sorted({p.guid for p in oft})
+        calls.append(
+            _get_logs(config.get("oft"), min(p.scanned_to for p in oft) + 1, [OFT_RECEIVED, guids])
+        )
+        queries.append((oft, _match_oft_receive))
+
+    results = await asyncio.to_thread(_rpc_batch, chain, calls)
+    if results[0] is None:
+        return
+    head = int(results[0], 16)
+
+    for (payments, match), logs in zip(queries, results[1:]):
+        if logs is None:
+            continue
+        match(payments, logs)
+        for payment in payments:
+            payment.scanned_to = head
+    for payment in group:
+        if payment.scanned_to is None:
+            payment.scanned_to = max(head - bridge_configs.LOG_LOOKBACK_BLOCKS, -1)
+
+
+def _match_cctp_mint(group: List[Payment], logs: List[Dict[str, Any]]):
+    # Nonces are only unique per source domain
+    by_nonce = {
+        (bridge_configs.CHAINS[p.source_chain]["cctp_domain"], p.nonce): p for p in group
+    }
+    for log in logs:
+        source_domain, _, _ = _decode(["uint32", "bytes32", "bytes"], _data(log))
+        payment = by_nonce.get((source_domain, int(log["topics"][2], 16)))
+        if payment is not None and not payment.done:
+            payment.destination_tx = log["transactionHash"]
+            _advance(payment, MINTED)
+
+
+def _match_oft_receive(group: List[Payment], logs: List[Dict[str, Any]]):
+    by_guid = {p.guid: p for p in group}
+    for log in logs:
+        payment = by_guid.get(log["topics"][1])
+        if payment is not None and not payment.done:
+            payment.recipient = "0x" + log["topics"][2][-40:]
+            payment.destination_tx = log["transactionHash"]
+            _advance(payment, MINTED)
+
+
+# ============ Helpers ============
+
+
+def _chain_with(field: str, value: int) -> Optional[str]:
+    for name, config in bridge_configs.CHAINS.items():
+        if config.get(field) == value:
+            return name
+    return None
+
+
+def _find_log(
+    logs: List[Dict[str, Any]], topic: str, address: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """First log with the event topic, from `address` if one is configured."""
+    for log in logs:
+        if not log["topics"] or log["topics"][0] != topic:
+            continue
+        if address and log["address"].lower() != address.lower():
+            continue
+        return log
+    return None
+
+
+def _data(log: Dict[str, Any]) -> bytes:
+    return bytes.fromhex(log["data"][2:])
+
+
+def _get_logs(address: Optional[str], from_block: int, topics: List[Any]) -> Tuple[str, list]:
+    query: Dict[str, Any] = {"fromBlock": hex(from_block), "toBlock": "latest", "topics": topics}
+    if address:
+        query["address"] = address
+    return "eth_getLogs", [query]
+
+
+def _rpc_batch(chain: str, calls: List[Tuple[str, list]]) -> List[Any]:
+    """
+    Send JSON-RPC calls to a chain as batch requests of up to RPC_BATCH_SIZE.
+
+    Returns:
+        list: Each call's result, or None if the node answered it with an error
+    """
+    results: List[Any] = []
+    for start in range(0, len(calls), RPC_BATCH_SIZE):
+        chunk = calls[start : start + RPC_BATCH_SIZE]
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(chunk)
+        ]
+        t0 = time.perf_counter()
+        failed = True
+        try:
+            response = requests.post(
+                bridge_configs.CHAINS[chain]["rpc"], json=payload, timeout=10
+            )
+            response.raise_for_status()
+            by_id = {item.get("id"): item for item in response.json()}
+            failed = False
+        finally:
+            metrics.observe_rpc(
+                chain,
+                metrics.batch_label(method for method, _ in chunk),
+                time.perf_counter() - t0,
+                failed,
+            )
+        results.extend(by_id.get(i, {}).get("result") for i in range(len(chunk)))
+    return results
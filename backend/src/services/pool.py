@@ -0,0 +1,758 @@
+"""
+Off-chain model of an Orbital pool (the design behind onchain/src/OrbitalPool.sol).
+
+Amounts are floats in whole tokens. A tick of radius r is the sphere around
+(r, ..., r) capped by the plane x·v = k, with v = (1, ..., 1)/√n the equal price
+vector. Interior ticks consolidate into one sphere whose radius is the sum of
+theirs; boundary ticks into a circle in their plane, so a pool of any number of
+ticks is quoted with the torus invariant
+
+    (x·v - k_bound - r_int·√n)² + (‖w‖ - s_bound)² = r_int²
+
+where w is the part of the total reserves orthogonal to v.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Callable, List, Optional, Sequence, Tuple
+
+FEE_DENOMINATOR = 10000
+
+# Root finding stops once the bracket is this small relative to the amounts involved.
+TOLERANCE = 1e-12
+MAX_ITERATIONS = 100
+
+
+def k_bounds(radius: float, token_count: int) -> Tuple[float, float]:
+    """Valid plane constants for a tick: k_min = r(√n-1), k_max = r(n-1)/√n."""
+    sqrt_n = math.sqrt(token_count)
+    return radius * (sqrt_n - 1), radius * (token_count - 1) / sqrt_n
+
+
+def equal_price_reserve(radius: float, token_count: int) -> float:
+    """Per-token reserve of a tick at the equal price point: r(1 - 1/√n)."""
+    return radius * (1 - 1 / math.sqrt(token_count))
+
+
+def boundary_radius(radius: float, plane_constant: float, token_count: int) -> float:
+    """Radius s of the circle a tick is confined to once its reserves reach the plane."""
+    offset = plane_constant - radius * math.sqrt(token_count)
+    return math.sqrt(max(radius * radius - offset * offset, 0.0))
+
+
+def depeg_price_to_k(depeg_price: float, radius: float, token_count: int) -> float:
+    """
+    Plane constant of a tick that reaches its boundary when one token trades at depeg_price.
+
+    On the tick sphere, the point where one token is priced at p against the others has
+    r - x = u(p, 1, ..., 1) with u = r/√(p² + n - 1); k is that point's projection x·v.
+    """
+    u = radius / math.sqrt(depeg_price * depeg_price + token_count - 1)
+    return (token_count * radius - u * (token_count - 1 + depeg_price)) / math.sqrt(
+        token_count
+    )
+
+
+def tick_from_capital(
+    capital: float, depeg_price: float, token_count: int
+) -> Tuple[float, float]:
+    """
+    (radius, k) of a balanced deposit, as OrbitalPool.addLiquidity(capital, depegTolerance) sets them.
+
+    The capital is split evenly and placed at the equal price point, so
+    r = (capital/n) / (1 - 1/√n).
+    """
+    radius = capital / token_count / (1 - 1 / math.sqrt(token_count))
+    return radius, depeg_price_to_k(depeg_price, radius, token_count)
+
+
+def capital_efficiency(radius: float, plane_constant: float, token_count: int) -> float:
+    """
+    Liquidity of a tick relative to a full sphere holding the same capital.
+
+    The tick never holds less than x_min of any token (its virtual reserve), so only
+    x_base - x_min of each token at the equal price point is actually at risk.
+    """
+    sqrt_n = math.sqrt(token_count)
+    base = equal_price_reserve(radius, token_count)
+    s = boundary_radius(radius, plane_constant, token_count)
+    x_min = plane_constant / sqrt_n - s * math.sqrt((token_count - 1) / token_count)
+    at_risk = base - max(x_min, 0.0)
+    return base / at_risk if at_risk > 0 else math.inf
+
+
+def _solve(
+    f: Callable[[float], float], lo: float, hi: float, f_lo: float, f_hi: float
+) -> Tuple[float, float]:
+    """
+    Bracketing root finder (Illinois variant of regula falsi).
+
+    Returns:
+        Tuple (lo, hi) around the root, with f(lo) and f(hi) of opposite signs
+    """
+    side = 0
+    scale = max(abs(lo), abs(hi), 1.0)
+    for _ in range(MAX_ITERATIONS):
+        if hi - lo <= TOLERANCE * scale:
+            break
+        x = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        if not lo < x < hi:
+            x = (lo + hi) / 2
+        fx = f(x)
+        if fx == 0:
+            return x, x
+        if (fx < 0) == (f_lo < 0):
+            if abs(x - lo) <= TOLERANCE * scale:
+                # Stalled on this side; bisect instead.
+                x = (x + hi) / 2
+                fx = f(x)
+                if (fx < 0) != (f_lo < 0):
+                    hi, f_hi = x, fx
+                    continue
+            lo, f_lo = x, fx
+            if side == -1:
+                f_hi /= 2
+            side = -1
+        else:
+            if abs(hi - x) <= TOLERANCE * scale:
+                x = (lo + x) / 2
+                fx = f(x)
+                if (fx < 0) == (f_lo < 0):
+                    lo, f_lo = x, fx
+                    continue
+            hi, f_hi = x, fx
+            if side == 1:
+                f_lo /= 2
+            side = 1
+    return lo, hi
+
+
+@dataclass(frozen=True)
+class TorusState:
+    """
+    Consolidated pool: total reserves plus the interior sphere and boundary circle.
+
+    Immutable, so routers and simulations can branch from a snapshot freely.
+    """
+
+    reserves: Tuple[float, ...]
+    interior_radius: float
+    boundary_constant: float = 0.0
+    boundary_radius: float = 0.0
+    fee_bps: int = 30
+
+    @property
+    def token_count(self) -> int:
+        return len(self.reserves)
+
+    def _residual(self, total: float, sum_squares: float) -> float:
+        """Torus invariant minus r_int² for reserves with the given sum and sum of squares."""
+        n = self.token_count
+        sqrt_n = math.sqrt(n)
+        projection = total / sqrt_n
+        orthogonal = math.sqrt(max(sum_squares - total * total / n, 0.0))
+        a = projection - self.boundary_constant - self.interior_radius * sqrt_n
+        b = orthogonal - self.boundary_radius
+        return a * a + b * b - self.interior_radius * self.interior_radius
+
+    def invariant(self) -> float:
+        """Residual of the torus invariant; zero for a consistent state."""
+        return self._residual(sum(self.reserves), sum(x * x for x in self.reserves))
+
+    def interior_projection(self) -> float:
+        """(x·v - k_bound) / r_int: interior ticks with k/r at or below this are on their boundary."""
+        if self.interior_radius == 0:
+            return math.inf
+        projection = sum(self.reserves) / math.sqrt(self.token_count)
+        return (projection - self.boundary_constant) / self.interior_radius
+
+    @cached_property
+    def gradients(self) -> Tuple[float, ...]:
+        """Partial derivatives of the invariant (halved); prices are their ratios."""
+        n = self.token_count
+        sqrt_n = math.sqrt(n)
+        total = sum(self.reserves)
+        mean = total / n
+        sum_squares = sum(x * x for x in self.reserves)
+        orthogonal = math.sqrt(max(sum_squares - total * total / n, 0.0))
+        a = total / sqrt_n - self.boundary_constant - self.interior_radius * sqrt_n
+        if orthogonal == 0:
+            return (a / sqrt_n,) * n
+        scale = (orthogonal - self.boundary_radius) / orthogonal
+        return tuple(a / sqrt_n + scale * (x - mean) for x in self.reserves)
+
+    def spot_price(self, token_in: int, token_out: int) -> float:
+        """Units of token_out paid per unit of token_in at the margin, before fees."""
+        return self.gradients[token_in] / self.gradients[token_out]
+
+    def marginal_rate(self, token_in: int, token_out: int) -> float:
+        """Units of token_out received per unit of token_in at the margin, after fees."""
+        fee_factor = (FEE_DENOMINATOR - self.fee_bps) / FEE_DENOMINATOR
+        return self.spot_price(token_in, token_out) * fee_factor
+
+    def _net(self, amount_in: float) -> float:
+        return amount_in * (FEE_DENOMINATOR - self.fee_bps) / FEE_DENOMINATOR
+
+    def _solve_out(self, token_in: int, token_out: int, net_in: float) -> Optional[float]:
+        x_in = self.reserves[token_in]
+        x_out = self.reserves[token_out]
+        total = sum(self.reserves) + net_in
+        sum_squares = (
+            sum(x * x for x in self.reserves) + (x_in + net_in) ** 2 - x_in * x_in
+        )
+        base_squares = sum_squares - x_out * x_out
+
+        def residual(out: float) -> float:
+            return self._residual(total - out, base_squares + (x_out - out) ** 2)
+
+        f_lo = residual(0.0)
+        if f_lo >= 0:
+            return 0.0
+        f_hi = residual(x_out)
+        if f_hi < 0:
+            return None
+        lo, _ = _solve(residual, 0.0, x_out, f_lo, f_hi)
+        return lo
+
+    def quote(self, token_in: int, token_out: int, amount_in: float) -> float:
+        """
+        Output of swapping amount_in (fee included) of token_in for token_out.
+
+        Raises:
+            ValueError: If the pool cannot fill the trade
+        """
+        if token_in == token_out:
+            raise ValueError("Same token")
+        if amount_in <= 0:
+            return 0.0
+        amount_out = self._solve_out(token_in, token_out, self._net(amount_in))
+        if amount_out is None:
+            raise ValueError("Insufficient liquidity")
+        return amount_out
+
+    def quote_in(self, token_in: int, token_out: int, amount_out: float) -> Optional[float]:
+        """Input (fee included) needed to receive amount_out, or None if the pool cannot."""
+        if token_in == token_out:
+            raise ValueError("Same token")
+        if amount_out <= 0:
+            return 0.0
+        x_in = self.reserves[token_in]
+        x_out = self.reserves[token_out]
+        if amount_out >= x_out:
+            return None
+        total = sum(self.reserves) - amount_out
+        base_squares = (
+            sum(x * x for x in self.reserves) - x_in * x_in - x_out * x_out
+        ) + (x_out - amount_out) ** 2
+
+        def residual(net_in: float) -> float:
+            return -self._residual(total + net_in, base_squares + (x_in + net_in) ** 2)
+
+        f_lo = residual(0.0)
+        if f_lo >= 0:
+            return 0.0
+        hi = max(amount_out, 1e-9)
+        f_hi = residual(hi)
+        while f_hi < 0:
+            hi *= 2
+            if hi > 1e6 * (x_out + amount_out):
+                return None
+            f_hi = residual(hi)
+        _, net_in = _solve(residual, 0.0, hi, f_lo, f_hi)
+        return net_in * FEE_DENOMINATOR / (FEE_DENOMINATOR - self.fee_bps)
+
+    def apply(
+        self, token_in: int, token_out: int, amount_in: float
+    ) -> Tuple[float, "TorusState"]:
+        """Quote a trade and return (amount_out, state after the trade). Fees leave the reserves."""
+        if token_in == token_out:
+            raise ValueError("Same token")
+        return self.apply_net(token_in, token_out, self._net(amount_in))
+
+    def apply_net(
+        self, token_in: int, token_out: int, net_in: float
+    ) -> Tuple[float, "TorusState"]:
+        """apply() for an input the fee has already been taken from."""
+        if net_in <= 0:
+            return 0.0, self
+        amount_out = self._solve_out(token_in, token_out, net_in)
+        if amount_out is None:
+            raise ValueError("Insufficient liquidity")
+        reserves = list(self.reserves)
+        reserves[token_in] += net_in
+        reserves[token_out] -= amount_out
+        return amount_out, replace(self, reserves=tuple(reserves))
+
+
+def fit_reserves(reserves: Sequence[float], fee_bps: int = 30) -> Optional[TorusState]:
+    """
+    Model live reserves as a single interior sphere through them.
+
+    Used when only the total reserves of a deployed pool are known: the sphere around
+    (r, ..., r) through x has r = (Σx + √((Σx)² - (n-1)Σx²)) / (n-1).
+
+    Returns:
+        TorusState, or None if the reserves are too unbalanced for any such sphere
+    """
+    n = len(reserves)
+    total = sum(reserves)
+    sum_squares = sum(x * x for x in reserves)
+    discriminant = total * total - (n - 1) * sum_squares
+    if n < 2 or total <= 0 or discriminant < 0:
+        return None
+    radius = (total + math.sqrt(discriminant)) / (n - 1)
+    return TorusState(tuple(float(x) for x in reserves), radius, fee_bps=fee_bps)
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Part of a trade priced on one consolidated state, between two tick crossings."""
+
+    net_in: float  # Net input traded before the segment
+    amount_out: float  # Output received before the segment
+    state: TorusState  # Pool state at the start of the segment
+    length: float  # Net input the segment covers
+    crossing: int  # -1 / 0 / +1: tick crossing down / none / up at its end
+
+
+# OrbitalPool.checkpoint(): reserves, fees, boundary tick count and consolidated aggregates.
+Checkpoint = Tuple[List[float], List[float], int, float, float, float]
+
+
+@dataclass
+class Tick:
+    """One LP position: a sphere of radius r capped by the plane x·v = k."""
+
+    radius: float
+    plane_constant: float
+    owner: str = ""
+    is_interior: bool = True
+    active: bool = True
+
+    @property
+    def normalized_boundary(self) -> float:
+        return self.plane_constant / self.radius
+
+
+class OrbitalPool:
+    """
+    Mutable pool made of LP ticks, mirroring OrbitalPool.sol's bookkeeping.
+
+    Ticks are kept sorted by normalized boundary k/r. A tick is on its boundary exactly
+    when the interior projection (TorusState.interior_projection) has reached its k/r,
+    so the boundary ticks are always a prefix of that order and the consolidated state
+    is maintained incrementally as the split point moves. Swaps are cut into segments
+    at every crossing, so the invariant holds exactly across tick state changes.
+
+    Per-tick reserves are never stored: quotes and swaps only touch the consolidated
+    state, and tick_reserves expands it for a single tick when asked.
+    """
+
+    def __init__(self, token_count: int, fee_bps: int = 30, symbols: Sequence[str] = ()):
+        if token_count < 2:
+            raise ValueError("Invalid token count")
+        self.token_count = token_count
+        self.fee_bps = fee_bps
+        self.symbols = list(symbols) or [str(i) for i in range(token_count)]
+        self.ticks: List[Tick] = []
+        self.reserves = [0.0] * token_count
+        self.fees = [0.0] * token_count
+
+        # Active ticks sorted by k/r; the first _split of them are on their boundary.
+        self._thresholds: List[float] = []
+        self._sorted_ticks: List[int] = []
+        self._split = 0
+        self._interior_radius = 0.0
+        self._boundary_constant = 0.0
+        self._boundary_radius = 0.0
+
+    def index(self, symbol: str) -> int:
+        return self.symbols.index(symbol)
+
+    def state(self) -> TorusState:
+        """The consolidated TorusState (no walk over ticks)."""
+        return TorusState(
+            tuple(self.reserves),
+            self._interior_radius,
+            self._boundary_constant,
+            self._boundary_radius,
+            self.fee_bps,
+        )
+
+    def _set_boundary(self, tick_index: int, on_boundary: bool):
+        tick = self.ticks[tick_index]
+        sign = 1 if on_boundary else -1
+        tick.is_interior = not on_boundary
+        self._interior_radius -= sign * tick.radius
+        self._boundary_constant += sign * tick.plane_constant
+        self._boundary_radius += sign * boundary_radius(
+            tick.radius, tick.plane_constant, self.token_count
+        )
+
+    def _cross_up(self):
+        """The interior projection reached the next threshold: those ticks hit their boundary."""
+        end = bisect_right(self._thresholds, self._thresholds[self._split])
+        for position in range(self._split, end):
+            self._set_boundary(self._sorted_ticks[position], True)
+        self._split = end
+
+    def _cross_down(self):
+        """The interior projection fell below the last threshold: those ticks leave their boundary."""
+        start = bisect_left(self._thresholds, self._thresholds[self._split - 1])
+        for position in range(start, self._split):
+            self._set_boundary(self._sorted_ticks[position], False)
+        self._split = start
+
+    def _direction(self) -> List[float]:
+        """Unit vector of the reserves' component orthogonal to the equal price vector."""
+        mean = sum(self.reserves) / self.token_count
+        w = [x - mean for x in self.reserves]
+        norm = math.sqrt(sum(c * c for c in w))
+        if norm == 0:
+            return [0.0] * self.token_count
+        return [c / norm for c in w]
+
+    def _boundary_reserves(self, tick: Tick, direction: Sequence[float]) -> List[float]:
+        s = boundary_radius(tick.radius, tick.plane_constant, self.token_count)
+        base = tick.plane_constant / math.sqrt(self.token_count)
+        return [base + s * d for d in direction]
+
+    def _interior_reserves(self) -> List[float]:
+        """Total reserves minus those of the boundary ticks."""
+        direction = self._direction()
+        base = self._boundary_constant / math.sqrt(self.token_count)
+        return [
+            x - base - self._boundary_radius * d for x, d in zip(self.reserves, direction)
+        ]
+
+    def tick_reserves(self, tick_index: int) -> List[float]:
+        """
+        Current reserves of one tick, expanded from the consolidated state.
+
+        Interior ticks hold the interior reserves pro rata to radius; boundary ticks sit
+        on their plane, displaced along the pool's orthogonal direction.
+
+        Raises:
+            ValueError: If the tick is not active
+        """
+        tick = self.ticks[tick_index]
+        if not tick.active:
+            raise ValueError("Tick not active")
+        if not tick.is_interior:
+            return self._boundary_reserves(tick, self._direction())
+        scale = tick.radius / self._interior_radius
+        return [x * scale for x in self._interior_reserves()]
+
+    def add_liquidity(self, radius: float, plane_constant: float, owner: str = "") -> int:
+        """
+        Add a tick at the pool's current prices.
+
+        Raises:
+            ValueError: If the plane constant is outside [k_min, k_max]
+        """
+        k_min, k_max = k_bounds(radius, self.token_count)
+        if radius <= 0 or not k_min <= plane_constant <= k_max:
+            raise ValueError("Invalid k value")
+
+        tick = Tick(radius, plane_constant, owner)
+        if self._interior_radius == 0:
+            if any(self.reserves):
+                raise ValueError("Pool has no interior liquidity")
+            reserves = [equal_price_reserve(radius, self.token_count)] * self.token_count
+        elif self.state().interior_projection() >= tick.normalized_boundary:
+            tick.is_interior = False
+            reserves = self._boundary_reserves(tick, self._direction())
+        else:
+            scale = radius / self._interior_radius
+            reserves = [x * scale for x in self._interior_reserves()]
+
+        self.ticks.append(tick)
+        tick_index = len(self.ticks) - 1
+        position = bisect_right(self._thresholds, tick.normalized_boundary)
+        if not tick.is_interior:
+            # Boundary ticks are a prefix of the sorted order.
+            position = min(position, self._split)
+        self._thresholds.insert(position, tick.normalized_boundary)
+        self._sorted_ticks.insert(position, tick_index)
+        if tick.is_interior:
+            self._interior_radius += radius
+        else:
+            self._split += 1
+            self._boundary_constant += plane_constant
+            self._boundary_radius += boundary_radius(radius, plane_constant, self.token_count)
+
+        for i, amount in enumerate(reserves):
+            self.reserves[i] += amount
+        return tick_index
+
+    def remove_liquidity(self, tick_index: int) -> List[float]:
+        """Deactivate a tick and return its reserves."""
+        reserves = self.tick_reserves(tick_index)
+        tick = self.ticks[tick_index]
+
+        position = bisect_left(self._thresholds, tick.normalized_boundary)
+        while self._sorted_ticks[position] != tick_index:
+            position += 1
+        del self._thresholds[position]
+        del self._sorted_ticks[position]
+        if tick.is_interior:
+            self._interior_radius -= tick.radius
+        else:
+            self._split -= 1
+            self._boundary_constant -= tick.plane_constant
+            self._boundary_radius -= boundary_radius(
+                tick.radius, tick.plane_constant, self.token_count
+            )
+
+        tick.active = False
+        for i, amount in enumerate(reserves):
+            self.reserves[i] -= amount
+        return reserves
+
+    def _crossing_input(
+        self,
+        state: TorusState,
+        token_in: int,
+        token_out: int,
+        lo: float,
+        hi: float,
+        threshold: float,
+    ) -> float:
+        """Net input in [lo, hi] at which the interior projection reaches threshold."""
+
+        def distance(net_in: float) -> float:
+            _, after = state.apply_net(token_in, token_out, net_in)
+            return after.interior_projection() - threshold
+
+        f_lo, f_hi = distance(lo), distance(hi)
+        if (f_lo < 0) == (f_hi < 0):
+            return lo if abs(f_lo) <= abs(f_hi) else hi
+        low, high = _solve(distance, lo, hi, f_lo, f_hi)
+        # Stop just short of the crossing so the segment never overshoots it.
+        return low if f_lo < 0 else high
+
+    def _turning_input(
+        self, state: TorusState, token_in: int, token_out: int, net_in: float
+    ) -> float:
+        """
+        Net input at which the two traded tokens reach the same reserve (and price).
+
+        The interior projection falls until then and rises after it.
+        """
+        x_in, x_out = state.reserves[token_in], state.reserves[token_out]
+        if x_in >= x_out:
+            return 0.0
+
+        def gap(amount: float) -> float:
+            out, _ = state.apply_net(token_in, token_out, amount)
+            return (x_in + amount) - (x_out - out)
+
+        f_hi = gap(net_in)
+        if f_hi <= 0:
+            return net_in
+        low, _ = _solve(gap, 0.0, net_in, x_in - x_out, f_hi)
+        return low
+
+    def _next_segment(
+        self, state: TorusState, token_in: int, token_out: int, net_in: float
+    ) -> Tuple[float, int]:
+        """
+        How much of net_in can trade before the next tick crossing.
+
+        Returns:
+            Tuple (net input of the segment, -1 / 0 / +1 for a crossing down / none / up)
+        """
+        lower = self._thresholds[self._split - 1] if self._split > 0 else -math.inf
+        upper = (
+            self._thresholds[self._split]
+            if self._split < len(self._thresholds)
+            else math.inf
+        )
+        turn = self._turning_input(state, token_in, token_out, net_in)
+        if turn > 0 and lower > -math.inf:
+            _, at_turn = state.apply_net(token_in, token_out, turn)
+            if at_turn.interior_projection() < lower:
+                return (
+                    self._crossing_input(state, token_in, token_out, 0.0, turn, lower),
+                    -1,
+                )
+        if upper < math.inf:
+            _, at_end = state.apply_net(token_in, token_out, net_in)
+            if at_end.interior_projection() >= upper:
+                return (
+                    self._crossing_input(state, token_in, token_out, turn, net_in, upper),
+                    1,
+                )
+        return net_in, 0
+
+    def swap(self, token_in: int, token_out: int, amount_in: float) -> float:
+        """
+        Execute a trade, segmented at every tick crossing.
+
+        Raises:
+            ValueError: If the pool cannot fill the trade
+        """
+        if token_in == token_out:
+            raise ValueError("Same token")
+        net_in = amount_in * (FEE_DENOMINATOR - self.fee_bps) / FEE_DENOMINATOR
+
+        saved = self.checkpoint()
+        try:
+            amount_out = self._execute(token_in, token_out, net_in)
+        except ValueError:
+            self.rollback(saved)
+            raise
+        self.fees[token_in] += amount_in - net_in
+        return amount_out
+
+    def trace(self, token_in: int, token_out: int, amount_in: float) -> List[Segment]:
+        """
+        Segments a trade would be cut into, without executing it.
+
+        A trade the pool cannot fill is traced up to the point where it fails, so the
+        segments also show how much the pool can take.
+        """
+        if token_in == token_out:
+            raise ValueError("Same token")
+        net_in = amount_in * (FEE_DENOMINATOR - self.fee_bps) / FEE_DENOMINATOR
+        saved = self.checkpoint()
+        segments: List[Segment] = []
+        try:
+            self._execute(token_in, token_out, net_in, segments)
+        except ValueError:
+            pass
+        finally:
+            self.rollback(saved)
+        return segments
+
+    def _execute(
+        self,
+        token_in: int,
+        token_out: int,
+        net_in: float,
+        segments: Optional[List[Segment]] = None,
+    ) -> float:
+        amount_out = 0.0
+        remaining = net_in
+        # A trade crosses each tick at most twice (down, then up past the turning point).
+        for _ in range(2 * len(self._thresholds) + 2):
+            state = self.state()
+            segment, crossing = self._next_segment(state, token_in, token_out, remaining)
+            out, after = state.apply_net(token_in, token_out, segment)
+            if segments is not None:
+                segments.append(
+                    Segment(net_in - remaining, amount_out, state, segment, crossing)
+                )
+            self.reserves = list(after.reserves)
+            amount_out += out
+            remaining -= segment
+            if crossing > 0:
+                if bisect_right(self._thresholds, self._thresholds[self._split]) == len(
+                    self._thresholds
+                ):
+                    # Every tick would be pinned to its boundary.
+                    raise ValueError("Insufficient liquidity")
+                self._cross_up()
+            elif crossing < 0:
+                self._cross_down()
+            if crossing == 0 or remaining <= TOLERANCE * net_in:
+                return amount_out
+        raise ValueError("Too many tick crossings")
+
+    def checkpoint(self) -> Checkpoint:
+        """Reserves, fees and tick states, for rollback after simulated swaps."""
+        return (
+            list(self.reserves),
+            list(self.fees),
+            self._split,
+            self._interior_radius,
+            self._boundary_constant,
+            self._boundary_radius,
+        )
+
+    def rollback(self, saved: Checkpoint):
+        """Return to a checkpoint. Ticks added or removed since are not undone."""
+        reserves, fees, split, *aggregates = saved
+        for position in range(min(split, self._split), max(split, self._split)):
+            self.ticks[self._sorted_ticks[position]].is_interior = position >= split
+        self.reserves = list(reserves)
+        self.fees = list(fees)
+        self._split = split
+        (
+            self._interior_radius,
+            self._boundary_constant,
+            self._boundary_radius,
+        ) = aggregates
+
+
+def fit_pool(
+    reserves: Sequence[float],
+    ticks: Sequence[Tuple[float, float]],
+    fee_bps: int = 30,
+    symbols: Sequence[str] = (),
+) -> Optional[OrbitalPool]:
+    """
+    Model live reserves as an OrbitalPool made of the given ticks.
+
+    Used when the total reserves and each tick's (radius, k) of a deployed pool are
+    known, but not which ticks are on their boundary. Taking the ticks in k/r order,
+    the first s are put on their boundary and the interior sphere is fitted through
+    what is left of the reserves, as fit_reserves does; the smallest s whose fitted
+    interior projection lands between the s-th and (s+1)-th k/r is the pool's split.
+    Interior ticks are then scaled to the fitted interior radius, keeping their k/r,
+    so the model sits exactly on the torus and crosses ticks where the pool would.
+
+    Without ticks, the pool is one interior tick spanning the whole sphere (k = k_max),
+    which never reaches its boundary: the same curve as fit_reserves.
+
+    Returns:
+        OrbitalPool, or None if the reserves fit no split of the ticks
+    """
+    n = len(reserves)
+    if n < 2 or sum(reserves) <= 0:
+        return None
+    sqrt_n = math.sqrt(n)
+    total = sum(reserves)
+    projection = total / sqrt_n
+    orthogonal = math.sqrt(max(sum(x * x for x in reserves) - total * total / n, 0.0))
+
+    ticks = sorted(ticks or [(1.0, k_bounds(1.0, n)[1])], key=lambda t: t[1] / t[0])
+    thresholds = [k / r for r, k in ticks]
+    interior_radii = [r for r, _ in ticks]
+    for position in range(len(ticks) - 2, -1, -1):
+        interior_radii[position] += interior_radii[position + 1]
+
+    boundary_constant = boundary_radius_ = 0.0
+    for split, (radius, plane_constant) in enumerate(ticks):
+        # (a - r√n)² + b² = r² for the interior radius r, taking the larger root.
+        a = projection - boundary_constant
+        b = orthogonal - boundary_radius_
+        discriminant = a * a - (n - 1) * b * b
+        if a > 0 and discriminant >= 0:
+            fitted = (sqrt_n * a + math.sqrt(discriminant)) / (n - 1)
+            fitted_projection = a / fitted
+            if (split == 0 or thresholds[split - 1] <= fitted_projection) and (
+                fitted_projection < thresholds[split]
+            ):
+                break
+        boundary_constant += plane_constant
+        boundary_radius_ += boundary_radius(radius, plane_constant, n)
+    else:
+        return None
+
+    pool = OrbitalPool(n, fee_bps, symbols)
+    scale = fitted / interior_radii[split]
+    for position, (radius, plane_constant) in enumerate(ticks):
+        if position >= split:
+            radius, plane_constant = radius * scale, plane_constant * scale
+        pool.ticks.append(Tick(radius, plane_constant, is_interior=position >= split))
+    pool._thresholds = thresholds
+    pool._sorted_ticks = list(range(len(ticks)))
+    pool._split = split
+    pool._interior_radius = fitted
+    pool._boundary_constant = boundary_constant
+    pool._boundary_radius = boundary_radius_
+    pool.reserves = [float(x) for x in reserves]
+    return pool
@@ -0,0 +1,201 @@
+import asyncio
+import functools
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src import metrics
+from src.configs import orbital_configs
+from src.services import orbital_math
+
+FEE_DENOMINATOR = 10000
+
+# (token addresses, token symbols, reserves normalized to orbital_configs.INTERNAL_DECIMALS)
+PoolState = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[int, ...]]
+
+_state: Optional[PoolState] = None
+
+# Pool tokens are fixed at deployment, so their addresses are only read once.
+_token_addresses: Tuple[str, ...] = ()
+
+# (radius, k) of each active tick, normalized like the reserves. Ticks only change
+# with liquidity, so they are re-read when the tick count or total liquidity does.
+_ticks: Tuple[Tuple[int, int], ...] = ()
+_ticks_read_at: Optional[Tuple[int, int]] = None
+
+# (amount, from symbol, from decimals, to symbol, to decimals) -> amount or None.
+# Only valid for _state; cleared whenever the pool state changes.
+_conversions: Dict[Tuple[int, str, int, str, int], Optional[int]] = {}
+
+_conversion_hit, _conversion_miss = metrics.cache_counters("conversions")
+
+# Called with ("pool", None) when the pool state changes.
+_listeners: List[Callable[[str, None], None]] = []
+
+
+def subscribe(listener: Callable[[str, None], None]):
+    """Register a callback for pool state changes (e.g. to drop compiled responses)."""
+    _listeners.append(listener)
+
+
+@functools.lru_cache(maxsize=None)
+def _pool_contract():
+    # Built on the first refresh (off the event loop) and reused, so web3 and the
+    # ABI are loaded once and not at import.
+    from web3 import HTTPProvider, Web3
+
+    web3 = Web3(HTTPProvider(orbital_configs.PROVIDER_URL))
+    web3.middleware_onion.add(metrics.rpc_middleware(orbital_configs.CHAIN))
+    return web3.eth.contract(
+        address=web3.to_checksum_address(orbital_configs.CONTRACT_ADDRESS),
+        abi=orbital_configs.ABI,
+    )
+
+
+def read_pool_state() -> PoolState:
+    """Read token addresses, symbols and reserves from the Orbital pool (blocking RPC calls)."""
+    global _token_addresses, _ticks_read_at
+    orbital_contract = _pool_contract()
+    # getPoolStats returns symbols, tick counts, normalized reserves and liquidity
+    symbols, tick_count, _, _, reserves, liquidity = (
+        orbital_contract.functions.getPoolStats().call()
+    )
+    if len(_token_addresses) != len(symbols):
+        _token_addresses = tuple(
+            orbital_contract.functions.tokens(i).call() for i in range(len(symbols))
+        )
+    if _ticks_read_at != (tick_count, liquidity):
+        _read_ticks(orbital_contract, tick_count)
+        _ticks_read_at = (tick_count, liquidity)
+    return _token_addresses, tuple(symbols), tuple(reserves)
+
+
+def _read_ticks(orbital_contract, tick_count: int):
+    """
+    Read every active tick's radius and k (blocking RPC calls).
+
+    Pools without activeTickIds/ticks getters (OrbitalPoolAdapter) leave no ticks,
+    and routing falls back to a single sphere through the reserves.
+    """
+    global _ticks
+    from web3.exceptions import ContractLogicError
+
+    ticks = []
+    try:
+        for i in range(tick_count):
+            # activeTickIds is shorter than the tick count once ticks are withdrawn.
+            try:
+                tick_id = orbital_contract.functions.activeTickIds(i).call()
+            except ContractLogicError:
+                break
+            _, _, k, radius, *_ = orbital_contract.functions.ticks(tick_id).call()
+            ticks.append((radius, k))
+    except ContractLogicError as e:
+        print(f"Orbital pool ticks unavailable, routing on reserves only: {e}")
+        ticks = []
+    _ticks = tuple(ticks)
+
+
+def read_quote(index_in: int, index_out: int, amount_in: int) -> int:
+    """OrbitalPool.getQuote by token index, in token units (a blocking RPC call)."""
+    return _pool_contract().functions.getQuote(index_in, index_out, amount_in).call()
+
+
+def set_pool_state(state: PoolState):
+    """Swap in a new pool snapshot, dropping cached conversions if it changed."""
+    global _state
+    if state == _state:
+        return
+    _state = state
+    _conversions.clear()
+    for listener in _listeners:
+        listener("pool", None)
+
+
+async def refresh():
+    set_pool_state(await asyncio.to_thread(read_pool_state))
+
+
+async def watch_pool():
+    """Keep the pool snapshot current; prices only change when the reserves do."""
+    while True:
+        try:
+            await refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Orbital pool refresh failed: {e}")
+        await asyncio.sleep(orbital_configs.REFRESH_SECONDS)
+
+
+def get_state() -> Optional[PoolState]:
+    """Latest pool snapshot, or None before the first successful refresh."""
+    return _state
+
+
+def get_ticks() -> Tuple[Tuple[int, int], ...]:
+    """(radius, k) of the pool's active ticks as of the latest snapshot; empty if unknown."""
+    return _ticks
+
+
+@functools.lru_cache(maxsize=1)
+def _sphere(reserves: Tuple[int, ...]) -> orbital_math.PoolState:
+    # getAmountOut on the snapshot reserves; 402s are priced without an RPC call each.
+    return orbital_math.PoolState(reserves, orbital_configs.SWAP_FEE_BPS)
+
+
+def _normalize(amount: int, decimals: int) -> int:
+    scale = orbital_configs.INTERNAL_DECIMALS - decimals
+    return amount * 10**scale if scale >= 0 else amount // 10**-scale
+
+
+def _denormalize_up(amount: int, decimals: int) -> int:
+    scale = orbital_configs.INTERNAL_DECIMALS - decimals
+    return -(-amount // 10**scale) if scale >= 0 else amount * 10**-scale
+
+
+def convert(
+    amount: int, from_symbol: str, from_decimals: int, to_symbol: str, to_decimals: int
+) -> Optional[int]:
+    """
+    Price an amount of one pool token in another.
+
+    Solved exactly on getAmountOut's sphere (orbital_math.PoolState.amount_in), fitted
+    through the snapshot's total reserves. The pool fits it through its interior
+    reserves, which are the same until ticks reach their boundary.
+
+    Args:
+        amount (int): Amount the merchant wants, in from_symbol's smallest unit
+        from_symbol (str): Pool symbol of the merchant's token (e.g., 'USDC')
+        from_decimals (int): Decimals of the merchant's token
+        to_symbol (str): Pool symbol of the token the payer holds (e.g., 'USDT')
+        to_decimals (int): Decimals of the payer's token
+
+    Returns:
+        int: Amount of to_symbol that swaps into at least `amount` of from_symbol,
+        or None if the pool does not hold both tokens or is too shallow
+    """
+    if from_symbol == to_symbol and from_decimals == to_decimals:
+        return amount
+
+    key = (amount, from_symbol, from_decimals, to_symbol, to_decimals)
+    if key in _conversions:
+        _conversion_hit.inc()
+        return _conversions[key]
+    _conversion_miss.inc()
+
+    converted = None
+    if _state is not None:
+        _, symbols, reserves = _state
+        if from_symbol in symbols and to_symbol in symbols:
+            try:
+                amount_in = _sphere(reserves).amount_in(
+                    symbols.index(to_symbol),
+                    symbols.index(from_symbol),
+                    _normalize(amount, from_decimals),
+                )
+            except orbital_math.OrbitalMathError:
+                amount_in = None  # Too unbalanced for any sphere through the reserves
+            if amount_in is not None:
+                converted = _denormalize_up(amount_in, to_decimals)
+
+    _conversions[key] = converted
+    return converted
@@ -0,0 +1,291 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from src.cache import MISSING, LRUCache
+from src.configs import merchant_configs, mongo_configs
+
+# Read-through caches in front of Mongo. Misses (None) are cached too, so unknown
+# resource ids do not reach the database on every request.
+_merchant_cache = LRUCache(
+    mongo_configs.CACHE_SIZE, mongo_configs.CACHE_TTL_SECONDS, name="merchants"
+)
+_resource_cache = LRUCache(
+    mongo_configs.CACHE_SIZE, mongo_configs.CACHE_TTL_SECONDS, name="resources"
+)
+
+# Called with ("merchant", name), ("resource", resource_id) or ("all", None) when
+# registry entries change.
+_listeners: List[Callable[[str, Any], None]] = []
+
+# pymongo is only imported once a MONGO_URI is configured.
+if TYPE_CHECKING:
+    from pymongo import AsyncMongoClient
+
+_client: Optional["AsyncMongoClient"] = None
+
+
+def subscribe(listener: Callable[[str, Any], None]):
+    """Register a callback for registry changes (e.g. to drop compiled responses)."""
+    _listeners.append(listener)
+
+
+def _invalidate(kind: str, key: Any):
+    if kind == "merchant":
+        _merchant_cache.invalidate(key)
+    else:
+        _resource_cache.invalidate(key)
+    for listener in _listeners:
+        listener(kind, key)
+
+
+def _invalidate_all():
+    _merchant_cache.clear()
+    _resource_cache.clear()
+    for listener in _listeners:
+        listener("all", None)
+
+
+def database():
+    """The registry's Mongo database, or None when MONGO_URI is not set."""
+    return _client[mongo_configs.DATABASE] if _client is not None else None
+
+
+def _merchants():
+    return _client[mongo_configs.DATABASE][mongo_configs.MERCHANTS_COLLECTION]
+
+
+def _resources():
+    return _client[mongo_configs.DATABASE][mongo_configs.RESOURCES_COLLECTION]
+
+
+async def connect():
+    """
+    Connect to Mongo, create indexes and seed the registry from merchant_configs.
+
+    With an empty mongo_configs.URI the registry stays in memory and is served
+    straight from merchant_configs.
+    """
+    global _client
+    if not mongo_configs.URI:
+        return
+
+    from pymongo import AsyncMongoClient
+
+    _client = AsyncMongoClient(
+        mongo_configs.URI,
+        maxPoolSize=mongo_configs.MAX_POOL_SIZE,
+        minPoolSize=mongo_configs.MIN_POOL_SIZE,
+        maxIdleTimeMS=mongo_configs.MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=mongo_configs.WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=mongo_configs.SERVER_SELECTION_TIMEOUT_MS,
+        appname="rip-stripe-backend",
+    )
+    await ensure_indexes()
+    await seed_from_configs()
+
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+async def ensure_indexes():
+    """Index merchants by name and resources by id (unique) and by merchant."""
+    from pymongo import ASCENDING, IndexModel
+
+    await _merchants().create_indexes(
+        [IndexModel([("name", ASCENDING)], unique=True)]
+    )
+    await _resources().create_indexes(
+        [
+            IndexModel([("resource_id", ASCENDING)], unique=True),
+            IndexModel([("merchant", ASCENDING), ("resource_id", ASCENDING)]),
+        ]
+    )
+
+
+async def seed_from_configs():
+    """Insert the merchants and resources from merchant_configs that are not stored yet."""
+    for name, currencies in merchant_configs.MERCHANT_TO_CURRENCY_MAP.items():
+        await _merchants().update_one(
+            {"_id": name},
+            {"$setOnInsert": {"name": name, "currencies": currencies}},
+            upsert=True,
+        )
+    for (merchant, resource_id), entry in merchant_configs.RESOURCE_CATALOG.items():
+        await _resources().update_one(
+            {"_id": resource_id},
+            {
+                "$setOnInsert": {
+                    "resource_id": resource_id,
+                    "merchant": merchant,
+                    **entry,
+                }
+            },
+            upsert=True,
+        )
+
+
+def _config_merchant(name: str) -> Optional[Dict[str, Any]]:
+    currencies = merchant_configs.MERCHANT_TO_CURRENCY_MAP.get(name)
+    if currencies is None:
+        return None
+    return {"name": name, "currencies": currencies}
+
+
+def _config_resource(resource_id: int) -> Optional[Dict[str, Any]]:
+    merchant = merchant_configs.MERCHANT_ID_TO_MERCHANT_MAP.get(resource_id)
+    entry = merchant_configs.RESOURCE_CATALOG.get((merchant, resource_id))
+    if entry is None:
+        return None
+    return {"resource_id": resource_id, "merchant": merchant, **entry}
+
+
+async def get_merchant(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a merchant ({'name', 'currencies'}) through the read-through cache.
+
+    Args:
+        name (str): Merchant name (e.g., 'NYTIMES')
+
+    Returns:
+        Merchant document, or None if the merchant is not registered
+    """
+    merchant = _merchant_cache.get(name)
+    if merchant is not MISSING:
+        return merchant
+
+    if _client is None:
+        merchant = _config_merchant(name)
+    else:
+        merchant = await _merchants().find_one({"_id": name}, {"_id": 0})
+    _merchant_cache.put(name, merchant)
+    return merchant
+
+
+async def get_resource(resource_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get a priced resource through the read-through cache.
+
+    Args:
+        resource_id (int): Resource identifier served under /get-resource
+
+    Returns:
+        Dict with merchant, symbol, price, asset, network, description and extra, or None
+    """
+    resource = _resource_cache.get(resource_id)
+    if resource is not MISSING:
+        return resource
+
+    if _client is None:
+        resource = _config_resource(resource_id)
+    else:
+        resource = await _resources().find_one({"_id": resource_id}, {"_id": 0})
+    _resource_cache.put(resource_id, resource)
+    return resource
+
+
+async def upsert_merchant(name: str, currencies: List[str]):
+    """Register a merchant or replace its accepted currencies."""
+    if _client is None:
+        merchant_configs.MERCHANT_TO_CURRENCY_MAP[name] = currencies
+    else:
+        await _merchants().replace_one(
+            {"_id": name}, {"name": name, "currencies": currencies}, upsert=True
+        )
+    _invalidate("merchant", name)
+
+
+async def upsert_resource(
+    merchant: str,
+    resource_id: int,
+    price: str,
+    asset: str,
+    network: str,
+    description: str,
+    extra: Optional[Dict[str, Any]] = None,
+    symbol: str = "USDC",
+):
+    """
+    Add or replace a priced resource for a merchant.
+
+    Args:
+        merchant (str): Merchant name (e.g., 'NYTIMES')
+        resource_id (int): Resource identifier served under /get-resource
+        price (str): Amount in the asset's smallest unit, integer encoded as a string
+        asset (str): Token contract address the merchant is paid in
+        network (str): x402 network name (e.g., 'base-sepolia')
+        description (str): Human readable description shown to the payer
+        extra (dict): EIP-712 domain of the asset ({'name', 'version'})
+        symbol (str): Pool symbol of the asset, used to price the other accepted tokens
+    """
+    entry = {
+        "symbol": symbol,
+        "price": price,
+        "asset": asset,
+        "network": network,
+        "description": description,
+        "extra": extra,
+    }
+    if _client is None:
+        merchant_configs.MERCHANT_ID_TO_MERCHANT_MAP[resource_id] = merchant
+        merchant_configs.RESOURCE_CATALOG[(merchant, resource_id)] = entry
+    else:
+        await _resources().replace_one(
+            {"_id": resource_id},
+            {"resource_id": resource_id, "merchant": merchant, **entry},
+            upsert=True,
+        )
+    _invalidate("resource", resource_id)
+
+
+async def delete_resource(resource_id: int):
+    """Remove a priced resource."""
+    if _client is None:
+        merchant = merchant_configs.MERCHANT_ID_TO_MERCHANT_MAP.get(resource_id)
+        merchant_configs.RESOURCE_CATALOG.pop((merchant, resource_id), None)
+    else:
+        await _resources().delete_one({"_id": resource_id})
+    _invalidate("resource", resource_id)
+
+
+async def watch_changes():
+    """
+    Invalidate cached entries from a change stream, so edits made by other workers
+    or directly in Mongo are picked up without a redeploy.
+
+    Change streams need a replica set; on a standalone mongod the cache TTL
+    (mongo_configs.CACHE_TTL_SECONDS) bounds staleness instead.
+    """
+    if _client is None:
+        return
+
+    from pymongo.errors import OperationFailure, PyMongoError
+
+    collections = {
+        mongo_configs.MERCHANTS_COLLECTION: "merchant",
+        mongo_configs.RESOURCES_COLLECTION: "resource",
+    }
+    pipeline = [{"$match": {"ns.coll": {"$in": list(collections)}}}]
+    while True:
+        try:
+            database = _client[mongo_configs.DATABASE]
+            async with await database.watch(pipeline) as stream:
+                # Anything may have changed while the stream was down.
+                _invalidate_all()
+                async for change in stream:
+                    kind = collections[change["ns"]["coll"]]
+                    _invalidate(kind, change["documentKey"]["_id"])
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as e:
+            # 40573: change streams are not supported on a standalone server.
+            print(f"Registry change stream unavailable: {e}")
+            if e.code == 40573:
+                return
+            await asyncio.sleep(5)
+        except PyMongoError as e:
+            print(f"Registry change stream interrupted: {e}")
+            await asyncio.sleep(5)
@@ -0,0 +1,242 @@
+"""
+Split routing on the off-chain pool model.
+
+A payment is cut into equal chunks; each chunk goes to the route (a direct swap or a
+two-hop swap through another token, in any pool) with the best marginal rate on the
+simulated pools, and is swapped through them before the next chunk. Swaps are
+segmented at tick crossings (pool.OrbitalPool.swap), so a route's rate drops where
+its pool's ticks reach their boundary and later chunks move to the other routes.
+Small chunks make this converge to the allocation that equalizes marginal rates
+across the routes in use, which maximizes total output for convex pools.
+"""
+
+import functools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.configs import orbital_configs
+from src.services import pricing
+from src.services.pool import Checkpoint, OrbitalPool, fit_pool
+
+DEFAULT_CHUNKS = 32
+
+# A pool as the router sees it: token symbols in pool order and the pool model.
+# plan_split swaps through the pools and rolls them back before returning.
+Market = Tuple[Sequence[str], OrbitalPool]
+
+
+@dataclass(frozen=True)
+class Hop:
+    pool: str
+    token_in: str
+    token_out: str
+
+
+@dataclass
+class Leg:
+    """One segment of the plan: everything routed along the same hops."""
+
+    hops: Tuple[Hop, ...]
+    amount_in: float = 0.0
+    amount_out: float = 0.0
+
+
+@dataclass
+class Plan:
+    token_in: str
+    token_out: str
+    amount_in: float
+    amount_out: float = 0.0
+    # Output of sending everything through the best single direct swap, for comparison
+    direct_amount_out: float = 0.0
+    legs: List[Leg] = field(default_factory=list)
+
+
+def find_routes(
+    markets: Dict[str, Market], token_in: str, token_out: str
+) -> List[Tuple[Hop, ...]]:
+    """All direct and two-hop routes from token_in to token_out across the pools."""
+    routes = []
+    for name, (symbols, _) in markets.items():
+        if token_in in symbols and token_out in symbols:
+            routes.append((Hop(name, token_in, token_out),))
+
+    for first, (first_symbols, _) in markets.items():
+        if token_in not in first_symbols:
+            continue
+        for middle in first_symbols:
+            if middle in (token_in, token_out):
+                continue
+            for second, (second_symbols, _) in markets.items():
+                if middle in second_symbols and token_out in second_symbols:
+                    routes.append(
+                        (Hop(first, token_in, middle), Hop(second, middle, token_out))
+                    )
+    return routes
+
+
+def _rate(markets: Dict[str, Market], route: Tuple[Hop, ...]) -> float:
+    rate = 1.0
+    for hop in route:
+        symbols, pool = markets[hop.pool]
+        rate *= pool.state().marginal_rate(
+            symbols.index(hop.token_in), symbols.index(hop.token_out)
+        )
+    return rate
+
+
+def _execute(markets: Dict[str, Market], route: Tuple[Hop, ...], amount: float) -> float:
+    """Swap an amount along a route. Raises ValueError, with the pools untouched, if it cannot fill."""
+    saved: Dict[str, Checkpoint] = {}
+    try:
+        for hop in route:
+            symbols, pool = markets[hop.pool]
+            saved.setdefault(hop.pool, pool.checkpoint())
+            amount = pool.swap(
+                symbols.index(hop.token_in), symbols.index(hop.token_out), amount
+            )
+    except ValueError:
+        for name, checkpoint in saved.items():
+            markets[name][1].rollback(checkpoint)
+        raise
+    return amount
+
+
+def plan_split(
+    markets: Dict[str, Market],
+    token_in: str,
+    token_out: str,
+    amount_in: float,
+    chunks: int = DEFAULT_CHUNKS,
+) -> Plan:
+    """
+    Split a trade across routes to maximize total output.
+
+    Args:
+        markets (dict): Pool name -> (symbols, OrbitalPool); left as they were on return
+        token_in (str): Symbol paid in
+        token_out (str): Symbol to receive
+        amount_in (float): Amount of token_in, fees included
+        chunks (int): Allocation granularity; more chunks, closer to optimal
+
+    Returns:
+        Plan: Legs with the amount routed along each and the expected output
+
+    Raises:
+        ValueError: If no route exists or the pools cannot absorb the trade
+    """
+    routes = find_routes(markets, token_in, token_out)
+    if not routes:
+        raise ValueError("No route")
+
+    start = {name: pool.checkpoint() for name, (_, pool) in markets.items()}
+    try:
+        return _plan(markets, routes, start, token_in, token_out, amount_in, chunks)
+    finally:
+        for name, checkpoint in start.items():
+            markets[name][1].rollback(checkpoint)
+
+
+def _plan(
+    markets: Dict[str, Market],
+    routes: List[Tuple[Hop, ...]],
+    start: Dict[str, Checkpoint],
+    token_in: str,
+    token_out: str,
+    amount_in: float,
+    chunks: int,
+) -> Plan:
+    plan = Plan(token_in, token_out, amount_in)
+    for route in routes:
+        if len(route) == 1:
+            try:
+                amount_out = _execute(markets, route, amount_in)
+                plan.direct_amount_out = max(plan.direct_amount_out, amount_out)
+            except ValueError:
+                continue
+            pool = route[0].pool
+            markets[pool][1].rollback(start[pool])
+
+    legs: Dict[Tuple[Hop, ...], Leg] = {}
+    live = list(routes)
+    chunk = amount_in / chunks
+    for _ in range(chunks):
+        while True:
+            if not live:
+                raise ValueError("Insufficient liquidity")
+            route = max(live, key=lambda r: _rate(markets, r))
+            try:
+                amount_out = _execute(markets, route, chunk)
+                break
+            except ValueError:
+                live.remove(route)
+
+        leg = legs.setdefault(route, Leg(route))
+        leg.amount_in += chunk
+        leg.amount_out += amount_out
+        plan.amount_out += amount_out
+
+    plan.legs = sorted(legs.values(), key=lambda leg: -leg.amount_in)
+    return plan
+
+
+def get_live_markets() -> Dict[str, Market]:
+    """
+    The deployed pool as a router market, keyed by its address.
+
+    The model is fitted through the total reserves from the pool's own ticks
+    (pool.fit_pool), in whole tokens, so simulated swaps cross ticks where the pool
+    would. If the ticks could not be read it is a single sphere through the reserves.
+    """
+    state = pricing.get_state()
+    if state is None:
+        return {}
+    _, symbols, reserves = state
+    pool = _live_pool(symbols, reserves, pricing.get_ticks())
+    if pool is None:
+        return {}
+    return {orbital_configs.CONTRACT_ADDRESS: (symbols, pool)}
+
+
+@functools.lru_cache(maxsize=1)
+def _live_pool(
+    symbols: Tuple[str, ...],
+    reserves: Tuple[int, ...],
+    ticks: Tuple[Tuple[int, int], ...],
+) -> Optional[OrbitalPool]:
+    # Fitted once per snapshot; plan_split leaves the pool as it found it.
+    scale = 10**orbital_configs.INTERNAL_DECIMALS
+    return fit_pool(
+        [x / scale for x in reserves],
+        [(radius / scale, k / scale) for radius, k in ticks],
+        orbital_configs.SWAP_FEE_BPS,
+        symbols,
+    )
+
+
+def plan_to_dict(plan: Plan) -> Dict[str, object]:
+    """Serialize a plan with amounts in the pool's 18-decimal units."""
+    scale = 10**orbital_configs.INTERNAL_DECIMALS
+
+    def units(amount: float) -> str:
+        return str(int(amount * scale))
+
+    return {
+        "tokenIn": plan.token_in,
+        "tokenOut": plan.token_out,
+        "amountIn": units(plan.amount_in),
+        "amountOut": units(plan.amount_out),
+        "directAmountOut": units(plan.direct_amount_out),
+        "segments": len(plan.legs),
+        "legs": [
+            {
+                "hops": [
+                    {"pool": hop.pool, "tokenIn": hop.token_in, "tokenOut": hop.token_out}
+                    for hop in leg.hops
+                ],
+                "amountIn": units(leg.amount_in),
+                "amountOut": units(leg.amount_out),
+            }
+            for leg in plan.legs
+        ],
+    }
@@ -0,0 +1,199 @@
+"""
+Key-value state shared by every worker, with a time-to-live per entry.
+
+Module globals diverge as soon as uvicorn runs more than one worker, so state that
+must agree across workers lives here: checkout entitlements (ENTITLEMENT), x402
+payment idempotency keys (IDEMPOTENCY), cross-chain payments and their transaction
+index (PAYMENT, PAYMENT_TX), checkout timeline spans (TIMELINE) and short leases
+that pick the one worker running a periodic job (LEASE). Entries are kept in the
+registry's Mongo database when MONGO_URI is set, so every host shares them; otherwise
+in a SQLite file (store_configs.SQLITE_PATH) shared by the workers on this host.
+Values are anything orjson can encode.
+"""
+
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+import orjson
+from src.configs import store_configs
+from src.services import registry
+
+ENTITLEMENT = "entitlement"
+IDEMPOTENCY = "idempotency"
+PAYMENT = "payment"
+PAYMENT_TX = "payment-tx"
+TIMELINE = "timeline"
+LEASE = "lease"
+
+_local = threading.local()
+
+
+def _sqlite() -> sqlite3.Connection:
+    # One connection per thread; calls run on asyncio.to_thread's pool.
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = sqlite3.connect(
+            store_configs.SQLITE_PATH,
+            timeout=store_configs.SQLITE_TIMEOUT_SECONDS,
+            isolation_level=None,
+        )
+        # WAL lets workers read while another one writes.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS shared_state ("
+            "kind TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "expires REAL NOT NULL, PRIMARY KEY (kind, key))"
+        )
+        _local.connection = connection
+    return connection
+
+
+def _sqlite_add(kind: str, key: str, value: bytes, expires: float, now: float) -> bool:
+    # Inserts, or takes over an expired entry; a live entry is left alone.
+    cursor = _sqlite().execute(
+        "INSERT INTO shared_state (kind, key, value, expires) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (kind, key) DO UPDATE SET value = excluded.value, "
+        "expires = excluded.expires WHERE shared_state.expires <= ?",
+        (kind, key, value, expires, now),
+    )
+    return cursor.rowcount == 1
+
+
+def _sqlite_put(kind: str, key: str, value: bytes, expires: float, now: float):
+    connection = _sqlite()
+    connection.execute("DELETE FROM shared_state WHERE expires <= ?", (now,))
+    connection.execute(
+        "INSERT OR REPLACE INTO shared_state (kind, key, value, expires) VALUES (?, ?, ?, ?)",
+        (kind, key, value, expires),
+    )
+
+
+def _sqlite_get(kind: str, key: str, now: float) -> Optional[bytes]:
+    row = (
+        _sqlite()
+        .execute(
+            "SELECT value FROM shared_state WHERE kind = ? AND key = ? AND expires > ?",
+            (kind, key, now),
+        )
+        .fetchone()
+    )
+    return row[0] if row else None
+
+
+def _sqlite_scan(kind: str, prefix: str, now: float) -> List[Tuple[str, bytes]]:
+    # Keys are compared as UTF-8 bytes, so the range is exactly the keys with the prefix.
+    return (
+        _sqlite()
+        .execute(
+            "SELECT key, value FROM shared_state WHERE kind = ? AND key >= ? AND key < ? "
+            "AND expires > ?",
+            (kind, prefix, prefix + "\U0010ffff", now),
+        )
+        .fetchall()
+    )
+
+
+def _sqlite_delete(kind: str, key: str):
+    _sqlite().execute("DELETE FROM shared_state WHERE kind = ? AND key = ?", (kind, key))
+
+
+def _collection():
+    database = registry.database()
+    return database[store_configs.COLLECTION] if database is not None else None
+
+
+def _expiry(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, timezone.utc)
+
+
+async def connect():
+    """Create the shared table, or the Mongo TTL index; call after registry.connect."""
+    collection = _collection()
+    if collection is None:
+        await asyncio.to_thread(_sqlite)
+        return
+    # Mongo drops entries shortly after they expire; reads check expiry themselves.
+    await collection.create_index("expires", expireAfterSeconds=0)
+
+
+async def add(kind: str, key: str, value: Any, ttl_seconds: float) -> bool:
+    """Store `value` unless a live entry exists; True if this call stored it."""
+    now = time.time()
+    collection = _collection()
+    if collection is None:
+        return await asyncio.to_thread(
+            _sqlite_add, kind, key, orjson.dumps(value), now + ttl_seconds, now
+        )
+
+    from pymongo.errors import DuplicateKeyError
+
+    try:
+        # Matches only an expired entry; otherwise the upsert collides on _id.
+        await collection.update_one(
+            {"_id": f"{kind}:{key}", "expires": {"$lte": _expiry(now)}},
+            {"$set": {"value": value, "expires": _expiry(now + ttl_seconds)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def put(kind: str, key: str, value: Any, ttl_seconds: float):
+    """Store `value`, replacing any entry."""
+    now = time.time()
+    collection = _collection()
+    if collection is None:
+        await asyncio.to_thread(
+            _sqlite_put, kind, key, orjson.dumps(value), now + ttl_seconds, now
+        )
+        return
+    await collection.replace_one(
+        {"_id": f"{kind}:{key}"},
+        {"value": value, "expires": _expiry(now + ttl_seconds)},
+        upsert=True,
+    )
+
+
+async def get(kind: str, key: str) -> Optional[Any]:
+    """The live value for a key, or None."""
+    now = time.time()
+    collection = _collection()
+    if collection is None:
+        value = await asyncio.to_thread(_sqlite_get, kind, key, now)
+        return orjson.loads(value) if value is not None else None
+    document = await collection.find_one(
+        {"_id": f"{kind}:{key}", "expires": {"$gt": _expiry(now)}}
+    )
+    return document["value"] if document else None
+
+
+async def scan(kind: str, prefix: str = "") -> List[Tuple[str, Any]]:
+    """(key, value) for every live entry of a kind whose key starts with `prefix`."""
+    now = time.time()
+    collection = _collection()
+    if collection is None:
+        rows = await asyncio.to_thread(_sqlite_scan, kind, prefix, now)
+        return [(key, orjson.loads(value)) for key, value in rows]
+    # An anchored prefix on _id is answered from the _id index.
+    cursor = collection.find(
+        {
+            "_id": {"$regex": "^" + re.escape(f"{kind}:{prefix}")},
+            "expires": {"$gt": _expiry(now)},
+        }
+    )
+    start = len(kind) + 1
+    return [(document["_id"][start:], document["value"]) async for document in cursor]
+
+
+async def delete(kind: str, key: str):
+    collection = _collection()
+    if collection is None:
+        await asyncio.to_thread(_sqlite_delete, kind, key)
+        return
+    await collection.delete_one({"_id": f"{kind}:{key}"})
@@ -0,0 +1,203 @@
+"""
+Depeg stress scenarios built from issuer stress-test data.
+
+Each stablecoin's compliance report carries redemption stress tests (10/30/50% of
+supply), a daily liquidity ratio, a redemption speed and volume volatility. A stress
+level becomes a depeg path: the redemptions the issuer cannot meet within a day spill
+into the pool as a one-way flow out of the coin, spread over the redemption period.
+Every coin and level runs through the pool model in one batch (backtest.simulate),
+which reports which LP ticks are pushed onto their boundary and how much of the
+stressed coin each LP ends up holding.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from src.configs import genius_configs
+from src.services.backtest import Flows, Position, initial_reserve, simulate
+from src.services.pool import (
+    FEE_DENOMINATOR,
+    TorusState,
+    boundary_radius,
+    equal_price_reserve,
+    tick_from_capital,
+)
+
+STRESS_LEVELS = {"10pct": 0.1, "30pct": 0.3, "50pct": 0.5}
+
+# How much of the unmet redemption demand reaches the pool, by stress-test result.
+RESULT_MULTIPLIERS = {"Pass": 1.0, "At risk": 1.5, "Fail": 2.0}
+
+STEPS_PER_DAY = 24
+
+
+def stress_profile(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flow parameters for one stablecoin report.
+
+    Returns:
+        Dict with, per stress level, the share of the coin's pool reserve sold into the
+        pool ('sold'), plus 'days' and 'volume_volatility'
+    """
+    liquidity = item["risk_liquidity"]
+    unmet = 1 - liquidity["daily_liquidity_ratio_percent"] / 100
+    results = liquidity["stress_tests"]
+    return {
+        "sold": {
+            level: share * unmet * RESULT_MULTIPLIERS.get(results.get(level), 2.0)
+            for level, share in STRESS_LEVELS.items()
+        },
+        "results": dict(results),
+        "days": max(int(liquidity["redemption_speed_days"]), 1),
+        "volume_volatility": item["issuance"]["volatility"]["volume_volatility"],
+    }
+
+
+def stress_flows(
+    symbols: Sequence[str],
+    reserve: float,
+    profiles: Dict[str, Dict[str, Any]],
+    seed: Optional[int] = 0,
+) -> Tuple[Flows, List[Tuple[str, str]]]:
+    """
+    One scenario per (coin, stress level): the coin is sold for the others in turn.
+
+    Args:
+        symbols (list): Pool tokens in pool order
+        reserve (float): Per-token pool reserve
+        profiles (dict): Symbol -> stress_profile, for the coins to stress
+        seed (int): Seed for the per-step size dispersion
+
+    Returns:
+        Tuple (Flows, [(symbol, level)] labelling each scenario)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(symbols)
+    labels = [
+        (symbol, level)
+        for symbol in symbols
+        if symbol in profiles
+        for level in STRESS_LEVELS
+    ]
+    steps = max(profiles[symbol]["days"] for symbol, _ in labels) * STEPS_PER_DAY
+
+    token_in = np.zeros((len(labels), steps), dtype=int)
+    token_out = np.zeros((len(labels), steps), dtype=int)
+    amount_in = np.zeros((len(labels), steps))
+    for row, (symbol, level) in enumerate(labels):
+        profile = profiles[symbol]
+        coin = symbols.index(symbol)
+        count = profile["days"] * STEPS_PER_DAY
+        # Hourly sizes vary with the coin's volume volatility but sum to the total sold.
+        weights = rng.lognormal(0.0, profile["volume_volatility"], count)
+        token_in[row] = coin
+        token_out[row] = (coin + 1 + np.arange(steps) % (n - 1)) % n
+        amount_in[row, :count] = reserve * profile["sold"][level] * weights / weights.sum()
+
+    prices = np.ones((len(labels), n))
+    depeg_token = np.array([symbols.index(symbol) for symbol, _ in labels])
+    return Flows(token_in, token_out, amount_in, prices, depeg_token), labels
+
+
+def run_stress(
+    positions: Sequence[Position],
+    symbols: Sequence[str],
+    data: Optional[Dict[str, Any]] = None,
+    fee_bps: int = 30,
+) -> List[Dict[str, Any]]:
+    """
+    Stress every pool coin found in the compliance data at every level.
+
+    Args:
+        positions (list): LP deposits making up the pool
+        symbols (list): Pool tokens in pool order
+        data (dict): Compliance dataset (default: genius_configs.DATA)
+        fee_bps (int): Swap fee in basis points
+
+    Returns:
+        list: Per (coin, level): the amount sold and how much of it the pool absorbed,
+        the coin's pool price afterwards (in units of the other tokens) and, per LP,
+        whether and when its tick reached its boundary, its change in holdings of the
+        coin and its loss against holding the deposit when the coin is marked at that
+        price
+    """
+    data = data or genius_configs.DATA
+    n = len(symbols)
+    profiles = {
+        item["name"]: stress_profile(item)
+        for item in data.get("stablecoins", [])
+        if item["name"] in symbols
+    }
+    if not profiles:
+        return []
+
+    reserve = initial_reserve(positions, n)
+    flows, labels = stress_flows(symbols, reserve, profiles)
+    rows = len(labels)
+
+    # Valuation is linear, so one extra copy of each scenario valued at the stressed
+    # coin's unit vector yields every tick's holding of that coin.
+    unit = np.zeros((rows, n))
+    unit[np.arange(rows), flows.depeg_token] = 1.0
+    batch = Flows(
+        np.concatenate([flows.token_in, flows.token_in]),
+        np.concatenate([flows.token_out, flows.token_out]),
+        np.concatenate([flows.amount_in, flows.amount_in]),
+        np.concatenate([flows.prices, unit]),
+        np.concatenate([flows.depeg_token, flows.depeg_token]),
+    )
+    result = simulate(positions, n, batch, fee_bps)
+
+    ticks = [tick_from_capital(p.capital, p.depeg_price, n) for p in positions]
+    deposit = [equal_price_reserve(radius, n) for radius, _ in ticks]
+    fee_factor = (FEE_DENOMINATOR - fee_bps) / FEE_DENOMINATOR
+
+    report = []
+    for row, (symbol, level) in enumerate(labels):
+        coin = symbols.index(symbol)
+        on_boundary = result["boundary"][row]
+        state = TorusState(
+            tuple(result["reserves"][row]),
+            sum(r for (r, _), b in zip(ticks, on_boundary) if not b),
+            sum(k for (_, k), b in zip(ticks, on_boundary) if b),
+            sum(boundary_radius(r, k, n) for (r, k), b in zip(ticks, on_boundary) if b),
+            fee_bps,
+        )
+        if state.interior_radius > 0:
+            price = state.spot_price(coin, (coin + 1) % n)
+        else:
+            # Every tick is pinned: the pool stopped at the last tick's depeg price and
+            # absorbs no more of the flow.
+            price = min(position.depeg_price for position in positions)
+        absorbed = (result["reserves"][row, coin] - reserve) / fee_factor
+
+        lps = []
+        for i, position in enumerate(positions):
+            value = result["final"][row, i]
+            holding = result["final"][rows + row, i]
+            crossed_at = int(result["crossed_at"][row, i])
+            lps.append(
+                {
+                    "owner": position.owner,
+                    "depegTolerance": position.depeg_price,
+                    "crossedAtStep": crossed_at if crossed_at >= 0 else None,
+                    "onBoundary": bool(on_boundary[i]),
+                    "exposure": float(holding - deposit[i]),
+                    "loss": float(deposit[i] * (n - 1 + price) - (value - (1 - price) * holding)),
+                }
+            )
+
+        report.append(
+            {
+                "coin": symbol,
+                "level": level,
+                "stressTest": profiles[symbol]["results"].get(level),
+                "sold": float(flows.amount_in[row].sum()),
+                "absorbed": float(absorbed),
+                "steps": int(np.count_nonzero(flows.amount_in[row])),
+                "poolPrice": price,
+                "boundaryTicks": int(on_boundary.sum()),
+                "lps": lps,
+            }
+        )
+    return report
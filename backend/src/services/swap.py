@@ -0,0 +1,144 @@
+import asyncio
+import functools
+
+from src import models
+from src.configs import orbital_configs
+from src.services import gas, pricing
+
+# OrbitalPool.swap(tokenIn, tokenOut, amountIn, minAmountOut, deadline)
+SWAP_SIGNATURE = "swap(address,address,uint256,uint256,uint256)"
+SWAP_SELECTOR = bytes.fromhex("7a950f99")  # First 4 bytes of keccak(SWAP_SIGNATURE)
+
+
+def checksum_address(address: str) -> str:
+    # eth_utils is imported with the first /swap rather than at start-up.
+    from eth_utils import to_checksum_address
+
+    return to_checksum_address(address)
+
+
+@functools.lru_cache(maxsize=None)
+def pool_address() -> str:
+    return checksum_address(orbital_configs.CONTRACT_ADDRESS)
+
+
+@functools.lru_cache(maxsize=None)
+def _swap_args_encoder():
+    # Built on the first /swap and reused; eth_abi is not loaded at start-up.
+    from eth_abi.registry import registry as abi_registry
+
+    return abi_registry.get_tuple_encoder(
+        "address", "address", "uint256", "uint256", "uint256"
+    )
+
+
+def encode_swap_calldata(
+    token_in: str, token_out: str, amount_in: int, min_amount_out: int, deadline: int
+) -> str:
+    """ABI-encode a call to OrbitalPool.swap as 0x-prefixed hex."""
+    args = _swap_args_encoder()((token_in, token_out, amount_in, min_amount_out, deadline))
+    return "0x" + (SWAP_SELECTOR + args).hex()
+
+
+async def quote(token_in: str, token_out: str, amount_in: int) -> int:
+    """
+    OrbitalPool.getQuote for the trade, read from the pool in token units.
+
+    Raises:
+        ValueError: If either token is not in the pool or the pool cannot fill the trade
+        LookupError: If the pool state has not been read yet or the pool is unreachable
+    """
+    state = pricing.get_state()
+    if state is None:
+        raise LookupError("Pool state unavailable")
+
+    addresses, _, _ = state
+    indices = {address.lower(): i for i, address in enumerate(addresses)}
+    if token_in.lower() not in indices or token_out.lower() not in indices:
+        raise ValueError("Token not in pool")
+
+    from web3.exceptions import ContractLogicError
+
+    try:
+        return await asyncio.to_thread(
+            pricing.read_quote,
+            indices[token_in.lower()],
+            indices[token_out.lower()],
+            amount_in,
+        )
+    except ContractLogicError as e:
+        raise ValueError(e.message) from e
+    except Exception as e:
+        raise LookupError(f"Pool quote unavailable: {e}") from e
+
+
+async def build_swap(request: models.SwapRequest) -> models.SwapResponse:
+    """
+    Build the unsigned OrbitalPool.swap transaction for a wallet to sign.
+
+    Args:
+        request (SwapRequest): Tokens, amounts, deadline and the signing wallet
+
+    Returns:
+        SwapResponse: Quoted amounts and the transaction ({'to', 'data', 'value',
+        'chainId', 'gas'})
+
+    Raises:
+        ValueError: If the request is malformed, targets another chain or the pool
+            cannot fill it
+        LookupError: If the pool state has not been read yet or the pool is unreachable
+    """
+    if request.chain != orbital_configs.CHAIN:
+        raise ValueError(f"Unsupported chain: {request.chain}")
+    if request.token_in.lower() == request.token_out.lower():
+        raise ValueError("Same token")
+
+    token_in = checksum_address(request.token_in)
+    token_out = checksum_address(request.token_out)
+    wallet = checksum_address(request.wallet_address)
+    amount_in = int(request.amount_in)
+    min_amount_out = int(request.min_amount_out)
+    if amount_in <= 0 or min_amount_out < 0:
+        raise ValueError("Invalid amount")
+
+    data = encode_swap_calldata(
+        token_in, token_out, amount_in, min_amount_out, request.deadline
+    )
+
+    fee_factor = pricing.FEE_DENOMINATOR - orbital_configs.SWAP_FEE_BPS
+    input_amount_net = amount_in * fee_factor // pricing.FEE_DENOMINATOR
+    output_amount = await quote(token_in, token_out, amount_in)
+    message = "Swap transaction built"
+
+    success = output_amount > 0 and output_amount >= min_amount_out
+    if output_amount and output_amount < min_amount_out:
+        message = "Quoted output is below minAmountOut"
+
+    estimate = await gas.estimate_gas(
+        ("swap", token_in, token_out, gas.amount_bucket(amount_in)),
+        {"from": wallet, "to": pool_address(), "data": data},
+    )
+    gas_limit = (
+        estimate * orbital_configs.GAS_HEADROOM_PERCENT // 100
+        if estimate is not None
+        else None
+    )
+
+    return models.SwapResponse(
+        input_amount_gross=str(amount_in),
+        input_amount_net=str(input_amount_net),
+        output_amount=str(output_amount),
+        effective_price=(
+            str(amount_in * 10**6 // output_amount) if output_amount else "0"
+        ),
+        segments=1,
+        success=success,
+        message=message,
+        transaction=models.SwapTransaction(
+            to=pool_address(),
+            data=data,
+            value="0",
+            chain_id=orbital_configs.CHAIN_ID,
+            gas=str(gas_limit) if gas_limit is not None else None,
+        ),
+    )
@@ -0,0 +1,216 @@
+"""
+Tracing of the x402 checkout: 402 -> /access-token -> /verify -> facilitator verify
+-> settlement retries.
+
+A checkout is one trace, and its trace id is the correlation id. The 402 response
+returns it in X-Correlation-ID (and a W3C traceparent); a client that sends either
+header back with X-PAYMENT continues the same trace. The id travels as a header
+because the 402 body is compiled once per catalog version and the X-PAYMENT payload
+is signed by the wallet, so neither can carry per-checkout data.
+
+Finished spans are written to the shared store (services.store) for GET
+/checkout/{correlation_id}/timeline, so a checkout whose requests reached different
+workers still has one timeline, and exported as configured in tracing_configs (JSON
+lines file and/or OTLP collector).
+"""
+
+import asyncio
+import re
+import secrets
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.trace import NonRecordingSpan, SpanContext, Status, StatusCode, TraceFlags
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+from src.configs import tracing_configs
+from src.services import store
+
+CORRELATION_HEADER = "X-Correlation-ID"
+
+_CORRELATION_ID = re.compile(r"^[0-9a-f]{32}$")
+_propagator = TraceContextTextMapPropagator()
+
+
+def _span_to_state(span: ReadableSpan) -> Dict[str, Any]:
+    return {
+        "name": span.name,
+        "spanId": format(span.context.span_id, "016x"),
+        "parentId": format(span.parent.span_id, "016x") if span.parent else None,
+        "start": span.start_time,
+        "end": span.end_time,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes),
+        "events": [
+            {"name": e.name, "timestamp": e.timestamp, "attributes": dict(e.attributes)}
+            for e in span.events
+        ],
+    }
+
+
+class _TimelineProcessor(SpanProcessor):
+    """
+    Writes finished spans to the shared store under their correlation id: one entry
+    per request, written when the request's root span ends.
+    """
+
+    def __init__(self):
+        # trace id -> finished spans of this process's open requests in that trace
+        self._open: Dict[int, List[Dict[str, Any]]] = {}
+        self._writes: Set[asyncio.Task] = set()
+
+    def on_end(self, span: ReadableSpan):
+        trace_id = span.context.trace_id
+        spans = self._open.setdefault(trace_id, [])
+        spans.append(_span_to_state(span))
+        if span.parent is not None and not span.parent.is_remote:
+            return
+        del self._open[trace_id]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Checkout spans end in request handlers; anything else has no timeline.
+            return
+        write = loop.create_task(
+            store.put(
+                store.TIMELINE,
+                f"{trace_id:032x}:{span.context.span_id:016x}",
+                spans,
+                tracing_configs.TIMELINE_TTL_SECONDS,
+            )
+        )
+        # Kept until done, so the write is not garbage-collected mid-flight.
+        self._writes.add(write)
+        write.add_done_callback(self._written)
+
+    def _written(self, write: asyncio.Task):
+        self._writes.discard(write)
+        if not write.cancelled() and write.exception() is not None:
+            print(f"Timeline spans not stored: {write.exception()}")
+
+
+def _build_provider():
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: tracing_configs.SERVICE_NAME})
+    )
+    provider.add_span_processor(_TimelineProcessor())
+
+    if tracing_configs.TRACE_FILE:
+        trace_file = open(tracing_configs.TRACE_FILE, "a")
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                ConsoleSpanExporter(
+                    out=trace_file,
+                    formatter=lambda span: span.to_json(indent=None) + "\n",
+                )
+            )
+        )
+    if tracing_configs.OTLP_ENABLED:
+        # Imported only when used; reads the standard OTEL_EXPORTER_OTLP_* settings.
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    return provider
+
+
+# Own provider rather than the global one, so importing this module does not change
+# tracing for the libraries the backend uses.
+_provider = _build_provider()
+tracer = _provider.get_tracer(__name__)
+
+
+def _checkout_context(headers) -> Any:
+    # A traceparent from the client wins; otherwise continue the trace named by the
+    # correlation id; otherwise start a new checkout.
+    context = _propagator.extract(headers)
+    if trace.get_current_span(context).get_span_context().is_valid:
+        return context
+
+    correlation_id = (headers.get(CORRELATION_HEADER) or "").lower()
+    if _CORRELATION_ID.match(correlation_id) and int(correlation_id, 16):
+        parent = SpanContext(
+            trace_id=int(correlation_id, 16),
+            span_id=secrets.randbits(64) or 1,
+            is_remote=True,
+            trace_flags=TraceFlags(TraceFlags.SAMPLED),
+        )
+        return trace.set_span_in_context(NonRecordingSpan(parent))
+    return None
+
+
+@contextmanager
+def checkout_span(name: str, request, **attributes):
+    """Root span of one checkout request, joined to the trace the client carried over."""
+    with tracer.start_as_current_span(
+        name,
+        context=_checkout_context(request.headers),
+        kind=trace.SpanKind.SERVER,
+        attributes={"http.route": request.url.path, **attributes},
+    ) as span:
+        yield span
+
+
+def span(name: str, **attributes):
+    """Child span of the current checkout stage."""
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def fail(span, message: str):
+    span.set_status(Status(StatusCode.ERROR, message))
+
+
+def correlation_id(span) -> str:
+    """The checkout's correlation id: its trace id as 32 hex digits."""
+    return format(span.get_span_context().trace_id, "032x")
+
+
+def correlation_headers(span) -> Dict[str, str]:
+    """Response headers that let the client continue this checkout's trace."""
+    headers: Dict[str, str] = {}
+    _propagator.inject(headers, trace.set_span_in_context(span))
+    headers[CORRELATION_HEADER] = correlation_id(span)
+    return headers
+
+
+async def get_timeline(correlation_id: str) -> Optional[List[Dict[str, Any]]]:
+    """A checkout's stored spans in start order (at most TIMELINE_MAX_SPANS), or None."""
+    if not _CORRELATION_ID.match(correlation_id.lower()):
+        return None
+    entries = await store.scan(store.TIMELINE, correlation_id.lower() + ":")
+    spans = sorted((span for _, spans in entries for span in spans), key=lambda s: s["start"])
+    return spans[: tracing_configs.TIMELINE_MAX_SPANS] or None
+
+
+def timeline_to_dict(correlation_id: str, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Spans of one checkout in start order, with offsets from the first span (ms)."""
+    span_ids = {s["spanId"] for s in spans}
+    start = spans[0]["start"]
+    end = max(s["end"] for s in spans)
+    return {
+        "correlationId": correlation_id.lower(),
+        "durationMs": (end - start) / 1e6,
+        "spans": [
+            {
+                "name": s["name"],
+                "spanId": s["spanId"],
+                # Requests continued from X-Correlation-ID alone have no parent span here
+                "parentId": s["parentId"] if s["parentId"] in span_ids else None,
+                "offsetMs": (s["start"] - start) / 1e6,
+                "durationMs": (s["end"] - s["start"]) / 1e6,
+                "status": s["status"],
+                "attributes": s["attributes"],
+                "events": [
+                    {
+                        "name": e["name"],
+                        "offsetMs": (e["timestamp"] - start) / 1e6,
+                        "attributes": e["attributes"],
+                    }
+                    for e in s["events"]
+                ],
+            }
+            for s in spans
+        ],
+    }
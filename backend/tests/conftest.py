@@ -0,0 +1,157 @@
+"""
+Shared fixtures for the backend tests. Nothing here needs a network: Mongo is
+mongomock behind a thin async wrapper matching the pymongo AsyncMongoClient calls
+the registry makes, and checkout state goes to a throwaway SQLite file.
+"""
+
+import os
+import tempfile
+
+import fastapi
+import mongomock
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+# Set before src.configs is imported.
+os.environ.setdefault("STORE_PATH", os.path.join(tempfile.mkdtemp(), "shared_state.sqlite3"))
+
+from src.configs import genius_configs, merchant_configs  # noqa: E402
+from src.router import router  # noqa: E402
+from src.services import compliance_index, registry  # noqa: E402
+
+
+class AsyncCollection:
+    """The AsyncCollection methods registry uses, over a mongomock collection."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.reads = 0
+
+    async def find_one(self, *args, **kwargs):
+        self.reads += 1
+        return self.collection.find_one(*args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return self.collection.update_one(*args, **kwargs)
+
+    async def replace_one(self, *args, **kwargs):
+        return self.collection.replace_one(*args, **kwargs)
+
+    async def delete_one(self, *args, **kwargs):
+        return self.collection.delete_one(*args, **kwargs)
+
+    async def create_indexes(self, indexes):
+        return self.collection.create_indexes(indexes)
+
+
+class AsyncDatabase:
+    """
+    Collections by name, plus watch(): each call pops the next item of `streams`,
+    raising it if it is an exception, otherwise opening a change stream over it.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self.collections = {}
+        self.streams = []
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = AsyncCollection(self.database[name])
+        return self.collections[name]
+
+    async def watch(self, pipeline):
+        stream = self.streams.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        return ChangeStream(stream)
+
+
+class ChangeStream:
+    def __init__(self, changes):
+        self.changes = list(changes)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.changes:
+            raise StopAsyncIteration
+        return self.changes.pop(0)
+
+
+class AsyncClient:
+    def __init__(self):
+        self.client = mongomock.MongoClient()
+        self.databases = {}
+
+    def __getitem__(self, name):
+        if name not in self.databases:
+            self.databases[name] = AsyncDatabase(self.client[name])
+        return self.databases[name]
+
+    async def close(self):
+        self.client.close()
+
+
+@pytest.fixture
+def configs(monkeypatch):
+    """Copies of the merchant/resource maps, so tests can edit the in-memory registry."""
+    for name in ("MERCHANT_ID_TO_MERCHANT_MAP", "MERCHANT_TO_CURRENCY_MAP", "RESOURCE_CATALOG"):
+        monkeypatch.setattr(merchant_configs, name, dict(getattr(merchant_configs, name)))
+    return merchant_configs
+
+
+@pytest.fixture
+def empty_registry(monkeypatch, configs):
+    """The in-memory registry (no MONGO_URI) with empty caches and no listeners."""
+    monkeypatch.setattr(registry, "_client", None)
+    monkeypatch.setattr(registry, "_listeners", [])
+    registry._merchant_cache.clear()
+    registry._resource_cache.clear()
+    yield registry
+    registry._merchant_cache.clear()
+    registry._resource_cache.clear()
+
+
+@pytest.fixture
+def mongo(empty_registry, monkeypatch):
+    """A mongomock-backed registry; yields the registry's database."""
+    client = AsyncClient()
+    monkeypatch.setattr(registry, "_client", client)
+    return registry.database()
+
+
+@pytest.fixture
+def client(empty_registry):
+    """The API routes over the in-memory registry, without the start-up tasks of src.main."""
+    app = fastapi.FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def dataset(monkeypatch, tmp_path):
+    """
+    Compliance data of its own: write(data, mtime) replaces the source, as an edit would,
+    and maps the rebuilt snapshot as the worker's index.
+    """
+    source, snapshot = tmp_path / "compliance.json", tmp_path / "compliance.snapshot"
+    monkeypatch.setattr(genius_configs, "SOURCE", str(source))
+    monkeypatch.setattr(genius_configs, "SNAPSHOT", str(snapshot))
+
+    def write(data, mtime, option=None):
+        source.write_bytes(orjson.dumps(data, option=option))
+        os.utime(source, (mtime, mtime))
+        index = compliance_index.load()
+        monkeypatch.setattr(compliance_index, "_index", index)
+        return index
+
+    return write
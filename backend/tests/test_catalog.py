@@ -0,0 +1,67 @@
+from src.configs import merchant_configs, orbital_configs
+from src.services import catalog, orbital_math, pricing
+from x402.encoding import safe_base64_encode
+from x402.types import EIP3009Authorization, ExactPaymentPayload, PaymentPayload
+
+
+def test_every_mapped_resource_is_priced(client):
+    for resource_id in merchant_configs.MERCHANT_ID_TO_MERCHANT_MAP:
+        response = client.get(f"/get-resource/{resource_id}")
+        assert response.status_code == 402
+        assert response.json()["accepts"][0]["maxAmountRequired"] == (
+            merchant_configs.PRICE.amount
+        )
+
+
+def test_the_frontend_article_is_for_sale(client):
+    # frontend/orbital-fe requests /get-resource/123
+    assert client.get("/get-resource/123").status_code == 402
+    assert client.get("/get-resource/5").status_code == 404
+
+
+def test_verify_defaults_to_the_frontend_article(client):
+    # frontend/orbital-fe calls /verify without resourceId; a payment on another network
+    # matches none of the article's accepts entries.
+    payment = PaymentPayload(
+        x402_version=1,
+        scheme="exact",
+        network="base",
+        payload=ExactPaymentPayload(
+            signature="0x" + "ab" * 65,
+            authorization=EIP3009Authorization(
+                from_="0x" + "ab" * 20,
+                to=merchant_configs.WALLET_ADDRESS,
+                value="1000",
+                valid_after="0",
+                valid_before="1999999999",
+                nonce="0x" + "22" * 32,
+            ),
+        ),
+    )
+    response = client.get(
+        "/verify",
+        headers={"X-PAYMENT": safe_base64_encode(payment.model_dump_json(by_alias=True))},
+    )
+    assert response.status_code == 402
+    assert response.json()["accepts"] == client.get("/get-resource/123").json()["accepts"]
+
+
+def test_other_tokens_are_priced_on_the_pools_sphere(monkeypatch):
+    # Reserves as getPoolStats returns them, normalized to 18 decimals
+    reserves = (1_000_000 * 10**18, 1_200_000 * 10**18, 900_000 * 10**18)
+    symbols = ("USDC", "USDT", "PYUSD")
+    monkeypatch.setattr(pricing, "_state", (("0x1", "0x2", "0x3"), symbols, reserves))
+    monkeypatch.setattr(pricing, "_conversions", {})
+
+    accepts = catalog.build_accepts(
+        merchant_configs.RESOURCE_CATALOG[("NYTIMES", 123)], symbols
+    )
+    prices = {entry.asset: int(entry.max_amount_required) for entry in accepts}
+    tokens = merchant_configs.PAYMENT_TOKENS
+    state = orbital_math.PoolState(reserves, orbital_configs.SWAP_FEE_BPS)
+    wanted = int(merchant_configs.PRICE.amount) * 10**12
+    for index, symbol in ((1, "USDT"), (2, "PYUSD")):
+        price = prices[tokens[symbol]["asset"]]
+        # Enough to swap into the USDC price on getAmountOut, and a unit less is not
+        assert state.amount_out(index, 0, price * 10**12) >= wanted
+        assert state.amount_out(index, 0, (price - 1) * 10**12) < wanted
@@ -0,0 +1,55 @@
+import os
+
+import orjson
+from src.configs import BACKEND_DIR
+from src.services import compliance
+
+with open(os.path.join(BACKEND_DIR, "genius_compliance_data.json"), "rb") as f:
+    DATASET = orjson.loads(f.read())
+
+
+def edited(coin: str, **issuance):
+    data = orjson.loads(orjson.dumps(DATASET))
+    for item in data["stablecoins"]:
+        if item["name"] == coin:
+            item["issuance"].update(issuance)
+    return data
+
+
+def test_same_day_edits_get_later_versions(dataset):
+    # 09:00 and 17:00 UTC on the same day
+    morning = dataset(DATASET, 1754384400)
+    seen = morning.version
+    assert seen == "2025-08-05T09:00:00.000000+00:00"
+    assert compliance.get_changed_coins(seen) == []
+
+    evening = dataset(edited("USDT", total_tokens_issued=1), 1754413200)
+    assert evening.version == "2025-08-05T17:00:00.000000+00:00"
+    assert compliance.get_changed_coins(seen) == ["USDT"]
+    assert evening.get_updated("USDC") == seen
+    assert evening.get_report_version("USDT") != morning.get_report_version("USDT")
+
+    # A bare date is midnight UTC; an empty since is everything
+    assert len(compliance.get_changed_coins("2025-08-05")) == len(DATASET["stablecoins"])
+    assert compliance.get_changed_coins("") == evening.names()
+
+
+def test_versions_only_increase(dataset):
+    first = dataset(DATASET, 1754413200)
+    # The source's clock went back, e.g. an older copy was restored
+    second = dataset(edited("USDC", total_tokens_issued=1), 1754384400)
+    assert compliance.parse_version(second.version) > compliance.parse_version(first.version)
+    assert compliance.get_changed_coins(first.version) == ["USDC"]
+
+    # A source edit that changes no report (here, only its layout) keeps the version
+    reformatted = dataset(edited("USDC", total_tokens_issued=1), 1754500000, orjson.OPT_INDENT_2)
+    assert reformatted.source_digest != second.source_digest
+    assert reformatted.version == second.version
+
+
+def test_invalid_since_is_a_bad_request(dataset, client):
+    index = dataset(DATASET, 1754384400)
+    assert client.get("/coin-data/changes", params={"since": "x"}).status_code == 400
+    response = client.get("/coin-data/changes", params={"since": index.version})
+    assert response.status_code == 200
+    assert response.json() == {"version": index.version, "changes": []}
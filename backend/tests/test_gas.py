@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import pytest
+from src.cache import LRUCache
+from src.configs import orbital_configs
+from src.services import gas
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Fresh estimate state, and eth_estimateGas batches that take 200ms, each one kept."""
+    sent = []
+
+    def send_batch(transactions):
+        sent.append([tx["data"] for tx in transactions])
+        time.sleep(0.2)
+        return [21_000 + len(tx["data"]) for tx in transactions]
+
+    monkeypatch.setattr(gas, "_estimates", LRUCache(16, 60, name="test-gas-estimates"))
+    monkeypatch.setattr(gas, "_pending", {})
+    monkeypatch.setattr(gas, "_flush_task", None)
+    monkeypatch.setattr(gas, "_send_batch", send_batch)
+    monkeypatch.setattr(orbital_configs, "GAS_BATCH_WINDOW_SECONDS", 0.01)
+    return sent
+
+
+def test_concurrent_callers_share_one_batch(batches):
+    async def scenario():
+        return await asyncio.gather(
+            gas.estimate_gas("a", {"data": "0x"}),
+            gas.estimate_gas("a", {"data": "0x"}),
+            gas.estimate_gas("b", {"data": "0x00"}),
+        )
+
+    assert asyncio.run(scenario()) == [21_002, 21_002, 21_004]
+    assert batches == [["0x", "0x00"]]
+
+
+def test_estimate_requested_during_a_batch_goes_out_in_the_next(batches):
+    async def scenario():
+        first = asyncio.create_task(gas.estimate_gas("a", {"data": "0x"}))
+        await asyncio.sleep(0.05)
+        # The batch with "a" is in flight
+        second = asyncio.create_task(gas.estimate_gas("b", {"data": "0x00"}))
+        return await asyncio.wait_for(asyncio.gather(first, second), 2)
+
+    assert asyncio.run(scenario()) == [21_002, 21_004]
+    assert batches == [["0x"], ["0x00"]]
+    assert not gas._pending
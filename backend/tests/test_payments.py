@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+
+import orjson
+import pytest
+from src.configs import bridge_configs, store_configs
+from src.services import payments
+
+# Receipts and destination logs in the shape eth_getTransactionReceipt and eth_getLogs
+# return them: a CCTP v1 depositForBurn from ethereum-sepolia to base-sepolia (with the
+# USDC transfers around it) and an OFT send from ethereum-sepolia to base-sepolia.
+with open(os.path.join(os.path.dirname(__file__), "data", "bridge_receipts.json")) as f:
+    RECORDED = json.load(f)
+
+
+@pytest.fixture
+def chains(empty_registry, monkeypatch, tmp_path):
+    """
+    A fresh store, and JSON-RPC answered from RECORDED: receipts on the source chain,
+    the destination head and logs once `minted` is set.
+    """
+    monkeypatch.setattr(store_configs, "SQLITE_PATH", str(tmp_path / "shared_state.sqlite3"))
+    monkeypatch.setattr(bridge_configs, "STREAM_POLL_SECONDS", 0.01)
+    state = {"minted": False, "attestations": [], "calls": []}
+
+    def rpc_batch(chain, calls):
+        state["calls"].append((chain, [method for method, _ in calls]))
+        receipts = {r["receipt"]["transactionHash"]: r["receipt"] for r in RECORDED.values()}
+        results = []
+        for method, params in calls:
+            if method == "eth_getTransactionReceipt":
+                results.append(receipts.get(params[0]))
+            elif method == "eth_blockNumber":
+                results.append(max(r["destinationHead"] for r in RECORDED.values()))
+            else:
+                topic = params[0]["topics"][0]
+                logs = [
+                    log
+                    for r in RECORDED.values()
+                    for log in r["destinationLogs"]
+                    if log["topics"][0] == topic
+                ]
+                results.append(logs if state["minted"] else [])
+        return results
+
+    def fetch_attestation(message_hash):
+        state["attestations"].append(message_hash)
+        if len(state["attestations"]) == 1:
+            return {"attestation": "PENDING", "status": "pending_confirmations"}
+        return RECORDED["cctp"]["attestation"]
+
+    monkeypatch.setattr(payments, "_rpc_batch", rpc_batch)
+    monkeypatch.setattr(payments, "_fetch_attestation", fetch_attestation)
+    return state
+
+
+async def _track(kind, rounds, chains):
+    """Register the recorded payment, stream its status and poll `rounds` times."""
+    recorded = RECORDED[kind]
+    payment = await payments.register(
+        kind, recorded["sourceChain"], recorded["receipt"]["transactionHash"]
+    )
+    events = []
+
+    async def stream():
+        async for event in payments.event_stream(await payments.get(payment.id)):
+            events.append(orjson.loads(event[len(b"data: ") :]))
+
+    streaming = asyncio.create_task(stream())
+    for round in range(rounds):
+        if round == rounds - 1:
+            chains["minted"] = True
+        await payments.poll()
+        await asyncio.sleep(0.05)
+    await asyncio.wait_for(streaming, 1)
+    return events
+
+
+def test_cctp_burn_is_followed_to_the_mint(chains):
+    events = asyncio.run(_track(payments.CCTP, 4, chains))
+
+    assert [event["stage"] for event in events] == ["submitted", "burned", "attested", "minted"]
+    burned, minted = events[1], events[-1]
+    assert burned["destinationChain"] == "base-sepolia"
+    assert burned["amount"] == "2500000"
+    assert burned["recipient"] == "0x5a1b0ed2b7ea8e3bb7f4c6a0ef8d9c4b2a6e3f10"
+    assert burned["nonce"] == 258714
+    assert burned["messageHash"] == chains["attestations"][0]
+    # The MessageSent payload is the message relayed with the attestation.
+    assert burned["message"].startswith("0x" + "00000000" + "00000000" + "00000006")
+    assert minted["attestation"] == RECORDED["cctp"]["attestation"]["attestation"]
+    assert minted["destinationTx"] == RECORDED["cctp"]["destinationLogs"][0]["transactionHash"]
+
+
+def test_oft_send_is_followed_to_the_receive(chains):
+    # The first destination round only notes the head to search from.
+    events = asyncio.run(_track(payments.LAYERZERO, 3, chains))
+
+    assert [event["stage"] for event in events] == ["submitted", "sent", "minted"]
+    _, sent, minted = events
+    assert sent["destinationChain"] == "base-sepolia"
+    assert sent["amount"] == str(999_999_999_999_000_000)
+    assert sent["guid"] == RECORDED["layerzero"]["destinationLogs"][0]["topics"][1]
+    assert minted["recipient"] == "0x5a1b0ed2b7ea8e3bb7f4c6a0ef8d9c4b2a6e3f10"
+    assert not chains["attestations"]
+
+
+def test_reverted_source_fails_the_payment(chains, monkeypatch):
+    reverted = dict(RECORDED["cctp"]["receipt"], status="0x0")
+    monkeypatch.setitem(RECORDED, "cctp", dict(RECORDED["cctp"], receipt=reverted))
+
+    events = asyncio.run(_track(payments.CCTP, 1, chains))
+    assert events[-1]["stage"] == payments.FAILED
+    assert events[-1]["error"] == "Source transaction reverted"
+
+
+def test_one_rpc_batch_per_chain_and_round(chains):
+    async def scenario():
+        for kind, recorded in RECORDED.items():
+            await payments.register(
+                kind, recorded["sourceChain"], recorded["receipt"]["transactionHash"]
+            )
+        # Receipts, then the destination heads to search from
+        await payments.poll()
+        await payments.poll()
+        chains["calls"].clear()
+        await payments.poll()
+
+    asyncio.run(scenario())
+    # Both payments wait on base-sepolia: one batch with the head and both log queries.
+    assert chains["calls"] == [
+        ("base-sepolia", ["eth_blockNumber", "eth_getLogs", "eth_getLogs"])
+    ]
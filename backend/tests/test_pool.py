@@ -0,0 +1,141 @@
+import copy
+import random
+
+import pytest
+from src.services.pool import OrbitalPool, tick_from_capital
+
+DEPEG_PRICES = (0.97, 0.9, 0.8, 0.6, 0.3)
+
+
+def make_pool(depeg_prices=DEPEG_PRICES, capital=1000.0, token_count=3, seed=0):
+    """Equal deposits at the given depeg tolerances, added in shuffled order."""
+    depeg_prices = list(depeg_prices)
+    random.Random(seed).shuffle(depeg_prices)
+    pool = OrbitalPool(token_count)
+    for depeg_price in depeg_prices:
+        pool.add_liquidity(*tick_from_capital(capital, depeg_price, token_count))
+    return pool
+
+
+def assert_classified(pool):
+    """Boundary ticks are exactly those whose k/r the interior projection has reached."""
+    projection = pool.state().interior_projection()
+    for tick in pool.ticks:
+        if tick.active:
+            assert tick.is_interior == (tick.normalized_boundary > projection * (1 + 1e-9))
+
+
+def test_ticks_are_classified_by_normalized_boundary():
+    pool = make_pool()
+    assert all(tick.is_interior for tick in pool.ticks)
+    for amount in (50.0, 100.0, 200.0):
+        pool.swap(0, 1, amount)
+        assert_classified(pool)
+    boundary = sum(not tick.is_interior for tick in pool.ticks)
+    assert 0 < boundary < len(pool.ticks)
+
+    # Trading back brings them off their boundary again.
+    pool.swap(1, 0, 300.0)
+    assert_classified(pool)
+    assert sum(not tick.is_interior for tick in pool.ticks) < boundary
+
+
+def test_swaps_are_segmented_exactly_at_crossings():
+    pool = make_pool()
+    segments = pool.trace(0, 1, 350.0)
+    crossings = [segment for segment in segments if segment.crossing]
+    assert len(crossings) >= 2
+
+    # Each crossing segment ends on the threshold of the tick it moves.
+    thresholds = sorted(tick.normalized_boundary for tick in pool.ticks)
+    for segment in crossings:
+        _, after = segment.state.apply_net(0, 1, segment.length)
+        assert min(abs(after.interior_projection() - t) for t in thresholds) < 1e-9
+
+    # The invariant holds on both sides of every crossing.
+    pool.swap(0, 1, 350.0)
+    assert abs(pool.state().invariant()) < 1e-9 * pool.state().interior_radius**2
+
+
+def test_one_swap_pays_what_many_small_ones_do():
+    one, many = make_pool(), make_pool()
+    amount_out = one.swap(0, 1, 350.0)
+    small_swaps = sum(many.swap(0, 1, 3.5) for _ in range(100))
+    assert amount_out == pytest.approx(small_swaps, rel=1e-9)
+    assert one.reserves == pytest.approx(many.reserves, rel=1e-9)
+    assert [tick.is_interior for tick in one.ticks] == [tick.is_interior for tick in many.ticks]
+
+
+def test_reserves_and_fees_are_conserved():
+    pool = make_pool()
+    before = list(pool.reserves)
+    amount_out = pool.swap(0, 1, 200.0)
+    fee = 200.0 * pool.fee_bps / 10000
+    assert pool.reserves[0] == pytest.approx(before[0] + 200.0 - fee)
+    assert pool.reserves[1] == pytest.approx(before[1] - amount_out)
+    assert pool.reserves[2] == pytest.approx(before[2])
+    assert pool.fees == pytest.approx([fee, 0.0, 0.0])
+
+    # The ticks' expanded reserves add up to the pool's, interior and boundary alike.
+    assert {tick.is_interior for tick in pool.ticks} == {True, False}
+    expanded = [pool.tick_reserves(i) for i in range(len(pool.ticks))]
+    for token, total in enumerate(pool.reserves):
+        assert sum(reserves[token] for reserves in expanded) == pytest.approx(total, rel=1e-9)
+
+    withdrawn = pool.remove_liquidity(len(pool.ticks) - 1)
+    assert [a + b for a, b in zip(pool.reserves, withdrawn)] == pytest.approx(
+        [sum(reserves[token] for reserves in expanded) for token in range(3)], rel=1e-9
+    )
+    with pytest.raises(ValueError, match="Tick not active"):
+        pool.tick_reserves(len(pool.ticks) - 1)
+
+
+def test_swap_path_does_not_walk_the_ticks():
+    class CountingList(list):
+        reads = 0
+
+        def __getitem__(self, index):
+            CountingList.reads += 1
+            return super().__getitem__(index)
+
+        def __iter__(self):
+            CountingList.reads += len(self)
+            return super().__iter__()
+
+    # 10,000 ticks at five depeg tolerances consolidate like the five-tick pool.
+    small = make_pool(capital=2000.0)
+    large = make_pool(DEPEG_PRICES * 2000, capital=1.0)
+    large.ticks = CountingList(large.ticks)
+
+    trade = 350.0
+    assert large.state().interior_radius == pytest.approx(small.state().interior_radius)
+    assert large.trace(0, 1, 10.0)[-1].crossing == 0
+    assert large.swap(0, 1, 10.0) == pytest.approx(small.swap(0, 1, 10.0), rel=1e-9)
+    assert CountingList.reads == 0
+
+    # A crossing touches only the ticks it moves: at most every tick once per crossing.
+    crossings = sum(bool(segment.crossing) for segment in large.trace(0, 1, trade))
+    reads = CountingList.reads
+    assert large.swap(0, 1, trade) == pytest.approx(small.swap(0, 1, trade), rel=1e-9)
+    reads = CountingList.reads - reads
+    moved = sum(not tick.is_interior for tick in list.__iter__(large.ticks))
+    assert 0 < moved < len(large.ticks)
+    assert 0 < reads <= moved * crossings
+
+    # Expanding one tick reads that tick alone.
+    reads = CountingList.reads
+    large.tick_reserves(0)
+    assert CountingList.reads - reads == 1
+
+
+def test_checkpoint_rolls_back_swaps():
+    pool = make_pool()
+    saved = pool.checkpoint()
+    expected = copy.deepcopy(pool)
+    pool.swap(0, 1, 350.0)
+    pool.rollback(saved)
+    assert pool.checkpoint() == saved
+    assert [tick.is_interior for tick in pool.ticks] == [
+        tick.is_interior for tick in expected.ticks
+    ]
+    assert pool.swap(0, 1, 350.0) == expected.swap(0, 1, 350.0)
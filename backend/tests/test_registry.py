@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+from pymongo.errors import OperationFailure
+from src import cache
+from src.cache import MISSING, LRUCache
+from src.configs import mongo_configs
+from src.services import registry
+
+RESOURCE_ID = 1000
+
+
+def resources(database):
+    return database[mongo_configs.RESOURCES_COLLECTION]
+
+
+def merchants(database):
+    return database[mongo_configs.MERCHANTS_COLLECTION]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.monotonic for the caches."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_cache_evicts_least_recently_used():
+    lru = LRUCache(2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1  # "b" is now the least recently used
+    lru.put("c", 3)
+    assert lru.get("b") is MISSING
+    assert (lru.get("a"), lru.get("c")) == (1, 3)
+    assert (lru.hits, lru.misses) == (3, 1)
+
+
+def test_lru_cache_expires_entries(clock):
+    lru = LRUCache(10, ttl_seconds=5)
+    lru.put("a", None)
+    assert lru.get("a") is None  # None is a cached value, not a miss
+    clock[0] += 5.1
+    assert lru.get("a") is MISSING
+
+
+def test_seed_from_configs_inserts_missing_entries_only(mongo, configs):
+    asyncio.run(registry.ensure_indexes())
+    merchants(mongo).collection.insert_one(
+        {"_id": "NYTIMES", "name": "NYTIMES", "currencies": ["USDT"]}
+    )
+
+    asyncio.run(registry.seed_from_configs())
+    asyncio.run(registry.seed_from_configs())
+
+    # An edited merchant is kept; the resource it did not have is added once.
+    assert merchants(mongo).collection.find_one({"_id": "NYTIMES"})["currencies"] == ["USDT"]
+    assert resources(mongo).collection.count_documents({}) == len(configs.RESOURCE_CATALOG)
+    resource = asyncio.run(registry.get_resource(RESOURCE_ID))
+    assert resource["merchant"] == "NYTIMES"
+    assert resource["price"] == configs.RESOURCE_CATALOG[("NYTIMES", RESOURCE_ID)]["price"]
+
+
+def test_reads_go_through_the_cache(mongo, configs, clock):
+    asyncio.run(registry.seed_from_configs())
+
+    for _ in range(3):
+        assert asyncio.run(registry.get_resource(RESOURCE_ID))["resource_id"] == RESOURCE_ID
+        assert asyncio.run(registry.get_resource(1)) is None
+    # One database read per id, unknown ids included
+    assert resources(mongo).reads == 2
+
+    clock[0] += mongo_configs.CACHE_TTL_SECONDS + 1
+    asyncio.run(registry.get_resource(RESOURCE_ID))
+    assert resources(mongo).reads == 3
+
+
+def test_cache_keeps_most_recently_used_resources(mongo, monkeypatch):
+    monkeypatch.setattr(registry, "_resource_cache", LRUCache(2, mongo_configs.CACHE_TTL_SECONDS))
+
+    for resource_id in (1, 2, 1, 3):  # 2 is evicted by 3
+        asyncio.run(registry.get_resource(resource_id))
+    reads = resources(mongo).reads
+    asyncio.run(registry.get_resource(1))
+    asyncio.run(registry.get_resource(3))
+    assert resources(mongo).reads == reads
+    asyncio.run(registry.get_resource(2))
+    assert resources(mongo).reads == reads + 1
+
+
+def test_writes_invalidate_and_notify(mongo):
+    events = []
+    registry.subscribe(lambda kind, key: events.append((kind, key)))
+    assert asyncio.run(registry.get_resource(7)) is None
+
+    asyncio.run(
+        registry.upsert_resource("NYTIMES", 7, "2000", "0xasset", "base-sepolia", "Archive")
+    )
+    assert asyncio.run(registry.get_resource(7))["price"] == "2000"
+    asyncio.run(registry.upsert_merchant("NYTIMES", ["USDC"]))
+    assert asyncio.run(registry.get_merchant("NYTIMES"))["currencies"] == ["USDC"]
+    asyncio.run(registry.delete_resource(7))
+    assert asyncio.run(registry.get_resource(7)) is None
+
+    assert events == [("resource", 7), ("merchant", "NYTIMES"), ("resource", 7)]
+
+
+def test_in_memory_registry_serves_merchant_configs(empty_registry, configs):
+    assert asyncio.run(registry.get_merchant("NYTIMES"))["currencies"] == (
+        configs.MERCHANT_TO_CURRENCY_MAP["NYTIMES"]
+    )
+    assert asyncio.run(registry.get_resource(RESOURCE_ID))["merchant"] == "NYTIMES"
+    assert asyncio.run(registry.get_merchant("UNKNOWN")) is None
+
+    asyncio.run(
+        registry.upsert_resource("NYTIMES", 7, "2000", "0xasset", "base-sepolia", "Archive")
+    )
+    assert configs.RESOURCE_CATALOG[("NYTIMES", 7)]["price"] == "2000"
+    assert asyncio.run(registry.get_resource(7))["price"] == "2000"
+    asyncio.run(registry.delete_resource(7))
+    assert asyncio.run(registry.get_resource(7)) is None
+
+
+def test_in_memory_registry_does_not_watch(empty_registry):
+    asyncio.run(asyncio.wait_for(registry.watch_changes(), 1))
+
+
+def test_watch_changes_invalidates_changed_entries(mongo):
+    asyncio.run(registry.seed_from_configs())
+    asyncio.run(registry.get_resource(RESOURCE_ID))
+    asyncio.run(registry.get_merchant("NYTIMES"))
+    events = []
+    registry.subscribe(lambda kind, key: events.append((kind, key)))
+
+    resources(mongo).collection.update_one({"_id": RESOURCE_ID}, {"$set": {"price": "5"}})
+    mongo.streams = [
+        [
+            {
+                "ns": {"coll": mongo_configs.RESOURCES_COLLECTION},
+                "documentKey": {"_id": RESOURCE_ID},
+            }
+        ],
+        # The stream ends; reopening it finds a standalone server.
+        OperationFailure("The $changeStream stage is only supported on replica sets", 40573),
+    ]
+    asyncio.run(asyncio.wait_for(registry.watch_changes(), 1))
+
+    assert events == [("all", None), ("resource", RESOURCE_ID)]
+    assert asyncio.run(registry.get_resource(RESOURCE_ID))["price"] == "5"
+
+
+def test_watch_changes_retries_until_unsupported(mongo, monkeypatch):
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(registry.asyncio, "sleep", sleep)
+    mongo.streams = [
+        OperationFailure("not primary", 10107),
+        OperationFailure("The $changeStream stage is only supported on replica sets", 40573),
+        [],  # Never reached: 40573 returns
+    ]
+    asyncio.run(registry.watch_changes())
+
+    assert sleeps == [5]
+    assert len(mongo.streams) == 1
@@ -0,0 +1,95 @@
+import os
+
+import brotli
+import orjson
+import pytest
+from src import responses
+from src.configs import BACKEND_DIR
+
+with open(os.path.join(BACKEND_DIR, "genius_compliance_data.json"), "rb") as f:
+    DATASET = orjson.loads(f.read())
+USDC = next(item for item in DATASET["stablecoins"] if item["name"] == "USDC")
+
+
+@pytest.fixture
+def coin_data(dataset, client):
+    dataset(DATASET, 1754384400)
+    return client
+
+
+def test_the_best_accepted_encoding_is_served(coin_data):
+    for accept, coding in (
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("*", "br"),
+        ("", None),
+    ):
+        response = coin_data.get("/coin-data/USDC", headers={"Accept-Encoding": accept})
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == coding
+        assert response.headers["vary"] == "Accept-Encoding"
+        # The client decodes every variant to the same report
+        assert response.json() == USDC
+
+
+def test_variants_are_precompressed_once():
+    variants = responses.encode_payload(USDC)
+    assert set(variants) == {"identity", "gzip", "br"}
+    assert brotli.decompress(variants["br"]) == variants["identity"]
+
+    small = responses.encode_payload({"ok": True})
+    assert set(small) == {"identity"}
+    assert responses.choose_encoding("br, gzip", small) == "identity"
+
+
+def test_a_matching_etag_gets_a_304(coin_data):
+    first = coin_data.get("/coin-data/USDC", headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+
+    again = coin_data.get("/coin-data/USDC", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    # Any encoding of the same body matches, and so does a weak tag among others
+    gzipped = coin_data.get("/coin-data/USDC", headers={"Accept-Encoding": "gzip"})
+    gzip_tag = gzipped.headers["etag"]
+    assert gzip_tag != etag
+
+    def status(coin, tags):
+        return coin_data.get(f"/coin-data/{coin}", headers={"If-None-Match": tags}).status_code
+
+    for tags in (gzip_tag, f'"other", W/{etag}', "*"):
+        assert status("USDC", tags) == 304
+    assert status("USDC", '"other"') == 200
+    assert status("USDT", etag) == 200
+
+
+def test_changes_feed_filters_by_since_and_revalidates(dataset, client):
+    seen = dataset(DATASET, 1754384400).version
+    everything = client.get("/coin-data/changes")
+    assert [change["name"] for change in everything.json()["changes"]] == [
+        item["name"] for item in DATASET["stablecoins"]
+    ]
+    assert client.get("/coin-data/changes", params={"since": seen}).json()["changes"] == []
+
+    edited = orjson.loads(orjson.dumps(DATASET))
+    next(item for item in edited["stablecoins"] if item["name"] == "PYUSD")["issuance"][
+        "total_tokens_issued"
+    ] = 1
+    latest = dataset(edited, 1754413200).version
+
+    changes = client.get("/coin-data/changes", params={"since": seen})
+    body = changes.json()
+    assert body["version"] == latest
+    assert [change["name"] for change in body["changes"]] == ["PYUSD"]
+    assert body["changes"][0]["data"]["issuance"]["total_tokens_issued"] == 1
+
+    etag = changes.headers["etag"]
+    revalidated = client.get(
+        "/coin-data/changes", params={"since": seen}, headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert client.get("/coin-data/changes", params={"since": latest}).json() == {
+        "version": latest,
+        "changes": [],
+    }
@@ -0,0 +1,75 @@
+import copy
+
+import pytest
+from src.configs import orbital_configs
+from src.services import pricing, routing
+from src.services.pool import OrbitalPool, tick_from_capital
+
+SYMBOLS = ("USDC", "USDT", "DAI")
+
+
+def make_pool(capital=1000.0, depeg_prices=(0.9, 0.5)) -> OrbitalPool:
+    """Equal ticks; the 0.9 one reaches its boundary on a USDC -> USDT trade of ~100."""
+    pool = OrbitalPool(len(SYMBOLS), symbols=SYMBOLS)
+    for depeg_price in depeg_prices:
+        pool.add_liquidity(*tick_from_capital(capital, depeg_price, len(SYMBOLS)))
+    return pool
+
+
+@pytest.fixture
+def markets():
+    return {"a": (SYMBOLS, make_pool()), "b": (SYMBOLS, make_pool())}
+
+
+def test_split_beats_a_single_route_across_a_crossing(markets):
+    amount_in = 150.0
+    alone = copy.deepcopy(markets["a"][1])
+    crossings = [segment.crossing for segment in alone.trace(0, 1, amount_in)]
+    assert crossings == [1, 0]
+    single = alone.swap(0, 1, amount_in)
+
+    plan = routing.plan_split(markets, "USDC", "USDT", amount_in)
+
+    assert plan.direct_amount_out == pytest.approx(single, rel=1e-9)
+    assert plan.amount_out > single * 1.1
+    assert {leg.hops[0].pool for leg in plan.legs} == {"a", "b"}
+
+    # Each leg swapped in one go through its own pool pays what the plan expects.
+    executed = 0.0
+    for leg in plan.legs:
+        pool = copy.deepcopy(markets[leg.hops[0].pool][1])
+        amount = leg.amount_in
+        for hop in leg.hops:
+            amount = pool.swap(pool.index(hop.token_in), pool.index(hop.token_out), amount)
+        executed += amount
+    assert executed == pytest.approx(plan.amount_out, rel=1e-6)
+
+
+def test_plan_leaves_the_pools_as_they_were(markets):
+    before = {name: pool.checkpoint() for name, (_, pool) in markets.items()}
+    routing.plan_split(markets, "USDC", "USDT", 150.0)
+    with pytest.raises(ValueError, match="Insufficient liquidity"):
+        routing.plan_split(markets, "USDC", "USDT", 10_000.0)
+    assert {name: pool.checkpoint() for name, (_, pool) in markets.items()} == before
+    assert [tick.is_interior for tick in markets["a"][1].ticks] == [True, True]
+
+
+def test_live_market_crosses_the_deployed_ticks(monkeypatch):
+    deployed = make_pool()
+    deployed.swap(0, 1, 150.0)
+    scale = 10**orbital_configs.INTERNAL_DECIMALS
+    reserves = tuple(int(x * scale) for x in deployed.reserves)
+    ticks = tuple(
+        (int(tick.radius * scale), int(tick.plane_constant * scale))
+        for tick in deployed.ticks
+    )
+    monkeypatch.setattr(pricing, "_state", (("0x1", "0x2", "0x3"), SYMBOLS, reserves))
+    monkeypatch.setattr(pricing, "_ticks", ticks)
+
+    ((symbols, pool),) = routing.get_live_markets().values()
+    assert symbols == SYMBOLS
+    assert [tick.is_interior for tick in pool.ticks] == [False, True]
+    # Back across the crossing the other way.
+    segments = pool.trace(1, 0, 300.0)
+    assert [segment.crossing for segment in segments][0] == -1
+    assert pool.swap(1, 0, 300.0) == pytest.approx(deployed.swap(1, 0, 300.0), rel=1e-6)
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from src import router, tracing
+from src.configs import merchant_configs, store_configs
+from src.services import payments, store
+from starlette.requests import Request
+from x402.encoding import safe_base64_encode
+from x402.types import EIP3009Authorization, ExactPaymentPayload, PaymentPayload
+
+RESOURCE_ID = 1000
+PAYER = "0x" + "ab" * 20
+NONCE = "0x" + "22" * 32
+TX_HASH = "0x" + "ab" * 32
+
+
+@pytest.fixture
+def shared_state(empty_registry, monkeypatch, tmp_path):
+    """A SQLite store of its own, as every worker on the host would see it."""
+    monkeypatch.setattr(store_configs, "SQLITE_PATH", str(tmp_path / "shared_state.sqlite3"))
+    return store
+
+
+def x_payment(payer=PAYER, nonce=NONCE) -> str:
+    payment = PaymentPayload(
+        x402_version=1,
+        scheme="exact",
+        network=merchant_configs.NETWORK,
+        payload=ExactPaymentPayload(
+            signature="0x" + "ab" * 65,
+            authorization=EIP3009Authorization(
+                from_=payer,
+                to=merchant_configs.WALLET_ADDRESS,
+                value="1000",
+                valid_after="0",
+                valid_before="1999999999",
+                nonce=nonce,
+            ),
+        ),
+    )
+    return safe_base64_encode(payment.model_dump_json(by_alias=True))
+
+
+def test_scan_returns_live_entries_with_the_prefix(shared_state):
+    async def scenario():
+        await store.put(store.TIMELINE, "aa:1", [1], 60)
+        await store.put(store.TIMELINE, "aa:2", [2], 60)
+        await store.put(store.TIMELINE, "ab:1", [3], 60)
+        await store.put(store.TIMELINE, "aa:3", [4], -1)  # Expired
+        await store.put(store.PAYMENT, "aa:4", [5], 60)
+        return await store.scan(store.TIMELINE, "aa:"), await store.scan(store.TIMELINE)
+
+    with_prefix, every = asyncio.run(scenario())
+    assert sorted(with_prefix) == [("aa:1", [1]), ("aa:2", [2])]
+    assert len(every) == 3
+
+
+def test_register_returns_the_payment_already_tracked(shared_state):
+    async def scenario():
+        first = await payments.register(payments.CCTP, "base-sepolia", TX_HASH)
+        again = await payments.register(payments.CCTP, "base-sepolia", "0x" + TX_HASH[2:].upper())
+        return first, again, await store.scan(store.PAYMENT)
+
+    first, again, stored = asyncio.run(scenario())
+    assert again.id == first.id
+    assert [key for key, _ in stored] == [first.id]
+
+
+def test_payment_state_round_trips_through_the_store(shared_state):
+    async def scenario():
+        payment = await payments.register(payments.CCTP, "base-sepolia", TX_HASH)
+        payment.message = b"\x00\x01"
+        payment.amount = 10**6
+        await payments._save(payment)
+        return payment, await payments.get(payment.id)
+
+    payment, stored = asyncio.run(scenario())
+    assert stored == payment
+    assert asyncio.run(payments.get("unknown")) is None
+
+
+def test_entitlement_needs_the_settled_payment_of_the_payer(shared_state):
+    async def scenario():
+        await store.put(
+            store.ENTITLEMENT,
+            router.entitlement_key("0x" + PAYER[2:].upper(), RESOURCE_ID),
+            {"nonce": NONCE, "checkout": "0" * 32},
+            60,
+        )
+        return [
+            await router._is_entitled(x_payment(), RESOURCE_ID),
+            await router._is_entitled(x_payment(nonce="0x" + "33" * 32), RESOURCE_ID),
+            await router._is_entitled(x_payment(payer="0x" + "44" * 20), RESOURCE_ID),
+            await router._is_entitled(x_payment(), RESOURCE_ID + 1),
+            await router._is_entitled("not base64", RESOURCE_ID),
+        ]
+
+    assert asyncio.run(scenario()) == [True, False, False, False, False]
+
+
+def test_get_resource_serves_an_entitled_payer(shared_state):
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": f"/get-resource/{RESOURCE_ID}",
+            "query_string": b"",
+            "headers": [(b"x-payment", x_payment().encode())],
+        }
+    )
+
+    async def scenario():
+        await store.put(
+            store.ENTITLEMENT,
+            router.entitlement_key(PAYER, RESOURCE_ID),
+            {"nonce": NONCE, "checkout": "0" * 32},
+            60,
+        )
+        return await router.get_resource(RESOURCE_ID, request)
+
+    assert asyncio.run(scenario()).status_code == 200
+
+
+def test_timeline_is_read_back_from_the_store(shared_state):
+    async def scenario():
+        with tracing.span("checkout.test") as root:
+            with tracing.span("checkout.test.child"):
+                pass
+        correlation_id = tracing.correlation_id(root)
+        # The request's spans are written once its root span has ended.
+        await asyncio.gather(*asyncio.all_tasks() - {asyncio.current_task()})
+        return correlation_id, await tracing.get_timeline(correlation_id)
+
+    correlation_id, spans = asyncio.run(scenario())
+    assert [span["name"] for span in spans] == ["checkout.test", "checkout.test.child"]
+    assert tracing.timeline_to_dict(correlation_id, spans)
+    assert asyncio.run(tracing.get_timeline("f" * 32)) is None
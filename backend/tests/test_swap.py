@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from src.services import pricing, swap
+from web3.exceptions import ContractLogicError
+
+ADDRESSES = ("0x" + "a1" * 20, "0x" + "b2" * 20, "0x" + "c3" * 20)
+STATE = (ADDRESSES, ("USDC", "USDT", "PYUSD"), (10**24, 10**24, 10**24))
+
+
+@pytest.fixture
+def quotes(monkeypatch):
+    """The pool snapshot, and getQuote answered by `quotes["answer"]` with each call kept."""
+    state = {"calls": [], "answer": lambda index_in, index_out, amount_in: amount_in - 1}
+
+    def read_quote(index_in, index_out, amount_in):
+        state["calls"].append((index_in, index_out, amount_in))
+        return state["answer"](index_in, index_out, amount_in)
+
+    monkeypatch.setattr(pricing, "_state", STATE)
+    monkeypatch.setattr(pricing, "read_quote", read_quote)
+    return state
+
+
+def test_quote_is_read_from_the_pool(quotes):
+    amount_out = asyncio.run(swap.quote(ADDRESSES[2].upper(), ADDRESSES[0], 5_000_000))
+    assert amount_out == 4_999_999
+    assert quotes["calls"] == [(2, 0, 5_000_000)]
+
+
+def test_quote_errors(quotes, monkeypatch):
+    with pytest.raises(ValueError, match="Token not in pool"):
+        asyncio.run(swap.quote("0x" + "d4" * 20, ADDRESSES[0], 1))
+
+    def revert(*_):
+        raise ContractLogicError("execution reverted: Insufficient liquidity")
+
+    quotes["answer"] = revert
+    with pytest.raises(ValueError, match="Insufficient liquidity"):
+        asyncio.run(swap.quote(ADDRESSES[0], ADDRESSES[1], 10**30))
+
+    def unreachable(*_):
+        raise ConnectionError("Connection refused")
+
+    quotes["answer"] = unreachable
+    with pytest.raises(LookupError, match="Pool quote unavailable"):
+        asyncio.run(swap.quote(ADDRESSES[0], ADDRESSES[1], 1))
+
+    monkeypatch.setattr(pricing, "_state", None)
+    with pytest.raises(LookupError, match="Pool state unavailable"):
+        asyncio.run(swap.quote(ADDRESSES[0], ADDRESSES[1], 1))
+    assert len(quotes["calls"]) == 2
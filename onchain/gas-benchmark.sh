@@ -0,0 +1,96 @@
+#!/bin/bash
+
+# Gas benchmarks for OrbitalPool (test/OrbitalPoolGas.t.sol): swap, addLiquidity and
+# removeLiquidity for 2-50 tokens, 1-1000 ticks, with and without boundary crossings.
+#
+# Usage:
+#   ./gas-benchmark.sh             Run, write gas-report/orbital-gas.csv and compare it
+#                                  with gas-report/baseline.csv
+#   ./gas-benchmark.sh --update    Run and save the results as the new baseline
+#   ANVIL=1 ./gas-benchmark.sh     Run against a local anvil node instead of the
+#                                  in-process EVM
+#
+# A scenario regresses when it uses more than GAS_TOLERANCE percent (default 5) over
+# the baseline. The Onchain gas workflow records the baseline on a pull request's base
+# commit and compares the change against it. Per-call snapshots are also written to snapshots/OrbitalPoolGas.json.
+#
+# The storage-layout benchmark (test/OrbitalPoolStorage.t.sol) runs alongside and
+# writes the distinct storage slots each operation reads and writes to
+# gas-report/orbital-storage.csv, for the pool and for the layout before packing
+# (test/reference/OrbitalPoolUnpacked.sol).
+
+set -euo pipefail
+cd "$(dirname "$0")"
+
+REPORT="gas-report/orbital-gas.csv"
+STORAGE_REPORT="gas-report/orbital-storage.csv"
+BASELINE="gas-report/baseline.csv"
+TOLERANCE="${GAS_TOLERANCE:-5}"
+ANVIL_PORT="${ANVIL_PORT:-8545}"
+
+UPDATE=0
+[[ "${1:-}" == "--update" ]] && UPDATE=1
+
+if [[ "$UPDATE" == "0" && ! -f "$BASELINE" ]]; then
+    echo "No baseline at $BASELINE; run ./gas-benchmark.sh --update on the commit to compare against." >&2
+    exit 1
+fi
+
+mkdir -p gas-report
+echo "operation,tokens,ticks,crossings,gas" > "$REPORT"
+echo "operation,tokens,layout,sload_slots,sstore_slots" > "$STORAGE_REPORT"
+
+# --isolate runs every pool call as its own transaction, so cold storage is priced
+# the way it is on chain
+FORGE_ARGS=(--match-contract 'OrbitalPool(Gas|Storage)Test' --isolate)
+
+if [[ "${ANVIL:-0}" == "1" ]]; then
+    anvil --silent --port "$ANVIL_PORT" --gas-limit 30000000000 &
+    ANVIL_PID=$!
+    trap 'kill $ANVIL_PID' EXIT
+    sleep 2
+    FORGE_ARGS+=(--fork-url "http://127.0.0.1:$ANVIL_PORT")
+fi
+
+echo "=== Running OrbitalPool gas benchmarks ==="
+forge test "${FORGE_ARGS[@]}"
+
+# Tests append rows in parallel; sort them so reports diff cleanly
+{
+    head -n 1 "$REPORT"
+    tail -n +2 "$REPORT" | sort -t, -k1,1 -k2,2n -k3,3n -k4,4n
+} > "$REPORT.tmp"
+mv "$REPORT.tmp" "$REPORT"
+{
+    head -n 1 "$STORAGE_REPORT"
+    tail -n +2 "$STORAGE_REPORT" | sort -t, -k1,1 -k2,2n -k3,3
+} > "$STORAGE_REPORT.tmp"
+mv "$STORAGE_REPORT.tmp" "$STORAGE_REPORT"
+
+echo ""
+column -s, -t < "$REPORT"
+echo ""
+column -s, -t < "$STORAGE_REPORT"
+echo ""
+
+if [[ "$UPDATE" == "1" ]]; then
+    cp "$REPORT" "$BASELINE"
+    echo "Baseline updated: $BASELINE"
+    exit 0
+fi
+
+awk -F, -v tolerance="$TOLERANCE" '
+    NR == FNR {
+        if (FNR > 1) baseline[$1 "," $2 "," $3 "," $4] = $5
+        next
+    }
+    FNR > 1 {
+        key = $1 "," $2 "," $3 "," $4
+        if (!(key in baseline)) next
+        if ($5 * 100 > baseline[key] * (100 + tolerance)) {
+            printf "REGRESSION %s: %d gas (baseline %d)\n", key, $5, baseline[key]
+            failed = 1
+        }
+    }
+    END { exit failed }
+' "$BASELINE" "$REPORT" && echo "No gas regressions over ${TOLERANCE}%."
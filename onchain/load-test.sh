@@ -0,0 +1,72 @@
+#!/bin/bash
+
+# Load test of the backend's pricing and swap endpoints against a local Orbital pool.
+# Starts anvil, deploys four mock stablecoins, an OrbitalPool seeded with TICKS
+# interior ticks, the adapter that serves it through the backend's pool ABI
+# (src/OrbitalPoolAdapter.sol) and a mock FtsoV2, points the backend at them and runs
+# backend/benchmarks/load.py against /price, /swap, /route and /impact.
+#
+# Usage:
+#   ./load-test.sh                             Run and write gas-report/load.json
+#   TICKS=1000 WORKERS=4 ./load-test.sh        More ticks, more uvicorn workers
+#   CONCURRENCY=1,8,64 DURATION=5 ./load-test.sh
+#
+# Everything runs offline. Needs anvil, forge, cast and curl.
+
+set -euo pipefail
+cd "$(dirname "$0")"
+
+ANVIL_PORT="${ANVIL_PORT:-8545}"
+BACKEND_PORT="${BACKEND_PORT:-8000}"
+RPC="http://127.0.0.1:$ANVIL_PORT"
+BACKEND="http://127.0.0.1:$BACKEND_PORT"
+REPORT="gas-report/load.json"
+
+# anvil's first default account; it holds the tokens and is the /swap wallet
+ANVIL_KEY="0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+DEPLOYER="0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+SYMBOLS="USDC,USDT,PYUSD,USDe"
+
+PIDS=()
+trap 'kill "${PIDS[@]}" 2>/dev/null' EXIT
+
+anvil --silent --port "$ANVIL_PORT" --chain-id 31337 &
+PIDS+=($!)
+sleep 2
+
+echo "=== Deploying the pool with ${TICKS:-100} ticks ==="
+TICKS="${TICKS:-100}" forge script script/DeployLoadTestPool.s.sol:DeployLoadTestPool \
+    --rpc-url "$RPC" --private-key "$ANVIL_KEY" --broadcast --silent
+
+# Fresh account, so the addresses follow from the deployment order
+TOKENS=$(for nonce in 0 1 2 3; do
+    cast compute-address "$DEPLOYER" --nonce "$nonce" | awk '{print $NF}'
+done | paste -sd, -)
+ADAPTER=$(cast compute-address "$DEPLOYER" --nonce 5 | awk '{print $NF}')
+FTSO=$(cast compute-address "$DEPLOYER" --nonce 6 | awk '{print $NF}')
+
+export ORBITAL_RPC_URL="$RPC"
+export ORBITAL_POOL_ADDRESS="$ADAPTER"
+export ORBITAL_CHAIN="anvil"
+export ORBITAL_CHAIN_ID=31337
+export FLARE_RPC_URL="$RPC"
+export FTSOV2_ADDRESS="$FTSO"
+
+echo "=== Starting the backend with ${WORKERS:-1} worker(s) ==="
+(cd ../backend && uvicorn src.main:server --port "$BACKEND_PORT" \
+    --workers "${WORKERS:-1}" --log-level warning) &
+PIDS+=($!)
+
+# /route answers once the pool state has been read
+for _ in $(seq 60); do
+    if curl -sf "$BACKEND/route?tokenIn=USDC&tokenOut=USDT&amountIn=1" > /dev/null; then
+        break
+    fi
+    sleep 1
+done
+
+mkdir -p gas-report
+(cd ../backend && python benchmarks/load.py --url "$BACKEND" \
+    --tokens "$TOKENS" --symbols "$SYMBOLS" --wallet "$DEPLOYER" --chain anvil \
+    --concurrency "${CONCURRENCY:-1,4,16,64}" --duration "${DURATION:-10}" \
+    --json "../onchain/$REPORT")
@@ -0,0 +1,25 @@
+#!/bin/bash
+
+# Differential corpus for the backend's bit-exact OrbitalMath port
+# (backend/src/services/orbital_math.py).
+#
+# Usage:
+#   ./orbital-math-corpus.sh    Regenerate corpus/orbital-math.jsonl with forge
+#                               (test/OrbitalMathCorpus.t.sol) and replay it against
+#                               the Python port
+#
+# Commit the corpus with any change to OrbitalMath or OrbitalPool.getAmountOut, so the
+# backend can be checked without forge.
+
+set -euo pipefail
+cd "$(dirname "$0")"
+
+mkdir -p corpus
+
+echo "=== Generating OrbitalMath corpus ==="
+forge test --match-contract OrbitalMathCorpusTest
+
+echo ""
+echo "=== Replaying against backend/src/services/orbital_math.py ==="
+cd ../backend
+python -m src.services.orbital_math ../onchain/corpus/orbital-math.jsonl
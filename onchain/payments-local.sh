@@ -0,0 +1,108 @@
+#!/bin/bash
+
+# End-to-end check of the backend's cross-chain payment tracker
+# (backend/src/services/payments.py) on two local anvil chains with mock CCTP
+# contracts (src/MockCCTP.sol) and a mock attestation service
+# (backend/mock_attestation.py).
+#
+# Usage:
+#   ./payments-local.sh    Start both chains, the mock attestation service and the
+#                          backend, burn mock USDC on the source chain, register the
+#                          payment and relay it once attested, then wait for the
+#                          tracker to report the mint
+#
+# Needs anvil, forge, cast, curl and jq.
+
+set -euo pipefail
+cd "$(dirname "$0")"
+
+SOURCE_PORT=8545
+DESTINATION_PORT=8546
+ATTESTATION_PORT=8547
+BACKEND_PORT=8000
+SOURCE_RPC="http://127.0.0.1:$SOURCE_PORT"
+DESTINATION_RPC="http://127.0.0.1:$DESTINATION_PORT"
+BACKEND="http://127.0.0.1:$BACKEND_PORT"
+
+# anvil's first default account
+ANVIL_KEY="0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+DEPLOYER="0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+AMOUNT=1000000  # 1 USDC
+
+PIDS=()
+trap 'kill "${PIDS[@]}" 2>/dev/null' EXIT
+
+anvil --silent --port "$SOURCE_PORT" --chain-id 31337 --block-time 1 &
+PIDS+=($!)
+anvil --silent --port "$DESTINATION_PORT" --chain-id 31338 --block-time 1 &
+PIDS+=($!)
+sleep 2
+
+echo "=== Deploying mock CCTP ==="
+CCTP_DOMAIN=0 forge script script/DeployMockCCTP.s.sol:DeployMockCCTP \
+    --rpc-url "$SOURCE_RPC" --private-key "$ANVIL_KEY" --broadcast --silent
+CCTP_DOMAIN=6 forge script script/DeployMockCCTP.s.sol:DeployMockCCTP \
+    --rpc-url "$DESTINATION_RPC" --private-key "$ANVIL_KEY" --broadcast --silent
+
+# Same deployer and nonces on both chains, so the addresses match
+USDC=$(cast compute-address "$DEPLOYER" --nonce 0 | awk '{print $NF}')
+TRANSMITTER=$(cast compute-address "$DEPLOYER" --nonce 1 | awk '{print $NF}')
+MESSENGER=$(cast compute-address "$DEPLOYER" --nonce 2 | awk '{print $NF}')
+
+export CCTP_ATTESTATION_URL="http://127.0.0.1:$ATTESTATION_PORT"
+export BRIDGE_CHAINS=$(jq -n \
+    --arg source "$SOURCE_RPC" --arg destination "$DESTINATION_RPC" \
+    --arg messenger "$MESSENGER" --arg transmitter "$TRANSMITTER" '{
+        "local-source": {"rpc": $source, "cctp_domain": 0, "lz_eid": 0,
+            "token_messenger": $messenger, "message_transmitter": $transmitter, "oft": ""},
+        "local-destination": {"rpc": $destination, "cctp_domain": 6, "lz_eid": 0,
+            "token_messenger": $messenger, "message_transmitter": $transmitter, "oft": ""}
+    }')
+
+echo "=== Starting mock attestation service and backend ==="
+(cd ../backend && uvicorn mock_attestation:app --port "$ATTESTATION_PORT" --log-level warning) &
+PIDS+=($!)
+(cd ../backend && uvicorn src.main:server --port "$BACKEND_PORT" --log-level warning) &
+PIDS+=($!)
+sleep 5
+
+echo "=== Burning $AMOUNT mock USDC on the source chain ==="
+cast send "$USDC" "approve(address,uint256)" "$MESSENGER" "$AMOUNT" \
+    --rpc-url "$SOURCE_RPC" --private-key "$ANVIL_KEY" > /dev/null
+TX_HASH=$(cast send "$MESSENGER" "depositForBurn(uint256,uint32,bytes32,address)" \
+    "$AMOUNT" 6 "$(cast to-uint256 "$DEPLOYER")" "$USDC" \
+    --rpc-url "$SOURCE_RPC" --private-key "$ANVIL_KEY" --json | jq -r .transactionHash)
+
+PAYMENT_ID=$(curl -sf -X POST "$BACKEND/payments" -H "Content-Type: application/json" \
+    -d "{\"sourceChain\": \"local-source\", \"txHash\": \"$TX_HASH\"}" | jq -r .id)
+echo "Tracking payment $PAYMENT_ID ($TX_HASH)"
+
+# Status updates are streamed to stdout as the payment moves
+curl -sN -H "Accept: text/event-stream" "$BACKEND/payments/$PAYMENT_ID/status" &
+PIDS+=($!)
+
+status() {
+    curl -sf "$BACKEND/payments/$PAYMENT_ID/status"
+}
+
+STAGE=""
+until [[ "$STAGE" == "attested" ]]; do
+    STAGE=$(status | jq -r .stage)
+    if [[ "$STAGE" == "failed" ]]; then status | jq .; exit 1; fi
+    sleep 1
+done
+
+echo "=== Relaying the attested message to the destination chain ==="
+cast send "$TRANSMITTER" "receiveMessage(bytes,bytes)" \
+    "$(status | jq -r .message)" "$(status | jq -r .attestation)" \
+    --rpc-url "$DESTINATION_RPC" --private-key "$ANVIL_KEY" > /dev/null
+
+for _ in $(seq 60); do
+    STAGE=$(status | jq -r .stage)
+    if [[ "$STAGE" == "minted" || "$STAGE" == "failed" ]]; then break; fi
+    sleep 1
+done
+
+echo ""
+status | jq .
+[[ "$STAGE" == "minted" ]]
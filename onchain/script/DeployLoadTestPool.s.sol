@@ -0,0 +1,67 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "forge-std/Script.sol";
+import "../src/MockERC20.sol";
+import "../src/MockFtsoV2.sol";
+import "../src/OrbitalPool.sol";
+import "../src/OrbitalPoolAdapter.sol";
+
+/**
+ * @notice Orbital pool with seeded liquidity and a mock FtsoV2 for a local anvil chain,
+ *         used by load-test.sh. Deploy from a fresh account so the addresses are fixed:
+ *         tokens (nonces 0-3), pool (nonce 4), adapter (nonce 5), FtsoV2 (nonce 6).
+ *         The deployer keeps the rest of the supply and approves the adapter, so it can
+ *         be the wallet the backend estimates swaps for.
+ */
+contract DeployLoadTestPool is Script {
+    // 6-decimal amounts, like the stablecoins they stand in for; SUPPLY covers MAX_TICKS
+    // deposits of this size.
+    uint256 internal constant SUPPLY = 1e18;
+    uint256 internal constant DEPOSIT = 1e12;              // Per token, per tick
+    uint256 internal constant INTERIOR_CONSTANT = 1e36;    // Above any reachable projection
+    uint256 internal constant MAX_TICKS = 100_000;
+
+    function run() external {
+        uint256 tickCount = vm.envOr("TICKS", uint256(100));
+        require(tickCount <= MAX_TICKS, "Too many ticks");
+        vm.startBroadcast();
+
+        string[4] memory symbols = [string("USDC"), "USDT", "PYUSD", "USDe"];
+        address[] memory tokens = new address[](symbols.length);
+        for (uint256 i = 0; i < symbols.length; i++) {
+            tokens[i] = address(new MockERC20(symbols[i], symbols[i], 6, SUPPLY));
+        }
+        OrbitalPool pool = new OrbitalPool(tokens);
+        OrbitalPoolAdapter adapter = new OrbitalPoolAdapter(pool);
+        MockFtsoV2 ftso = new MockFtsoV2();
+
+        // Same feed ids as flare_configs.STABLECOIN_FEED_IDS
+        ftso.setFeed(bytes21(0x01464c522f55534400000000000000000000000000), 2_000_000, 8);   // FLR/USD
+        ftso.setFeed(bytes21(0x014254432f55534400000000000000000000000000), 6_000_000, 2);   // BTC/USD
+        ftso.setFeed(bytes21(0x014554482f55534400000000000000000000000000), 300_000, 2);     // ETH/USD
+
+        uint256[] memory amounts = new uint256[](tokens.length);
+        for (uint256 i = 0; i < tokens.length; i++) {
+            amounts[i] = DEPOSIT;
+            MockERC20(tokens[i]).approve(address(pool), type(uint256).max);
+            MockERC20(tokens[i]).approve(address(adapter), type(uint256).max);
+        }
+        for (uint256 i = 0; i < tickCount; i++) {
+            pool.addLiquidity(amounts, INTERIOR_CONSTANT);
+        }
+
+        for (uint256 i = 0; i < tokens.length; i++) {
+            console.log(symbols[i], tokens[i]);
+        }
+        console.log("OrbitalPool:", address(pool));
+        console.log("OrbitalPoolAdapter:", address(adapter));
+        console.log("FtsoV2:", address(ftso));
+        console.log("Ticks:", tickCount);
+
+        vm.stopBroadcast();
+    }
+}
+
+// TICKS=100 forge script script/DeployLoadTestPool.s.sol:DeployLoadTestPool \
+//   --rpc-url http://127.0.0.1:8545 --private-key $ANVIL_KEY --broadcast
@@ -0,0 +1,31 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "forge-std/Script.sol";
+import "../src/MockCCTP.sol";
+import "../src/MockERC20.sol";
+
+/**
+ * @notice Mock USDC and CCTP v1 contracts for a local anvil chain, used by
+ *         payments-local.sh. Deploy from a fresh account so every chain gets the same
+ *         addresses: token (nonce 0), transmitter (nonce 1), messenger (nonce 2).
+ */
+contract DeployMockCCTP is Script {
+    function run() external {
+        uint32 domain = uint32(vm.envUint("CCTP_DOMAIN"));
+        vm.startBroadcast();
+
+        MockERC20 usdc = new MockERC20("USD Coin", "USDC", 6, 1_000_000 * 1e6);
+        MockMessageTransmitter transmitter = new MockMessageTransmitter(domain);
+        MockTokenMessenger messenger = new MockTokenMessenger(transmitter, usdc);
+
+        console.log("USDC:", address(usdc));
+        console.log("MessageTransmitter:", address(transmitter));
+        console.log("TokenMessenger:", address(messenger));
+
+        vm.stopBroadcast();
+    }
+}
+
+// CCTP_DOMAIN=0 forge script script/DeployMockCCTP.s.sol:DeployMockCCTP \
+//   --rpc-url http://127.0.0.1:8545 --private-key $ANVIL_KEY --broadcast
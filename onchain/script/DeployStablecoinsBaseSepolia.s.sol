@@ -22,13 +22,17 @@ contract DeployStablecoinsBaseSepolia is Script {
         MockERC20 usdc = new MockERC20("USD Coin", "USDC", 6, 1_000_000 * 10**6);
         MockERC20 usdt = new MockERC20("Tether USD", "USDT", 6, 1_000_000 * 10**6);
         MockERC20 pyusd = new MockERC20("PayPal USD", "PYUSD", 6, 1_000_000 * 10**6);
-        MockERC20 usde = new MockERC20("Ethena USD", "USDe", 6, 1_000_000 * 10**6);
+        MockERC20 usde = new MockERC20("Ethena USD", "USDe", 18, 1_000_000 ether);
+        MockERC20 dai = new MockERC20("Dai Stablecoin", "DAI", 18, 1_000_000 ether);
+        MockERC20 frax = new MockERC20("Frax", "FRAX", 18, 1_000_000 ether);
 
         console.log("Stablecoins deployed:");
         console.log("USDC:", address(usdc));
         console.log("USDT:", address(usdt));
         console.log("PYUSD:", address(pyusd));
         console.log("USDe:", address(usde));
+        console.log("DAI:", address(dai));
+        console.log("FRAX:", address(frax));
         console.log("");
 
         // Mint tokens to predefined addresses
@@ -59,12 +63,26 @@ contract DeployStablecoinsBaseSepolia is Script {
         console.log("PYUSD minted: 100,000 to each user");
 
         // USDe distribution (18 decimals)
-        usde.mint(OWNER, mintAmount6d);
-        usde.mint(USER_1, mintAmount6d);
-        usde.mint(USER_2, mintAmount6d);
-        usde.mint(DAN, mintAmount6d);
+        usde.mint(OWNER, mintAmount18d);
+        usde.mint(USER_1, mintAmount18d);
+        usde.mint(USER_2, mintAmount18d);
+        usde.mint(DAN, mintAmount18d);
         console.log("USDe minted: 100,000 to each user");
 
+        // DAI distribution (18 decimals)
+        dai.mint(OWNER, mintAmount18d);
+        dai.mint(USER_1, mintAmount18d);
+        dai.mint(USER_2, mintAmount18d);
+        dai.mint(DAN, mintAmount18d);
+        console.log("DAI minted: 100,000 to each user");
+
+        // FRAX distribution (18 decimals)
+        frax.mint(OWNER, mintAmount18d);
+        frax.mint(USER_1, mintAmount18d);
+        frax.mint(USER_2, mintAmount18d);
+        frax.mint(DAN, mintAmount18d);
+        console.log("FRAX minted: 100,000 to each user");
+
         console.log("");
         console.log("=== Deployment Summary ===");
         console.log("Network: Ethereum Sepolia");
@@ -72,6 +90,8 @@ contract DeployStablecoinsBaseSepolia is Script {
         console.log("USDT:", address(usdt));
         console.log("PYUSD:", address(pyusd));
         console.log("USDe:", address(usde));
+        console.log("DAI:", address(dai));
+        console.log("FRAX:", address(frax));
         console.log("");
         console.log("Recipients:");
         console.log("OWNER:", OWNER);
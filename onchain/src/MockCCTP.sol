@@ -0,0 +1,139 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "./MockERC20.sol";
+
+/**
+ * @title MockMessageTransmitter
+ * @notice CCTP v1 MessageTransmitter for local chains: same events and message format,
+ *         but any attestation is accepted
+ * @dev Message layout: version (4), sourceDomain (4), destinationDomain (4), nonce (8),
+ *      sender (32), recipient (32), destinationCaller (32), messageBody
+ */
+contract MockMessageTransmitter {
+    uint32 public immutable localDomain;
+    uint64 public nextAvailableNonce;
+    mapping(bytes32 => bool) public usedNonces;
+
+    event MessageSent(bytes message);
+    event MessageReceived(
+        address indexed caller,
+        uint32 sourceDomain,
+        uint64 indexed nonce,
+        bytes32 sender,
+        bytes messageBody
+    );
+
+    constructor(uint32 _localDomain) {
+        localDomain = _localDomain;
+    }
+
+    function sendMessage(
+        uint32 destinationDomain,
+        bytes32 recipient,
+        bytes calldata messageBody
+    ) external returns (uint64 nonce) {
+        nonce = nextAvailableNonce++;
+        emit MessageSent(
+            abi.encodePacked(
+                uint32(0),
+                localDomain,
+                destinationDomain,
+                nonce,
+                bytes32(uint256(uint160(msg.sender))),
+                recipient,
+                bytes32(0),
+                messageBody
+            )
+        );
+    }
+
+    function receiveMessage(bytes calldata message, bytes calldata) external returns (bool) {
+        require(uint32(bytes4(message[8:12])) == localDomain, "Invalid destination domain");
+        uint32 sourceDomain = uint32(bytes4(message[4:8]));
+        uint64 nonce = uint64(bytes8(message[12:20]));
+        bytes32 sender = bytes32(message[20:52]);
+        address recipient = address(uint160(uint256(bytes32(message[52:84]))));
+
+        bytes32 key = keccak256(abi.encodePacked(sourceDomain, nonce));
+        require(!usedNonces[key], "Nonce already used");
+        usedNonces[key] = true;
+
+        bytes calldata body = message[116:];
+        require(
+            MockTokenMessenger(recipient).handleReceiveMessage(sourceDomain, sender, body),
+            "Handler failed"
+        );
+        emit MessageReceived(msg.sender, sourceDomain, nonce, sender, body);
+        return true;
+    }
+}
+
+/**
+ * @title MockTokenMessenger
+ * @notice CCTP v1 TokenMessenger for local chains. Burns hold the tokens in the
+ *         messenger and mints use MockERC20.mint.
+ * @dev Burn message layout: version (4), burnToken (32), mintRecipient (32), amount (32),
+ *      messageSender (32). The destination messenger is assumed to share this address,
+ *      which holds when both chains are deployed from the same account and nonce.
+ */
+contract MockTokenMessenger {
+    MockMessageTransmitter public immutable localMessageTransmitter;
+    MockERC20 public immutable localToken;
+
+    event DepositForBurn(
+        uint64 indexed nonce,
+        address indexed burnToken,
+        uint256 amount,
+        address indexed depositor,
+        bytes32 mintRecipient,
+        uint32 destinationDomain,
+        bytes32 destinationTokenMessenger,
+        bytes32 destinationCaller
+    );
+    event MintAndWithdraw(address indexed mintRecipient, uint256 amount, address indexed mintToken);
+
+    constructor(MockMessageTransmitter _localMessageTransmitter, MockERC20 _localToken) {
+        localMessageTransmitter = _localMessageTransmitter;
+        localToken = _localToken;
+    }
+
+    function depositForBurn(
+        uint256 amount,
+        uint32 destinationDomain,
+        bytes32 mintRecipient,
+        address burnToken
+    ) external returns (uint64 nonce) {
+        require(amount > 0, "Amount must be nonzero");
+        require(mintRecipient != bytes32(0), "Mint recipient must be nonzero");
+        require(burnToken == address(localToken), "Unsupported burn token");
+        localToken.transferFrom(msg.sender, address(this), amount);
+
+        bytes32 destinationMessenger = bytes32(uint256(uint160(address(this))));
+        bytes memory body = abi.encodePacked(
+            uint32(0),
+            bytes32(uint256(uint160(burnToken))),
+            mintRecipient,
+            amount,
+            bytes32(uint256(uint160(msg.sender)))
+        );
+        nonce = localMessageTransmitter.sendMessage(destinationDomain, destinationMessenger, body);
+        emit DepositForBurn(
+            nonce, burnToken, amount, msg.sender, mintRecipient, destinationDomain,
+            destinationMessenger, bytes32(0)
+        );
+    }
+
+    function handleReceiveMessage(
+        uint32,
+        bytes32,
+        bytes calldata messageBody
+    ) external returns (bool) {
+        require(msg.sender == address(localMessageTransmitter), "Invalid message transmitter");
+        address mintRecipient = address(uint160(uint256(bytes32(messageBody[36:68]))));
+        uint256 amount = uint256(bytes32(messageBody[68:100]));
+        localToken.mint(mintRecipient, amount);
+        emit MintAndWithdraw(mintRecipient, amount, address(localToken));
+        return true;
+    }
+}
@@ -0,0 +1,27 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+/**
+ * @title MockFtsoV2
+ * @notice Stand-in for Flare's FtsoV2 on a local chain: getFeedById returns a fixed
+ *         value per feed, timestamped with the current block
+ * @dev Only the call the backend's /price makes (services/oracle.py) is implemented.
+ */
+contract MockFtsoV2 {
+    struct Feed {
+        uint256 value;
+        int8 decimals;
+    }
+
+    mapping(bytes21 => Feed) public feeds;
+
+    function setFeed(bytes21 feedId, uint256 value, int8 decimals) external {
+        feeds[feedId] = Feed(value, decimals);
+    }
+
+    function getFeedById(bytes21 feedId) external payable returns (uint256, int8, uint64) {
+        Feed memory feed = feeds[feedId];
+        require(feed.value != 0, "Unknown feed");
+        return (feed.value, feed.decimals, uint64(block.timestamp));
+    }
+}
@@ -6,6 +6,7 @@ import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
 import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
 import "@openzeppelin/contracts/utils/ReentrancyGuard.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin/contracts/utils/math/SafeCast.sol";
 import "./libraries/OrbitalMath.sol";
 
 /**
@@ -19,15 +20,28 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
     
     /**
      * @notice Represents a liquidity tick in N-dimensional space
-     * @dev Each tick is a sphere with optional plane boundary constraint
+     * @dev Each tick is a sphere with optional plane boundary constraint. Packed into two
+     *      slots plus the reserves: radius and plane constant share one, the owner and
+     *      flags the other, and reserves are stored two per slot. The fields keep their
+     *      original order, so the ticks() getter still returns (radius, planeConstant,
+     *      isInterior, owner, active); radius and planeConstant are now uint128, which
+     *      ABI-encodes the same as the uint256 they replaced.
      */
     struct Tick {
-        uint256 radius;          // r: sphere radius (liquidity amount)
-        uint256 planeConstant;   // c: plane boundary distance
+        uint128 radius;          // r: sphere radius (liquidity amount)
+        uint128 planeConstant;   // c: plane boundary distance
         bool isInterior;         // Whether reserves are interior or on boundary
-        uint256[] reserves;      // Current reserve state
         address owner;           // LP who owns this tick
         bool active;             // Whether tick is active
+        uint128[] reserves;      // Reserve state while on the boundary (interior ticks derive theirs)
+    }
+    
+    /**
+     * @notice Consolidated reserves of one token, packed into a single slot
+     */
+    struct TokenReserves {
+        uint128 interior;        // Sum of reserves over interior ticks
+        uint128 boundary;        // Sum of reserves over boundary ticks
     }
     
     /**
@@ -44,16 +58,27 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
     
     // Pool configuration
     IERC20[] public tokens;
-    uint256 public tokenCount;
+    uint256 public immutable tokenCount;
+    
+    // Component of the equal price vector e = (1,1,...,1)/sqrt(n), fixed at deployment
+    uint256 internal immutable equalPriceComponent;
     
     // Tick management
     Tick[] public ticks;
     mapping(address => uint256[]) public userTicks; // User -> tick indices
     
-    // Global state for efficient computation
-    uint256 public totalInteriorRadiusSquared;  // Sum of r_i^2 for interior ticks
-    uint256 public totalBoundaryRadiusSquared;  // Sum of r_i^2 for boundary ticks
-    uint256 public totalBoundaryConstantSquared; // Sum of c_i^2 for boundary ticks
+    // Consolidated reserves, one slot per token. Swaps only touch these, so their cost
+    // depends on the token count and the number of crossings, not on the number of ticks.
+    TokenReserves[] internal tokenReserves;
+    // Interior ticks share the interior reserves pro rata to radius: interior / 
+    // totalInteriorRadius is the per-share accumulator (like Uniswap's fee growth), so a
+    // tick's reserves are derived when read or withdrawn instead of rewritten every swap.
+    uint256 public totalInteriorRadius;
+    
+    // Active tick indices sorted by plane constant. The reserves' projection only moves
+    // ticks across a single split point: the first boundaryTickCount are on their boundary.
+    uint256[] internal sortedTicks;
+    uint256 public boundaryTickCount;
     
     // Fee parameters
     uint256 public constant FEE_DENOMINATOR = 10000;
@@ -100,8 +125,11 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
         require(_tokens.length <= 100, "Too many tokens");
         
         tokenCount = _tokens.length;
-        for (uint256 i = 0; i < tokenCount; i++) {
+        equalPriceComponent = OrbitalMath.PRECISION / 
+                              OrbitalMath.sqrt(_tokens.length * OrbitalMath.PRECISION);
+        for (uint256 i = 0; i < _tokens.length; i++) {
             tokens.push(IERC20(_tokens[i]));
+            tokenReserves.push();
         }
     }
     
@@ -134,24 +162,26 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
             }
         }
         
-        // Create new tick
-        Tick memory newTick = Tick({
-            radius: radius,
-            planeConstant: planeConstant,
-            isInterior: true,
-            reserves: amounts,
-            owner: msg.sender,
-            active: true
-        });
-        
-        ticks.push(newTick);
-        tickIndex = ticks.length - 1;
+        // Create new tick; interior ticks derive their reserves, so none are stored
+        tickIndex = ticks.length;
+        Tick storage tick = ticks.push();
+        tick.radius = SafeCast.toUint128(radius);
+        tick.planeConstant = SafeCast.toUint128(planeConstant);
+        tick.owner = msg.sender;
+        tick.isInterior = true;
+        tick.active = true;
         
         // Update user's tick list
         userTicks[msg.sender].push(tickIndex);
         
-        // Update global state
-        _updateGlobalState();
+        // Join the interior; if the reserves are already past the tick's plane, move it
+        // straight onto its boundary so the sorted prefix stays the boundary set
+        _joinInterior(radius, amounts);
+        if (_insertSorted(tickIndex) < boundaryTickCount) {
+            _moveToBoundary(tickIndex);
+            boundaryTickCount++;
+        }
+        _syncBoundary(_getProjection(_getTotalReserves()));
         
         emit LiquidityAdded(msg.sender, tickIndex, radius);
     }
@@ -170,26 +200,35 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
         Tick storage tick = ticks[tickIndex];
         require(tick.owner == msg.sender, "Not tick owner");
         
+        // Take the tick out of the aggregates and rejoin with what is left
+        uint256[] memory reserves = _getTickReserves(tick);
+        _leave(tick, reserves);
+        
         amounts = new uint256[](tokenCount);
         
         // Calculate amounts to return
         for (uint256 i = 0; i < tokenCount; i++) {
-            amounts[i] = (tick.reserves[i] * fraction) / OrbitalMath.PRECISION;
+            amounts[i] = (reserves[i] * fraction) / OrbitalMath.PRECISION;
             if (amounts[i] > 0) {
                 tokens[i].transfer(msg.sender, amounts[i]);
-                tick.reserves[i] -= amounts[i];
+                reserves[i] -= amounts[i];
             }
         }
         
         // Update tick state
-        tick.radius = (tick.radius * (OrbitalMath.PRECISION - fraction)) / 
-                      OrbitalMath.PRECISION;
+        uint256 radius = (uint256(tick.radius) * (OrbitalMath.PRECISION - fraction)) / 
+                         OrbitalMath.PRECISION;
+        tick.radius = uint128(radius);
         
-        if (tick.radius < 1000) { // Minimum tick size
+        if (radius < 1000) { // Minimum tick size
             tick.active = false;
+            _storeReserves(tick, reserves);
+            _removeSorted(tickIndex);
+        } else {
+            _join(tick, reserves);
         }
         
-        _updateGlobalState();
+        _syncBoundary(_getProjection(_getTotalReserves()));
         
         emit LiquidityRemoved(msg.sender, tickIndex, fraction);
     }
@@ -220,22 +259,21 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
         // Apply fee
         uint256 amountInAfterFee = (amountIn * (FEE_DENOMINATOR - swapFee)) / FEE_DENOMINATOR;
         
-        // Get current total reserves
-        uint256[] memory totalReserves = _getTotalReserves();
-        
-        // Calculate output amount using invariant
+        // Boundary ticks are pinned to their planes, so the trade is priced on and moves
+        // the interior reserves only
         amountOut = _calculateSwapOutput(
-            totalReserves,
+            _getInteriorReserves(),
             tokenIn,
             tokenOut,
             amountInAfterFee
         );
-        amountOut = amountIn;
-
-        // Update reserves and check for tick crossings
-        totalReserves[tokenIn] += amountInAfterFee;
-        totalReserves[tokenOut] -= amountOut;
-        _updateTickReservesWithCrossings(totalReserves);
+        require(amountOut >= minAmountOut, "Slippage exceeded");
+        
+        tokenReserves[tokenIn].interior += SafeCast.toUint128(amountInAfterFee);
+        tokenReserves[tokenOut].interior -= uint128(amountOut);
+        
+        // Move the ticks whose planes the reserves crossed
+        _syncBoundary(_getProjection(_getTotalReserves()));
         
         // Transfer output token
         tokens[tokenOut].transfer(msg.sender, amountOut);
@@ -246,170 +284,253 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
     // ============ Internal Functions ============
     
     /**
-     * @notice Calculate swap output maintaining torus invariant
+     * @notice Calculate swap output on the sphere through the interior reserves
+     * @dev The sphere around (r, ..., r) keeps sum((r - x_i)^2) = r^2, and a trade only
+     *      changes the tokenIn and tokenOut terms, so the output is solved in closed
+     *      form. The square root rounds down, which rounds the output in the pool's
+     *      favour.
      */
     function _calculateSwapOutput(
         uint256[] memory reserves,
         uint256 tokenIn,
         uint256 tokenOut,
         uint256 amountIn
-    ) internal view returns (uint256) {
-        // Get current invariant
-        uint256 currentInvariant = _computeTorusInvariant(reserves);
-        
-        // Binary search for output amount that maintains invariant
-        uint256 low = 0;
-        uint256 high = reserves[tokenOut];
-        uint256 mid;
-        
-        // Use binary search for better accuracy than constant product
-        for (uint256 i = 0; i < 128; i++) {
-            mid = (low + high) / 2;
-            
-            uint256[] memory newReserves = new uint256[](tokenCount);
-            for (uint256 j = 0; j < tokenCount; j++) {
-                newReserves[j] = reserves[j];
-            }
-            newReserves[tokenIn] += amountIn;
-            newReserves[tokenOut] -= mid;
-            
-            uint256 newInvariant = _computeTorusInvariant(newReserves);
-            
-            if (newInvariant > currentInvariant) {
-                high = mid;
-            } else {
-                low = mid;
-            }
-            
-            if (high - low <= 1) break;
-        }
+    ) internal pure returns (uint256) {
+        uint256 radius = _fitRadius(reserves);
+        uint256 reserveIn = reserves[tokenIn];
+        uint256 reserveOut = reserves[tokenOut];
+        uint256 newReserveIn = reserveIn + amountIn;
+        // Past the centre a token's price would turn negative
+        require(newReserveIn < radius && reserveOut <= radius, "Insufficient liquidity");
+        
+        uint256 diffIn = radius - reserveIn;
+        uint256 newDiffIn = radius - newReserveIn;
+        uint256 diffOut = radius - reserveOut;
+        uint256 newDiffOut = OrbitalMath.sqrt(
+            diffOut * diffOut + diffIn * diffIn - newDiffIn * newDiffIn
+        );
         
-        return low;
+        return newDiffOut - diffOut;
     }
     
     /**
-     * @notice Compute the torus invariant for given reserves
+     * @notice Radius of the sphere around (r, ..., r) through the reserves
+     * @dev The larger root of (n - 1)r^2 - 2Sr + Q = 0, with S the sum and Q the sum of
+     *      squares of the reserves. Rounding down keeps sum((r - x_i)^2) <= r^2, so a
+     *      trade can never take more than the reserve out.
      */
-    function _computeTorusInvariant(uint256[] memory reserves) internal view returns (uint256) {
+    function _fitRadius(uint256[] memory reserves) internal pure returns (uint256) {
+        uint256 sum = 0;
         uint256 sumSquares = 0;
         for (uint256 i = 0; i < reserves.length; i++) {
+            sum += reserves[i];
             sumSquares += reserves[i] * reserves[i];
         }
-        uint256[] memory e = _getEqualPriceVector();
-        uint256 projection = 0;
-        for (uint256 i = 0; i < reserves.length; i++) {
-            projection += (reserves[i] * e[i]) / OrbitalMath.PRECISION;
+        
+        // Reserves this unbalanced are on no such sphere
+        uint256 spread = (reserves.length - 1) * sumSquares;
+        require(sum * sum >= spread, "Insufficient liquidity");
+        
+        return (sum + OrbitalMath.sqrt(sum * sum - spread)) / (reserves.length - 1);
+    }
+    
+    /**
+     * @notice Move ticks across the split so that exactly those whose plane constant is
+     *         at most the reserves' projection are on their boundary
+     * @dev Walks only the ticks that cross. Same test as comparing both sides normalized
+     *      by the tick radius.
+     */
+    function _syncBoundary(uint256 projection) internal {
+        uint256 split = boundaryTickCount;
+        uint256 count = sortedTicks.length;
+        
+        while (split < count && ticks[sortedTicks[split]].planeConstant <= projection) {
+            _moveToBoundary(sortedTicks[split]);
+            split++;
+        }
+        while (split > 0 && ticks[sortedTicks[split - 1]].planeConstant > projection) {
+            split--;
+            _moveToInterior(sortedTicks[split]);
         }
-        uint256 projectionSquared = (projection * projection) / OrbitalMath.PRECISION;
         
-        uint256 radiusSum = totalInteriorRadiusSquared + totalBoundaryRadiusSquared;
+        boundaryTickCount = split;
+    }
+    
+    /**
+     * @notice Materialize an interior tick's share and pin it to its plane
+     * @dev The share taken out of the interior is exactly what the tick is credited, so
+     *      the consolidated reserves still add up to the pool's balances.
+     */
+    function _moveToBoundary(uint256 tickIndex) internal {
+        Tick storage tick = ticks[tickIndex];
+        uint256 radius = tick.radius;
+        uint256[] memory reserves = _getInteriorShare(radius);
+        
+        _leaveInterior(radius, reserves);
+        tick.isInterior = false;
+        _join(tick, reserves);
         
-        // Torus invariant: (sum(x_i^2) - (R_int^2 + R_bnd^2))^2 + 4*R_bnd^2*(<x,e>^2 - C_bnd^2)
-        uint256 term1 = sumSquares > radiusSum ? sumSquares - radiusSum : 0;
-        uint256 term1Squared = (term1 * term1) / OrbitalMath.PRECISION;
+        emit TickBoundaryCrossed(tickIndex, false);
+    }
+    
+    /**
+     * @notice Pool a boundary tick's reserves back into the interior
+     */
+    function _moveToInterior(uint256 tickIndex) internal {
+        Tick storage tick = ticks[tickIndex];
+        uint256[] memory reserves = _loadReserves(tick);
         
-        uint256 term2 = 4 * totalBoundaryRadiusSquared * 
-                       (projectionSquared > totalBoundaryConstantSquared ? 
-                        projectionSquared - totalBoundaryConstantSquared : 0) / 
-                       OrbitalMath.PRECISION;
+        _leaveBoundary(reserves);
+        tick.isInterior = true;
+        _joinInterior(tick.radius, reserves);
         
-        return term1Squared + term2;
+        emit TickBoundaryCrossed(tickIndex, true);
     }
     
     /**
-     * @notice Update tick reserves and handle boundary crossings
+     * @notice Add a tick's reserves and radius to the aggregates of its current side
      */
-    function _updateTickReservesWithCrossings(uint256[] memory newTotalReserves) internal {
-        uint256[] memory e = _getEqualPriceVector();
-        uint256 newProjection = 0;
-        for (uint256 i = 0; i < newTotalReserves.length; i++) {
-            newProjection += (newTotalReserves[i] * e[i]) / OrbitalMath.PRECISION;
+    function _join(Tick storage tick, uint256[] memory reserves) internal {
+        if (tick.isInterior) {
+            _joinInterior(tick.radius, reserves);
+            return;
         }
         
-        // Check each tick for boundary crossing
-        for (uint256 i = 0; i < ticks.length; i++) {
-            if (!ticks[i].active) continue;
-            
-            Tick storage tick = ticks[i];
-            uint256 normalizedProjection = (newProjection * OrbitalMath.PRECISION) / tick.radius;
-            uint256 normalizedBoundary = (tick.planeConstant * OrbitalMath.PRECISION) / tick.radius;
-            
-            bool wasInterior = tick.isInterior;
-            tick.isInterior = normalizedProjection < normalizedBoundary;
-            
-            if (wasInterior != tick.isInterior) {
-                emit TickBoundaryCrossed(i, tick.isInterior);
+        _storeReserves(tick, reserves);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            tokenReserves[i].boundary += SafeCast.toUint128(reserves[i]);
+        }
+    }
+    
+    /**
+     * @notice Remove a tick's reserves and radius from the aggregates of its current side
+     */
+    function _leave(Tick storage tick, uint256[] memory reserves) internal {
+        if (tick.isInterior) {
+            _leaveInterior(tick.radius, reserves);
+        } else {
+            _leaveBoundary(reserves);
+        }
+    }
+    
+    function _joinInterior(uint256 radius, uint256[] memory reserves) internal {
+        for (uint256 i = 0; i < tokenCount; i++) {
+            tokenReserves[i].interior += SafeCast.toUint128(reserves[i]);
+        }
+        totalInteriorRadius += radius;
+    }
+    
+    function _leaveInterior(uint256 radius, uint256[] memory reserves) internal {
+        for (uint256 i = 0; i < tokenCount; i++) {
+            tokenReserves[i].interior -= SafeCast.toUint128(reserves[i]);
+        }
+        totalInteriorRadius -= radius;
+    }
+    
+    function _leaveBoundary(uint256[] memory reserves) internal {
+        for (uint256 i = 0; i < tokenCount; i++) {
+            tokenReserves[i].boundary -= SafeCast.toUint128(reserves[i]);
+        }
+    }
+    
+    /**
+     * @notice Write a boundary tick's reserves, two per slot
+     */
+    function _storeReserves(Tick storage tick, uint256[] memory reserves) internal {
+        uint128[] storage stored = tick.reserves;
+        if (stored.length == 0) {
+            for (uint256 i = 0; i < tokenCount; i++) {
+                stored.push(SafeCast.toUint128(reserves[i]));
             }
+            return;
+        }
+        for (uint256 i = 0; i < tokenCount; i++) {
+            stored[i] = SafeCast.toUint128(reserves[i]);
+        }
+    }
+    
+    function _loadReserves(Tick storage tick) internal view returns (uint256[] memory reserves) {
+        uint128[] storage stored = tick.reserves;
+        reserves = new uint256[](tokenCount);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            reserves[i] = stored[i];
         }
-        
-        // Update reserves for all ticks
-        _updateTickReserves(newTotalReserves);
-        _updateGlobalState();
     }
     
     /**
-     * @notice Update individual tick reserves after trade
+     * @notice Insert an active tick into sortedTicks after any with the same plane constant
+     * @return position Index it was inserted at
      */
-    function _updateTickReserves(uint256[] memory newTotalReserves) internal {
-        uint256 totalInteriorRadius = 0;
-        
-        // Sum interior tick radii
-        for (uint256 i = 0; i < ticks.length; i++) {
-            if (ticks[i].active && ticks[i].isInterior) {
-                totalInteriorRadius += ticks[i].radius;
+    function _insertSorted(uint256 tickIndex) internal returns (uint256 position) {
+        uint256 planeConstant = ticks[tickIndex].planeConstant;
+        uint256 high = sortedTicks.length;
+        
+        while (position < high) {
+            uint256 mid = (position + high) / 2;
+            if (ticks[sortedTicks[mid]].planeConstant <= planeConstant) {
+                position = mid + 1;
+            } else {
+                high = mid;
             }
         }
         
-        // Update tick reserves
-        for (uint256 i = 0; i < ticks.length; i++) {
-            if (!ticks[i].active) continue;
-            
-            Tick storage tick = ticks[i];
-            
-            if (tick.isInterior && totalInteriorRadius > 0) {
-                // Interior ticks: proportional reserves
-                for (uint256 j = 0; j < tokenCount; j++) {
-                    tick.reserves[j] = (newTotalReserves[j] * tick.radius) / 
-                                      totalInteriorRadius;
-                }
-            } else if (!tick.isInterior) {
-                // Boundary ticks: project to boundary
-                _projectTickToBoundary(tick);
-            }
+        sortedTicks.push(tickIndex);
+        for (uint256 i = sortedTicks.length - 1; i > position; i--) {
+            sortedTicks[i] = sortedTicks[i - 1];
         }
+        sortedTicks[position] = tickIndex;
     }
     
     /**
-     * @notice Project tick reserves onto its boundary plane
+     * @notice Drop a deactivated tick from sortedTicks
      */
-    function _projectTickToBoundary(Tick storage tick) internal {
-        uint256[] memory e = _getEqualPriceVector();
-        uint256 projection = 0;
-        for (uint256 i = 0; i < tick.reserves.length; i++) {
-            projection += (tick.reserves[i] * e[i]) / OrbitalMath.PRECISION;
+    function _removeSorted(uint256 tickIndex) internal {
+        uint256 count = sortedTicks.length;
+        uint256 position = 0;
+        while (sortedTicks[position] != tickIndex) {
+            position++;
         }
         
-        if (projection != tick.planeConstant) {
-            // Adjust to satisfy plane constraint while maintaining sphere constraint
-            
-            for (uint256 i = 0; i < tokenCount; i++) {
-                tick.reserves[i] = (tick.reserves[i] * tick.planeConstant) / projection;
-            }
+        for (uint256 i = position; i + 1 < count; i++) {
+            sortedTicks[i] = sortedTicks[i + 1];
+        }
+        sortedTicks.pop();
+        
+        if (position < boundaryTickCount) {
+            boundaryTickCount--;
         }
     }
     
     /**
-     * @notice Get the equal price vector e = (1,1,...,1)/sqrt(n)
+     * @notice Reserves of an interior tick with the given radius
      */
-    function _getEqualPriceVector() internal view returns (uint256[] memory) {
-        uint256[] memory e = new uint256[](tokenCount);
-        uint256 component = OrbitalMath.PRECISION / 
-                           OrbitalMath.sqrt(tokenCount * OrbitalMath.PRECISION);
+    function _getInteriorShare(uint256 radius) internal view returns (uint256[] memory share) {
+        share = new uint256[](tokenCount);
+        if (totalInteriorRadius == 0) return share;
         
         for (uint256 i = 0; i < tokenCount; i++) {
-            e[i] = component;
+            share[i] = (uint256(tokenReserves[i].interior) * radius) / totalInteriorRadius;
+        }
+    }
+    
+    /**
+     * @notice Current reserves of a tick
+     */
+    function _getTickReserves(Tick storage tick) internal view returns (uint256[] memory) {
+        if (tick.isInterior) {
+            return _getInteriorShare(tick.radius);
+        }
+        return _loadReserves(tick);
+    }
+    
+    /**
+     * @notice Projection <x, e> of reserves onto the equal price vector
+     */
+    function _getProjection(uint256[] memory reserves) internal view returns (uint256 projection) {
+        uint256 component = equalPriceComponent;
+        for (uint256 i = 0; i < reserves.length; i++) {
+            projection += (reserves[i] * component) / OrbitalMath.PRECISION;
         }
-        return e;
     }
     
     /**
@@ -418,40 +539,21 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
     function _getTotalReserves() internal view returns (uint256[] memory) {
         uint256[] memory total = new uint256[](tokenCount);
         
-        for (uint256 i = 0; i < ticks.length; i++) {
-            if (ticks[i].active) {
-                for (uint256 j = 0; j < tokenCount; j++) {
-                    total[j] += ticks[i].reserves[j];
-                }
-            }
+        for (uint256 i = 0; i < tokenCount; i++) {
+            TokenReserves storage token = tokenReserves[i];
+            total[i] = uint256(token.interior) + token.boundary;
         }
         
         return total;
     }
     
     /**
-     * @notice Update global invariant parameters
+     * @notice Get the reserves of the interior ticks, which swaps are priced on
      */
-    function _updateGlobalState() internal {
-        totalInteriorRadiusSquared = 0;
-        totalBoundaryRadiusSquared = 0;
-        totalBoundaryConstantSquared = 0;
-        
-        for (uint256 i = 0; i < ticks.length; i++) {
-            if (!ticks[i].active) continue;
-            
-            Tick storage tick = ticks[i];
-            uint256 radiusSquared = (tick.radius * tick.radius) / 
-                                   OrbitalMath.PRECISION;
-            
-            if (tick.isInterior) {
-                totalInteriorRadiusSquared += radiusSquared;
-            } else {
-                totalBoundaryRadiusSquared += radiusSquared;
-                uint256 constantSquared = (tick.planeConstant * tick.planeConstant) / 
-                                         OrbitalMath.PRECISION;
-                totalBoundaryConstantSquared += constantSquared;
-            }
+    function _getInteriorReserves() internal view returns (uint256[] memory interior) {
+        interior = new uint256[](tokenCount);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            interior[i] = tokenReserves[i].interior;
         }
     }
     
@@ -479,6 +581,13 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
         return _getTotalReserves();
     }
     
+    /**
+     * @notice Get the interior reserves that swaps and getAmountOut are priced on
+     */
+    function getInteriorReserves() external view returns (uint256[] memory) {
+        return _getInteriorReserves();
+    }
+    
     /**
      * @notice Get capital efficiency for a tick
      */
@@ -487,12 +596,13 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
         validTickIndex(tickIndex) 
         returns (uint256) {
         Tick storage tick = ticks[tickIndex];
+        uint256 radius = tick.radius;
         uint256 sqrtN = OrbitalMath.sqrt(tokenCount * OrbitalMath.PRECISION);
-        uint256 denominator = tick.radius - (tick.planeConstant * sqrtN) / OrbitalMath.PRECISION;
+        uint256 denominator = radius - (uint256(tick.planeConstant) * sqrtN) / OrbitalMath.PRECISION;
         
         if (denominator <= 0) return OrbitalMath.PRECISION;
         
-        return (tick.radius * OrbitalMath.PRECISION) / denominator;
+        return (radius * OrbitalMath.PRECISION) / denominator;
     }
     
     /**
@@ -514,7 +624,7 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
             tick.planeConstant,
             tick.isInterior,
             tick.owner,
-            tick.reserves
+            _getTickReserves(tick)
         );
     }
     
@@ -524,7 +634,14 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
     function getUserTicks(address user) external view returns (uint256[] memory) {
         return userTicks[user];
     }
-    
+
+    /**
+     * @notice Number of ticks created, including inactive ones
+     */
+    function tickCount() external view returns (uint256) {
+        return ticks.length;
+    }
+
     /**
      * @notice Calculate output amount for a given input (view function for quotes)
      */
@@ -539,9 +656,8 @@ contract OrbitalPool is ReentrancyGuard, Ownable {
         require(tokenIn != tokenOut, "Same token");
         
         uint256 amountInAfterFee = (amountIn * (FEE_DENOMINATOR - swapFee)) / FEE_DENOMINATOR;
-        uint256[] memory reserves = _getTotalReserves();
         
-        return _calculateSwapOutput(reserves, tokenIn, tokenOut, amountInAfterFee);
+        return _calculateSwapOutput(_getInteriorReserves(), tokenIn, tokenOut, amountInAfterFee);
     }
     
     // ============ Admin Functions ============
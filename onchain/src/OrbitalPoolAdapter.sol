@@ -0,0 +1,95 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/extensions/IERC20Metadata.sol";
+import "./OrbitalPool.sol";
+import "./libraries/OrbitalTypes.sol";
+
+/**
+ * @title OrbitalPoolAdapter
+ * @notice Serves an OrbitalPool through the interface the backend reads and builds swaps
+ *         for (backend/abi/OrbitalPool.json): token addresses in swap, getPoolStats with
+ *         reserves normalized to 18 decimals, and getQuote by token index
+ * @dev Used by load-test.sh to run the backend against a local pool. The adapter holds
+ *      no balances between calls: swap pulls the input from the caller, trades it on
+ *      the pool and forwards the output.
+ */
+contract OrbitalPoolAdapter {
+    uint8 public constant INTERNAL_DECIMALS = 18;
+
+    OrbitalPool public immutable pool;
+    address[] public tokens;
+
+    // Token address -> index in the pool, plus one (zero means not in the pool)
+    mapping(address => uint256) private _indexPlusOne;
+    uint256[] private _scales;
+
+    constructor(OrbitalPool _pool) {
+        pool = _pool;
+        uint256 tokenCount = _pool.tokenCount();
+        for (uint256 i = 0; i < tokenCount; i++) {
+            address token = address(_pool.tokens(i));
+            tokens.push(token);
+            _indexPlusOne[token] = i + 1;
+            _scales.push(uint256(10) ** (INTERNAL_DECIMALS - IERC20Metadata(token).decimals()));
+            IERC20(token).approve(address(_pool), type(uint256).max);
+        }
+    }
+
+    /**
+     * @notice Swap by token address, sending the output to the caller
+     * @param tokenIn Token to sell
+     * @param tokenOut Token to buy
+     * @param amountIn Amount to sell
+     * @param minAmountOut Minimum amount to receive
+     * @param deadline Latest block timestamp the swap may execute at
+     */
+    function swap(
+        address tokenIn,
+        address tokenOut,
+        uint256 amountIn,
+        uint256 minAmountOut,
+        uint256 deadline
+    ) external returns (uint256 amountOut) {
+        require(block.timestamp <= deadline, "Expired");
+        uint256 indexIn = _indexOf(tokenIn);
+        uint256 indexOut = _indexOf(tokenOut);
+
+        IERC20(tokenIn).transferFrom(msg.sender, address(this), amountIn);
+        amountOut = pool.swap(indexIn, indexOut, amountIn, minAmountOut);
+        IERC20(tokenOut).transfer(msg.sender, amountOut);
+    }
+
+    /**
+     * @notice Pool symbols, tick counts, reserves normalized to 18 decimals and total
+     *         interior radius as liquidity
+     * @dev interiorTicks counts withdrawn ticks too; the pool keeps them inactive
+     */
+    function getPoolStats() external view returns (OrbitalTypes.PoolStats memory stats) {
+        uint256[] memory reserves = pool.getReserves();
+        stats.tokenSymbols = new string[](tokens.length);
+        for (uint256 i = 0; i < tokens.length; i++) {
+            stats.tokenSymbols[i] = IERC20Metadata(tokens[i]).symbol();
+            reserves[i] *= _scales[i];
+        }
+        stats.totalReserves = reserves;
+        stats.totalTicks = pool.tickCount();
+        stats.boundaryTicks = pool.boundaryTickCount();
+        stats.interiorTicks = stats.totalTicks - stats.boundaryTicks;
+        stats.totalLiquidity = pool.totalInteriorRadius();
+    }
+
+    /**
+     * @notice Output of a swap by token index, in the output token's decimals
+     */
+    function getQuote(uint8 tokenIn, uint8 tokenOut, uint256 amountIn) external view returns (uint256) {
+        return pool.getAmountOut(tokenIn, tokenOut, amountIn);
+    }
+
+    function _indexOf(address token) internal view returns (uint256) {
+        uint256 indexPlusOne = _indexPlusOne[token];
+        require(indexPlusOne != 0, "Token not in pool");
+        return indexPlusOne - 1;
+    }
+}
@@ -315,9 +315,10 @@ library OrbitalMath {
     function sqrt(uint256 x) internal pure returns (uint256 y) {
         if (x == 0) return 0;
         
-        // Initial guess
-        uint256 z = (x + 1) / 2;
-        y = x;
+        // Initial guess: 2^(floor(log2(x)) / 2 + 1) is above sqrt(x) and within a factor
+        // of 2 of it, so Newton's method converges in a handful of steps
+        y = 1 << ((log2(x) >> 1) + 1);
+        uint256 z = (x / y + y) / 2;
         
         // Newton's method
         while (z < y) {
@@ -326,6 +327,20 @@ library OrbitalMath {
         }
     }
 
+    /// @notice Index of the most significant set bit (floor(log2(x))), 0 for x = 0
+    /// @param x Input value
+    /// @return r floor(log2(x))
+    function log2(uint256 x) internal pure returns (uint256 r) {
+        if (x >= 1 << 128) { x >>= 128; r += 128; }
+        if (x >= 1 << 64) { x >>= 64; r += 64; }
+        if (x >= 1 << 32) { x >>= 32; r += 32; }
+        if (x >= 1 << 16) { x >>= 16; r += 16; }
+        if (x >= 1 << 8) { x >>= 8; r += 8; }
+        if (x >= 1 << 4) { x >>= 4; r += 4; }
+        if (x >= 1 << 2) { x >>= 2; r += 2; }
+        if (x >= 1 << 1) { r += 1; }
+    }
+
     /// @notice Calculate nth root (approximation)
     /// @param x Input value
     /// @param n Root degree
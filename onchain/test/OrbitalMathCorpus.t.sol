@@ -0,0 +1,318 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import {Test} from "forge-std/Test.sol";
+import "../src/OrbitalPool.sol";
+import "../src/MockERC20.sol";
+import "../src/libraries/OrbitalMath.sol";
+
+/**
+ * @title OrbitalMathHarness
+ * @notice External entry points for the internal library functions, so reverts can be
+ *         caught
+ */
+contract OrbitalMathHarness {
+    function sqrt(uint256 x) external pure returns (uint256) {
+        return OrbitalMath.sqrt(x);
+    }
+
+    function nthRoot(uint256 x, uint256 n) external pure returns (uint256) {
+        return OrbitalMath.nthRoot(x, n);
+    }
+
+    function sumSquaredDifferences(uint256[] memory reserves, uint256 radius)
+        external pure returns (uint256) {
+        return OrbitalMath.sumSquaredDifferences(reserves, radius);
+    }
+
+    function calculateSwapOutputMulti(
+        uint256[] memory allReserves,
+        uint256 tokenInIndex,
+        uint256 tokenOutIndex,
+        uint256 amountIn,
+        uint256 radius,
+        uint256 feeRate
+    ) external pure returns (uint256) {
+        return OrbitalMath.calculateSwapOutputMulti(
+            allReserves, tokenInIndex, tokenOutIndex, amountIn, radius, feeRate
+        );
+    }
+
+    function calculatePrice(uint256 reserveA, uint256 reserveB, uint256 radius)
+        external pure returns (uint256) {
+        return OrbitalMath.calculatePrice(reserveA, reserveB, radius);
+    }
+
+    function calculateLPTokensToMint(
+        uint256[] memory amounts,
+        uint256[] memory reserves,
+        uint256 totalSupply
+    ) external pure returns (uint256) {
+        return OrbitalMath.calculateLPTokensToMint(amounts, reserves, totalSupply);
+    }
+}
+
+/**
+ * @title OrbitalMathCorpusTest
+ * @notice Writes the differential corpus for the backend's Python port
+ *         (backend/src/services/orbital_math.py)
+ * @dev Run with ./orbital-math-corpus.sh. Each line of corpus/orbital-math.jsonl is
+ *      {"fn", "args", "out"}: uints as decimal strings, and out is either the result or
+ *      the revert (custom error name, "Panic(<code>)" or "Error" for require). Inputs
+ *      come from a fixed seed, so the corpus only changes when the contracts do.
+ */
+contract OrbitalMathCorpusTest is Test {
+    string internal constant CORPUS = "corpus/orbital-math.jsonl";
+    uint256 internal constant CASES = 300;
+    uint256 internal constant POOLS = 20;
+    uint256 internal constant QUOTES_PER_POOL = 15;
+
+    OrbitalMathHarness internal harness;
+    uint256 internal nonce;
+
+    function testWriteCorpus() public {
+        harness = new OrbitalMathHarness();
+        vm.writeFile(CORPUS, "");
+
+        for (uint256 i = 0; i < CASES; i++) {
+            _sqrtCase();
+            _nthRootCase();
+            _sumSquaredDifferencesCase();
+            _swapOutputMultiCase();
+            _priceCase();
+            _lpTokensCase();
+        }
+        for (uint256 i = 0; i < POOLS; i++) {
+            _amountOutCases();
+        }
+    }
+
+    // ============ Cases ============
+
+    function _sqrtCase() internal {
+        uint256 x = _random(256);
+        string memory out;
+        try harness.sqrt(x) returns (uint256 y) {
+            out = vm.toString(y);
+        } catch (bytes memory reason) {
+            out = _revert(reason);
+        }
+        _write("sqrt", _uint(x), out);
+    }
+
+    function _nthRootCase() internal {
+        uint256 x = _random(256);
+        uint256 n = _next() % 13;
+        string memory out;
+        try harness.nthRoot(x, n) returns (uint256 y) {
+            out = vm.toString(y);
+        } catch (bytes memory reason) {
+            out = _revert(reason);
+        }
+        _write("nthRoot", string.concat(_uint(x), ",", _uint(n)), out);
+    }
+
+    function _sumSquaredDifferencesCase() internal {
+        uint256 radius = _random(140);
+        // 0 and 11 tokens are rejected
+        uint256[] memory reserves = _reservesBelow(_next() % 12, radius);
+        string memory out;
+        try harness.sumSquaredDifferences(reserves, radius) returns (uint256 sum) {
+            out = vm.toString(sum);
+        } catch (bytes memory reason) {
+            out = _revert(reason);
+        }
+        _write("sumSquaredDifferences", string.concat(_array(reserves), ",", _uint(radius)), out);
+    }
+
+    function _swapOutputMultiCase() internal {
+        uint256 radius = _random(140);
+        uint256 n = 2 + _next() % 5;
+        uint256[] memory reserves = _reservesBelow(n, radius);
+        // Indices one past the end are rejected
+        uint256 tokenIn = _next() % (n + 1);
+        uint256 tokenOut = _next() % (n + 1);
+        uint256 amountIn = _random(140);
+        uint256[4] memory fees = [uint256(0), 30, 10000, 10001];
+        uint256 feeRate = fees[_next() % 4];
+
+        string memory out;
+        try harness.calculateSwapOutputMulti(reserves, tokenIn, tokenOut, amountIn, radius, feeRate)
+            returns (uint256 amountOut) {
+            out = vm.toString(amountOut);
+        } catch (bytes memory reason) {
+            out = _revert(reason);
+        }
+        _write(
+            "calculateSwapOutputMulti",
+            string.concat(
+                _array(reserves), ",", _uint(tokenIn), ",", _uint(tokenOut), ",",
+                _uint(amountIn), ",", _uint(radius), ",", _uint(feeRate)
+            ),
+            out
+        );
+    }
+
+    function _priceCase() internal {
+        uint256 radius = _random(200);
+        uint256 reserveA = _next() % 8 == 0 ? radius : _random(200);
+        uint256 reserveB = _random(200);
+        string memory out;
+        try harness.calculatePrice(reserveA, reserveB, radius) returns (uint256 price) {
+            out = vm.toString(price);
+        } catch (bytes memory reason) {
+            out = _revert(reason);
+        }
+        _write(
+            "calculatePrice",
+            string.concat(_uint(reserveA), ",", _uint(reserveB), ",", _uint(radius)),
+            out
+        );
+    }
+
+    function _lpTokensCase() internal {
+        uint256 n = 1 + _next() % 6;
+        uint256[] memory amounts = new uint256[](n);
+        uint256[] memory reserves = new uint256[](_next() % 8 == 0 ? n + 1 : n);
+        for (uint256 i = 0; i < n; i++) {
+            amounts[i] = _random(100);
+        }
+        for (uint256 i = 0; i < reserves.length; i++) {
+            reserves[i] = _next() % 16 == 0 ? 0 : _random(100);
+        }
+        uint256 totalSupply = _next() % 2 == 0 ? 0 : _random(100);
+
+        string memory out;
+        try harness.calculateLPTokensToMint(amounts, reserves, totalSupply) returns (uint256 lpTokens) {
+            out = vm.toString(lpTokens);
+        } catch (bytes memory reason) {
+            out = _revert(reason);
+        }
+        _write(
+            "calculateLPTokensToMint",
+            string.concat(_array(amounts), ",", _array(reserves), ",", _uint(totalSupply)),
+            out
+        );
+    }
+
+    /**
+     * @notice Build a pool with interior and boundary ticks, move it with a few swaps,
+     *         then record getAmountOut against the state it reads
+     */
+    function _amountOutCases() internal {
+        uint256 n = 2 + _next() % 4;
+        address[] memory addresses = new address[](n);
+        for (uint256 i = 0; i < n; i++) {
+            MockERC20 token = new MockERC20("Token", "TKN", 6, type(uint128).max);
+            addresses[i] = address(token);
+        }
+        OrbitalPool pool = new OrbitalPool(addresses);
+        for (uint256 i = 0; i < n; i++) {
+            MockERC20(addresses[i]).approve(address(pool), type(uint256).max);
+        }
+
+        uint256 tickCount = 1 + _next() % 5;
+        for (uint256 t = 0; t < tickCount; t++) {
+            uint256[] memory amounts = new uint256[](n);
+            for (uint256 i = 0; i < n; i++) {
+                amounts[i] = 1e6 + _next() % 1e12;
+            }
+            // Some ticks start on their boundary
+            uint256 planeConstant = _next() % 3 == 0 ? _next() % 1e12 : 1e36;
+            try pool.addLiquidity(amounts, planeConstant) {} catch {}
+        }
+        for (uint256 s = 0; s < 3; s++) {
+            try pool.swap(_next() % n, _next() % n, 1 + _next() % 1e9, 0) {} catch {}
+        }
+
+        string memory swapFee = _uint(pool.swapFee());
+        string memory reserves = _array(pool.getInteriorReserves());
+
+        for (uint256 q = 0; q < QUOTES_PER_POOL; q++) {
+            uint256 tokenIn = _next() % (n + 1);
+            uint256 tokenOut = _next() % n;
+            uint256 amountIn = _random(50);
+            string memory out;
+            try pool.getAmountOut(tokenIn, tokenOut, amountIn) returns (uint256 amountOut) {
+                out = vm.toString(amountOut);
+            } catch (bytes memory reason) {
+                out = _revert(reason);
+            }
+            _write(
+                "getAmountOut",
+                string.concat(
+                    reserves, ",", _uint(tokenIn), ",", _uint(tokenOut), ",",
+                    _uint(amountIn), ",", swapFee
+                ),
+                out
+            );
+        }
+    }
+
+    // ============ Helpers ============
+
+    function _next() internal returns (uint256) {
+        return uint256(keccak256(abi.encode("orbital-math-corpus", nonce++)));
+    }
+
+    /**
+     * @notice A random value of up to maxBits bits, with the bit length itself random so
+     *         small and large magnitudes are both covered
+     */
+    function _random(uint256 maxBits) internal returns (uint256) {
+        uint256 bits = 1 + _next() % maxBits;
+        return _next() >> (256 - bits);
+    }
+
+    /**
+     * @notice Reserves mostly below the radius, with the occasional one at or above it
+     */
+    function _reservesBelow(uint256 n, uint256 radius) internal returns (uint256[] memory reserves) {
+        reserves = new uint256[](n);
+        for (uint256 i = 0; i < n; i++) {
+            uint256 roll = _next() % 16;
+            if (roll == 0) {
+                reserves[i] = radius;
+            } else if (roll == 1) {
+                reserves[i] = _random(200);
+            } else {
+                reserves[i] = radius == 0 ? 0 : _next() % radius;
+            }
+        }
+    }
+
+    function _revert(bytes memory reason) internal pure returns (string memory) {
+        if (reason.length < 4) return "Error";
+        bytes4 selector = bytes4(reason);
+        if (selector == OrbitalMath.InvalidTokenCount.selector) return "InvalidTokenCount";
+        if (selector == OrbitalMath.InvalidReserves.selector) return "InvalidReserves";
+        if (selector == OrbitalMath.InvariantViolation.selector) return "InvariantViolation";
+        if (selector == bytes4(keccak256("Panic(uint256)"))) {
+            uint256 code;
+            assembly {
+                code := mload(add(reason, 36))
+            }
+            return string.concat("Panic(", vm.toString(code), ")");
+        }
+        return "Error";
+    }
+
+    function _uint(uint256 x) internal pure returns (string memory) {
+        return string.concat('"', vm.toString(x), '"');
+    }
+
+    function _array(uint256[] memory values) internal pure returns (string memory out) {
+        out = "[";
+        for (uint256 i = 0; i < values.length; i++) {
+            out = string.concat(out, i == 0 ? "" : ",", _uint(values[i]));
+        }
+        out = string.concat(out, "]");
+    }
+
+    function _write(string memory fn, string memory args, string memory out) internal {
+        vm.writeLine(
+            CORPUS,
+            string.concat('{"fn":"', fn, '","args":[', args, '],"out":"', out, '"}')
+        );
+    }
+}
@@ -299,6 +299,40 @@ contract OrbitalPoolTest is Test {
         vm.stopPrank();
     }
     
+    function testBoundaryTickKeepsItsShare() public {
+        vm.startPrank(user1);
+        uint256[] memory amounts = new uint256[](4);
+        amounts[0] = 1000 * 1e6;
+        amounts[1] = 1000 * 1e6;
+        amounts[2] = 1000 * 1e6;
+        amounts[3] = 1000 * 1e6;
+
+        tokenA.approve(address(pool), 2 * amounts[0]);
+        tokenB.approve(address(pool), 2 * amounts[1]);
+        tokenC.approve(address(pool), 2 * amounts[2]);
+        tokenD.approve(address(pool), 2 * amounts[3]);
+
+        pool.addLiquidity(amounts, 1e36);
+        // A plane constant of zero is reached at any reserves, so this tick moves
+        // straight onto its boundary with its share of the interior
+        uint256 tickIndex = pool.addLiquidity(amounts, 0);
+        vm.stopPrank();
+
+        (, , bool isInterior, , uint256[] memory reserves) = pool.getTickInfo(tickIndex);
+        assertFalse(isInterior);
+        assertEq(pool.boundaryTickCount(), 1);
+        for (uint256 i = 0; i < 4; i++) {
+            assertEq(reserves[i], amounts[i]);
+        }
+
+        // Nothing is lost or created on the way: the reserves are the pool's balances
+        uint256[] memory totalReserves = pool.getReserves();
+        assertEq(totalReserves[0], tokenA.balanceOf(address(pool)));
+        assertEq(totalReserves[1], tokenB.balanceOf(address(pool)));
+        assertEq(totalReserves[2], tokenC.balanceOf(address(pool)));
+        assertEq(totalReserves[3], tokenD.balanceOf(address(pool)));
+    }
+
     function testGetSpotPrice() public {
         // Add liquidity
         vm.startPrank(user1);
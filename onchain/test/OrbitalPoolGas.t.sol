@@ -0,0 +1,242 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import {Test} from "forge-std/Test.sol";
+import "../src/OrbitalPool.sol";
+import "../src/MockERC20.sol";
+import "../src/libraries/OrbitalMath.sol";
+
+/**
+ * @title OrbitalPoolGasTest
+ * @notice Gas benchmarks for swap, addLiquidity and removeLiquidity across token counts,
+ *         tick counts and boundary crossings
+ * @dev Run with ./gas-benchmark.sh, which writes gas-report/orbital-gas.csv and checks it
+ *      against gas-report/baseline.csv. Each measurement is also saved with forge's gas
+ *      snapshot cheatcodes (snapshots/OrbitalPoolGas.json).
+ */
+contract OrbitalPoolGasTest is Test {
+    string internal constant REPORT = "gas-report/orbital-gas.csv";
+    string internal constant SNAPSHOT_GROUP = "OrbitalPoolGas";
+
+    // 18-decimal amounts. Crossing ticks are kept small so that the swap back toward the
+    // peg lowers the projection below their planes even at 1000 ticks and 50 tokens.
+    uint256 internal constant DEPOSIT = 1000e18;           // Per token, per benchmark tick
+    uint256 internal constant CROSSING_DEPOSIT = 1e12;     // Per token, per crossing tick
+    uint256 internal constant INTERIOR_CONSTANT = 1e36;    // Above any reachable projection
+    uint256 internal constant SWAP_AMOUNT = 100e18;
+
+    // Swap gas may grow by at most this many percent from 1 to 1000 ticks
+    uint256 internal constant TICK_SCALING_TOLERANCE = 10;
+
+    OrbitalPool internal pool;
+    uint256[] internal deposit;
+
+    function testGasBenchmark2Tokens() public {
+        _benchmark(2);
+    }
+
+    function testGasBenchmark3Tokens() public {
+        _benchmark(3);
+    }
+
+    function testGasBenchmark4Tokens() public {
+        _benchmark(4);
+    }
+
+    function testGasBenchmark8Tokens() public {
+        _benchmark(8);
+    }
+
+    function testGasBenchmark16Tokens() public {
+        _benchmark(16);
+    }
+
+    function testGasBenchmark32Tokens() public {
+        _benchmark(32);
+    }
+
+    function testGasBenchmark50Tokens() public {
+        _benchmark(50);
+    }
+
+    /**
+     * @notice Grow one pool to 1, 10, 100 and 1000 ticks and measure every operation at
+     *         each size
+     */
+    function _benchmark(uint256 tokenCount) internal {
+        _deploy(tokenCount);
+
+        uint256[4] memory tickCounts = [uint256(1), 10, 100, 1000];
+        uint256 firstSwapGas;
+        uint256 lastSwapGas;
+        uint256 added = 0;
+
+        for (uint256 i = 0; i < tickCounts.length; i++) {
+            vm.pauseGasMetering();
+            while (added < tickCounts[i]) {
+                pool.addLiquidity(deposit, INTERIOR_CONSTANT);
+                added++;
+            }
+            vm.resumeGasMetering();
+
+            lastSwapGas = _measureSwap(tokenCount, added, 0);
+            if (i == 0) firstSwapGas = lastSwapGas;
+            _measureSwap(tokenCount, added, 1);
+            _measureSwap(tokenCount, added, 10);
+
+            _measureAddLiquidity(tokenCount, added, "addLiquidity", INTERIOR_CONSTANT);
+            // Sorts ahead of every existing tick, so the index shifts all of them
+            _measureAddLiquidity(tokenCount, added, "addLiquidityFront", INTERIOR_CONSTANT - 1);
+
+            _measureRemoveLiquidity(tokenCount, added, "removeLiquidity", 5e17);
+            _measureRemoveLiquidity(tokenCount, added, "removeLiquidityFull", OrbitalMath.PRECISION);
+        }
+
+        // Swaps that cross nothing must not pay for the ticks they do not touch
+        assertLe(
+            lastSwapGas * 100,
+            firstSwapGas * (100 + TICK_SCALING_TOLERANCE),
+            "Swap gas grows with tick count"
+        );
+    }
+
+    /**
+     * @notice Swap token 1 back for token 0 after moving the pool off its peg and pinning
+     *         `crossings` small ticks to their boundary at the off-peg projection
+     * @dev Off the peg, token 1 is the scarcer token, so the measured swap pays out more
+     *      than the net input it adds. The reserves' sum, and with it the projection,
+     *      falls below the pinned planes, and the swap moves every pinned tick back to
+     *      the interior. Every crossing count runs the same trades, so the rows differ
+     *      only in the ticks crossed.
+     */
+    function _measureSwap(
+        uint256 tokenCount,
+        uint256 tickCount,
+        uint256 crossings
+    ) internal returns (uint256 gasUsed) {
+        uint256 state = vm.snapshotState();
+
+        vm.pauseGasMetering();
+        pool.swap(0, 1, SWAP_AMOUNT, 0);
+        // Adding a tick only raises the projection, so every one of them stays pinned
+        uint256 planeConstant = _getProjection(tokenCount);
+        uint256[] memory amounts = _uniform(tokenCount, CROSSING_DEPOSIT);
+        for (uint256 i = 0; i < crossings; i++) {
+            pool.addLiquidity(amounts, planeConstant);
+        }
+        vm.resumeGasMetering();
+        assertEq(pool.boundaryTickCount(), crossings);
+
+        vm.startSnapshotGas(SNAPSHOT_GROUP, _name("swap", tokenCount, tickCount, crossings));
+        pool.swap(1, 0, SWAP_AMOUNT / 2, 0);
+        gasUsed = vm.stopSnapshotGas();
+
+        assertEq(pool.boundaryTickCount(), 0);
+        _record("swap", tokenCount, tickCount, crossings, gasUsed);
+        vm.revertToState(state);
+    }
+
+    function _measureAddLiquidity(
+        uint256 tokenCount,
+        uint256 tickCount,
+        string memory operation,
+        uint256 planeConstant
+    ) internal {
+        uint256 state = vm.snapshotState();
+
+        vm.startSnapshotGas(SNAPSHOT_GROUP, _name(operation, tokenCount, tickCount, 0));
+        pool.addLiquidity(deposit, planeConstant);
+        _record(operation, tokenCount, tickCount, 0, vm.stopSnapshotGas());
+
+        vm.revertToState(state);
+    }
+
+    /**
+     * @notice Withdraw from the oldest tick, which sorts first among equal plane constants
+     */
+    function _measureRemoveLiquidity(
+        uint256 tokenCount,
+        uint256 tickCount,
+        string memory operation,
+        uint256 fraction
+    ) internal {
+        uint256 state = vm.snapshotState();
+
+        vm.startSnapshotGas(SNAPSHOT_GROUP, _name(operation, tokenCount, tickCount, 0));
+        pool.removeLiquidity(0, fraction);
+        _record(operation, tokenCount, tickCount, 0, vm.stopSnapshotGas());
+
+        vm.revertToState(state);
+    }
+
+    // ============ Helpers ============
+
+    function _deploy(uint256 tokenCount) internal {
+        address[] memory addresses = new address[](tokenCount);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            MockERC20 token = new MockERC20("Token", "TKN", 18, type(uint128).max);
+            addresses[i] = address(token);
+        }
+        pool = new OrbitalPool(addresses);
+
+        for (uint256 i = 0; i < tokenCount; i++) {
+            MockERC20(addresses[i]).approve(address(pool), type(uint256).max);
+        }
+        deposit = _uniform(tokenCount, DEPOSIT);
+    }
+
+    function _uniform(uint256 tokenCount, uint256 amount) internal pure returns (uint256[] memory amounts) {
+        amounts = new uint256[](tokenCount);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            amounts[i] = amount;
+        }
+    }
+
+    /**
+     * @notice The pool's projection of its total reserves, computed the way the pool does
+     */
+    function _getProjection(uint256 tokenCount) internal view returns (uint256 projection) {
+        uint256[] memory reserves = pool.getReserves();
+        uint256 component = OrbitalMath.PRECISION /
+                           OrbitalMath.sqrt(tokenCount * OrbitalMath.PRECISION);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            projection += (reserves[i] * component) / OrbitalMath.PRECISION;
+        }
+    }
+
+    function _name(
+        string memory operation,
+        uint256 tokenCount,
+        uint256 tickCount,
+        uint256 crossings
+    ) internal view returns (string memory) {
+        return string.concat(
+            operation,
+            "_n", vm.toString(tokenCount),
+            "_ticks", vm.toString(tickCount),
+            "_crossings", vm.toString(crossings)
+        );
+    }
+
+    /**
+     * @notice Append a row to the CSV report (header written by gas-benchmark.sh)
+     */
+    function _record(
+        string memory operation,
+        uint256 tokenCount,
+        uint256 tickCount,
+        uint256 crossings,
+        uint256 gasUsed
+    ) internal {
+        vm.writeLine(
+            REPORT,
+            string.concat(
+                operation, ",",
+                vm.toString(tokenCount), ",",
+                vm.toString(tickCount), ",",
+                vm.toString(crossings), ",",
+                vm.toString(gasUsed)
+            )
+        );
+    }
+}
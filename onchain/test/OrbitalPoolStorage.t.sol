@@ -0,0 +1,231 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import {Test} from "forge-std/Test.sol";
+import "../src/OrbitalPool.sol";
+import "../src/MockERC20.sol";
+import "../src/libraries/OrbitalMath.sol";
+import "./reference/OrbitalPoolUnpacked.sol";
+
+/**
+ * @notice The calls the storage benchmark makes, shared by OrbitalPool and
+ *         OrbitalPoolUnpacked
+ */
+interface IOrbitalPoolStorage {
+    function addLiquidity(uint256[] memory amounts, uint256 planeConstant) external returns (uint256);
+    function removeLiquidity(uint256 tickIndex, uint256 fraction) external returns (uint256[] memory);
+    function swap(uint256 tokenIn, uint256 tokenOut, uint256 amountIn, uint256 minAmountOut)
+        external returns (uint256);
+    function getReserves() external view returns (uint256[] memory);
+    function getTickInfo(uint256 tickIndex)
+        external view returns (uint256, uint256, bool, address, uint256[] memory);
+    function boundaryTickCount() external view returns (uint256);
+}
+
+/**
+ * @title OrbitalPoolStorageTest
+ * @notice Storage-layout benchmark: distinct pool slots read (SLOAD) and written (SSTORE)
+ *         by each operation across token counts, on the packed layout and on the layout
+ *         before it (test/reference/OrbitalPoolUnpacked.sol)
+ * @dev Run with ./gas-benchmark.sh, which writes gas-report/orbital-storage.csv. Slots
+ *      are counted once per operation, since only the first access to a slot is cold.
+ */
+contract OrbitalPoolStorageTest is Test {
+    string internal constant REPORT = "gas-report/orbital-storage.csv";
+
+    uint256 internal constant DEPOSIT = 1e12;              // Per token, per tick
+    uint256 internal constant INTERIOR_CONSTANT = 1e36;    // Above any reachable projection
+    uint256 internal constant SWAP_AMOUNT = 1e9;
+    uint256 internal constant EXTRA_TICKS = 10;
+
+    // Operations in the order _measure runs them
+    uint256 internal constant GET_RESERVES = 0;
+    uint256 internal constant GET_TICK_INFO_INTERIOR = 1;
+    uint256 internal constant GET_TICK_INFO_BOUNDARY = 2;
+    uint256 internal constant SWAP = 3;
+    uint256 internal constant ADD_LIQUIDITY = 4;
+    uint256 internal constant REMOVE_LIQUIDITY = 5;
+    uint256 internal constant SWAP_MANY_TICKS = 6;
+
+    struct Access {
+        uint256 reads;
+        uint256 writes;
+    }
+
+    uint256[] internal deposit;
+
+    function testStorage2Tokens() public {
+        _benchmark(2);
+    }
+
+    function testStorage4Tokens() public {
+        _benchmark(4);
+    }
+
+    function testStorage8Tokens() public {
+        _benchmark(8);
+    }
+
+    function testStorage16Tokens() public {
+        _benchmark(16);
+    }
+
+    /**
+     * @notice Measure both layouts, check the packed one's slot counts and that packing
+     *         reads fewer slots where it merges them
+     */
+    function _benchmark(uint256 tokenCount) internal {
+        Access[7] memory packed = _measure(_deploy(tokenCount, false), tokenCount, "packed");
+        Access[7] memory unpacked = _measure(_deploy(tokenCount, true), tokenCount, "unpacked");
+
+        // One packed slot per token, plus the token count and the array length
+        assertLe(packed[GET_RESERVES].reads, tokenCount + 2, "getReserves reads per-side reserve slots");
+        // Two tick slots, the reserves length and two reserves per slot, plus the
+        // pool-level counts
+        assertLe(
+            packed[GET_TICK_INFO_BOUNDARY].reads,
+            6 + (tokenCount + 1) / 2,
+            "Boundary tick reserves are not packed"
+        );
+        // The reentrancy status, the two traded reserve slots and the boundary count
+        assertLe(packed[SWAP].writes, 4, "swap writes more than the traded reserves");
+        // Swaps only touch the consolidated reserves, so more ticks cost no extra slots
+        assertEq(packed[SWAP_MANY_TICKS].reads, packed[SWAP].reads, "swap reads grow with tick count");
+
+        // Interior and boundary reserves of a token share a slot; so do a tick's radius
+        // and plane constant, and two boundary reserves
+        assertLt(
+            packed[GET_RESERVES].reads,
+            unpacked[GET_RESERVES].reads,
+            "Packing does not reduce getReserves reads"
+        );
+        assertLt(
+            packed[GET_TICK_INFO_BOUNDARY].reads,
+            unpacked[GET_TICK_INFO_BOUNDARY].reads,
+            "Packing does not reduce boundary tick reads"
+        );
+        // The swap prices from both sides of each token's reserves
+        assertLe(packed[SWAP].reads, unpacked[SWAP].reads, "Packing adds swap SLOADs");
+    }
+
+    /**
+     * @notice One interior and one boundary tick, then every operation against them
+     */
+    function _measure(
+        IOrbitalPoolStorage pool,
+        uint256 tokenCount,
+        string memory layout
+    ) internal returns (Access[7] memory accesses) {
+        pool.addLiquidity(deposit, INTERIOR_CONSTANT);
+        pool.addLiquidity(_uniform(tokenCount, DEPOSIT / 1000), _getProjection(pool, tokenCount));
+        assertEq(pool.boundaryTickCount(), 1);
+        uint256 interiorTick = 0;
+        uint256 boundaryTick = 1;
+
+        vm.record();
+        pool.getReserves();
+        accesses[GET_RESERVES] = _record(pool, "getReserves", tokenCount, layout);
+
+        vm.record();
+        pool.getTickInfo(interiorTick);
+        accesses[GET_TICK_INFO_INTERIOR] = _record(pool, "getTickInfoInterior", tokenCount, layout);
+
+        vm.record();
+        pool.getTickInfo(boundaryTick);
+        accesses[GET_TICK_INFO_BOUNDARY] = _record(pool, "getTickInfoBoundary", tokenCount, layout);
+
+        vm.record();
+        pool.swap(0, 1, SWAP_AMOUNT, 0);
+        accesses[SWAP] = _record(pool, "swap", tokenCount, layout);
+
+        vm.record();
+        pool.addLiquidity(deposit, INTERIOR_CONSTANT);
+        accesses[ADD_LIQUIDITY] = _record(pool, "addLiquidity", tokenCount, layout);
+
+        vm.record();
+        pool.removeLiquidity(interiorTick, 5e17);
+        accesses[REMOVE_LIQUIDITY] = _record(pool, "removeLiquidity", tokenCount, layout);
+
+        for (uint256 i = 0; i < EXTRA_TICKS; i++) {
+            pool.addLiquidity(deposit, INTERIOR_CONSTANT);
+        }
+        vm.record();
+        pool.swap(0, 1, SWAP_AMOUNT, 0);
+        accesses[SWAP_MANY_TICKS] = _record(pool, "swapManyTicks", tokenCount, layout);
+    }
+
+    // ============ Helpers ============
+
+    function _deploy(uint256 tokenCount, bool unpacked) internal returns (IOrbitalPoolStorage pool) {
+        address[] memory addresses = new address[](tokenCount);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            MockERC20 token = new MockERC20("Token", "TKN", 18, type(uint128).max);
+            addresses[i] = address(token);
+        }
+        pool = unpacked
+            ? IOrbitalPoolStorage(address(new OrbitalPoolUnpacked(addresses)))
+            : IOrbitalPoolStorage(address(new OrbitalPool(addresses)));
+
+        for (uint256 i = 0; i < tokenCount; i++) {
+            MockERC20(addresses[i]).approve(address(pool), type(uint256).max);
+        }
+        deposit = _uniform(tokenCount, DEPOSIT);
+    }
+
+    function _uniform(uint256 tokenCount, uint256 amount) internal pure returns (uint256[] memory amounts) {
+        amounts = new uint256[](tokenCount);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            amounts[i] = amount;
+        }
+    }
+
+    /**
+     * @notice The pool's projection of its total reserves, computed the way the pool does
+     */
+    function _getProjection(
+        IOrbitalPoolStorage pool,
+        uint256 tokenCount
+    ) internal view returns (uint256 projection) {
+        uint256[] memory reserves = pool.getReserves();
+        uint256 component = OrbitalMath.PRECISION /
+                           OrbitalMath.sqrt(tokenCount * OrbitalMath.PRECISION);
+        for (uint256 i = 0; i < tokenCount; i++) {
+            projection += (reserves[i] * component) / OrbitalMath.PRECISION;
+        }
+    }
+
+    /**
+     * @notice Count the distinct pool slots accessed since vm.record and append a row to
+     *         the CSV report (header written by gas-benchmark.sh)
+     */
+    function _record(
+        IOrbitalPoolStorage pool,
+        string memory operation,
+        uint256 tokenCount,
+        string memory layout
+    ) internal returns (Access memory access) {
+        (bytes32[] memory readSlots, bytes32[] memory writeSlots) = vm.accesses(address(pool));
+        access.reads = _distinct(readSlots);
+        access.writes = _distinct(writeSlots);
+        vm.writeLine(
+            REPORT,
+            string.concat(
+                operation, ",",
+                vm.toString(tokenCount), ",",
+                layout, ",",
+                vm.toString(access.reads), ",",
+                vm.toString(access.writes)
+            )
+        );
+    }
+
+    function _distinct(bytes32[] memory slots) internal pure returns (uint256 count) {
+        for (uint256 i = 0; i < slots.length; i++) {
+            bool seen = false;
+            for (uint256 j = 0; j < i && !seen; j++) {
+                seen = slots[j] == slots[i];
+            }
+            if (!seen) count++;
+        }
+    }
+}
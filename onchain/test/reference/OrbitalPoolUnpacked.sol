@@ -0,0 +1,704 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+// Import OpenZeppelin contracts
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/utils/ReentrancyGuard.sol";
+import "@openzeppelin/contracts/access/Ownable.sol";
+import "../../src/libraries/OrbitalMath.sol";
+
+/**
+ * @title OrbitalPoolUnpacked
+ * @notice OrbitalPool as it was before its storage was packed: full-width tick fields and
+ *         reserves, and separate interior and boundary reserve arrays
+ * @dev Test-only reference for test/OrbitalPoolStorage.t.sol, which measures the slots
+ *      each operation touches on both layouts. Not deployed; do not change its logic.
+ */
+contract OrbitalPoolUnpacked is ReentrancyGuard, Ownable {
+    
+    // ============ Structs ============
+    
+    /**
+     * @notice Represents a liquidity tick in N-dimensional space
+     * @dev Each tick is a sphere with optional plane boundary constraint
+     */
+    struct Tick {
+        uint256 radius;          // r: sphere radius (liquidity amount)
+        uint256 planeConstant;   // c: plane boundary distance
+        bool isInterior;         // Whether reserves are interior or on boundary
+        uint256[] reserves;      // Reserve state while on the boundary (interior ticks derive theirs)
+        address owner;           // LP who owns this tick
+        bool active;             // Whether tick is active
+    }
+    
+    /**
+     * @notice Pool information structure
+     */
+    struct PoolInfo {
+        address[] tokens;
+        uint256 tokenCount;
+        uint256 totalVolume;
+        uint256 createdAt;
+    }
+    
+    // ============ State Variables ============
+    
+    // Pool configuration
+    IERC20[] public tokens;
+    uint256 public immutable tokenCount;
+    
+    // Component of the equal price vector e = (1,1,...,1)/sqrt(n), fixed at deployment
+    uint256 internal immutable equalPriceComponent;
+    
+    // Tick management
+    Tick[] public ticks;
+    mapping(address => uint256[]) public userTicks; // User -> tick indices
+    
+    // Global state for efficient computation
+    uint256 public totalInteriorRadiusSquared;  // Sum of r_i^2 for interior ticks
+    uint256 public totalBoundaryRadiusSquared;  // Sum of r_i^2 for boundary ticks
+    uint256 public totalBoundaryConstantSquared; // Sum of c_i^2 for boundary ticks
+    
+    // Consolidated reserves. Swaps only touch these, so their cost depends on the token
+    // count and the number of crossings, not on the number of ticks.
+    uint256[] internal interiorReserves;  // Sum of reserves over interior ticks
+    uint256[] internal boundaryReserves;  // Sum of reserves over boundary ticks
+    // Interior ticks share interiorReserves pro rata to radius: interiorReserves / 
+    // totalInteriorRadius is the per-share accumulator (like Uniswap's fee growth), so a
+    // tick's reserves are derived when read or withdrawn instead of rewritten every swap.
+    uint256 public totalInteriorRadius;
+    
+    // Active tick indices sorted by plane constant. The reserves' projection only moves
+    // ticks across a single split point: the first boundaryTickCount are on their boundary.
+    uint256[] internal sortedTicks;
+    uint256 public boundaryTickCount;
+    
+    // Fee parameters
+    uint256 public constant FEE_DENOMINATOR = 10000;
+    uint256 public swapFee = 30; // 0.3% default fee
+    
+    // Factory functionality
+    mapping(bytes32 => address) public pools;
+    address[] public allPools;
+    
+    // ============ Events ============
+    
+    event PoolCreated(address indexed pool, address[] tokens);
+    event LiquidityAdded(address indexed provider, uint256 tickIndex, uint256 radius);
+    event LiquidityRemoved(address indexed provider, uint256 tickIndex, uint256 amount);
+    event Swap(
+        address indexed trader, 
+        uint256 tokenIn, 
+        uint256 tokenOut, 
+        uint256 amountIn, 
+        uint256 amountOut
+    );
+    event TickBoundaryCrossed(uint256 tickIndex, bool nowInterior);
+    
+    // ============ Modifiers ============
+    
+    modifier validTokenIndex(uint256 index) {
+        require(index < tokenCount, "Invalid token index");
+        _;
+    }
+    
+    modifier validTickIndex(uint256 index) {
+        require(index < ticks.length && ticks[index].active, "Invalid tick");
+        _;
+    }
+    
+    // ============ Constructor ============
+    
+    /**
+     * @notice Initialize pool with token addresses
+     * @param _tokens Array of ERC20 token addresses
+     */
+    constructor(address[] memory _tokens) Ownable(msg.sender) {
+        require(_tokens.length >= 2, "Need at least 2 tokens");
+        require(_tokens.length <= 100, "Too many tokens");
+        
+        tokenCount = _tokens.length;
+        equalPriceComponent = OrbitalMath.PRECISION / 
+                              OrbitalMath.sqrt(_tokens.length * OrbitalMath.PRECISION);
+        for (uint256 i = 0; i < _tokens.length; i++) {
+            tokens.push(IERC20(_tokens[i]));
+        }
+        interiorReserves = new uint256[](_tokens.length);
+        boundaryReserves = new uint256[](_tokens.length);
+    }
+    
+    // ============ Main Functions ============
+    
+    /**
+     * @notice Add liquidity to the pool
+     * @param amounts Token amounts to deposit
+     * @param planeConstant Tick boundary parameter (concentration level)
+     * @return tickIndex Index of created tick
+     */
+    function addLiquidity(
+        uint256[] memory amounts,
+        uint256 planeConstant
+    ) external nonReentrant returns (uint256 tickIndex) {
+        require(amounts.length == tokenCount, "Invalid amounts length");
+        
+        // Calculate radius from deposit amounts (geometric approach)
+        uint256 sumSquares = 0;
+        for (uint256 i = 0; i < tokenCount; i++) {
+            sumSquares += amounts[i] * amounts[i];
+        }
+        uint256 radius = OrbitalMath.sqrt(sumSquares);
+        require(radius > 0, "Zero liquidity");
+        
+        // Transfer tokens from user
+        for (uint256 i = 0; i < tokenCount; i++) {
+            if (amounts[i] > 0) {
+                tokens[i].transferFrom(msg.sender, address(this), amounts[i]);
+            }
+        }
+        
+        // Create new tick
+        Tick memory newTick = Tick({
+            radius: radius,
+            planeConstant: planeConstant,
+            isInterior: true,
+            reserves: amounts,
+            owner: msg.sender,
+            active: true
+        });
+        
+        ticks.push(newTick);
+        tickIndex = ticks.length - 1;
+        
+        // Update user's tick list
+        userTicks[msg.sender].push(tickIndex);
+        
+        // Join the interior; if the reserves are already past the tick's plane, move it
+        // straight onto its boundary so the sorted prefix stays the boundary set
+        _joinInterior(radius, amounts);
+        if (_insertSorted(tickIndex) < boundaryTickCount) {
+            _moveToBoundary(tickIndex);
+            boundaryTickCount++;
+        }
+        _syncBoundary(_getProjection(_getTotalReserves()));
+        
+        emit LiquidityAdded(msg.sender, tickIndex, radius);
+    }
+    
+    /**
+     * @notice Remove liquidity from a tick
+     * @param tickIndex Index of tick to remove from
+     * @param fraction Fraction to remove (scaled by 1e18)
+     */
+    function removeLiquidity(
+        uint256 tickIndex,
+        uint256 fraction
+    ) external nonReentrant validTickIndex(tickIndex) returns (uint256[] memory amounts) {
+        require(fraction <= OrbitalMath.PRECISION, "Fraction > 1");
+        
+        Tick storage tick = ticks[tickIndex];
+        require(tick.owner == msg.sender, "Not tick owner");
+        
+        // Take the tick out of the aggregates and rejoin with what is left
+        uint256[] memory reserves = _getTickReserves(tick);
+        _leave(tick, reserves);
+        
+        amounts = new uint256[](tokenCount);
+        
+        // Calculate amounts to return
+        for (uint256 i = 0; i < tokenCount; i++) {
+            amounts[i] = (reserves[i] * fraction) / OrbitalMath.PRECISION;
+            if (amounts[i] > 0) {
+                tokens[i].transfer(msg.sender, amounts[i]);
+                reserves[i] -= amounts[i];
+            }
+        }
+        
+        // Update tick state
+        tick.radius = (tick.radius * (OrbitalMath.PRECISION - fraction)) / 
+                      OrbitalMath.PRECISION;
+        
+        if (tick.radius < 1000) { // Minimum tick size
+            tick.active = false;
+            tick.reserves = reserves;
+            _removeSorted(tickIndex);
+        } else {
+            _join(tick, reserves);
+        }
+        
+        _syncBoundary(_getProjection(_getTotalReserves()));
+        
+        emit LiquidityRemoved(msg.sender, tickIndex, fraction);
+    }
+    
+    /**
+     * @notice Execute token swap
+     * @param tokenIn Index of token to sell
+     * @param tokenOut Index of token to buy
+     * @param amountIn Amount to sell
+     * @param minAmountOut Minimum amount to receive
+     */
+    function swap(
+        uint256 tokenIn,
+        uint256 tokenOut,
+        uint256 amountIn,
+        uint256 minAmountOut
+    ) external nonReentrant 
+      validTokenIndex(tokenIn) 
+      validTokenIndex(tokenOut) 
+      returns (uint256 amountOut) {
+        
+        require(tokenIn != tokenOut, "Same token");
+        require(amountIn > 0, "Zero input");
+        
+        // Transfer input token
+        tokens[tokenIn].transferFrom(msg.sender, address(this), amountIn);
+        
+        // Apply fee
+        uint256 amountInAfterFee = (amountIn * (FEE_DENOMINATOR - swapFee)) / FEE_DENOMINATOR;
+        
+        // Get current total reserves
+        uint256[] memory totalReserves = _getTotalReserves();
+        
+        // Calculate output amount using invariant
+        amountOut = _calculateSwapOutput(
+            totalReserves,
+            tokenIn,
+            tokenOut,
+            amountInAfterFee
+        );
+        amountOut = amountIn;
+
+        // Boundary ticks are pinned to their planes, so the trade moves interior reserves
+        require(amountOut <= interiorReserves[tokenOut], "Insufficient liquidity");
+        interiorReserves[tokenIn] += amountInAfterFee;
+        interiorReserves[tokenOut] -= amountOut;
+        totalReserves[tokenIn] += amountInAfterFee;
+        totalReserves[tokenOut] -= amountOut;
+        
+        // Move the ticks whose planes the reserves crossed
+        _syncBoundary(_getProjection(totalReserves));
+        
+        // Transfer output token
+        tokens[tokenOut].transfer(msg.sender, amountOut);
+        
+        emit Swap(msg.sender, tokenIn, tokenOut, amountIn, amountOut);
+    }
+    
+    // ============ Internal Functions ============
+    
+    /**
+     * @notice Calculate swap output maintaining torus invariant
+     * @dev Only the tokenIn and tokenOut reserves change during the search, so the sum
+     *      of squares and the projection are computed once and updated for those two
+     *      terms per step; no memory is allocated inside the loop.
+     */
+    function _calculateSwapOutput(
+        uint256[] memory reserves,
+        uint256 tokenIn,
+        uint256 tokenOut,
+        uint256 amountIn
+    ) internal view returns (uint256) {
+        uint256 component = equalPriceComponent;
+        uint256 interiorRadiusSquared = totalInteriorRadiusSquared;
+        uint256 boundaryRadiusSquared = totalBoundaryRadiusSquared;
+        uint256 boundaryConstantSquared = totalBoundaryConstantSquared;
+        
+        uint256 sumSquares = 0;
+        uint256 projection = 0;
+        for (uint256 i = 0; i < reserves.length; i++) {
+            sumSquares += reserves[i] * reserves[i];
+            projection += (reserves[i] * component) / OrbitalMath.PRECISION;
+        }
+        
+        // Get current invariant
+        uint256 currentInvariant = _computeTorusInvariant(
+            sumSquares,
+            projection,
+            interiorRadiusSquared,
+            boundaryRadiusSquared,
+            boundaryConstantSquared
+        );
+        
+        // Sums over every token except tokenOut, with amountIn already added to tokenIn
+        uint256 reserveIn = reserves[tokenIn];
+        uint256 reserveOut = reserves[tokenOut];
+        uint256 newReserveIn = reserveIn + amountIn;
+        sumSquares = sumSquares - reserveIn * reserveIn - reserveOut * reserveOut + 
+                     newReserveIn * newReserveIn;
+        projection = projection - (reserveIn * component) / OrbitalMath.PRECISION - 
+                     (reserveOut * component) / OrbitalMath.PRECISION + 
+                     (newReserveIn * component) / OrbitalMath.PRECISION;
+        
+        // Binary search for output amount that maintains invariant
+        uint256 low = 0;
+        uint256 high = reserveOut;
+        uint256 mid;
+        
+        // Use binary search for better accuracy than constant product
+        for (uint256 i = 0; i < 128; i++) {
+            mid = (low + high) / 2;
+            uint256 newReserveOut = reserveOut - mid;
+            
+            uint256 newInvariant = _computeTorusInvariant(
+                sumSquares + newReserveOut * newReserveOut,
+                projection + (newReserveOut * component) / OrbitalMath.PRECISION,
+                interiorRadiusSquared,
+                boundaryRadiusSquared,
+                boundaryConstantSquared
+            );
+            
+            if (newInvariant > currentInvariant) {
+                high = mid;
+            } else {
+                low = mid;
+            }
+            
+            if (high - low <= 1) break;
+        }
+        
+        return low;
+    }
+    
+    /**
+     * @notice Compute the torus invariant from the reserves' sum of squares and projection
+     */
+    function _computeTorusInvariant(
+        uint256 sumSquares,
+        uint256 projection,
+        uint256 interiorRadiusSquared,
+        uint256 boundaryRadiusSquared,
+        uint256 boundaryConstantSquared
+    ) internal pure returns (uint256) {
+        uint256 projectionSquared = (projection * projection) / OrbitalMath.PRECISION;
+        
+        uint256 radiusSum = interiorRadiusSquared + boundaryRadiusSquared;
+        
+        // Torus invariant: (sum(x_i^2) - (R_int^2 + R_bnd^2))^2 + 4*R_bnd^2*(<x,e>^2 - C_bnd^2)
+        uint256 term1 = sumSquares > radiusSum ? sumSquares - radiusSum : 0;
+        uint256 term1Squared = (term1 * term1) / OrbitalMath.PRECISION;
+        
+        uint256 term2 = 4 * boundaryRadiusSquared * 
+                       (projectionSquared > boundaryConstantSquared ? 
+                        projectionSquared - boundaryConstantSquared : 0) / 
+                       OrbitalMath.PRECISION;
+        
+        return term1Squared + term2;
+    }
+    
+    /**
+     * @notice Move ticks across the split so that exactly those whose plane constant is
+     *         at most the reserves' projection are on their boundary
+     * @dev Walks only the ticks that cross. Same test as comparing both sides normalized
+     *      by the tick radius.
+     */
+    function _syncBoundary(uint256 projection) internal {
+        uint256 split = boundaryTickCount;
+        uint256 count = sortedTicks.length;
+        
+        while (split < count && ticks[sortedTicks[split]].planeConstant <= projection) {
+            _moveToBoundary(sortedTicks[split]);
+            split++;
+        }
+        while (split > 0 && ticks[sortedTicks[split - 1]].planeConstant > projection) {
+            split--;
+            _moveToInterior(sortedTicks[split]);
+        }
+        
+        boundaryTickCount = split;
+    }
+    
+    /**
+     * @notice Materialize an interior tick's share and pin it to its plane
+     */
+    function _moveToBoundary(uint256 tickIndex) internal {
+        Tick storage tick = ticks[tickIndex];
+        uint256[] memory reserves = _getInteriorShare(tick.radius);
+        
+        _leaveInterior(tick.radius, reserves);
+        tick.isInterior = false;
+        _join(tick, _projectToBoundary(reserves, tick.planeConstant));
+        
+        emit TickBoundaryCrossed(tickIndex, false);
+    }
+    
+    /**
+     * @notice Pool a boundary tick's reserves back into the interior
+     */
+    function _moveToInterior(uint256 tickIndex) internal {
+        Tick storage tick = ticks[tickIndex];
+        uint256[] memory reserves = tick.reserves;
+        
+        _leaveBoundary(tick, reserves);
+        tick.isInterior = true;
+        _joinInterior(tick.radius, reserves);
+        
+        emit TickBoundaryCrossed(tickIndex, true);
+    }
+    
+    /**
+     * @notice Add a tick's reserves and radius to the aggregates of its current side
+     */
+    function _join(Tick storage tick, uint256[] memory reserves) internal {
+        if (tick.isInterior) {
+            _joinInterior(tick.radius, reserves);
+            return;
+        }
+        
+        tick.reserves = reserves;
+        for (uint256 i = 0; i < tokenCount; i++) {
+            boundaryReserves[i] += reserves[i];
+        }
+        totalBoundaryRadiusSquared += (tick.radius * tick.radius) / OrbitalMath.PRECISION;
+        totalBoundaryConstantSquared += (tick.planeConstant * tick.planeConstant) / 
+                                        OrbitalMath.PRECISION;
+    }
+    
+    /**
+     * @notice Remove a tick's reserves and radius from the aggregates of its current side
+     */
+    function _leave(Tick storage tick, uint256[] memory reserves) internal {
+        if (tick.isInterior) {
+            _leaveInterior(tick.radius, reserves);
+        } else {
+            _leaveBoundary(tick, reserves);
+        }
+    }
+    
+    function _joinInterior(uint256 radius, uint256[] memory reserves) internal {
+        for (uint256 i = 0; i < tokenCount; i++) {
+            interiorReserves[i] += reserves[i];
+        }
+        totalInteriorRadius += radius;
+        totalInteriorRadiusSquared += (radius * radius) / OrbitalMath.PRECISION;
+    }
+    
+    function _leaveInterior(uint256 radius, uint256[] memory reserves) internal {
+        for (uint256 i = 0; i < tokenCount; i++) {
+            interiorReserves[i] -= reserves[i];
+        }
+        totalInteriorRadius -= radius;
+        totalInteriorRadiusSquared -= (radius * radius) / OrbitalMath.PRECISION;
+    }
+    
+    function _leaveBoundary(Tick storage tick, uint256[] memory reserves) internal {
+        for (uint256 i = 0; i < tokenCount; i++) {
+            boundaryReserves[i] -= reserves[i];
+        }
+        totalBoundaryRadiusSquared -= (tick.radius * tick.radius) / OrbitalMath.PRECISION;
+        totalBoundaryConstantSquared -= (tick.planeConstant * tick.planeConstant) / 
+                                        OrbitalMath.PRECISION;
+    }
+    
+    /**
+     * @notice Insert an active tick into sortedTicks after any with the same plane constant
+     * @return position Index it was inserted at
+     */
+    function _insertSorted(uint256 tickIndex) internal returns (uint256 position) {
+        uint256 planeConstant = ticks[tickIndex].planeConstant;
+        uint256 high = sortedTicks.length;
+        
+        while (position < high) {
+            uint256 mid = (position + high) / 2;
+            if (ticks[sortedTicks[mid]].planeConstant <= planeConstant) {
+                position = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        
+        sortedTicks.push(tickIndex);
+        for (uint256 i = sortedTicks.length - 1; i > position; i--) {
+            sortedTicks[i] = sortedTicks[i - 1];
+        }
+        sortedTicks[position] = tickIndex;
+    }
+    
+    /**
+     * @notice Drop a deactivated tick from sortedTicks
+     */
+    function _removeSorted(uint256 tickIndex) internal {
+        uint256 count = sortedTicks.length;
+        uint256 position = 0;
+        while (sortedTicks[position] != tickIndex) {
+            position++;
+        }
+        
+        for (uint256 i = position; i + 1 < count; i++) {
+            sortedTicks[i] = sortedTicks[i + 1];
+        }
+        sortedTicks.pop();
+        
+        if (position < boundaryTickCount) {
+            boundaryTickCount--;
+        }
+    }
+    
+    /**
+     * @notice Reserves of an interior tick with the given radius
+     */
+    function _getInteriorShare(uint256 radius) internal view returns (uint256[] memory share) {
+        share = new uint256[](tokenCount);
+        if (totalInteriorRadius == 0) return share;
+        
+        for (uint256 i = 0; i < tokenCount; i++) {
+            share[i] = (interiorReserves[i] * radius) / totalInteriorRadius;
+        }
+    }
+    
+    /**
+     * @notice Current reserves of a tick
+     */
+    function _getTickReserves(Tick storage tick) internal view returns (uint256[] memory) {
+        if (tick.isInterior) {
+            return _getInteriorShare(tick.radius);
+        }
+        return tick.reserves;
+    }
+    
+    /**
+     * @notice Scale reserves onto a boundary plane
+     */
+    function _projectToBoundary(
+        uint256[] memory reserves,
+        uint256 planeConstant
+    ) internal view returns (uint256[] memory) {
+        uint256 projection = _getProjection(reserves);
+        
+        if (projection != 0 && projection != planeConstant) {
+            for (uint256 i = 0; i < tokenCount; i++) {
+                reserves[i] = (reserves[i] * planeConstant) / projection;
+            }
+        }
+        return reserves;
+    }
+    
+    /**
+     * @notice Projection <x, e> of reserves onto the equal price vector
+     */
+    function _getProjection(uint256[] memory reserves) internal view returns (uint256 projection) {
+        uint256 component = equalPriceComponent;
+        for (uint256 i = 0; i < reserves.length; i++) {
+            projection += (reserves[i] * component) / OrbitalMath.PRECISION;
+        }
+    }
+    
+    /**
+     * @notice Get total reserves across all active ticks
+     */
+    function _getTotalReserves() internal view returns (uint256[] memory) {
+        uint256[] memory total = new uint256[](tokenCount);
+        
+        for (uint256 i = 0; i < tokenCount; i++) {
+            total[i] = interiorReserves[i] + boundaryReserves[i];
+        }
+        
+        return total;
+    }
+    
+    // ============ View Functions ============
+    
+    /**
+     * @notice Get spot price between two tokens
+     */
+    function getSpotPrice(uint256 tokenA, uint256 tokenB) 
+        external view 
+        validTokenIndex(tokenA)
+        validTokenIndex(tokenB)
+        returns (uint256) {
+        uint256[] memory reserves = _getTotalReserves();
+        
+        if (reserves[tokenA] == 0) return type(uint256).max;
+        
+        return (reserves[tokenB] * OrbitalMath.PRECISION) / reserves[tokenA];
+    }
+    
+    /**
+     * @notice Get pool reserves for all tokens
+     */
+    function getReserves() external view returns (uint256[] memory) {
+        return _getTotalReserves();
+    }
+    
+    /**
+     * @notice Get capital efficiency for a tick
+     */
+    function getTickEfficiency(uint256 tickIndex) 
+        external view 
+        validTickIndex(tickIndex) 
+        returns (uint256) {
+        Tick storage tick = ticks[tickIndex];
+        uint256 sqrtN = OrbitalMath.sqrt(tokenCount * OrbitalMath.PRECISION);
+        uint256 denominator = tick.radius - (tick.planeConstant * sqrtN) / OrbitalMath.PRECISION;
+        
+        if (denominator <= 0) return OrbitalMath.PRECISION;
+        
+        return (tick.radius * OrbitalMath.PRECISION) / denominator;
+    }
+    
+    /**
+     * @notice Get tick information
+     */
+    function getTickInfo(uint256 tickIndex) 
+        external view 
+        validTickIndex(tickIndex)
+        returns (
+            uint256 radius,
+            uint256 planeConstant,
+            bool isInterior,
+            address owner,
+            uint256[] memory reserves
+        ) {
+        Tick storage tick = ticks[tickIndex];
+        return (
+            tick.radius,
+            tick.planeConstant,
+            tick.isInterior,
+            tick.owner,
+            _getTickReserves(tick)
+        );
+    }
+    
+    /**
+     * @notice Get user's tick indices
+     */
+    function getUserTicks(address user) external view returns (uint256[] memory) {
+        return userTicks[user];
+    }
+    
+    /**
+     * @notice Calculate output amount for a given input (view function for quotes)
+     */
+    function getAmountOut(
+        uint256 tokenIn,
+        uint256 tokenOut,
+        uint256 amountIn
+    ) external view 
+      validTokenIndex(tokenIn)
+      validTokenIndex(tokenOut)
+      returns (uint256) {
+        require(tokenIn != tokenOut, "Same token");
+        
+        uint256 amountInAfterFee = (amountIn * (FEE_DENOMINATOR - swapFee)) / FEE_DENOMINATOR;
+        uint256[] memory reserves = _getTotalReserves();
+        
+        return _calculateSwapOutput(reserves, tokenIn, tokenOut, amountInAfterFee);
+    }
+    
+    // ============ Admin Functions ============
+    
+    /**
+     * @notice Update swap fee (only owner)
+     */
+    function setSwapFee(uint256 _swapFee) external onlyOwner {
+        require(_swapFee <= 100, "Fee too high"); // Max 1%
+        swapFee = _swapFee;
+    }
+    
+    /**
+     * @notice Emergency withdraw function (only owner)
+     */
+    function emergencyWithdraw(address token, uint256 amount) external onlyOwner {
+        IERC20(token).transfer(msg.sender, amount);
+    }
+}
\ No newline at end of file